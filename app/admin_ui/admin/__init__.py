@@ -1,4 +1,5 @@
 from .change import *  # noqa
 from .data_models import *  # noqa
+from .runs import *  # noqa
 from .site import *  # noqa
 from .users import *  # noqa
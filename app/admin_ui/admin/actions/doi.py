@@ -1,9 +1,22 @@
+from functools import partial
+
 from django.contrib import messages
+from django.db import transaction
+
+from cmr import tasks
+from cmr.batch_matching import create_match_run
 
 
 def fetch_dois(modeladmin, request, queryset):
+    run = create_match_run(
+        queryset.model._meta.model_name,
+        queryset.values_list("uuid", flat=True),
+        user=request.user,
+    )
+    # the run must be committed before its task looks it up
+    transaction.on_commit(partial(tasks.start_match_run.delay, str(run.uuid)))
     messages.add_message(
-        request, messages.INFO, f"Scheduled DOI fetch operations for {queryset.count()} models"
+        request, messages.INFO, f"Scheduled DOI fetch operations for {len(run.targets)} models"
     )
 
 
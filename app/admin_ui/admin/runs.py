@@ -0,0 +1,107 @@
+from django.contrib import admin
+from django.utils.html import format_html, format_html_join
+
+from api_app.models import MatchRun, SyncRun
+
+
+class RunHistoryAdmin(admin.ModelAdmin):
+    """Read-only history of task runs, with the telemetry recorded by `api_app.telemetry`"""
+
+    @admin.display(description="duration")
+    def duration(self, obj):
+        if not obj.finished_at:
+            return None
+        return obj.finished_at - obj.created_at
+
+    @admin.display(description="queries")
+    def query_count(self, obj):
+        return obj.telemetry.get("counters", {}).get("orm_queries", 0)
+
+    @admin.display(description="HTTP requests")
+    def http_request_count(self, obj):
+        return obj.telemetry.get("counters", {}).get("http_requests", 0)
+
+    @admin.display(description="stage timings")
+    def stage_timings(self, obj):
+        return self._telemetry_table(obj.telemetry)
+
+    @admin.display(description="breakdown")
+    def breakdown(self, obj):
+        """Telemetry of each part of the run, such as a matched record or a synced scheme"""
+        rows = [
+            (name, result.get("name", ""), self._telemetry_table(result.get("telemetry", {})))
+            for name, result in obj.report.items()
+        ]
+        return format_html(
+            "<table>{}</table>",
+            format_html_join("", "<tr><th>{} {}</th><td>{}</td></tr>", rows),
+        )
+
+    @staticmethod
+    def _telemetry_table(telemetry):
+        rows = [
+            *((f"{name} (s)", seconds) for name, seconds in telemetry.get("stages", {}).items()),
+            *telemetry.get("counters", {}).items(),
+        ]
+        return format_html(
+            "<table>{}</table>", format_html_join("", "<tr><td>{}</td><td>{}</td></tr>", rows)
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MatchRun)
+class MatchRunAdmin(RunHistoryAdmin):
+    list_display = (
+        "created_at",
+        "table_name",
+        "record_count",
+        "status",
+        "user",
+        "duration",
+        "query_count",
+        "http_request_count",
+    )
+    list_filter = ("status", "table_name")
+    readonly_fields = (
+        "uuid",
+        "table_name",
+        "targets",
+        "status",
+        "user",
+        "finished_at",
+        "duration",
+        "error",
+        "report",
+        "stage_timings",
+        "breakdown",
+    )
+
+    @admin.display(description="records")
+    def record_count(self, obj: MatchRun):
+        return len(obj.targets)
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(RunHistoryAdmin):
+    list_display = (
+        "created_at",
+        "status",
+        "duration",
+        "query_count",
+        "http_request_count",
+    )
+    list_filter = ("status",)
+    readonly_fields = (
+        "uuid",
+        "status",
+        "finished_at",
+        "duration",
+        "report",
+        "stage_timings",
+        "breakdown",
+    )
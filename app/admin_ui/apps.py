@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AdminUiConfig(AppConfig):
     name = "admin_ui"
+
+    def ready(self):
+        # register the signal receivers that expire cached DOI review choices
+        from . import doi_review  # noqa
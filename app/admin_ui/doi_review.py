@@ -0,0 +1,413 @@
+"""
+Data loading for the DOI approval page.
+
+The approval page shows one page of DOI drafts recommended for a campaign, with choice
+lists for relating each DOI to campaigns, platforms, instruments and CDPIs. Rather than
+offering the whole catalogue, choices are limited to the campaign's own tree (its
+deployments' collection periods and their platforms and instruments) plus whatever the
+DOIs on the page already reference. The campaign tree choices are cached per campaign
+and invalidated whenever a draft in that tree changes.
+"""
+import base64
+import json
+import time
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional, Sequence
+from uuid import UUID
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, Value, functions
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.forms import ModelChoiceField
+from django.utils import timezone
+
+from api_app.models import ApprovalLog, Change, ChangeReference
+from api_app.search import index_drafts
+from data_models import models as data_models
+
+from .fields import ChangeMultipleChoiceField
+
+# DoiForm field name -> model offered in that field's choices
+DOI_CHOICE_FIELDS = {
+    "campaigns": data_models.Campaign,
+    "platforms": data_models.Platform,
+    "instruments": data_models.Instrument,
+    "collection_periods": data_models.CollectionPeriod,
+}
+
+CHOICES_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Platform and instrument drafts are shared between campaigns, so any change to them
+# invalidates the choices of every campaign
+SHARED_SCOPE = "shared"
+
+
+def _version_key(scope) -> str:
+    return f"doi_review:version:{scope}"
+
+
+def get_version(scope) -> int:
+    # Versions are timestamps rather than counters so that an evicted version can't be
+    # reissued and revive a stale cache entry
+    return cache.get_or_set(_version_key(scope), time.time_ns(), None)
+
+
+def invalidate(scope):
+    cache.set(_version_key(scope), time.time_ns(), None)
+
+
+def get_campaign_tree(campaign_uuid) -> dict[str, set[str]]:
+    """Collects the uuids of the drafts that make up a campaign's tree.
+
+    Args:
+        campaign_uuid (UUID): Canonical uuid of the campaign
+
+    Returns:
+        dict: DOI_CHOICE_FIELDS field name -> set of draft uuids (as strings)
+    """
+    active_drafts = Change.objects.filter(action=Change.Actions.CREATE).exclude(
+        status=Change.Statuses.IN_TRASH
+    )
+    deployment_uuids = [
+        str(uuid)
+        for uuid in active_drafts.of_type(data_models.Deployment)
+        .referencing("campaign", [campaign_uuid])
+        .values_list("uuid", flat=True)
+    ]
+    collection_periods = (
+        active_drafts.of_type(data_models.CollectionPeriod)
+        .referencing("deployment", deployment_uuids)
+        .values_list("uuid", "update__platform", "update__instruments")
+        if deployment_uuids
+        else []
+    )
+
+    tree = {
+        "campaigns": {str(campaign_uuid)},
+        "platforms": set(),
+        "instruments": set(),
+        "collection_periods": set(),
+    }
+    for uuid, platform, instruments in collection_periods:
+        tree["collection_periods"].add(str(uuid))
+        if platform:
+            tree["platforms"].add(platform)
+        tree["instruments"].update(instruments or [])
+    return tree
+
+
+def build_choices(uuids_by_field: dict[str, set[str]]) -> dict[str, list[tuple[str, str]]]:
+    """Renders (value, label) choices for the given draft uuids, one query per field"""
+    choices = {}
+    for field_name, model in DOI_CHOICE_FIELDS.items():
+        uuids = uuids_by_field.get(field_name)
+        if not uuids:
+            choices[field_name] = []
+            continue
+        queryset = ChangeMultipleChoiceField.get_queryset_for_model(model).filter(uuid__in=uuids)
+        # Plain strings keep the choices picklable for the cache
+        choices[field_name] = [
+            (str(value), str(label))
+            for value, label in ModelChoiceField(queryset, empty_label=None).choices
+        ]
+    return choices
+
+
+def get_campaign_choices(campaign_uuid) -> dict[str, list[tuple[str, str]]]:
+    key = (
+        f"doi_review:choices:{campaign_uuid}"
+        f":{get_version(campaign_uuid)}:{get_version(SHARED_SCOPE)}"
+    )
+    choices = cache.get(key)
+    if choices is None:
+        choices = build_choices(get_campaign_tree(campaign_uuid))
+        cache.set(key, choices, CHOICES_CACHE_TIMEOUT)
+    return choices
+
+
+def encode_cursor(values: Sequence) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Optional[list]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+    # [offset, status, concept_id, uuid]
+    if isinstance(position, list) and len(position) == 4:
+        return position
+
+
+@dataclass
+class DoiReviewPage:
+    dois: list[Change]
+    total: int
+    offset: int = 0
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    choices: dict[str, list[tuple[str, str]]] = field(default_factory=dict)
+
+    @property
+    def start_index(self) -> int:
+        return self.offset + 1 if self.dois else 0
+
+    @property
+    def end_index(self) -> int:
+        return self.offset + len(self.dois)
+
+
+class DoiReviewData:
+    """
+    Loads a single page of DOI drafts for a campaign along with the choices needed to
+    render them. Pages are addressed with an opaque keyset cursor over
+    (status, concept_id, uuid), so unreviewed DOIs come first and deep pages cost the
+    same as the first one. A page is either the one after the last DOI of the previous
+    page, or the one before the first DOI of the next page.
+    """
+
+    def __init__(self, campaign_uuid: UUID, page_size: int = 10):
+        self.campaign_uuid = campaign_uuid
+        self.page_size = page_size
+
+    def get_queryset(self):
+        return (
+            Change.objects.of_type(data_models.DOI)
+            .referencing("campaigns", [self.campaign_uuid])
+            .annotate(
+                concept_id=functions.Coalesce(KeyTextTransform("concept_id", "update"), Value(""))
+            )
+            .order_by("status", "concept_id", "uuid")
+        )
+
+    def get_page(self, cursor: Optional[str] = None, before: Optional[str] = None) -> DoiReviewPage:
+        """
+        Args:
+            cursor (str, optional): `next_cursor` of the previous page
+            before (str, optional): `previous_cursor` of the next page
+
+        Returns:
+            DoiReviewPage: the page, or the first page if the cursor is invalid
+        """
+        queryset = self.get_queryset()
+        total = queryset.count()
+        fields = ("uuid", "update", "status")
+
+        offset, has_next = 0, False
+        if before and (position := decode_cursor(before)):
+            offset, status, concept_id, uuid = position
+            earlier = queryset.filter(
+                Q(status__lt=status)
+                | Q(status=status, concept_id__lt=concept_id)
+                | Q(status=status, concept_id=concept_id, uuid__lt=uuid)
+            )
+            dois = list(earlier.reverse().only(*fields)[: self.page_size + 1])
+            if len(dois) > self.page_size:
+                dois = dois[: self.page_size][::-1]
+                # rows may have come and gone since, but a page with rows before it isn't first
+                offset, has_next = max(offset - self.page_size, 1), True
+            else:
+                dois, offset = list(queryset.only(*fields)[: self.page_size + 1]), 0
+        else:
+            if cursor and (position := decode_cursor(cursor)):
+                offset, status, concept_id, uuid = position
+                queryset = queryset.filter(
+                    Q(status__gt=status)
+                    | Q(status=status, concept_id__gt=concept_id)
+                    | Q(status=status, concept_id=concept_id, uuid__gt=uuid)
+                )
+            dois = list(queryset.only(*fields)[: self.page_size + 1])
+
+        if len(dois) > self.page_size:
+            dois, has_next = dois[: self.page_size], True
+        next_cursor = previous_cursor = None
+        if has_next:
+            last = dois[-1]
+            next_cursor = encode_cursor(
+                [offset + self.page_size, last.status, last.concept_id, str(last.uuid)]
+            )
+        if offset and dois:
+            first = dois[0]
+            previous_cursor = encode_cursor(
+                [offset, first.status, first.concept_id, str(first.uuid)]
+            )
+
+        return DoiReviewPage(
+            dois=dois,
+            total=total,
+            offset=offset,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+            choices=self.get_choices(dois),
+        )
+
+    def get_choices(self, dois: Sequence[Change]) -> dict[str, list[tuple[str, str]]]:
+        """
+        Campaign tree choices, extended with any values already selected on the page's
+        DOIs that fall outside of the tree so that they aren't dropped on save.
+        """
+        choices = get_campaign_choices(self.campaign_uuid)
+
+        missing = {field_name: set() for field_name in DOI_CHOICE_FIELDS}
+        for field_name in DOI_CHOICE_FIELDS:
+            known = {value for value, _ in choices[field_name]}
+            for doi in dois:
+                missing[field_name].update(
+                    str(uuid) for uuid in doi.update.get(field_name) or [] if str(uuid) not in known
+                )
+        if not any(missing.values()):
+            return choices
+
+        extra = build_choices(missing)
+        return {
+            field_name: sorted(choices[field_name] + extra[field_name], key=lambda c: c[1])
+            for field_name in DOI_CHOICE_FIELDS
+        }
+
+
+class DoiReviewResult(NamedTuple):
+    updated: list[Change]
+    trashed: list[Change]
+    ignored: list[dict]
+
+
+TRANSITION_NOTES = "Transitioned via the DOI Approval form"
+
+
+def _get_transition(status: int, keep: Optional[bool]) -> list[tuple[int, int]]:
+    """Works out the (log action, new status) steps a DOI takes for a review decision.
+
+    Args:
+        status (int): Current status of the DOI draft
+        keep (bool | None): True when marked as reviewed, False when marked for
+            deletion and None when left unreviewed
+
+    Returns:
+        list: (ApprovalLog.Actions, Change.Statuses) pairs, empty if the status stays
+    """
+    if keep is False:
+        if status == Change.Statuses.IN_TRASH:
+            return []
+        return [(ApprovalLog.Actions.TRASH, Change.Statuses.IN_TRASH)]
+
+    steps = []
+    if status == Change.Statuses.IN_TRASH:
+        status = Change.Statuses.IN_PROGRESS
+        steps.append((ApprovalLog.Actions.UNTRASH, status))
+
+    if keep is True:
+        if status in [Change.Statuses.CREATED, Change.Statuses.IN_PROGRESS]:
+            steps.append((ApprovalLog.Actions.SUBMIT, Change.Statuses.AWAITING_REVIEW))
+    elif status == Change.Statuses.CREATED:
+        # never been previously edited and neither checkmark nor trash were selected
+        steps.append((ApprovalLog.Actions.EDIT, Change.Statuses.IN_PROGRESS))
+    return steps
+
+
+def commit_doi_review(dois: Sequence[dict], user) -> DoiReviewResult:
+    """
+    Persist the reviewed rows of a DOI approval formset. All transitions are computed in
+    memory and written with one bulk update of the changed drafts and one bulk insert of
+    their approval logs, inside a single transaction, so the number of queries doesn't
+    grow with the number of rows.
+
+    Args:
+        dois (list): cleaned_data of the changed DoiForms
+        user (User): User reviewing the DOIs
+
+    Returns:
+        DoiReviewResult: updated, trashed and ignored (already published) DOIs
+    """
+    stored_dois = Change.objects.select_related("content_type").in_bulk(
+        [doi["uuid"] for doi in dois]
+    )
+    now = timezone.now()
+    result = DoiReviewResult(updated=[], trashed=[], ignored=[])
+    logs = []
+
+    for doi in dois:
+        stored_doi = stored_dois[doi["uuid"]]
+
+        if stored_doi.status == Change.Statuses.PUBLISHED:
+            result.ignored.append(doi)
+            continue
+
+        changed = False
+        for field_name, value in doi.items():
+            if field_name in ["uuid", "keep"] or stored_doi.update.get(field_name) == value:
+                continue
+            stored_doi.update[field_name] = value
+            changed = True
+        if changed:
+            stored_doi.refresh_diff()
+            stored_doi.refresh_cmr_fingerprint()
+
+        for action, status in _get_transition(stored_doi.status, doi["keep"]):
+            logs.append(
+                ApprovalLog(
+                    change=stored_doi,
+                    user=user,
+                    action=action,
+                    notes=TRANSITION_NOTES,
+                )
+            )
+            stored_doi.status = status
+            changed = True
+
+        if not changed:
+            continue
+
+        stored_doi.updated_at = now
+        if stored_doi.status == Change.Statuses.IN_TRASH:
+            result.trashed.append(stored_doi)
+        else:
+            result.updated.append(stored_doi)
+
+    changed_dois = result.updated + result.trashed
+    with transaction.atomic():
+        Change.objects.bulk_update(
+            changed_dois, ["update", "diff", "cmr_fingerprint", "updated_at", "status"]
+        )
+        ApprovalLog.objects.bulk_create(logs)
+        # bulk writes skip `Change.save` and the post_save receivers that maintain the search
+        # index, so derived tables are refreshed here
+        ChangeReference.objects.sync(changed_dois)
+        index_drafts(changed_dois)
+
+    return result
+
+
+def _get_draft_value(draft: Change, key: str):
+    """Read a key from a draft, falling back to the create draft of the same record"""
+    if value := draft.update.get(key):
+        return value
+    return (
+        Change.objects.filter(uuid=draft.canonical_uuid, action=Change.Actions.CREATE)
+        .values_list(f"update__{key}", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Change, dispatch_uid="invalidate_doi_review_choices")
+def invalidate_doi_review_choices(sender, instance, **kwargs):
+    """Expire cached choices of the campaign whose tree contains the saved draft"""
+    model = instance.content_type.model
+    if model in ("platform", "instrument"):
+        invalidate(SHARED_SCOPE)
+    elif model == "campaign":
+        invalidate(instance.canonical_uuid)
+    elif model == "deployment":
+        if campaign := _get_draft_value(instance, "campaign"):
+            invalidate(campaign)
+    elif model == "collectionperiod":
+        if deployment := _get_draft_value(instance, "deployment"):
+            campaign = (
+                Change.objects.filter(uuid=deployment)
+                .values_list("update__campaign", flat=True)
+                .first()
+            )
+            if campaign:
+                invalidate(campaign)
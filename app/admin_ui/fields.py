@@ -1,6 +1,5 @@
 from django.core.exceptions import ValidationError
-from django.db.models import expressions, functions, UUIDField
-from django.db.models.fields.json import KeyTextTransform
+from django.db.models import expressions, Q
 from django.contrib.gis.forms.fields import PolygonField
 from django.forms import (
     MultipleChoiceField,
@@ -48,23 +47,42 @@ class ChangeChoiceMixin:
         super().__init__(*args, **kwargs)
         self.dest_model = dest_model
 
-    @classmethod
-    def get_queryset_for_model(cls, dest_model):
+    @staticmethod
+    def get_identifier_attrs(dest_model):
         """
-        Generate the queryset for all of the options elements in a select input. For the
-        textual identifier of each option, we want to render the 'short_name' attribute
-        of the published version of every draft. If the draft has never been published,
-        we render the 'short_name' value from the 'update' attribute of the draft. As
-        such, if any update to a record's 'short_name' was published, we will render that
-        value. Otherwise, we will render the first 'short_name' it was ever assigned.
+        Select which attributes are to be used when rendering string represntation of draft
         """
-        # Select which attributes are to be used when rendering string represntation of draft
-        identifier_attrs = (
+        return (
             ("campaign", "deployment", "platform", "update__platform_identifier")
             if dest_model is data_models.CollectionPeriod
-            else ('short_name',)
+            else ('display_name',)
         )
 
+    @classmethod
+    def search_queryset_for_model(cls, dest_model, term):
+        """
+        Narrow the options of `get_queryset_for_model` to those with an identifier
+        attribute containing `term`, as used when searching options in a select input.
+        """
+        queryset = cls.get_queryset_for_model(dest_model)
+        if not term:
+            return queryset
+
+        query = Q()
+        for attr in cls.get_identifier_attrs(dest_model):
+            query |= Q(**{f"{attr}__icontains": term})
+        return queryset.filter(query)
+
+    @classmethod
+    def get_queryset_for_model(cls, dest_model):
+        """
+        Generate the queryset for all of the options elements in a select input. Each
+        option is described by the `display_name` of the record's create draft, which is
+        the name of the published record or, if the draft has never been published, the
+        name it was first assigned.
+        """
+        identifier_attrs = cls.get_identifier_attrs(dest_model)
+
         # Get relevant drafts
         qs = (
             ChangeWithIdentifier(*identifier_attrs).objects.of_type(dest_model)
@@ -82,7 +100,7 @@ class ChangeChoiceMixin:
             )
         )
 
-        # Annotate QS with identifier attribute(s) to be used in dropdown
+        # Collection periods have no name of their own, describe them by their related records
         if dest_model is data_models.CollectionPeriod:
             qs = (
                 # Get Deployment short_name from related deployments
@@ -100,27 +118,15 @@ class ChangeChoiceMixin:
                 # Get Campaign short_name by looking up campaigns related to the deployments
                 # related to this draft 🤕
                 .annotate(
-                    deployment_jsonb=models.Subquery(
-                        models.Change.objects.of_type(data_models.Deployment).filter(
-                            action=models.Change.Actions.CREATE,
-                            uuid=expressions.OuterRef('deployment_uuid'),
+                    # retrieve the campaign referenced by the related deployment draft
+                    campaign_uuid=models.Subquery(
+                        models.ChangeReference.objects.filter(
+                            source_change=expressions.OuterRef('deployment_uuid'),
+                            field_name='campaign',
                             # NOTE: the `deployment_uuid` attribute is generated behind the
                             # scenes via .annotate_from_relationship() when we populated the
                             # `deployment` attribute
-                        )
-                        # NOTE: We are extracting the 'update' JSONB values from deployments
-                        # rather than 'update__campaign' because selecting attributes in the
-                        # 'update' object strangely returns JSONB rather than TEXT, making
-                        # it challenging/not-possible to later cast to a UUID
-                        .values('update')[:1]
-                    ),
-                    # retrieve the campaign uuid as TEXT, cast to UUID
-                    campaign_uuid=functions.Cast(
-                        KeyTextTransform(
-                            'campaign',
-                            "deployment_jsonb",
-                        ),
-                        output_field=UUIDField(),
+                        ).values('target_uuid')[:1]
                     ),
                     # use campaign uuid to retrieve campaign create draft, extract its short_name
                     campaign=models.Subquery(
@@ -129,25 +135,7 @@ class ChangeChoiceMixin:
                             action=models.Change.Actions.CREATE,
                             uuid=expressions.OuterRef('campaign_uuid'),
                         )
-                        .values('update__short_name')[:1],
-                    ),
-                )
-            )
-
-        else:
-            qs = (
-                qs
-                # We want to describe every option in the choice field by its short_name from
-                # the *published* version of that record. However, if there is no published
-                # version, we will fall back to the short_name from the updates object.
-                .annotate_from_published(
-                    dest_model,
-                    to_attr="short_name",
-                    # Attribute to use for textual description of field
-                    identifier=(
-                        'title'
-                        if dest_model in [data_models.Image, data_models.Website]
-                        else 'short_name'
+                        .values('display_name')[:1],
                     ),
                 )
             )
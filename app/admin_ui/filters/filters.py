@@ -16,9 +16,7 @@ from .utils import (
 )
 
 # TODO:
-# 1. Look at .values with Cast function
-#   -> This is for queries like these: Q(update__campaigns__contains=(str(val[0]) for val in campaigns)
-# 2. Merge the filters.py and published_filters.py into as single file.
+# 1. Merge the filters.py and published_filters.py into as single file.
 
 
 def GenericDraftFilter(model_name, filter_configs=default_filter_configs):
@@ -60,7 +58,7 @@ class DeploymentFilter(CampaignFilter):
         deployments = get_deployments(campaigns)
         return queryset.filter(
             Q(model_instance_uuid__in=deployments)
-            | Q(update__campaign__in=(str(val[0]) for val in campaigns))
+            | Q(uuid__in=Change.objects.referencing("campaign", [val[0] for val in campaigns]))
         )
 
     class Meta:
@@ -100,7 +98,7 @@ class DoiFilter(CampaignFilter):
         model_instances = DOI.objects.filter(campaigns__in=campaigns).values_list("uuid")
         return queryset.filter(
             Q(model_instance_uuid__in=model_instances)
-            | Q(update__campaigns__contains=(str(val[0]) for val in campaigns))
+            | Q(uuid__in=Change.objects.referencing("campaigns", [val[0] for val in campaigns]))
         )
 
     class Meta:
@@ -128,7 +126,7 @@ class GcmdSyncListFilter(django_filters.FilterSet):
         queryset=ContentType.objects.filter(model__startswith="gcmd"),
     )
     short_name = django_filters.CharFilter(
-        label="Keyword", field_name="short_name", lookup_expr='icontains'
+        label="Keyword", field_name="display_name", lookup_expr='icontains'
     )
 
 
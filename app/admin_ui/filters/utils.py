@@ -1,7 +1,7 @@
 import django_filters
 from django.db.models.query_utils import Q
 
-from api_app.models import Change
+from api_app.models import Change, get_display_name_field
 from data_models import models
 from data_models.models import Campaign, Deployment
 
@@ -50,8 +50,7 @@ def get_draft_campaigns(search_string):
     campaign_draft_uuids = (
         Change.objects.of_type(Campaign)
         .filter(
-            Q(update__short_name__icontains=search_string)
-            | Q(update__long_name__icontains=search_string)
+            Q(display_name__icontains=search_string) | Q(update__long_name__icontains=search_string)
         )
         .values_list("uuid")
     )
@@ -93,11 +92,14 @@ def filter_draft_and_published(model_name):
 
         """
 
-        field_name_in_draft_query = {f"{field_name}__icontains": search_string}
-
         # remove the "update__" part for the field_name
         model_field_name = field_name.replace("update__", "")
         Model = getattr(models, model_name)
+
+        # the field that names a record is also stored, indexed, on its drafts
+        if model_field_name == get_display_name_field(Model):
+            field_name = "display_name"
+        field_name_in_draft_query = {f"{field_name}__icontains": search_string}
         matching_model_instances = Model.objects.filter(
             **{f"{model_field_name}__icontains": search_string}
         ).values_list("uuid")
@@ -125,12 +127,16 @@ def second_level_campaign_name_filter(queryset, search_string, model):
     deployments = get_deployments(campaigns)
     deployments_change_objects = Change.objects.of_type(Deployment).filter(
         Q(model_instance_uuid__in=deployments)
-        | Q(update__campaign__in=(str(val[0]) for val in campaigns))
+        | Q(uuid__in=Change.objects.referencing("campaign", [val[0] for val in campaigns]))
     )
 
     model_instances = model.objects.filter(deployment__in=deployments)
     unioned_deployments = deployments.union(deployments_change_objects.values_list("uuid"))
     return queryset.filter(
         Q(model_instance_uuid__in=model_instances)
-        | Q(update__deployment__in=(str(val[0]) for val in unioned_deployments))
+        | Q(
+            uuid__in=Change.objects.referencing(
+                "deployment", [val[0] for val in unioned_deployments]
+            )
+        )
     )
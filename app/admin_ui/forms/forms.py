@@ -1,7 +1,6 @@
 from collections import OrderedDict
 
 from django import forms
-from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Submit
@@ -105,26 +104,19 @@ class DoiForm(forms.Form):
 
 
 class DoiFormSet(forms.formset_factory(DoiForm, extra=0)):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, choices, **kwargs):
+        """
+        Args:
+            choices (dict): DoiForm field name -> (value, label) choices shared by every
+                form in the formset. Building these once outside of the forms avoids
+                redundant queries for the M2M fields within each form.
+                https://code.djangoproject.com/ticket/22841
+        """
         super().__init__(*args, **kwargs)
+        self.choices = choices
         self.helper = TableInlineFormSetHelper()
         self.helper.add_input(Submit("submit", "Save"))
 
-    @cached_property
-    def choices(self):
-        # To avoid redundant queries for the M2M fields within each of this
-        # formset's forms, we manually build the choices outside of the form.
-        # https://code.djangoproject.com/ticket/22841
-        querysets = {
-            "campaigns": ChangeMultipleChoiceField.get_queryset_for_model(data_models.Campaign),
-            "platforms": ChangeMultipleChoiceField.get_queryset_for_model(data_models.Platform),
-            "instruments": ChangeMultipleChoiceField.get_queryset_for_model(data_models.Instrument),
-            "collection_periods": ChangeMultipleChoiceField.get_queryset_for_model(
-                data_models.CollectionPeriod
-            ),
-        }
-        return {field: list(forms.ModelChoiceField(qs).choices) for field, qs in querysets.items()}
-
     def get_form_kwargs(self, index):
         return {**super().get_form_kwargs(index), "choices": self.choices}
 
@@ -5,11 +5,12 @@ from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.db.models.fields import PolygonField
 from django.db import models as model_fields
-from django.forms import modelform_factory, HiddenInput
+from django.forms import BaseForm, modelform_factory, HiddenInput
 from django.http import HttpResponseBadRequest
 from django.http.response import Http404
 from django.shortcuts import render
 from django.views.generic.edit import ModelFormMixin
+from api_app.models import Change
 from api_app.urls import camel_to_snake
 
 from data_models import models
@@ -71,7 +72,20 @@ def formfield_callback(f, disabled_fields=[], **kwargs):
     return f.formfield(**kwargs)
 
 
-class ChangeModelFormMixin(ModelFormMixin):
+class RelatedLinksMixin:
+    """
+    Resolve the links to published records and drafts rendered by the related record inputs
+    of every form in the context in bulk, before the template renders them.
+    """
+
+    def render_to_response(self, context, **response_kwargs):
+        widgets.resolve_related_links(
+            *(value for value in context.values() if isinstance(value, BaseForm))
+        )
+        return super().render_to_response(context, **response_kwargs)
+
+
+class ChangeModelFormMixin(RelatedLinksMixin, ModelFormMixin):
     """
     This mixin attempts to simplify working with a second form (the model_form)
     when editing Change objects.
@@ -133,6 +147,21 @@ class ChangeModelFormMixin(ModelFormMixin):
 
         return super().get_context_data(**kwargs)
 
+    def get_comparison_form(self, draft, model_form):
+        """
+        Generates a disabled form of the values replaced by an Update draft, used for
+        generating a diff view. Fields listed in the draft's stored diff are highlighted on
+        the draft's form.
+        """
+        if not draft or draft.action != Change.Actions.UPDATE:
+            return None
+
+        comparison_form = self.destination_model_form(
+            initial={**draft.update, **draft.previous}, auto_id="readonly_%s"
+        )
+        utils.highlight_changed_fields(model_form, draft.diff)
+        return utils.disable_form_fields(comparison_form)
+
     @staticmethod
     def get_verbose_names(model_type) -> Dict:
         return {
@@ -0,0 +1,45 @@
+// Polls the progress of the tasks rendered by api_app/task_progress.html until they are done
+var TASK_PROGRESS_POLL_INTERVAL = 3000;
+var TASK_DONE_STATES = ['SUCCESS', 'FAILURE', 'REVOKED'];
+
+function formatDuration(seconds) {
+  if (seconds < 60) return seconds + 's';
+  return Math.floor(seconds / 60) + 'm ' + (seconds % 60) + 's';
+}
+
+function pollTaskProgress(element) {
+  $.getJSON(element.data('url'), function (task) {
+    var progress = task.progress;
+    var bar = element.find('.progress-bar');
+
+    if (progress) {
+      var percent = progress.total ? Math.round((100 * progress.done) / progress.total) : 0;
+      bar.css('width', percent + '%');
+      element.find('.task-progress-stage').text(
+        progress.stage + (progress.total ? ' ' + progress.done + '/' + progress.total : '')
+      );
+      element.find('.task-progress-current').text(progress.current);
+      element.find('.task-progress-eta').text(
+        progress.eta !== null ? '~' + formatDuration(progress.eta) + ' left' : ''
+      );
+      element.find('.task-progress-errors').text(
+        progress.errors ? progress.errors + ' errors' : ''
+      );
+    } else {
+      element.find('.task-progress-stage').text(task.state);
+    }
+
+    if (TASK_DONE_STATES.indexOf(task.state) !== -1) {
+      bar.css('width', '100%').toggleClass('bg-danger', task.state !== 'SUCCESS');
+      element.find('.task-progress-current, .task-progress-eta').text('');
+      return;
+    }
+    setTimeout(function () { pollTaskProgress(element); }, TASK_PROGRESS_POLL_INTERVAL);
+  });
+}
+
+$(document).ready(function () {
+  $('.task-progress[data-url]').each(function () {
+    pollTaskProgress($(this));
+  });
+});
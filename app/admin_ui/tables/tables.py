@@ -7,7 +7,7 @@ from django_tables2 import A
 import django_tables2 as tables
 from api_app.urls import camel_to_snake
 
-from api_app.models import Change
+from api_app.models import Change, SearchIndex
 from data_models.models import (
     Campaign,
     Deployment,
@@ -169,7 +169,7 @@ class DraftTableBase(tables.Table):
 class LimitedTableBase(DraftTableBase):
     short_name = BackupValueColumn(
         verbose_name="Short Name",
-        accessor="update__short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -189,7 +189,7 @@ class LimitedTableBase(DraftTableBase):
 class IOPChangeListTable(DraftTableBase):
     short_name = BackupValueColumn(
         verbose_name="Short Name",
-        accessor="update__short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -224,7 +224,7 @@ class IOPChangeListTable(DraftTableBase):
 class SignificantEventChangeListTable(DraftTableBase):
     short_name = BackupValueColumn(
         verbose_name="Short Name",
-        accessor="update__short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -488,7 +488,7 @@ class PartnerOrgChangeListTable(LimitedTableBase):
                     "model": camel_to_snake(record.model_name),
                 },
             ),
-            label=record.update.get('short_name') or '---',
+            label=record.display_name or '---',
         )
 
 
@@ -552,7 +552,7 @@ class PlatformChangeListTable(LimitedTableBase):
                     "model": camel_to_snake(record.model_name),
                 },
             ),
-            label=record.update.get('short_name') or '---',
+            label=record.display_name or '---',
         )
 
 
@@ -572,7 +572,7 @@ class InstrumentChangeListTable(LimitedTableBase):
                     "model": camel_to_snake(record.model_name),
                 },
             ),
-            label=record.update.get('short_name') or '---',
+            label=record.display_name or '---',
         )
 
 
@@ -580,7 +580,7 @@ class InstrumentChangeListTable(LimitedTableBase):
 class ChangeSummaryTable(DraftTableBase):
     short_name = BackupValueColumn(
         verbose_name="Short Name",
-        accessor="update__short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -603,7 +603,7 @@ class ChangeSummaryTable(DraftTableBase):
                     "model": camel_to_snake(record.model_name),
                 },
             ),
-            label=record.update.get('short_name') or '---',
+            label=record.display_name or '---',
         )
 
     class Meta:
@@ -615,7 +615,7 @@ class ChangeSummaryTable(DraftTableBase):
 class WebsiteChangeListTable(DraftTableBase):
     title = BackupValueColumn(
         verbose_name="Title",
-        accessor="update__title",
+        accessor="display_name",
         backup_accessor="content_object.title",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -638,7 +638,7 @@ class WebsiteChangeListTable(DraftTableBase):
 class AliasChangeListTable(DraftTableBase):
     short_name = BackupValueColumn(
         verbose_name="Short Name",
-        accessor="update__short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -658,7 +658,7 @@ class AliasChangeListTable(DraftTableBase):
 class GcmdProjectChangeListTable(DraftTableBase):
     short_name = BackupValueColumn(
         verbose_name="Short Name",
-        accessor="update__short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -680,7 +680,7 @@ class GcmdProjectChangeListTable(DraftTableBase):
 class GcmdInstrumentChangeListTable(DraftTableBase):
     short_name = BackupValueColumn(
         verbose_name="Short Name",
-        accessor="update__short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -726,7 +726,7 @@ class GcmdInstrumentChangeListTable(DraftTableBase):
 class GcmdPlatformChangeListTable(DraftTableBase):
     short_name = BackupValueColumn(
         verbose_name="Short Name",
-        accessor="update__short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -807,7 +807,7 @@ class GcmdSyncListTable(DraftTableBase):
 
     short_name = BackupValueColumn(
         verbose_name="GCMD Keyword",
-        accessor="short_name",
+        accessor="display_name",
         backup_accessor="content_object.short_name",
         linkify=("change-gcmd", [tables.A("uuid")]),
     )
@@ -857,7 +857,7 @@ class GcmdSyncListTable(DraftTableBase):
 class ImageChangeListTable(DraftTableBase):
     title = BackupValueColumn(
         verbose_name="Title",
-        accessor="update__title",
+        accessor="display_name",
         backup_accessor="content_object.title",
         linkify=("change-update", [tables.A("uuid")]),
     )
@@ -877,13 +877,14 @@ class ImageChangeListTable(DraftTableBase):
                     "model": camel_to_snake(record.model_name),
                 },
             ),
-            label=record.update.get('short_name') or '---',
+            label=record.display_name or '---',
         )
 
 
 # This table renders a list of historical drafts
 class DraftHistoryTable(tables.Table):
     draft_action = tables.Column(accessor=tables.A('action'))
+    changed_fields = tables.Column(accessor=tables.A('diff'), empty_values=())
     submitted_by = tables.Column(empty_values=())
     reviewed_by = tables.Column(empty_values=())
     published_by = tables.Column(empty_values=())
@@ -909,6 +910,9 @@ class DraftHistoryTable(tables.Table):
         fields = ("uuid", "submitted_by")
         orderable = False
 
+    def render_changed_fields(self, value):
+        return ", ".join(value) or "-"
+
     def render_submitted_by(self, record):
         if approval := record.approvallog_set.filter(action=ApprovalLog.Actions.PUBLISH).first():
             return approval.user.username
@@ -932,3 +936,35 @@ class DraftHistoryTable(tables.Table):
             return approval.date
         else:
             return "not published yet"
+
+
+class SearchResultTable(tables.Table):
+    title = tables.Column(verbose_name="Name")
+    model = tables.Column(verbose_name="Model Type", accessor="content_type__model")
+    is_draft = tables.BooleanColumn(verbose_name="Unpublished Draft")
+    score = tables.Column(verbose_name="Relevance")
+
+    class Meta:
+        model = SearchIndex
+        attrs = {"class": "table table-striped", "thead": {"class": "table-primary"}}
+        fields = ("title", "model", "is_draft", "score")
+        orderable = False
+
+    def render_title(self, value, record):
+        return format_html(
+            '<a href="{form_url}" class="draft-link">{label}</a>',
+            form_url=reverse(
+                "canonical-redirect",
+                kwargs={
+                    "canonical_uuid": record.object_uuid,
+                    "model": camel_to_snake(record.content_type.model_class().__name__),
+                },
+            ),
+            label=value or "---",
+        )
+
+    def render_model(self, record):
+        return record.content_type.model_class()._meta.verbose_name.title()
+
+    def render_score(self, value):
+        return f"{value:.2f}"
@@ -0,0 +1,142 @@
+from unittest import mock
+
+from django.forms import modelform_factory
+from django.test import TestCase
+from django.urls import reverse
+
+from admin_ui import fields, widgets
+from admin_ui.mixins import formfield_callback
+from admin_ui.tests import factories
+from admin_ui.views import ChangeAutocompleteView
+from data_models.models import Campaign, Deployment
+from data_models.tests.factories import CampaignFactory
+
+
+class TestChangeAutocompleteView(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory.create()
+        self.url = reverse("change-autocomplete", kwargs={"model": "campaign"})
+        self.drafts = {
+            short_name: factories.ChangeFactory.make_create_change_object(
+                CampaignFactory, custom_fields={"short_name": short_name}
+            )
+            for short_name in ["ACES", "ACT-AMERICA", "OLYMPEX"]
+        }
+
+    def test_requires_auth(self):
+        response = self.client.get(self.url)
+        self.assertEqual(302, response.status_code)
+        self.assertEqual(f"{reverse('account_login')}?next={self.url}", response.url)
+
+    def test_unknown_model(self):
+        self.client.force_login(user=self.user)
+        response = self.client.get(reverse("change-autocomplete", kwargs={"model": "nothing"}))
+        self.assertEqual(404, response.status_code)
+
+    def test_search(self):
+        self.client.force_login(user=self.user)
+        response = self.client.get(self.url, {"term": "ac"})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {
+                "results": [
+                    {"id": str(self.drafts["ACES"].uuid), "text": "ACES"},
+                    {"id": str(self.drafts["ACT-AMERICA"].uuid), "text": "ACT-AMERICA"},
+                ],
+                "pagination": {"more": False},
+            },
+            response.json(),
+        )
+
+    @mock.patch.object(ChangeAutocompleteView, "paginate_by", 2)
+    def test_pagination(self):
+        self.client.force_login(user=self.user)
+        first = self.client.get(self.url).json()
+        second = self.client.get(self.url, {"page": 2}).json()
+
+        self.assertEqual(["ACES", "ACT-AMERICA"], [result["text"] for result in first["results"]])
+        self.assertTrue(first["pagination"]["more"])
+        self.assertEqual(["OLYMPEX"], [result["text"] for result in second["results"]])
+        self.assertFalse(second["pagination"]["more"])
+
+
+class TestAddAnotherChoiceFieldWidget(TestCase):
+    def setUp(self):
+        self.drafts = [
+            factories.ChangeFactory.make_create_change_object(
+                CampaignFactory, custom_fields={"short_name": short_name}
+            )
+            for short_name in ["ACES", "OLYMPEX"]
+        ]
+        self.field = fields.ChangeChoiceField(
+            dest_model=Campaign,
+            queryset=fields.ChangeChoiceField.get_queryset_for_model(Campaign),
+            widget=widgets.AddAnotherChoiceFieldWidget(model=Campaign),
+        )
+
+    def test_renders_only_selected_option(self):
+        html = self.field.widget.render("campaign", str(self.drafts[1].uuid))
+
+        self.assertIn(f'value="{self.drafts[1].uuid}" selected', html)
+        self.assertIn("OLYMPEX", html)
+        self.assertNotIn("ACES", html)
+        self.assertIn(
+            f'data-ajax--url="{reverse("change-autocomplete", kwargs={"model": "campaign"})}"',
+            html,
+        )
+
+    def test_renders_empty_option_without_value(self):
+        html = self.field.widget.render("campaign", None)
+
+        self.assertIn('<option value="" selected>', html)
+        self.assertNotIn("ACES", html)
+        self.assertNotIn("OLYMPEX", html)
+
+
+class TestResolveRelatedLinks(TestCase):
+    def setUp(self):
+        self.campaign = CampaignFactory()
+        self.draft = factories.ChangeFactory.make_update_change_object(
+            CampaignFactory, self.campaign
+        )
+        self.unpublished = factories.ChangeFactory.make_create_change_object(CampaignFactory)
+        self.DeploymentForm = modelform_factory(
+            Deployment, exclude=[], formfield_callback=formfield_callback
+        )
+
+    def test_links_are_resolved_in_bulk(self):
+        forms = [
+            self.DeploymentForm(initial={"campaign": self.campaign.uuid}),
+            self.DeploymentForm(initial={"campaign": self.unpublished.uuid}),
+            self.DeploymentForm(),
+        ]
+        with self.assertNumQueries(2):
+            widgets.resolve_related_links(*forms)
+
+        published_url = reverse(
+            "published-detail", kwargs={"model": "campaign", "canonical_uuid": self.campaign.uuid}
+        )
+        draft_url = reverse("change-update", kwargs={"pk": self.draft.uuid})
+        # Only the selected option is looked up when rendering
+        with self.assertNumQueries(1):
+            html = str(forms[0]["campaign"])
+        self.assertIn(published_url, html)
+        self.assertIn(draft_url, html)
+
+        with self.assertNumQueries(1):
+            html = str(forms[1]["campaign"])
+        self.assertNotIn("View published", html)
+        self.assertNotIn("View latest draft", html)
+
+    def test_unresolved_widget_looks_up_its_value(self):
+        form = self.DeploymentForm(initial={"campaign": self.campaign.uuid})
+        html = str(form["campaign"])
+
+        self.assertIn(
+            reverse(
+                "published-detail",
+                kwargs={"model": "campaign", "canonical_uuid": self.campaign.uuid},
+            ),
+            html,
+        )
+        self.assertIn(reverse("change-update", kwargs={"pk": self.draft.uuid}), html)
@@ -1,11 +1,14 @@
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from admg_webapp.users.models import User
-from api_app.models import Change
-from data_models.models import Campaign, Season
+from api_app.models import Change, Recommendation
+from data_models.models import Campaign, GcmdInstrument, Season
 from admin_ui.tests import factories
-from data_models.tests.factories import CampaignFactory
+from admin_ui.views import ChangeGcmdUpdateView
+from data_models.tests.factories import CampaignFactory, GcmdInstrumentFactory, InstrumentFactory
 
 
 class TestChangeUpdateView(TestCase):
@@ -166,3 +169,67 @@ class TestCampaignDetailView(TestCase):
         )
 
         self.assertTrue(hasattr(delete_change, 'model_instance_uuid'))
+
+
+class TestChangeGcmdUpdateView(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory.create(role=User.Roles.ADMIN)
+        self.keyword = GcmdInstrumentFactory.create()
+        self.change = factories.ChangeFactory.create(
+            content_type=ContentType.objects.get_for_model(GcmdInstrument),
+            action=Change.Actions.UPDATE,
+            model_instance_uuid=self.keyword.uuid,
+            update={"short_name": "Renamed"},
+        )
+        self.url = reverse("change-gcmd", args=[self.change.uuid])
+
+    def recommend(self, count, connected=0):
+        instruments = InstrumentFactory.create_batch(count)
+        for instrument in instruments[:connected]:
+            instrument.gcmd_instruments.add(self.keyword)
+        for instrument in instruments:
+            Recommendation.objects.create(change=self.change, casei_object=instrument)
+        return instruments
+
+    def test_affected_records(self):
+        connected, other = self.recommend(2, connected=1)
+        self.client.force_login(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {str(connected.uuid): "Yes", str(other.uuid): "No"},
+            {
+                str(record["row"].uuid): record["is_connected"]
+                for record in response.context["affected_records"]
+            },
+        )
+
+    def test_affected_records_take_constant_queries(self):
+        self.client.force_login(user=self.user)
+        self.recommend(2, connected=1)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        self.recommend(10, connected=5)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.url)
+
+        self.assertEqual(len(few), len(many))
+
+    def test_choices_are_applied_in_bulk(self):
+        connected, other = self.recommend(2, connected=1)
+        view = ChangeGcmdUpdateView(object=self.change)
+
+        with self.assertNumQueries(5), self.captureOnCommitCallbacks():
+            view.process_choices(
+                [str(connected.uuid), str(other.uuid)],
+                {str(connected.uuid): "False", str(other.uuid): "True"},
+                "Publish",
+            )
+
+        self.assertEqual([other], list(self.keyword.instruments.all()))
+        self.assertEqual(
+            {(False, True), (True, True)},
+            set(Recommendation.objects.values_list("result", "submitted")),
+        )
@@ -3,11 +3,13 @@ from datetime import datetime, timezone
 from django.test import TestCase
 from django.urls import reverse
 
-from admin_ui.views.doi import update_dois
+from admin_ui.doi_review import DoiReviewData, commit_doi_review
+from api_app.models import ApprovalLog, Change
 
 # from api_app.tests.test_change import TestChange
 
 from admin_ui.tests import factories
+from data_models.tests import factories as data_factories
 from data_models.tests.factories import DOIFactory
 
 from freezegun import freeze_time
@@ -27,12 +29,190 @@ class TestDoiApprovalView(TestCase):
         self.assertEqual(f"{reverse('account_login')}?next={url}", response.url)
 
     @freeze_time(frozen_time)
-    def test_update_dois_sets_updated_at(self):
+    def test_commit_doi_review_sets_updated_at(self):
         old_updated_at = self.change.updated_at
         assert old_updated_at != frozen_time
 
         doi_form_value = {"uuid": self.change.uuid, "keep": True}
 
-        update_dois(dois=[doi_form_value], user=self.user)
+        commit_doi_review(dois=[doi_form_value], user=self.user)
         self.change.refresh_from_db()
         assert self.change.updated_at == frozen_time
+
+
+class TestCommitDoiReview(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory.create()
+        self.dois = [
+            factories.ChangeFactory.make_create_change_object(DOIFactory) for _ in range(3)
+        ]
+
+    def test_transitions(self):
+        reviewed, trashed, untouched = self.dois
+        result = commit_doi_review(
+            dois=[
+                {"uuid": reviewed.uuid, "keep": True},
+                {"uuid": trashed.uuid, "keep": False},
+                {"uuid": untouched.uuid, "keep": None},
+            ],
+            user=self.user,
+        )
+
+        assert [doi.uuid for doi in result.updated] == [reviewed.uuid, untouched.uuid]
+        assert [doi.uuid for doi in result.trashed] == [trashed.uuid]
+        for doi in self.dois:
+            doi.refresh_from_db()
+        assert reviewed.status == Change.Statuses.AWAITING_REVIEW
+        assert trashed.status == Change.Statuses.IN_TRASH
+        assert untouched.status == Change.Statuses.IN_PROGRESS
+        assert ApprovalLog.objects.filter(change=reviewed).latest("date").action == (
+            ApprovalLog.Actions.SUBMIT
+        )
+        assert ApprovalLog.objects.filter(change=trashed).latest("date").action == (
+            ApprovalLog.Actions.TRASH
+        )
+
+    def test_untrash_and_submit(self):
+        doi = self.dois[0]
+        commit_doi_review(dois=[{"uuid": doi.uuid, "keep": False}], user=self.user)
+        commit_doi_review(dois=[{"uuid": doi.uuid, "keep": True}], user=self.user)
+
+        doi.refresh_from_db()
+        assert doi.status == Change.Statuses.AWAITING_REVIEW
+        assert list(
+            ApprovalLog.objects.filter(change=doi).order_by("date").values_list("action", flat=True)
+        ) == [
+            ApprovalLog.Actions.CREATE,
+            ApprovalLog.Actions.TRASH,
+            ApprovalLog.Actions.UNTRASH,
+            ApprovalLog.Actions.SUBMIT,
+        ]
+
+    def test_published_dois_are_ignored(self):
+        doi = self.dois[0]
+        Change.objects.filter(uuid=doi.uuid).update(status=Change.Statuses.PUBLISHED)
+
+        result = commit_doi_review(dois=[{"uuid": doi.uuid, "keep": False}], user=self.user)
+
+        assert result.ignored == [{"uuid": doi.uuid, "keep": False}]
+        doi.refresh_from_db()
+        assert doi.status == Change.Statuses.PUBLISHED
+
+    def test_unchanged_dois_are_not_written(self):
+        doi = self.dois[0]
+        commit_doi_review(dois=[{"uuid": doi.uuid, "keep": True}], user=self.user)
+
+        result = commit_doi_review(dois=[{"uuid": doi.uuid, "keep": True}], user=self.user)
+
+        assert result.updated == []
+
+    def test_query_count_is_constant(self):
+        more_dois = [
+            factories.ChangeFactory.make_create_change_object(DOIFactory) for _ in range(5)
+        ]
+
+        # select, savepoint, bulk update, bulk insert, search index delete/insert/update, release
+        with self.assertNumQueries(8):
+            commit_doi_review(
+                dois=[{"uuid": doi.uuid, "keep": True} for doi in self.dois], user=self.user
+            )
+        with self.assertNumQueries(8):
+            commit_doi_review(
+                dois=[{"uuid": doi.uuid, "keep": True} for doi in more_dois], user=self.user
+            )
+
+
+class TestDoiReviewData(TestCase):
+    def setUp(self):
+        make_draft = factories.ChangeFactory.make_create_change_object
+        self.campaign = make_draft(data_factories.CampaignFactory)
+        self.deployment = make_draft(
+            data_factories.DeploymentFactory, {"campaign": str(self.campaign.uuid)}
+        )
+        self.platform = make_draft(data_factories.PlatformFactory)
+        self.instrument = make_draft(data_factories.InstrumentFactory)
+        self.collection_period = make_draft(
+            data_factories.CollectionPeriodFactory,
+            {
+                "deployment": str(self.deployment.uuid),
+                "platform": str(self.platform.uuid),
+                "instruments": [str(self.instrument.uuid)],
+            },
+        )
+        self.unrelated_platform = make_draft(data_factories.PlatformFactory)
+        self.dois = [
+            make_draft(
+                DOIFactory,
+                {"campaigns": [str(self.campaign.uuid)], "concept_id": f"C{i:03}-TEST"},
+            )
+            for i in range(5)
+        ]
+
+    def test_choices_limited_to_campaign_tree(self):
+        choices = DoiReviewData(self.campaign.uuid).get_page().choices
+
+        assert [value for value, _ in choices["campaigns"]] == [str(self.campaign.uuid)]
+        assert [value for value, _ in choices["platforms"]] == [str(self.platform.uuid)]
+        assert [value for value, _ in choices["instruments"]] == [str(self.instrument.uuid)]
+        assert [value for value, _ in choices["collection_periods"]] == [
+            str(self.collection_period.uuid)
+        ]
+
+    def test_choices_include_values_selected_outside_tree(self):
+        doi = self.dois[0]
+        doi.update["platforms"] = [str(self.unrelated_platform.uuid)]
+        doi.save()
+
+        choices = DoiReviewData(self.campaign.uuid).get_page().choices
+
+        assert {value for value, _ in choices["platforms"]} == {
+            str(self.platform.uuid),
+            str(self.unrelated_platform.uuid),
+        }
+
+    def test_choices_cache_expires_when_tree_changes(self):
+        review_data = DoiReviewData(self.campaign.uuid)
+        review_data.get_page()
+
+        new_platform = factories.ChangeFactory.make_create_change_object(
+            data_factories.PlatformFactory
+        )
+        self.collection_period.update["platform"] = str(new_platform.uuid)
+        self.collection_period.save()
+
+        choices = review_data.get_page().choices
+        assert [value for value, _ in choices["platforms"]] == [str(new_platform.uuid)]
+
+    def test_keyset_pages(self):
+        review_data = DoiReviewData(self.campaign.uuid, page_size=2)
+
+        seen = []
+        page = review_data.get_page()
+        while True:
+            assert page.total == 5
+            assert page.start_index == len(seen) + 1
+            seen.extend(doi.uuid for doi in page.dois)
+            if not page.next_cursor:
+                break
+            page = review_data.get_page(cursor=page.next_cursor)
+
+        assert seen == [doi.uuid for doi in self.dois]
+
+    def test_keyset_pages_backwards(self):
+        review_data = DoiReviewData(self.campaign.uuid, page_size=2)
+        first = review_data.get_page()
+        second = review_data.get_page(cursor=first.next_cursor)
+        last = review_data.get_page(cursor=second.next_cursor)
+        assert first.previous_cursor is None
+
+        back = review_data.get_page(before=last.previous_cursor)
+        assert [doi.uuid for doi in back.dois] == [doi.uuid for doi in second.dois]
+        assert (back.offset, back.next_cursor) == (2, second.next_cursor)
+
+        front = review_data.get_page(before=back.previous_cursor)
+        assert [doi.uuid for doi in front.dois] == [doi.uuid for doi in first.dois]
+        assert (front.offset, front.previous_cursor) == (0, None)
+
+    def test_invalid_cursor_returns_first_page(self):
+        page = DoiReviewData(self.campaign.uuid, page_size=2).get_page(cursor="garbage")
+        assert [doi.uuid for doi in page.dois] == [doi.uuid for doi in self.dois[:2]]
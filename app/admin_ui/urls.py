@@ -10,7 +10,14 @@ urlpatterns = [
     path(settings.ADMIN_URL, admin.site.urls),
     # Actions
     path("actions/deploy-admin", views.trigger_deploy, name="trigger-deploy"),
+    path(
+        "instrumentation",
+        views.InstrumentationReportView.as_view(),
+        name="instrumentation-report",
+    ),
     path("", views.SummaryView.as_view(), name="summary"),
+    path("tasks/<str:task_id>/progress", views.task_progress, name="task-progress"),
+    path("search", views.GlobalSearchView.as_view(), name="global-search"),
     path(
         "v2/<str:model>/<uuid:canonical_uuid>/details",
         v2.CampaignDetailView.as_view(),
@@ -27,6 +34,11 @@ urlpatterns = [
     # NOTE: For 'model' arg of URL, snake_case of model class name is expected
     path("drafts/<str:model>", views.ChangeListView.as_view(), name="change-list"),
     path("drafts/<str:model>/add", views.ChangeCreateView.as_view(), name="change-add"),
+    path(
+        "drafts/<str:model>/autocomplete",
+        views.ChangeAutocompleteView.as_view(),
+        name="change-autocomplete",
+    ),
     path("drafts/edit/<uuid:pk>", views.ChangeUpdateView.as_view(), name="change-update"),
     path(
         "drafts/edit/<uuid:pk>/transition",
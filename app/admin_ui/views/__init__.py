@@ -1,4 +1,8 @@
+from .autocomplete import *  # noqa
 from .change import *  # noqa
 from .deploy import *  # noqa
 from .doi import *  # noqa
+from .instrumentation import *  # noqa
 from .published import *  # noqa
+from .search import *  # noqa
+from .tasks import *  # noqa
@@ -0,0 +1,41 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views.generic import View
+
+from .. import fields, mixins
+
+
+@method_decorator(login_required, name="dispatch")
+class ChangeAutocompleteView(mixins.DynamicModelMixin, View):
+    """
+    Options of a draft's ForeignKey select input, searched and paginated on demand. Options
+    are labelled the same way as `ChangeChoiceField.get_queryset_for_model`. The response
+    follows the format expected by Select2's AJAX data source.
+    """
+
+    paginate_by = 20
+
+    def get(self, request, *args, **kwargs):
+        term = request.GET.get("term", "").strip()
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+
+        queryset = fields.ChangeChoiceField.search_queryset_for_model(
+            self._model_config["model"], term
+        )
+        start = (page - 1) * self.paginate_by
+        # Fetch one extra option rather than counting to find out if there's a next page
+        options = list(queryset[start : start + self.paginate_by + 1])
+
+        return JsonResponse(
+            {
+                "results": [
+                    {"id": str(option.pk), "text": str(option)}
+                    for option in options[: self.paginate_by]
+                ],
+                "pagination": {"more": len(options) > self.paginate_by},
+            }
+        )
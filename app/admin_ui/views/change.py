@@ -1,5 +1,6 @@
 import logging
-from typing import Dict
+from collections import defaultdict
+from typing import Dict, List
 
 import django_tables2
 from django.contrib import messages
@@ -7,7 +8,6 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import (
     Case,
-    CharField,
     Count,
     OuterRef,
     Q,
@@ -17,7 +17,6 @@ from django.db.models import (
     functions,
     Subquery,
 )
-from django.db.models.fields.json import KeyTextTransform
 from django.http import Http404, HttpResponseBadRequest, HttpResponseRedirect
 from django.urls import reverse
 from django.utils.decorators import method_decorator
@@ -53,7 +52,7 @@ from data_models.models import (
 )
 from kms import gcmd
 
-from .. import filters, forms, mixins, tables, utils
+from .. import filters, forms, mixins, tables
 
 logger = logging.getLogger(__name__)
 
@@ -183,19 +182,18 @@ class CampaignDetailView(NotificationSidebar, DetailView):
         context = super().get_context_data(**kwargs)
         deployments = CampaignDetailView._filter_latest_changes(
             Change.objects.of_type(Deployment)
-            .filter(
-                update__campaign=str(
-                    context['object'].model_instance_uuid or self.kwargs[self.pk_url_kwarg]
-                )
+            .referencing(
+                "campaign",
+                [context['object'].model_instance_uuid or self.kwargs[self.pk_url_kwarg]],
             )
             .prefetch_approvals()
         )
 
-        deployment_uuids = [str(d.model_instance_uuid or d.uuid) for d in deployments]
+        deployment_uuids = [d.model_instance_uuid or d.uuid for d in deployments]
 
         collection_periods = CampaignDetailView._filter_latest_changes(
             Change.objects.of_type(CollectionPeriod)
-            .filter(update__deployment__in=deployment_uuids)
+            .referencing("deployment", deployment_uuids)
             .select_related("content_type")
             .prefetch_approvals()
             .annotate_from_relationship(
@@ -213,7 +211,7 @@ class CampaignDetailView(NotificationSidebar, DetailView):
             str(uuid): short_name
             for uuid, short_name in Change.objects.of_type(Instrument)
             .filter(uuid__in=instrument_uuids)
-            .values_list("uuid", "update__short_name")
+            .values_list("uuid", "display_name")
         }
         for cp in collection_periods:
             cp.instrument_names = sorted(
@@ -230,21 +228,13 @@ class CampaignDetailView(NotificationSidebar, DetailView):
             ),
             "significant_events": CampaignDetailView._filter_latest_changes(
                 Change.objects.of_type(SignificantEvent)
-                .filter(
-                    update__deployment__in=[
-                        str(d.model_instance_uuid or d.uuid) for d in deployments
-                    ]
-                )
+                .referencing("deployment", deployment_uuids)
                 .select_related("content_type")
                 .prefetch_approvals()
             ),
             "iops": CampaignDetailView._filter_latest_changes(
                 Change.objects.of_type(IOP)
-                .filter(
-                    update__deployment__in=[
-                        str(d.model_instance_uuid or d.uuid) for d in deployments
-                    ]
-                )
+                .referencing("deployment", deployment_uuids)
                 .select_related("content_type")
                 .prefetch_approvals()
             ),
@@ -353,42 +343,10 @@ class ChangeUpdateView(NotificationSidebar, mixins.ChangeModelFormMixin, UpdateV
             "view_model": camel_to_snake(self.get_model_form_content_type().model_class().__name__),
             "ancestors": context["object"].get_ancestors().select_related("content_type"),
             "descendents": context["object"].get_descendents().select_related("content_type"),
-            "comparison_form": self._get_comparison_form(context['model_form']),
+            "comparison_form": self.get_comparison_form(self.object, context['model_form']),
             "canonical_uuid": self.object.pk,
         }
 
-    def _get_comparison_form(self, model_form):
-        """
-        Generates a disabled form for the published model, used for generating
-        a diff view.
-        """
-        if self.object.action != self.object.Actions.UPDATE:
-            return None
-
-        published_form = self.destination_model_form(
-            instance=self.object.content_object, auto_id="readonly_%s"
-        )
-
-        # if published or trashed then the old data doesn't need to be from the database, it
-        # needs to be from the previous field of the change_object
-        if self.object.is_locked:
-            for key, val in self.object.previous.items():
-                published_form.initial[key] = val
-
-        comparison_obj = self.object.previous if self.object.is_locked else self.object.update
-        for field_name in comparison_obj:
-            # ignore data that does not fit in form
-            # ignore fields that don't fit in destination model (eg if destination model changes)
-            if field_name not in published_form:
-                continue
-            if not utils.compare_values(
-                published_form[field_name].value(), model_form[field_name].value()
-            ):
-                attrs = model_form.fields[field_name].widget.attrs
-                attrs["class"] = f"{attrs.get('class', '')} changed-item".strip()
-
-        return utils.disable_form_fields(published_form)
-
     def get_model_form_content_type(self) -> ContentType:
         return self.object.content_type
 
@@ -396,15 +354,14 @@ class ChangeUpdateView(NotificationSidebar, mixins.ChangeModelFormMixin, UpdateV
         related_fields = {}
         content_type = self.get_model_form_content_type().model_class().__name__
         if content_type in ["Campaign", "Platform", "Deployment", "Instrument", "PartnerOrg"]:
-            related_fields["alias"] = Change.objects.of_type(Alias).filter(
-                update__object_id=str(self.object.canonical_uuid)
+            related_fields["alias"] = Change.objects.of_type(Alias).referencing(
+                "object_id", [self.object.canonical_uuid]
             )
         if content_type == "Campaign":
             related_fields["website"] = (
                 Change.objects.of_type(Website)
-                .filter(
-                    action=Change.Actions.CREATE, update__campaign=str(self.object.canonical_uuid)
-                )
+                .filter(action=Change.Actions.CREATE)
+                .referencing("campaign", [self.object.canonical_uuid])
                 .annotate_from_relationship(
                     of_type=Website, to_attr="title", uuid_from="website", identifier="title"
                 )
@@ -463,19 +420,20 @@ class ChangeListView(NotificationSidebar, mixins.DynamicModelMixin, SingleTableM
 
     def post(self, request, **kwargs):
         from cmr import tasks
+        from .doi import track_doi_fetch
 
         campaign = self.get_object()
-        task = tasks.match_dois.delay(campaign.content_type.model, campaign.uuid)
-        past_doi_fetches = request.session.get("doi_task_ids", {})
+        task, started = tasks.match_dois.delay_once(campaign.content_type.model, campaign.uuid)
         uuid = str(self.kwargs["pk"])
-        request.session["doi_task_ids"] = {
-            **past_doi_fetches,
-            uuid: [task.id, *past_doi_fetches.get(uuid, [])],
-        }
+        track_doi_fetch(request, uuid, task.id)
         messages.add_message(
             request,
             messages.INFO,
-            f"Fetching DOIs for {campaign.update.get('short_name', uuid)}...",
+            (
+                f"Fetching DOIs for {campaign.update.get('short_name', uuid)}..."
+                if started
+                else f"DOIs are already being fetched for {campaign.update.get('short_name', uuid)}"
+            ),
         )
         return HttpResponseRedirect(reverse("doi-approval", args=[campaign.uuid]))
 
@@ -546,14 +504,6 @@ class GcmdSyncListView(NotificationSidebar, SingleTableMixin, FilterView):
             Change.objects.of_type(GcmdInstrument, GcmdPlatform, GcmdProject, GcmdPhenomenon)
             .select_related("content_type")
             .annotate(
-                short_name=functions.Coalesce(
-                    *[
-                        functions.NullIf(KeyTextTransform(attr, dictionary), Value(""))
-                        for attr in gcmd.short_name_priority
-                        for dictionary in ["update", "previous"]
-                    ],
-                    output_field=CharField(),
-                ),
                 resolved_records=functions.Coalesce(SubqueryCount(resolved_records), Value(0)),
                 affected_records=Count("recommendation", distinct=True),
             )
@@ -567,14 +517,21 @@ class GcmdSyncListView(NotificationSidebar, SingleTableMixin, FilterView):
             **super().get_context_data(**kwargs),
             "display_name": "GCMD Keyword",
             "current_view": "gcmd-list",
+            "sync_task_id": self.request.session.get("gcmd_sync_task_id"),
         }
 
     def post(self, request, **kwargs):
         from kms import tasks
 
-        task = tasks.sync_gcmd.delay()
+        # a full sync goes over every scheme, even those whose KMS version was synced already
+        task, started = tasks.sync_gcmd.delay_once(full=bool(request.POST.get("full")))
         logger.debug(f"Task return value: {task}")
-        messages.add_message(request, messages.INFO, "Syncing with GCMD...")
+        request.session["gcmd_sync_task_id"] = task.id
+        messages.add_message(
+            request,
+            messages.INFO,
+            "Syncing with GCMD..." if started else "A GCMD sync is already running...",
+        )
         return HttpResponseRedirect(reverse('gcmd-list'))
 
 
@@ -620,31 +577,48 @@ class ChangeGcmdUpdateView(NotificationSidebar, UpdateView):
             "casei_uuid": uuid,
         }
 
-    def is_connected(self, gcmd_keyword, casei_object, content_type):
-        if gcmd_keyword.action == Change.Actions.CREATE:
+    def is_connected(self, casei_object, connected_uuids):
+        if self.object.action == Change.Actions.CREATE:
             return "New Keyword"
-        else:
-            keyword_set = gcmd.get_casei_keyword_set(casei_object, content_type)
-            is_connnected = gcmd_keyword.content_object in keyword_set.all()
-            return "Yes" if is_connnected else "No"
+        return "Yes" if casei_object.uuid in connected_uuids else "No"
 
-    def get_affected_records(self) -> Dict:
-        content_type = self.get_model_form_content_type().model_class().__name__
-        recommendations = Recommendation.objects.filter(change_id=self.object.canonical_uuid)
+    @staticmethod
+    def get_casei_objects(recommendations) -> Dict:
+        """The recommended CASEI objects by uuid, fetched with one query per content type"""
+        uuids_by_content_type = defaultdict(list)
+        for recommendation in recommendations:
+            uuids_by_content_type[recommendation.content_type_id].append(recommendation.object_uuid)
+        casei_objects = {}
+        for content_type_id, uuids in uuids_by_content_type.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            casei_objects.update(model.objects.in_bulk(uuids))
+        return casei_objects
+
+    def get_affected_records(self) -> List[Dict]:
+        recommendations = list(Recommendation.objects.filter(change_id=self.object.canonical_uuid))
+        casei_objects = self.get_casei_objects(recommendations)
+        gcmd_keyword = (
+            self.object.content_object if self.object.action != Change.Actions.CREATE else None
+        )
+        connected_uuids = (
+            gcmd.get_connected_uuids(gcmd_keyword, casei_objects) if gcmd_keyword else set()
+        )
         category = self.get_affected_type()
         affected_records, uuids = [], []
 
         for recommendation in recommendations:
-            uuids.append(str(recommendation.casei_object.uuid))
+            casei_object = casei_objects.get(recommendation.object_uuid)
+            if casei_object is None:
+                # the object was deleted since it was recommended
+                continue
+            uuids.append(str(casei_object.uuid))
             affected_records.append(
                 {
-                    "row": recommendation.casei_object,
+                    "row": casei_object,
                     "status": "Published",
                     "category": category,
-                    "link": self.get_affected_url(recommendation.casei_object.uuid),
-                    "is_connected": self.is_connected(
-                        self.object, recommendation.casei_object, content_type
-                    ),
+                    "link": self.get_affected_url(casei_object.uuid),
+                    "is_connected": self.is_connected(casei_object, connected_uuids),
                     "current_selection": recommendation.result,
                     "is_submitted": recommendation.submitted,
                     "uuids": uuids,
@@ -655,45 +629,42 @@ class ChangeGcmdUpdateView(NotificationSidebar, UpdateView):
     def get_back_button_url(self):
         return "gcmd-list"
 
-    def get_casei_object(self, uuid, content_type):
-        casei_model = gcmd.get_casei_model(content_type)
-        return casei_model.objects.get(uuid=uuid)
-
-    def process_choice(self, choice_uuid, decision_dict, request_type="Save"):
-        gcmd_change = self.get_object()
-        change_action = gcmd_change.action
-        recommendation = Recommendation.objects.get(object_uuid=choice_uuid, change=gcmd_change)
-
-        # Save the user's input for both save and publish buttons
-        if change_action == Change.Actions.DELETE or decision_dict.get(choice_uuid) == "False":
-            recommendation.result = False
-        elif decision_dict.get(choice_uuid) == "True":
-            recommendation.result = True
-        elif decision_dict.get(choice_uuid) is None:
-            recommendation.result = None
-        recommendation.save()
-
-        if request_type == "Publish":
-            content_type = gcmd_change.content_type.model_class().__name__
-            gcmd_keyword = gcmd_change.content_object
-            casei_object = self.get_casei_object(choice_uuid, content_type)
-            keyword_set = gcmd.get_casei_keyword_set(casei_object, content_type)
-
-            if change_action == Change.Actions.DELETE or decision_dict.get(choice_uuid) == "False":
+    def process_choices(self, choice_uuids, decision_dict, request_type="Save"):
+        """
+        Stores the user's choices of the recommendations and, on publish, applies them to
+        the keyword's connections, with bulk writes whatever the number of recommendations
+        """
+        gcmd_change = self.object
+        is_delete = gcmd_change.action == Change.Actions.DELETE
+        recommendations = list(
+            Recommendation.objects.filter(change=gcmd_change, object_uuid__in=choice_uuids)
+        )
+        connect, disconnect = [], []
+
+        for recommendation in recommendations:
+            decision = decision_dict.get(str(recommendation.object_uuid))
+            # Save the user's input for both save and publish buttons
+            if is_delete or decision == "False":
                 recommendation.result = False
-                recommendation.submitted = True
-                keyword_set.remove(gcmd_keyword)
-            elif decision_dict.get(choice_uuid) == "True":
+            elif decision == "True":
                 recommendation.result = True
+            elif decision is None:
+                recommendation.result = None
+
+            if request_type == "Publish" and (is_delete or decision in ["True", "False"]):
+                # Change Resolved list to "Submitted"
                 recommendation.submitted = True
-                keyword_set.add(gcmd_keyword)
+                if recommendation.result:
+                    connect.append(recommendation.object_uuid)
+                else:
+                    disconnect.append(recommendation.object_uuid)
 
-            # Change Resolved list to "Submitted" and save all database changes.
-            casei_object.save()
-            recommendation.save()
+        Recommendation.objects.bulk_update(recommendations, ["result", "submitted"])
+        if connect or disconnect:
+            gcmd.set_keyword_connections(gcmd_change.content_object, connect, disconnect)
 
     def publish_keyword(self, user):
-        gcmd_change = self.get_object()
+        gcmd_change = self.object
         # Publish the keyword, Create keywords are automatically "Published" so skip them.
         if not gcmd_change.action == Change.Actions.CREATE:
             gcmd_change.publish(user=user)
@@ -706,8 +677,12 @@ class ChangeGcmdUpdateView(NotificationSidebar, UpdateView):
             for x in request.POST
             if x.startswith("choice-")
         }
-        for casei_uuid in ast.literal_eval(request.POST.get("related_uuids", "[]")):
-            self.process_choice(casei_uuid, choices, request.POST.get("user_button", "Save"))
+        self.object = self.get_object()
+        self.process_choices(
+            ast.literal_eval(request.POST.get("related_uuids", "[]")),
+            choices,
+            request.POST.get("user_button", "Save"),
+        )
 
         # After all connections are made (or ignored), let's finally publish the keyword!
         if request.POST.get("user_button") == "Publish":
@@ -715,12 +690,12 @@ class ChangeGcmdUpdateView(NotificationSidebar, UpdateView):
 
             messages.success(
                 request,
-                f'Successfully published GCMD Keyword "{gcmd.get_short_name(self.get_object())}"',
+                f'Successfully published GCMD Keyword "{gcmd.get_short_name(self.object)}"',
             )
             return HttpResponseRedirect(reverse("gcmd-list"))
         else:
             messages.success(
                 request,
-                f'Successfully saved progress for "{gcmd.get_short_name(self.get_object())}"',
+                f'Successfully saved progress for "{gcmd.get_short_name(self.object)}"',
             )
             return HttpResponseRedirect(reverse("change-gcmd", args=[kwargs["pk"]]))
@@ -1,90 +1,31 @@
 from typing import Sequence
-from uuid import UUID
 from api_app.views.generic_views import NotificationSidebar
-from api_app.models import ApprovalLog, Change
+from api_app.models import Change
 from cmr import tasks
-from data_models.models import DOI, Campaign
+from data_models.models import Campaign
 from django.contrib import messages
-from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.http import Http404, HttpResponseRedirect
 from django.urls import reverse
-from django.utils import timezone
 from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.views import View
 from django.views.generic.detail import SingleObjectMixin
 from django.views.generic.edit import FormView
-from django.views.generic.list import MultipleObjectMixin
 from django_celery_results.models import TaskResult
 
 from .. import forms
+from ..doi_review import DoiReviewData, commit_doi_review
 
 
-def trash_dois(doi_uuids: Sequence[UUID], user: get_user_model()):
-    for doi in Change.objects.filter(uuid__in=doi_uuids):
-        doi.trash(user=user, doi=True)
-        doi.save()
-
-
-def update_dois(dois: Sequence[dict], user: get_user_model()):
-    ignored_updates = []
-    change_status_to_edit = []
-    change_status_to_review = []
-    stored_dois = Change.objects.in_bulk([doi["uuid"] for doi in dois])
-    for doi in dois:
-        stored_doi = stored_dois[doi["uuid"]]
-
-        if stored_doi.status == Change.Statuses.PUBLISHED:
-            ignored_updates.append(doi)
-            continue
-
-        # Persist DOI updates
-        for field, value in doi.items():
-            if field in ["uuid", "keep"]:
-                continue
-            stored_doi.update[field] = value
-        # never been previously edited and checkmark and trash haven't been selected
-        if stored_doi.status == Change.Statuses.CREATED and doi["keep"] is None:
-            stored_doi.status = Change.Statuses.IN_PROGRESS
-            stored_doi.updated_at = timezone.now()
-            change_status_to_edit.append(stored_doi)
-        # checkmark was selected
-        elif doi["keep"] is True:
-            if stored_doi.status == Change.Statuses.IN_TRASH:
-                stored_doi.untrash(user=user, doi=True)
-            stored_doi.status = Change.Statuses.AWAITING_REVIEW
-            stored_doi.updated_at = timezone.now()
-            change_status_to_review.append(stored_doi)
-
-    Change.objects.bulk_update(
-        stored_dois.values(), ["update", "updated_at", "status"], batch_size=100
-    )
-
-    ApprovalLog.objects.bulk_create(
-        [
-            ApprovalLog(
-                change=doi,
-                user=user,
-                action=ApprovalLog.Actions.EDIT,
-                notes="Transitioned via the DOI Approval form",
-            )
-            for doi in change_status_to_edit
-        ]
-    )
-
-    ApprovalLog.objects.bulk_create(
-        [
-            ApprovalLog(
-                change=doi,
-                user=user,
-                action=ApprovalLog.Actions.SUBMIT,
-                notes="Transitioned via the DOI Approval form",
-            )
-            for doi in change_status_to_review
-        ]
-    )
-
-    return change_status_to_edit + change_status_to_review, ignored_updates
+def track_doi_fetch(request, uuid, task_id):
+    """Keeps the id of a DOI fetch task of a campaign in the session, for its approval page"""
+    past_doi_fetches = request.session.get("doi_task_ids", {})
+    task_ids = past_doi_fetches.get(uuid, [])
+    request.session["doi_task_ids"] = {
+        **past_doi_fetches,
+        uuid: [task_id, *(past_task_id for past_task_id in task_ids if past_task_id != task_id)],
+    }
 
 
 @method_decorator(login_required, name="dispatch")
@@ -99,23 +40,23 @@ class DoiFetchView(NotificationSidebar, View):
 
     def post(self, request, **kwargs):
         campaign = self.get_object()
-        task = tasks.match_dois.delay(campaign.content_type.model, campaign.uuid)
-        past_doi_fetches = request.session.get("doi_task_ids", {})
+        task, started = tasks.match_dois.delay_once(campaign.content_type.model, campaign.uuid)
         uuid = str(self.kwargs["canonical_uuid"])
-        request.session["doi_task_ids"] = {
-            **past_doi_fetches,
-            uuid: [task.id, *past_doi_fetches.get(uuid, [])],
-        }
+        track_doi_fetch(request, uuid, task.id)
         messages.add_message(
             request,
             messages.INFO,
-            f"Fetching DOIs for {campaign.update.get('short_name', uuid)}...",
+            (
+                f"Fetching DOIs for {campaign.update.get('short_name', uuid)}..."
+                if started
+                else f"DOIs are already being fetched for {campaign.update.get('short_name', uuid)}"
+            ),
         )
         return HttpResponseRedirect(reverse("doi-approval", args=[campaign.uuid]))
 
 
 @method_decorator(login_required, name="dispatch")
-class DoiApprovalView(NotificationSidebar, SingleObjectMixin, MultipleObjectMixin, FormView):
+class DoiApprovalView(NotificationSidebar, SingleObjectMixin, FormView):
     form_class = forms.DoiFormSet
     template_name = "api_app/campaign_dois.html"
     paginate_by = 10
@@ -126,13 +67,15 @@ class DoiApprovalView(NotificationSidebar, SingleObjectMixin, MultipleObjectMixi
         self.object = self.get_object(queryset=self.campaign_queryset)
         return super().get(request, *args, **kwargs)
 
-    def get_queryset(self):
-        return (
-            Change.objects.of_type(DOI).filter(
-                update__campaigns__contains=str(self.kwargs["canonical_uuid"])
-            )
-            # Order the DOIs by review status so that unreviewed DOIs are shown first
-            .order_by("status", "update__concept_id")
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object(queryset=self.campaign_queryset)
+        return super().post(request, *args, **kwargs)
+
+    @cached_property
+    def doi_page(self):
+        # Loaded once per request and shared by the initial data, the choices and the context
+        return DoiReviewData(self.kwargs["canonical_uuid"], page_size=self.paginate_by).get_page(
+            cursor=self.request.GET.get("after"), before=self.request.GET.get("before")
         )
 
     def get_context_data(self, **kwargs):
@@ -148,18 +91,18 @@ class DoiApprovalView(NotificationSidebar, SingleObjectMixin, MultipleObjectMixi
                 # By setting the view model, our nav sidebar knows to highlight the link for campaigns
                 'view_model': 'campaign',
                 "canonical_uuid": self.kwargs["canonical_uuid"],
-                "object_list": self.get_queryset(),
+                "doi_page": self.doi_page,
                 "form": None,
-                "formset": self.get_form(),
+                "formset": kwargs.get("form") or self.get_form(),
                 "doi_tasks": doi_tasks,
             }
         )
 
+    def get_form_kwargs(self):
+        return {**super().get_form_kwargs(), "choices": self.doi_page.choices}
+
     def get_initial(self):
         # This is where we generate the DOI data to be shown in the formset
-        queryset = self.get_queryset()
-        page_size = self.get_paginate_by(queryset)
-        _, _, paginated_queryset, _ = self.paginate_queryset(queryset, page_size)
         return [
             {
                 "uuid": v.uuid,
@@ -176,37 +119,23 @@ class DoiApprovalView(NotificationSidebar, SingleObjectMixin, MultipleObjectMixi
                 "readonly": v.status == Change.Statuses.PUBLISHED,
                 **v.update,
             }
-            for v in paginated_queryset.only("uuid", "update", "status")
+            for v in self.doi_page.dois
         ]
 
     def form_valid(self, formset: forms.DoiFormSet):
-        changed_dois: Sequence[forms.DoiForm] = [
+        changed_dois: Sequence[dict] = [
             form.cleaned_data for form in formset.forms if form.has_changed()
         ]
-
-        to_update: list[dict] = []
-        to_trash: list[dict] = []
-
-        for doi in changed_dois:
-            if doi["keep"] is False:
-                to_trash.append(doi)
-            else:
-                to_update.append(doi)
-
-        if to_trash:
-            trash_dois(doi_uuids=[doi["uuid"] for doi in to_trash], user=self.request.user)
-
-        if to_update:
-            updated_dois, ignored_dois = update_dois(dois=to_update)
+        result = commit_doi_review(dois=changed_dois, user=self.request.user)
 
         messages.info(
             self.request,
-            f"Updated {len(updated_dois)} and removed {len(to_trash)} DOIs.",
+            f"Updated {len(result.updated)} and removed {len(result.trashed)} DOIs.",
         )
 
-        if ignored_dois:
+        if result.ignored:
             messages.warning(
-                self.request, f"Ignored changes to published {len(ignored_dois)} DOIs."
+                self.request, f"Ignored changes to published {len(result.ignored)} DOIs."
             )
         return super().form_valid(formset)
 
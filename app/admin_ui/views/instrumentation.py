@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.http import Http404
+from django.utils.decorators import method_decorator
+from django.views.generic import TemplateView
+
+from api_app.instrumentation import get_report
+from api_app.views.generic_views import NotificationSidebar
+
+
+@method_decorator(login_required, name="dispatch")
+@method_decorator(user_passes_test(lambda user: user.is_admg_admin()), name="dispatch")
+class InstrumentationReportView(NotificationSidebar, TemplateView):
+    """
+    Slowest endpoints and worst N+1 offenders recorded by the instrumentation middleware
+    """
+
+    template_name = "api_app/instrumentation_report.html"
+
+    def get(self, request, *args, **kwargs):
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise Http404("Request instrumentation is disabled")
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        return {
+            **super().get_context_data(**kwargs),
+            "report": get_report(),
+            "window_minutes": settings.REQUEST_INSTRUMENTATION_WINDOW // 60,
+        }
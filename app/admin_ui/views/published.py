@@ -1,7 +1,7 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.contenttypes.models import ContentType
 from django.http import Http404
-from django.shortcuts import redirect, render
+from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.views import View
@@ -39,7 +39,9 @@ class PublishedListView(
         }
 
 
-class ModelObjectView(NotificationSidebar, mixins.DynamicModelMixin, DetailView):
+class ModelObjectView(
+    NotificationSidebar, mixins.RelatedLinksMixin, mixins.DynamicModelMixin, DetailView
+):
     fields = "__all__"
 
     def _initialize_form(self, form_class, disable_all=False, **kwargs):
@@ -100,7 +102,7 @@ class PublishedEditView(ModelObjectView):
         if not len(new_form.changed_data):
             context = self.get_context_data(**kwargs)
             context["message"] = "Nothing changed"
-            return render(request, self.template_name, context)
+            return self.render_to_response(context)
 
         change_object = Change.objects.create(
             content_object=self.object,
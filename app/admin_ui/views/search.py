@@ -0,0 +1,32 @@
+from django.contrib.auth.decorators import login_required
+from django.utils.decorators import method_decorator
+from django_tables2 import SingleTableView
+
+from api_app.models import SearchIndex
+from api_app.search import search
+from api_app.views.generic_views import NotificationSidebar
+
+from .. import tables
+
+
+@method_decorator(login_required, name="dispatch")
+class GlobalSearchView(NotificationSidebar, SingleTableView):
+    """
+    Search across all searchable models and their drafts from a single search box.
+    """
+
+    model = SearchIndex
+    table_class = tables.SearchResultTable
+    paginate_by = 25
+    template_name = "api_app/search_results.html"
+
+    def get_search_term(self):
+        return self.request.GET.get("q", "").strip()
+
+    def get_queryset(self):
+        if not (term := self.get_search_term()):
+            return SearchIndex.objects.none()
+        return search(term, include_drafts=True)
+
+    def get_context_data(self, **kwargs):
+        return {**super().get_context_data(**kwargs), "search_term": self.get_search_term()}
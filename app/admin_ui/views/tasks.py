@@ -0,0 +1,10 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+
+from api_app.progress import get_task_progress
+
+
+@login_required
+def task_progress(request, task_id):
+    """State and progress of a Celery task, polled by the pages that started it"""
+    return JsonResponse(get_task_progress(task_id))
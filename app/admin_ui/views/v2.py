@@ -262,7 +262,10 @@ class HistoryDetailView(ModelObjectView, CampaignRelatedView):
     def get_context_data(self, **kwargs):
         return {
             **super().get_context_data(**kwargs),
-            "model_form": self._get_form(initial=kwargs.get("object").update, disable_all=True),
+            "model_form": utils.highlight_changed_fields(
+                self._get_form(initial=kwargs.get("object").update, disable_all=True),
+                kwargs.get("object").diff,
+            ),
             "view_model": (
                 Change.objects.get(uuid=self.kwargs[self.pk_url_kwarg]).model_name.lower()
             ),
@@ -360,40 +363,10 @@ class CanonicalDraftEdit(
             "view_model": camel_to_snake(self.get_model_form_content_type().model_class().__name__),
             "ancestors": context["object"].get_ancestors().select_related("content_type"),
             "descendents": context["object"].get_descendents().select_related("content_type"),
-            "comparison_form": self._get_comparison_form(context['model_form']),
+            "comparison_form": self.get_comparison_form(self.object, context['model_form']),
             "canonical_uuid": self.kwargs[self.pk_url_kwarg],
         }
 
-    def _get_comparison_form(self, model_form):
-        """
-        Generates a disabled form for the published model, used for generating
-        a diff view.
-        """
-        if self.object.action != self.object.Actions.UPDATE:
-            return None
-
-        published_form = self.destination_model_form(
-            instance=self.object.content_object, auto_id="readonly_%s"
-        )
-
-        # if published or trashed then the old data doesn't need to be from the database, it
-        # needs to be from the previous field of the change_object
-        if self.object.is_locked:
-            for key, val in self.object.previous.items():
-                published_form.initial[key] = val
-
-        comparison_obj = self.destination_model_form(
-            data=self.object.previous if self.object.is_locked else self.object.update
-        )
-        for field_name in comparison_obj.fields:
-            if not utils.compare_values(
-                published_form[field_name].value(), model_form[field_name].value()
-            ):
-                attrs = model_form.fields[field_name].widget.attrs
-                attrs["class"] = f"{attrs.get('class', '')} changed-item".strip()
-
-        return utils.disable_form_fields(published_form)
-
     def get_model_form_content_type(self) -> ContentType:
         return self.get_object().content_type
 
@@ -401,13 +374,14 @@ class CanonicalDraftEdit(
         related_fields = {}
         content_type = self.get_model_form_content_type().model_class().__name__
         if content_type in ["Campaign", "Platform", "Deployment", "Instrument", "PartnerOrg"]:
-            related_fields["alias"] = Change.objects.of_type(Alias).filter(
-                update__object_id=str(self.object.uuid)
+            related_fields["alias"] = Change.objects.of_type(Alias).referencing(
+                "object_id", [self.object.uuid]
             )
         if content_type == "Campaign":
             related_fields["website"] = (
                 Change.objects.of_type(Website)
-                .filter(action=Change.Actions.CREATE, update__campaign=str(self.object.uuid))
+                .filter(action=Change.Actions.CREATE)
+                .referencing("campaign", [self.object.uuid])
                 .annotate_from_relationship(
                     of_type=Website, to_attr="title", uuid_from="website", identifier="title"
                 )
@@ -507,16 +481,15 @@ class CreateUpdateView(
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        self.object = self.get_object()
         return {
-            **super().get_context_data(**kwargs),
+            **context,
             "content_type_name": (self.get_model_form_content_type().model_class().__name__),
-            "comparison_form": self._get_comparison_form(context['model_form']),
+            "comparison_form": self.get_comparison_form(self.object, context['model_form']),
             "object": self.object,
             "canonical_uuid": self.kwargs[self.pk_url_kwarg],
-            "view_model": (
-                Change.objects.get(uuid=self.kwargs[self.pk_url_kwarg]).model_name.lower()
-            ),
-            "display_name": Change.objects.get(uuid=self.kwargs[self.pk_url_kwarg]).model_name,
+            "view_model": self.canonical_change.model_name.lower(),
+            "display_name": self.canonical_change.model_name,
         }
 
     def get_success_url(self):
@@ -579,40 +552,11 @@ class CreateUpdateView(
         most_recent_published_draft.action = Change.Actions.UPDATE
         most_recent_published_draft.update = most_recent_published_draft.update
         most_recent_published_draft.previous = most_recent_published_draft.update
+        # nothing has been changed yet
+        most_recent_published_draft.diff = {}
 
         return most_recent_published_draft
 
-    def _get_comparison_form(self, model_form):
-        """
-        Generates a disabled form for the published model, used for generating
-        a diff view.
-        """
-        self.object = self.get_object()
-        if self.object.action != self.object.Actions.UPDATE:
-            return None
-
-        published_form = self.destination_model_form(
-            instance=self.object.content_object, auto_id="readonly_%s"
-        )
-
-        # if published or trashed then the old data doesn't need to be from the database, it
-        # needs to be from the previous field of the change_object
-        if self.object.is_locked:
-            for key, val in self.object.previous.items():
-                published_form.initial[key] = val
-
-        comparison_obj = self.destination_model_form(
-            data=self.object.previous if self.object.is_locked else self.object.update
-        )
-        for field_name in comparison_obj.fields:
-            if not utils.compare_values(
-                published_form[field_name].value(), model_form[field_name].value()
-            ):
-                attrs = model_form.fields[field_name].widget.attrs
-                attrs["class"] = f"{attrs.get('class', '')} changed-item".strip()
-
-        return utils.disable_form_fields(published_form)
-
     def post(self, *args, **kwargs):
         """
         Handle POST requests: instantiate a form instance with the passed
@@ -665,17 +609,15 @@ class CampaignDetailView(NotificationSidebar, DetailView):
         context = super().get_context_data(**kwargs)
         deployments = CampaignDetailView._filter_latest_changes(
             Change.objects.of_type(Deployment)
-            .filter(
-                update__campaign=str(
-                    context['object'].model_instance_uuid or self.kwargs["canonical_uuid"]
-                )
+            .referencing(
+                "campaign", [context['object'].model_instance_uuid or self.kwargs["canonical_uuid"]]
             )
             .prefetch_approvals()
         )
 
         collection_periods = CampaignDetailView._filter_latest_changes(
             Change.objects.of_type(CollectionPeriod)
-            .filter(update__deployment__in=[str(d.canonical_uuid) for d in deployments])
+            .referencing("deployment", [d.canonical_uuid for d in deployments])
             .select_related("content_type")
             .prefetch_approvals()
             .annotate_from_relationship(
@@ -693,7 +635,7 @@ class CampaignDetailView(NotificationSidebar, DetailView):
             str(uuid): short_name
             for uuid, short_name in Change.objects.of_type(Instrument)
             .filter(uuid__in=instrument_uuids)
-            .values_list("uuid", "update__short_name")
+            .values_list("uuid", "display_name")
         }
         for cp in collection_periods:
             cp.instrument_names = sorted(
@@ -711,13 +653,13 @@ class CampaignDetailView(NotificationSidebar, DetailView):
             ),
             "significant_events": CampaignDetailView._filter_latest_changes(
                 Change.objects.of_type(SignificantEvent)
-                .filter(update__deployment__in=[str(d.canonical_uuid) for d in deployments])
+                .referencing("deployment", [d.canonical_uuid for d in deployments])
                 .select_related("content_type")
                 .prefetch_approvals()
             ),
             "iops": CampaignDetailView._filter_latest_changes(
                 Change.objects.of_type(IOP)
-                .filter(update__deployment__in=[str(d.canonical_uuid) for d in deployments])
+                .referencing("deployment", [d.canonical_uuid for d in deployments])
                 .select_related("content_type")
                 .prefetch_approvals()
             ),
@@ -1,13 +1,18 @@
 import json
 import logging
-from typing import Optional
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Type
 
 from django import forms
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
 from django.contrib.gis import gdal
 from django.contrib.gis.forms import widgets
 from django.contrib.gis.gdal import CoordTransform, SpatialReference
 from django.contrib.gis.geos import GEOSGeometry
+from django.forms.models import ModelChoiceIterator
 from django.urls import reverse
 from django.utils import translation
 from django.utils.safestring import mark_safe
@@ -96,11 +101,118 @@ class ImagePreviewWidget(forms.widgets.FileInput):
             return input_html
 
 
+class RelatedLinks:
+    """
+    Published records and most recent active drafts of the records selected in
+    `AddAnotherChoiceFieldWidget` inputs, looked up with one query each regardless of the
+    number of inputs.
+    """
+
+    def __init__(self, values_by_model: Dict[Type[models.Model], Iterable]):
+        uuids_by_model = {
+            model: uuids
+            for model, values in values_by_model.items()
+            if (uuids := {pk for value in values if (pk := self._as_uuid(value))})
+        }
+        self.published = set()
+        self.active_drafts = {}
+        if not uuids_by_model:
+            return
+
+        published_querysets = [
+            model.objects.filter(pk__in=uuids).order_by().values_list("pk", flat=True)
+            for model, uuids in uuids_by_model.items()
+        ]
+        self.published = set(published_querysets[0].union(*published_querysets[1:]))
+        self.active_drafts = dict(
+            Change.objects.filter(model_instance_uuid__in=set().union(*uuids_by_model.values()))
+            .exclude(status__in=(Change.Statuses.PUBLISHED, Change.Statuses.IN_TRASH))
+            .order_by("model_instance_uuid", "-updated_at")
+            .distinct("model_instance_uuid")
+            .values_list("model_instance_uuid", "uuid")
+        )
+
+    @staticmethod
+    def _as_uuid(value) -> Optional[uuid.UUID]:
+        try:
+            return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+        except ValueError:
+            return None
+
+    def is_published(self, value) -> bool:
+        return self._as_uuid(value) in self.published
+
+    def get_active_draft(self, value) -> Optional[uuid.UUID]:
+        return self.active_drafts.get(self._as_uuid(value))
+
+
+def resolve_related_links(*forms):
+    """
+    Look up the links rendered by every `AddAnotherChoiceFieldWidget` of the provided forms
+    in bulk, rather than once per input when the forms are rendered.
+    """
+    bound_fields = [
+        bound_field
+        for form in forms
+        if form is not None
+        for bound_field in form
+        if isinstance(bound_field.field.widget, AddAnotherChoiceFieldWidget)
+    ]
+    values_by_model = defaultdict(list)
+    for bound_field in bound_fields:
+        values_by_model[bound_field.field.widget.model].append(bound_field.value())
+
+    related_links = RelatedLinks(values_by_model)
+    for bound_field in bound_fields:
+        bound_field.field.widget.related_links = related_links
+
+
 class AddAnotherChoiceFieldWidget(forms.Select):
+    """
+    Select input for drafts of a related record. Only the selected option is rendered,
+    other options are searched from the autocomplete endpoint by Select2.
+    """
+
     def __init__(self, model, *args, **kwargs):
         self.model = model
         return super().__init__(*args, **kwargs)
 
+    def get_selected_choices(self, value):
+        """
+        Reduce the widget's choices to the empty choice and the selected values, looking the
+        selected values up rather than evaluating every option of the field's queryset.
+        """
+        if not isinstance(self.choices, ModelChoiceIterator):
+            return [choice for choice in self.choices if str(choice[0]) in ["", *value]]
+
+        field = self.choices.field
+        choices = [] if field.empty_label is None else [("", field.empty_label)]
+        selected = [pk for pk in value if pk]
+        if selected:
+            try:
+                choices.extend(
+                    self.choices.choice(option)
+                    for option in self.choices.queryset.filter(uuid__in=selected)
+                )
+            except ValidationError:
+                logger.warning("Unable to look up selected choices %s", selected)
+        return choices
+
+    def optgroups(self, name, value, attrs=None):
+        all_choices = self.choices
+        self.choices = self.get_selected_choices(value)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices
+
+    def get_context(self, name, value, attrs):
+        autocomplete_url = reverse(
+            "change-autocomplete", kwargs={"model": camel_to_snake(self.model._meta.object_name)}
+        )
+        attrs = {**(attrs or {}), "data-ajax--url": autocomplete_url, "data-ajax--delay": 250}
+        return super().get_context(name, value, attrs)
+
     def render(self, name, value, *args, **kwargs):
         create_form_url = reverse(
             "change-add", kwargs={"model": camel_to_snake(self.model._meta.object_name)}
@@ -113,16 +225,17 @@ class AddAnotherChoiceFieldWidget(forms.Select):
             f" {self.model._meta.verbose_name.title()}</a>",
         ]
         if value:
+            # Forms resolve the links of all their inputs up front with `resolve_related_links`,
+            # a widget rendered on its own looks up its own value
+            related_links = getattr(self, "related_links", None) or RelatedLinks(
+                {self.model: [value]}
+            )
             # add a published url if available
-            try:
-                published = self.model.objects.get(pk=value)
-            except self.model.DoesNotExist:
-                pass
-            else:
+            if related_links.is_published(value):
                 published_url = reverse(
                     "published-detail",
                     kwargs={
-                        "canonical_uuid": published.pk,
+                        "canonical_uuid": value,
                         "model": camel_to_snake(self.model._meta.object_name),
                     },
                 )
@@ -132,14 +245,8 @@ class AddAnotherChoiceFieldWidget(forms.Select):
                     f" {self.model._meta.verbose_name.title().lower()}</a>"
                 )
             # get most recent active draft
-            active_draft = (
-                Change.objects.filter(model_instance_uuid=value)
-                .exclude(status__in=(Change.Statuses.PUBLISHED, Change.Statuses.IN_TRASH))
-                .order_by("-updated_at")
-                .first()
-            )
-            if active_draft:
-                update_form_url = reverse("change-update", kwargs={"pk": active_draft.pk})
+            if active_draft_uuid := related_links.get_active_draft(value):
+                update_form_url = reverse("change-update", kwargs={"pk": active_draft_uuid})
                 output.append(
                     f"<a class='link-to small' data-select_id='id_{name}' href='{update_form_url}'"
                     " target='_blank'>&#x29c9; View latest draft</a>"
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApiAppConfig(AppConfig):
     default_auto_field = 'django.db.models.AutoField'
     name = "api_app"
+
+    def ready(self):
+        from .search import connect_signals
+
+        connect_signals()
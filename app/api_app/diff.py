@@ -0,0 +1,81 @@
+"""
+Structured diffs between the values an Update draft replaces and the values it proposes.
+
+A diff maps each changed field to its old and new value, normalized so that equivalent
+representations (form input strings, serializer output, reordered many to many lists,
+bounding boxes as text or GeoJSON) compare equal:
+
+    {"short_name": {"old": "ACES", "new": "ACES-2"}}
+
+Diffs are stored on `Change.diff` whenever a draft is edited and refreshed when the
+record it targets is saved, so pages only need to read them.
+"""
+import json
+from datetime import date, datetime
+
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.geos import GEOSException, GEOSGeometry
+from django.core.exceptions import FieldDoesNotExist
+
+from data_models.serializers import get_geojson_from_bb
+
+
+def _normalize_geometry(value):
+    try:
+        if isinstance(value, str):
+            try:
+                # bounding boxes are submitted as "n, s, e, w"
+                value = get_geojson_from_bb(value)
+            except ValueError:
+                pass
+        else:
+            value = json.dumps(value)
+        return GEOSGeometry(value).wkt
+    except (GEOSException, ValueError, TypeError):
+        return str(value)
+
+
+def normalize_value(field, value):
+    """
+    Convert a field's value to a JSON-serializable form in which equivalent values are equal
+    """
+    if value is None or value == "" or value == []:
+        return None
+    if field.many_to_many:
+        values = value if isinstance(value, (list, tuple)) else [value]
+        return sorted(str(item) for item in values)
+    if isinstance(field, GeometryField):
+        return _normalize_geometry(value)
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def compute_diff(model, previous: dict, update: dict) -> dict:
+    """
+    Compare the proposed values of a draft to the values they replace.
+
+    Args:
+        model (Model): model class the draft targets
+        previous (dict): values of the published record, keyed by field name
+        update (dict): values proposed by the draft, keyed by field name
+
+    Returns:
+        dict: {field name: {"old": value, "new": value}} for each field of the model that
+            the draft changes
+    """
+    diff = {}
+    for field_name, new_value in update.items():
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            # ignore data that does not fit in the model (eg if the model changed)
+            continue
+
+        old = normalize_value(field, previous.get(field_name))
+        new = normalize_value(field, new_value)
+        if old != new:
+            diff[field_name] = {"old": old, "new": new}
+    return diff
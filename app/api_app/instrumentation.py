@@ -0,0 +1,320 @@
+"""
+Per-request cost instrumentation.
+
+When `REQUEST_INSTRUMENTATION` is enabled, `InstrumentationMiddleware` records for every
+request the resolved view name, total time, DB time, query count, duplicate queries
+(the same SQL run more than once, usually an N+1), hits and misses of the configured
+caches and time spent building serializer data. The metrics are returned in a
+`Server-Timing` header, logged as structured JSON and stored as a `RequestMetric` row,
+shared by every process, from which the admin report page aggregates the requests of a
+rolling window when it is read.
+"""
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Optional
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from api_app.models import RequestMetric
+
+logger = logging.getLogger(__name__)
+
+# Requests expired from the window are deleted once every PRUNE_INTERVAL stored requests
+PRUNE_INTERVAL = 100
+
+
+@dataclass
+class RequestMetrics:
+    view_name: str = ""
+    method: str = ""
+    status_code: int = 0
+    total_ms: float = 0
+    db_ms: float = 0
+    query_count: int = 0
+    duplicate_query_count: int = 0
+    worst_duplicate_query: str = ""
+    worst_duplicate_count: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    serializer_ms: float = 0
+    timestamp: float = 0
+    _queries: Counter = field(default_factory=Counter, repr=False)
+    _serializer_depth: int = field(default=0, repr=False)
+    _cache_depth: int = field(default=0, repr=False)
+
+    def summarize_queries(self):
+        self.query_count = sum(self._queries.values())
+        self.duplicate_query_count = self.query_count - len(self._queries)
+        if self._queries:
+            sql, count = self._queries.most_common(1)[0]
+            if count > 1:
+                self.worst_duplicate_query = sql
+                self.worst_duplicate_count = count
+
+    def as_dict(self) -> dict:
+        return {key: value for key, value in asdict(self).items() if not key.startswith("_")}
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            [
+                f"total;dur={self.total_ms:.1f}",
+                f'db;dur={self.db_ms:.1f};desc="{self.query_count} queries, '
+                f'{self.duplicate_query_count} duplicates"',
+                f"serializer;dur={self.serializer_ms:.1f}",
+                f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            ]
+        )
+
+
+_current_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+class QueryRecorder:
+    """`connection.execute_wrapper` that times every query and counts it by its SQL"""
+
+    def __init__(self, metrics: RequestMetrics):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.db_ms += (time.perf_counter() - start) * 1000
+            self.metrics._queries[sql] += 1
+
+
+def _timed_serializer_data(data_property):
+    @wraps(data_property.fget)
+    def data(self):
+        metrics = _current_metrics.get()
+        if not metrics:
+            return data_property.fget(self)
+
+        # Nested serializers are timed as part of their outermost serializer
+        metrics._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return data_property.fget(self)
+        finally:
+            metrics._serializer_depth -= 1
+            if not metrics._serializer_depth:
+                metrics.serializer_ms += (time.perf_counter() - start) * 1000
+
+    return property(data)
+
+
+_serializers_instrumented = False
+
+
+def instrument_serializers():
+    """Time `.data` of every DRF serializer. Safe to call more than once."""
+    global _serializers_instrumented
+    if _serializers_instrumented:
+        return
+
+    from rest_framework import serializers
+
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        serializer_class.data = _timed_serializer_data(serializer_class.data)
+    _serializers_instrumented = True
+
+
+# Default passed to the cache by `_counted_get` to tell misses from cached values
+_MISSING = object()
+
+
+def _counted_get(get):
+    @wraps(get)
+    def counted_get(self, key, default=None, version=None):
+        metrics = _current_metrics.get()
+        # Backends implementing get with get_many, or the other way around, count once
+        if not metrics or metrics._cache_depth:
+            return get(self, key, default, version)
+
+        metrics._cache_depth += 1
+        try:
+            value = get(self, key, _MISSING, version)
+        finally:
+            metrics._cache_depth -= 1
+        if value is _MISSING:
+            metrics.cache_misses += 1
+            return default
+        metrics.cache_hits += 1
+        return value
+
+    return counted_get
+
+
+def _counted_get_many(get_many):
+    @wraps(get_many)
+    def counted_get_many(self, keys, version=None):
+        metrics = _current_metrics.get()
+        if not metrics or metrics._cache_depth:
+            return get_many(self, keys, version)
+
+        keys = list(keys)
+        metrics._cache_depth += 1
+        try:
+            values = get_many(self, keys, version)
+        finally:
+            metrics._cache_depth -= 1
+        metrics.cache_hits += len(values)
+        metrics.cache_misses += len(set(keys)) - len(values)
+        return values
+
+    return counted_get_many
+
+
+def _counted_get_or_set(get_or_set):
+    @wraps(get_or_set)
+    def counted_get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        metrics = _current_metrics.get()
+        if not metrics or metrics._cache_depth:
+            return get_or_set(self, key, default, timeout, version)
+
+        # get_or_set reads the value again after setting it, which isn't another lookup
+        value = self.get(key, _MISSING, version)
+        if value is not _MISSING:
+            return value
+        metrics._cache_depth += 1
+        try:
+            return get_or_set(self, key, default, timeout, version)
+        finally:
+            metrics._cache_depth -= 1
+
+    return counted_get_or_set
+
+
+_instrumented_cache_classes = set()
+
+
+def instrument_caches():
+    """
+    Count the hits and misses of `get`, `get_many` and `get_or_set` on the backend of every
+    configured cache. Safe to call more than once.
+    """
+    for alias in settings.CACHES:
+        cache_class = type(caches[alias])
+        if cache_class in _instrumented_cache_classes:
+            continue
+        cache_class.get = _counted_get(cache_class.get)
+        cache_class.get_many = _counted_get_many(cache_class.get_many)
+        cache_class.get_or_set = _counted_get_or_set(cache_class.get_or_set)
+        _instrumented_cache_classes.add(cache_class)
+
+
+def _window_start():
+    return timezone.now() - timedelta(seconds=settings.REQUEST_INSTRUMENTATION_WINDOW)
+
+
+def store_metrics(metrics: RequestMetrics):
+    """
+    Stores the metrics of a request with a single insert, occasionally deleting the requests
+    that have left the rolling window or exceed REQUEST_INSTRUMENTATION_MAX_ENTRIES
+    """
+    entry = RequestMetric.objects.create(view_name=metrics.view_name, metrics=metrics.as_dict())
+    if entry.pk % PRUNE_INTERVAL == 0:
+        RequestMetric.objects.filter(
+            Q(created_at__lte=_window_start())
+            | Q(pk__lte=entry.pk - settings.REQUEST_INSTRUMENTATION_MAX_ENTRIES)
+        ).delete()
+
+
+def get_report(limit: int = 20) -> dict:
+    """Aggregates the requests of the rolling window per view.
+
+    Args:
+        limit (int, optional): Number of views to return per ranking. Defaults to 20.
+
+    Returns:
+        dict: {"request_count", "slowest", "n_plus_one"} where the rankings are lists of
+            per-view aggregates
+    """
+    entries = list(
+        RequestMetric.objects.filter(created_at__gt=_window_start())
+        .order_by("-pk")
+        .values_list("metrics", flat=True)[: settings.REQUEST_INSTRUMENTATION_MAX_ENTRIES]
+    )
+    by_view = defaultdict(list)
+    for entry in entries:
+        by_view[entry["view_name"]].append(entry)
+
+    views = []
+    for view_name, requests in by_view.items():
+        total_times = sorted(request["total_ms"] for request in requests)
+        worst = max(requests, key=lambda request: request["worst_duplicate_count"])
+        views.append(
+            {
+                "view_name": view_name,
+                "count": len(requests),
+                "avg_ms": sum(total_times) / len(total_times),
+                "p95_ms": total_times[min(len(total_times) - 1, int(len(total_times) * 0.95))],
+                "max_ms": total_times[-1],
+                "avg_db_ms": sum(request["db_ms"] for request in requests) / len(requests),
+                "avg_queries": sum(request["query_count"] for request in requests) / len(requests),
+                "max_duplicates": max(request["duplicate_query_count"] for request in requests),
+                "worst_duplicate_query": worst["worst_duplicate_query"],
+                "worst_duplicate_count": worst["worst_duplicate_count"],
+            }
+        )
+
+    return {
+        "request_count": len(entries),
+        "slowest": sorted(views, key=lambda view: view["p95_ms"], reverse=True)[:limit],
+        "n_plus_one": sorted(
+            [view for view in views if view["max_duplicates"]],
+            key=lambda view: view["max_duplicates"],
+            reverse=True,
+        )[:limit],
+    }
+
+
+class InstrumentationMiddleware:
+    """
+    Records the cost of each request. Enable with the `REQUEST_INSTRUMENTATION` setting;
+    when disabled, Django drops the middleware entirely.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        instrument_serializers()
+        instrument_caches()
+
+    def __call__(self, request):
+        metrics = RequestMetrics(method=request.method, timestamp=time.time())
+        token = _current_metrics.set(metrics)
+        recorder = QueryRecorder(metrics)
+        start = time.perf_counter()
+        try:
+            with connections["default"].execute_wrapper(recorder):
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        metrics.total_ms = (time.perf_counter() - start) * 1000
+        metrics.status_code = response.status_code
+        metrics.view_name = (
+            request.resolver_match.view_name if request.resolver_match else request.path
+        )
+        metrics.summarize_queries()
+
+        response["Server-Timing"] = metrics.server_timing()
+        logger.info(json.dumps({"event": "request_metrics", **metrics.as_dict()}))
+        store_metrics(metrics)
+        return response
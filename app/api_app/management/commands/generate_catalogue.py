@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from data_models.tests.catalogue import CatalogueGenerator, CatalogueSize
+
+
+class Command(BaseCommand):
+    help = "Fill the database with a seeded synthetic catalogue, e.g. for profiling locally"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1,
+            help=f"Multiplies the default of {CatalogueSize.campaigns} campaigns",
+        )
+
+    def handle(self, *args, **options):
+        size = CatalogueSize().scaled(options["scale"])
+        catalogue = CatalogueGenerator(size, seed=options["seed"]).generate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(catalogue.campaigns)} campaigns, {len(catalogue.dois)} DOIs, "
+                f"{catalogue.change_count} drafts and {catalogue.approval_log_count} approval logs"
+            )
+        )
@@ -1,5 +1,7 @@
+from django.apps import apps
 from django.core.management.commands import loaddata
 from api_app.models import Change
+from data_models.models import Dated, Hierarchical
 
 
 # Patch the loaddata command
@@ -9,9 +11,17 @@ class Command(loaddata.Command):
     Sometimes dumpdata creates a file that loads in the wrong order, and these tests fail.
     This bit of code overwrites the loaddata command to write a note on the Change object
     which can be used to skip these checks.
+
+    Fixtures are loaded without calling `save()`, so the stored ancestors of hierarchical
+    records and date ranges of dated records are recomputed afterwards.
     """
 
     def handle(self, *fixture_labels, **options):
         Change.loading_data = True
         super().handle(*fixture_labels, **options)
         Change.loading_data = False
+        for model in Hierarchical.__subclasses__():
+            model.rebuild_ancestors()
+        for model in apps.get_app_config("data_models").get_models():
+            if issubclass(model, Dated):
+                model.rebuild_date_ranges()
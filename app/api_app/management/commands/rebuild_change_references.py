@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api_app.models import ChangeReference
+
+
+class Command(BaseCommand):
+    help = "Rebuild the references between drafts extracted from their 'update' data"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = ChangeReference.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Extracted {count} references"))
@@ -0,0 +1,71 @@
+# Generated by Django 4.1.5 on 2026-10-19 12:31
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('api_app', '0021_alter_change_update'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='SearchIndex',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                (
+                    'object_uuid',
+                    models.UUIDField(help_text='Canonical UUID of the indexed record.'),
+                ),
+                ('is_draft', models.BooleanField(default=False)),
+                ('title', models.TextField(blank=True, default='')),
+                ('body', models.TextField(blank=True, default='')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                (
+                    'change',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to='api_app.change',
+                    ),
+                ),
+                (
+                    'content_type',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype'
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='searchindex',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_vector'], name='searchindex_vector_gin'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='searchindex',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['title'], name='searchindex_title_trgm', opclasses=['gin_trgm_ops']
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='searchindex',
+            constraint=models.UniqueConstraint(
+                fields=('content_type', 'object_uuid', 'is_draft'), name='unique_search_entry'
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.1.5 on 2026-10-19 12:34
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.fields.json
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0022_searchindex'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='change',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.db.models.fields.json.KeyTransform('campaigns', 'update'),
+                name='change_update_campaigns_gin',
+            ),
+        ),
+    ]
@@ -0,0 +1,126 @@
+# Generated by Django 4.1.5 on 2026-10-19 12:49
+
+import json
+from datetime import date, datetime
+
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.geos import GEOSException, GEOSGeometry
+from django.core.exceptions import FieldDoesNotExist
+from django.db import migrations, models
+import uuid
+
+BATCH_SIZE = 500
+
+
+# Frozen copy of `api_app.diff` as of this migration
+
+
+def _get_geojson_from_bb(bb_data):
+    n, s, e, w = [float(coord) for coord in bb_data.split(",")]
+    return json.dumps(
+        {
+            "type": "Polygon",
+            "coordinates": [[[w, s], [e, s], [e, n], [w, n], [w, s]]],
+            "crs": {"type": "name", "properties": {"name": "EPSG:4326"}},
+        }
+    )
+
+
+def _normalize_geometry(value):
+    try:
+        if isinstance(value, str):
+            try:
+                value = _get_geojson_from_bb(value)
+            except ValueError:
+                pass
+        else:
+            value = json.dumps(value)
+        return GEOSGeometry(value).wkt
+    except (GEOSException, ValueError, TypeError):
+        return str(value)
+
+
+def _normalize_value(field, value):
+    if value is None or value == "" or value == []:
+        return None
+    if field.many_to_many:
+        values = value if isinstance(value, (list, tuple)) else [value]
+        return sorted(str(item) for item in values)
+    if isinstance(field, GeometryField):
+        return _normalize_geometry(value)
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _compute_diff(model, previous, update):
+    diff = {}
+    for field_name, new_value in update.items():
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+
+        old = _normalize_value(field, previous.get(field_name))
+        new = _normalize_value(field, new_value)
+        if old != new:
+            diff[field_name] = {"old": old, "new": new}
+    return diff
+
+
+def compute_diffs(apps, schema_editor):
+    Change = apps.get_model("api_app", "Change")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    models_by_content_type = {}
+    for content_type in ContentType.objects.all():
+        try:
+            model = apps.get_model(content_type.app_label, content_type.model)
+        except LookupError:
+            continue
+        models_by_content_type[content_type.pk] = model
+
+    changes = Change.objects.filter(action="Update").only(
+        "uuid", "content_type_id", "previous", "update"
+    )
+    updated = []
+    for change in changes.iterator(chunk_size=BATCH_SIZE):
+        model = models_by_content_type.get(change.content_type_id)
+        if not model:
+            continue
+        change.diff = _compute_diff(model, change.previous, change.update)
+        if change.diff:
+            updated.append(change)
+        if len(updated) >= BATCH_SIZE:
+            Change.objects.bulk_update(updated, ["diff"])
+            updated = []
+    Change.objects.bulk_update(updated, ["diff"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0023_change_update_campaigns_index'),
+        # diffs are computed from the fields of the data models
+        ('data_models', '0056_alter_doi_cmr_data_formats_alter_doi_cmr_dates_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='diff',
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text='Fields changed by an Update draft, with their old and new values.',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='change',
+            name='model_instance_uuid',
+            field=models.UUIDField(blank=True, db_index=True, default=uuid.uuid4, null=True),
+        ),
+        migrations.RunPython(compute_diffs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 4.1.5 on 2026-10-19 12:52
+
+from uuid import UUID
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# generic foreign keys aren't part of the historical models
+GENERIC_OBJECT_FIELDS = {("data_models", "alias"): ("object_id",)}
+
+
+def get_reference_fields(model):
+    """Frozen copy of `api_app.models.get_reference_fields` for the historical models"""
+    field_names = [
+        field.name
+        for field in model._meta.get_fields()
+        if field.concrete
+        and (field.many_to_one or field.many_to_many)
+        and field.related_model._meta.label_lower != "contenttypes.contenttype"
+    ]
+    model_key = (model._meta.app_label, model._meta.model_name)
+    return (*field_names, *GENERIC_OBJECT_FIELDS.get(model_key, ()))
+
+
+def populate_references(apps, schema_editor, batch_size=2000):
+    """Frozen copy of `ChangeReferenceQuerySet.rebuild`"""
+    Change = apps.get_model("api_app", "Change")
+    ChangeReference = apps.get_model("api_app", "ChangeReference")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    reference_fields = {}
+    for content_type in ContentType.objects.all():
+        try:
+            model = apps.get_model(content_type.app_label, content_type.model)
+        except LookupError:
+            continue
+        reference_fields[content_type.pk] = get_reference_fields(model)
+
+    references = []
+    drafts = Change.objects.only("uuid", "content_type_id", "update")
+    for change in drafts.iterator(chunk_size=batch_size):
+        change_references = set()
+        for field_name in reference_fields.get(change.content_type_id, ()):
+            values = change.update.get(field_name)
+            for value in values if isinstance(values, list) else [values]:
+                try:
+                    change_references.add((field_name, UUID(str(value))))
+                except ValueError:
+                    # empty or malformed values don't reference anything
+                    continue
+        references.extend(
+            ChangeReference(
+                source_change_id=change.uuid, field_name=field_name, target_uuid=target_uuid
+            )
+            for field_name, target_uuid in change_references
+        )
+        if len(references) >= batch_size:
+            ChangeReference.objects.bulk_create(references)
+            references = []
+    ChangeReference.objects.bulk_create(references)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0024_change_diff'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeReference',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('field_name', models.CharField(max_length=64)),
+                ('target_uuid', models.UUIDField()),
+                (
+                    'source_change',
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='references',
+                        to='api_app.change',
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='changereference',
+            index=models.Index(
+                fields=['target_uuid', 'field_name'], name='changereference_target_idx'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='changereference',
+            constraint=models.UniqueConstraint(
+                fields=('source_change', 'field_name', 'target_uuid'),
+                name='unique_change_reference',
+            ),
+        ),
+        migrations.RunPython(populate_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 4.1.5 on 2026-10-19 12:56
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.functions.text
+
+BATCH_SIZE = 500
+
+# Frozen copy of `api_app.models.DISPLAY_NAME_FIELDS` and `get_display_name`
+DISPLAY_NAME_FIELDS = (
+    "short_name",
+    "title",
+    "variable_3",
+    "variable_2",
+    "variable_1",
+    "term",
+    "concept_id",
+)
+
+
+def get_display_name(*sources):
+    for field_name in DISPLAY_NAME_FIELDS:
+        for values in sources:
+            if value := values.get(field_name):
+                return str(value)
+    return ""
+
+
+def _update_in_batches(Change, changes):
+    """Writes the display_name of the changes yielded, BATCH_SIZE changes at a time"""
+    batch = []
+    for change in changes:
+        batch.append(change)
+        if len(batch) >= BATCH_SIZE:
+            Change.objects.bulk_update(batch, ["display_name"])
+            batch = []
+    Change.objects.bulk_update(batch, ["display_name"])
+
+
+def populate_display_names(apps, schema_editor):
+    Change = apps.get_model("api_app", "Change")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    # Published create drafts are named after their record, as are drafts that don't name it
+    record_uuids = {}
+
+    def named_from_values():
+        changes = Change.objects.only(
+            "uuid",
+            "content_type_id",
+            "model_instance_uuid",
+            "action",
+            "status",
+            "update",
+            "previous",
+        )
+        for change in changes.iterator(chunk_size=BATCH_SIZE):
+            change.display_name = get_display_name(change.update, change.previous)
+            if change.action == "Create" and change.status == 6:
+                record_uuids.setdefault(change.content_type_id, set()).add(change.uuid)
+            elif not change.display_name and change.action != "Create":
+                record_uuids.setdefault(change.content_type_id, set()).add(
+                    change.model_instance_uuid
+                )
+            if change.display_name:
+                yield change
+
+    _update_in_batches(Change, named_from_values())
+
+    record_names = {}
+    for content_type in ContentType.objects.filter(pk__in=record_uuids):
+        try:
+            model = apps.get_model(content_type.app_label, content_type.model)
+        except LookupError:
+            continue
+        field_names = {field.name for field in model._meta.concrete_fields}
+        name_fields = [name for name in DISPLAY_NAME_FIELDS if name in field_names]
+        records = model.objects.filter(uuid__in=record_uuids[content_type.pk]).values(
+            "uuid", *name_fields
+        )
+        record_names.update(
+            (record["uuid"], get_display_name(record)) for record in records.iterator()
+        )
+
+    def named_from_records():
+        changes = Change.objects.only("uuid", "model_instance_uuid", "action", "display_name")
+        for change in changes.iterator(chunk_size=BATCH_SIZE):
+            record_uuid = change.uuid if change.action == "Create" else change.model_instance_uuid
+            if record_uuid not in record_names:
+                continue
+            if change.action == "Create" or not change.display_name:
+                display_name = record_names[record_uuid] or change.display_name
+                if display_name != change.display_name:
+                    change.display_name = display_name
+                    yield change
+
+    _update_in_batches(Change, named_from_records())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0025_changereference'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='display_name',
+            field=models.TextField(
+                blank=True,
+                default='',
+                editable=False,
+                help_text='Name of the targeted record, used to list, sort and search drafts.',
+            ),
+        ),
+        migrations.RunPython(populate_display_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['display_name'], name='change_display_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('display_name'), name='gin_trgm_ops'
+                ),
+                name='change_display_name_trgm',
+            ),
+        ),
+    ]
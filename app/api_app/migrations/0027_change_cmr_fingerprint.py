@@ -0,0 +1,92 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:10
+
+import ast
+import hashlib
+import json
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+# Frozen copy of `cmr.utils.cmr_fingerprint` and the fields it hashes
+CORE_CMR_FIELDS = [
+    'cmr_short_name',
+    'cmr_entry_title',
+    'cmr_projects',
+    'cmr_dates',
+    'cmr_plats_and_insts',
+    'cmr_science_keywords',
+    'cmr_abstract',
+    'cmr_data_formats',
+    'doi',
+]
+STRUCTURED_CMR_FIELDS = [
+    'cmr_projects',
+    'cmr_dates',
+    'cmr_plats_and_insts',
+    'cmr_science_keywords',
+    'cmr_data_formats',
+]
+
+
+def _normalize_cmr_value(field, value):
+    if field in STRUCTURED_CMR_FIELDS and isinstance(value, str):
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+    if isinstance(value, str):
+        value = value.strip()
+    return value or None
+
+
+def cmr_fingerprint(metadata):
+    normalized = {
+        field: _normalize_cmr_value(field, metadata.get(field)) for field in CORE_CMR_FIELDS
+    }
+    canonical = json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def populate_cmr_fingerprints(apps, schema_editor):
+    Change = apps.get_model("api_app", "Change")
+
+    changes = Change.objects.filter(content_type__model="doi").only("uuid", "update")
+    batch = []
+    for change in changes.iterator(chunk_size=BATCH_SIZE):
+        change.cmr_fingerprint = cmr_fingerprint(change.update)
+        batch.append(change)
+        if len(batch) >= BATCH_SIZE:
+            Change.objects.bulk_update(batch, ["cmr_fingerprint"])
+            batch = []
+    Change.objects.bulk_update(batch, ["cmr_fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0026_change_display_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='cmr_fingerprint',
+            field=models.CharField(
+                blank=True,
+                default='',
+                editable=False,
+                help_text='Hash of the core CMR metadata of DOI drafts, used to skip unchanged DOIs.',
+                max_length=64,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(
+                condition=models.Q(('cmr_fingerprint', ''), _negated=True),
+                fields=['cmr_fingerprint'],
+                name='change_cmr_fingerprint_idx',
+            ),
+        ),
+        migrations.RunPython(populate_cmr_fingerprints, migrations.RunPython.noop),
+    ]
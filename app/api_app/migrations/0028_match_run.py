@@ -0,0 +1,68 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api_app', '0027_change_cmr_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchRun',
+            fields=[
+                (
+                    'uuid',
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    'table_name',
+                    models.CharField(
+                        help_text='Table of the matched records, such as campaign.', max_length=20
+                    ),
+                ),
+                (
+                    'targets',
+                    models.JSONField(default=list, help_text='UUIDs of the matched records.'),
+                ),
+                (
+                    'status',
+                    models.IntegerField(
+                        choices=[(0, 'Pending'), (1, 'Running'), (2, 'Finished'), (3, 'Failed')],
+                        default=0,
+                    ),
+                ),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                (
+                    'report',
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text='Counts of the new, updated and unchanged DOIs of each matched record, or the error it failed with, by uuid.',
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='match_runs',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
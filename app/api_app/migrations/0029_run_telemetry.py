@@ -0,0 +1,70 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:23
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0028_match_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRun',
+            fields=[
+                (
+                    'uuid',
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    'status',
+                    models.IntegerField(
+                        choices=[(1, 'Running'), (2, 'Finished'), (3, 'Failed')], default=1
+                    ),
+                ),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                (
+                    'report',
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text='Counts of the keywords created, updated, deleted, published and unchanged in each scheme, with its telemetry, by scheme.',
+                    ),
+                ),
+                (
+                    'telemetry',
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text='Seconds spent in each stage and counters of the whole run.',
+                    ),
+                ),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='matchrun',
+            name='telemetry',
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text='Seconds spent in each stage and counters of the whole run.',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='matchrun',
+            name='report',
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text='Counts of the new, updated and unchanged DOIs of each matched record, with its telemetry, or the error it failed with, by uuid.',
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0029_run_telemetry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GcmdSchemeVersion',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('scheme', models.CharField(max_length=32, unique=True)),
+                ('version', models.CharField(max_length=64)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
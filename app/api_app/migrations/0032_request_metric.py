@@ -0,0 +1,31 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:42
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0031_task_lock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestMetric',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                (
+                    'created_at',
+                    models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+                ),
+                ('view_name', models.CharField(max_length=256)),
+                ('metrics', models.JSONField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_app', '0032_request_metric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchrun',
+            name='error',
+            field=models.TextField(
+                blank=True,
+                default='',
+                help_text='Error the run failed with before matching records.',
+            ),
+        ),
+    ]
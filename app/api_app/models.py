@@ -1,22 +1,32 @@
 from datetime import date, datetime
+from functools import lru_cache, partial
 from uuid import UUID, uuid4
 
 from crum import get_current_user
 from django.apps import apps
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
+from django.db import models, transaction
 from django.db.models import expressions, functions, Subquery, Q
-from django.db.models.fields.json import KeyTextTransform
-from django.db.models.signals import post_save
+from django.db.models.fields.json import KeyTransform
+from django.db.models.signals import m2m_changed, post_save
 from django.dispatch import receiver
+from django.utils import timezone
+from psycopg2.extras import Range
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 
 from admg_webapp.users.models import User
+from api_app.diff import compute_diff
 from api_app.signals import temp_disconnect_signal
+from api_app.snapshot import get_snapshot
+from api_app.telemetry import merge_telemetry, stage
+from cmr.utils import cmr_fingerprint
 from data_models import serializers
+from data_models.temporal import range_bounds
 
 
 def generate_failure_response(message):
@@ -117,7 +127,70 @@ class ApprovalLog(models.Model):
         return f"{action}d" if action.endswith("e") else f"{action}ed"
 
 
+@lru_cache(maxsize=None)
+def get_reference_fields(model) -> tuple[str, ...]:
+    """
+    Names of the fields of a model whose values in a draft's `update` reference other
+    records: foreign keys, many to many fields and the object of generic foreign keys.
+    """
+    field_names = [
+        field.name
+        for field in model._meta.get_fields()
+        if field.concrete
+        and (field.many_to_one or field.many_to_many)
+        and field.related_model is not ContentType
+    ]
+    field_names += [
+        field.fk_field
+        for field in model._meta.private_fields
+        if isinstance(field, GenericForeignKey)
+    ]
+    return tuple(field_names)
+
+
+# Fields that name a record in listings and select inputs, in order of preference
+DISPLAY_NAME_FIELDS = (
+    "short_name",
+    "title",
+    "variable_3",
+    "variable_2",
+    "variable_1",
+    "term",
+    "concept_id",
+)
+
+
+def get_display_name(*sources: dict) -> str:
+    """
+    Name of a record, taken from the first populated `DISPLAY_NAME_FIELDS` field found in
+    the provided dicts of values (eg a draft's `update`, then its `previous`).
+    """
+    for field_name in DISPLAY_NAME_FIELDS:
+        for values in sources:
+            if value := values.get(field_name):
+                return str(value)
+    return ""
+
+
+@lru_cache(maxsize=None)
+def get_display_name_field(model) -> str | None:
+    """Name of the field of a model that its drafts' `display_name` is taken from"""
+    field_names = {field.name for field in model._meta.concrete_fields}
+    return next((name for name in DISPLAY_NAME_FIELDS if name in field_names), None)
+
+
 class ChangeQuerySet(models.QuerySet):
+    def referencing(self, field_name: str, uuids):
+        """
+        Limit changes to those whose `update` references any of the provided uuids in the
+        provided field (eg deployments of a campaign are `referencing("campaign", [uuid])`)
+        """
+        return self.filter(
+            uuid__in=ChangeReference.objects.filter(
+                field_name=field_name, target_uuid__in=uuids
+            ).values("source_change")
+        )
+
     def related_drafts(self, uuid: str):
         return self.filter(Q(uuid=uuid) | Q(model_instance_uuid=uuid))
 
@@ -154,7 +227,7 @@ class ChangeQuerySet(models.QuerySet):
         of_type: models.Model,
         to_attr: str,
         uuid_from: str,
-        identifier="short_name",
+        identifier=None,
     ):
         """
         Annotate queryset with an identifier obtained from a related model.
@@ -167,63 +240,28 @@ class ChangeQuerySet(models.QuerySet):
             attribute in the "update" dict of source model that holds the uuid
             of the model to be joined
         identifier:
-            attribute in the "update" dict of joined model that holds the identifier
+            attribute in the "update" dict of joined model that holds the identifier,
+            defaults to the `display_name` of the joined model's create draft
         """
         uuid_dest_attr = f"{of_type._meta.model_name}_uuid"
         return self.annotate(
             **{
-                uuid_dest_attr: functions.Cast(
-                    functions.Coalesce(
-                        functions.NullIf(
-                            KeyTextTransform(uuid_from, "update"), expressions.Value("")
-                        ),
-                        # In the event that the Change model doesn't have the uuid_from property in its
-                        # 'update' object, the operation to retrieve the value from the 'update' will return
-                        # NULL. The DB will complain if we try to try to join a UUID on a NULL value, so in
-                        # the event that the uuid_from key isn't present in the 'update' object, we use a
-                        # dummy UUID fallback for the join which won't exist in the join table.
-                        expressions.Value("00000000-0000-0000-0000-000000000000"),
-                    ),
-                    output_field=models.UUIDField(),
+                uuid_dest_attr: models.Subquery(
+                    ChangeReference.objects.filter(
+                        source_change=expressions.OuterRef("uuid"), field_name=uuid_from
+                    ).values("target_uuid")[:1]
                 ),
                 to_attr: models.Subquery(
                     Change.objects.of_type(of_type)
                     .filter(
-                        # NOTE: This only shows the first created short_name, but doesn't reflect updated short_names
                         action=Change.Actions.CREATE,
                         uuid=expressions.OuterRef(uuid_dest_attr),
                     )
-                    .values(f"update__{identifier}")[:1]
+                    .values(f"update__{identifier}" if identifier else "display_name")[:1]
                 ),
             }
         )
 
-    def annotate_from_published(self, of_type, to_attr, identifier="short_name"):
-        """
-        Retrieve an identifier string from published model if possible, falling
-        back to change model if no published model is available.
-
-        of_type:
-            class of model that contains our desired identifier
-        to_attr:
-            attribute to where identifier will be annotated
-        identifier:
-            attribute in the "update" dict of joined model that holds the identifier
-        """
-        return self.annotate(
-            **{
-                to_attr: functions.Coalesce(
-                    expressions.Subquery(
-                        (of_type.objects.filter(uuid=expressions.OuterRef("uuid"))[:1]).values(
-                            identifier
-                        )
-                    ),
-                    KeyTextTransform(identifier, "update"),
-                    output_field=models.TextField(),
-                )
-            }
-        )
-
 
 class Change(models.Model):
     # this field is updated by the manage.py loaddata command and allows us to skip certain tests
@@ -275,7 +313,7 @@ class Change(models.Model):
         help_text="Model for which the draft pertains.",
         on_delete=models.CASCADE,
     )
-    model_instance_uuid = models.UUIDField(default=uuid4, blank=True, null=True)
+    model_instance_uuid = models.UUIDField(default=uuid4, blank=True, null=True, db_index=True)
     content_object = GenericForeignKey("content_type", "model_instance_uuid")
 
     status = models.IntegerField(choices=Statuses.choices, default=Statuses.IN_PROGRESS)
@@ -283,6 +321,24 @@ class Change(models.Model):
     updated_at = models.DateTimeField(blank=True, null=True, db_index=True)
     field_status_tracking = models.JSONField(default=dict, blank=True)
     previous = models.JSONField(default=dict)
+    display_name = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Name of the targeted record, used to list, sort and search drafts.",
+    )
+    diff = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Fields changed by an Update draft, with their old and new values.",
+    )
+    cmr_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Hash of the core CMR metadata of DOI drafts, used to skip unchanged DOIs.",
+    )
 
     action = models.CharField(
         max_length=10,
@@ -293,6 +349,21 @@ class Change(models.Model):
 
     class Meta:
         verbose_name = "Draft"
+        indexes = [
+            # serves `update__campaigns__contains` lookups, e.g. DOI drafts of a campaign
+            GinIndex(KeyTransform("campaigns", "update"), name="change_update_campaigns_gin"),
+            models.Index(fields=["display_name"], name="change_display_name_idx"),
+            # serves `display_name__icontains` lookups, which compare UPPER(display_name)
+            GinIndex(
+                OpClass(functions.Upper("display_name"), name="gin_trgm_ops"),
+                name="change_display_name_trgm",
+            ),
+            models.Index(
+                fields=["cmr_fingerprint"],
+                name="change_cmr_fingerprint_idx",
+                condition=~Q(cmr_fingerprint=""),
+            ),
+        ]
 
     @classmethod
     def from_db(cls, db, field_names, values):
@@ -382,6 +453,9 @@ class Change(models.Model):
             return [cls._get_processed_value(val) for val in value]
         elif isinstance(value, date) or isinstance(value, datetime):
             return value.isoformat()
+        elif isinstance(value, Range):
+            start, end = range_bounds(value)
+            return {"start": cls._get_processed_value(start), "end": cls._get_processed_value(end)}
 
         return value
 
@@ -391,15 +465,49 @@ class Change(models.Model):
         or the uuid deosn't exist in case of edit/delete change
         """
         model = apps.get_model("data_models", self.model_name)
-        if self.action != Change.Actions.CREATE:
-            serializer_class = getattr(serializers, f"{self.model_name}Serializer")
-            instance = model.objects.get(uuid=self.model_instance_uuid)
-            if self.action == Change.Actions.UPDATE:
-                serializer = serializer_class(instance)
-                self.previous = {
-                    key: Change._get_processed_value(serializer.data.get(key))
-                    for key in self.update
-                }
+        if self.action == Change.Actions.UPDATE:
+            # only the fields the draft changes are read, rather than the whole record
+            snapshot = get_snapshot(model, self.model_instance_uuid, self.update)
+            self.previous = {
+                key: Change._get_processed_value(value) for key, value in snapshot.items()
+            }
+            self.refresh_diff()
+        elif self.action != Change.Actions.CREATE:
+            model.objects.values("uuid").get(uuid=self.model_instance_uuid)
+
+    def refresh_diff(self):
+        """
+        Store the fields that an Update draft changes on `diff`, comparing `update` to the
+        values it replaces in `previous`.
+        """
+        if self.action != Change.Actions.UPDATE:
+            self.diff = {}
+            return
+        self.diff = compute_diff(self.content_type.model_class(), self.previous, self.update)
+
+    def refresh_display_name(self):
+        """
+        Store the name of the targeted record on `display_name`, falling back to the values
+        replaced by the draft and then to the published record when the draft doesn't
+        rename it.
+        """
+        if self.action == self.Actions.CREATE and self.status == self.Statuses.PUBLISHED:
+            # kept in line with the published record by `refresh_display_name_dispatcher`
+            self.display_name = self.display_name or get_display_name(self.update)
+            return
+
+        self.display_name = get_display_name(self.update, self.previous)
+        if not self.display_name and self.action != self.Actions.CREATE:
+            if record := self.content_object:
+                self.display_name = get_display_name(vars(record))
+
+    def refresh_cmr_fingerprint(self):
+        """Store the fingerprint of the core CMR metadata of DOI drafts on `cmr_fingerprint`"""
+        # get_for_id is cached, unlike the content_type relation
+        if ContentType.objects.get_for_id(self.content_type_id).model == "doi":
+            self.cmr_fingerprint = cmr_fingerprint(self.update)
+        else:
+            self.cmr_fingerprint = ""
 
     def get_latest_log(self):
         return ApprovalLog.objects.filter(change=self).order_by("date").last()
@@ -409,7 +517,8 @@ class Change(models.Model):
         Get record and all ancestry records.
         """
         # We use a recursive CTE to allow us to get all of the UUIDs of
-        # this change and all of its ancestors. We join the data to the
+        # this change and all of its ancestors, following the references
+        # extracted from each draft's 'update'. We join the data to the
         # django_content_type table to allow us to customize how the
         # relationship between parent and child is linked (ie on which
         # field). UUIDs come out in order of this change first, then its
@@ -418,7 +527,6 @@ class Change(models.Model):
             WITH RECURSIVE parent AS (
                 SELECT
                     c.uuid,
-                    c.update,
                     ct.model
                 FROM
                     {self._meta.db_table} c,
@@ -429,20 +537,19 @@ class Change(models.Model):
                 UNION ALL
                 SELECT
                     c.uuid,
-                    c.update,
                     ct.model
                 FROM
-                    {self._meta.db_table} c,
-                    django_content_type ct,
                     parent p
+                    JOIN {ChangeReference._meta.db_table} r ON r.source_change_id = p.uuid
+                    JOIN {self._meta.db_table} c ON c.uuid = r.target_uuid
+                    JOIN django_content_type ct ON c.content_type_id = ct.id
                 WHERE
-                    c.content_type_id = ct.id
                     -- The only time we want campaign relationships is when
                     -- looking up the parent of a deployment
-                    AND CASE WHEN p.model ~* 'deployment|doi' THEN
-                        p.update ->> 'campaign' = c.uuid::text
+                    r.field_name = CASE WHEN p.model ~* 'deployment|doi' THEN
+                        'campaign'
                     ELSE
-                        p.update ->> 'deployment' = c.uuid::text
+                        'deployment'
                     END
             )
             SELECT
@@ -465,8 +572,7 @@ class Change(models.Model):
         )
 
     def get_descendents(self):
-        return self.__class__.objects.filter(
-            **{f"update__{self.content_type.model}": str(self.uuid)},
+        return self.__class__.objects.referencing(self.content_type.model, [self.uuid]).filter(
             # Hack: Some draft IOPs, SigEvents, and CollectionPeriods will have a 'update.campaign'
             # property, despite the fact that the actual models do not store that detail. We want to
             # ignore those records as they misrepresent the heirarchy of the data.
@@ -513,7 +619,41 @@ class Change(models.Model):
                     {"model_instance_uuid": "Unpublished draft already exists for this model uuid."}
                 )
 
-        return super().save(*args, **kwargs)
+        self.refresh_display_name()
+        self.refresh_cmr_fingerprint()
+        result = super().save(*args, **kwargs)
+        self.sync_references()
+        return result
+
+    def get_references(self) -> set[tuple[str, UUID]]:
+        """(field name, uuid) pairs of the records referenced by this draft's `update`"""
+        # get_for_id is cached, unlike the content_type relation
+        model = ContentType.objects.get_for_id(self.content_type_id).model_class()
+        if not model:
+            return set()
+
+        references = set()
+        for field_name in get_reference_fields(model):
+            values = self.update.get(field_name)
+            for value in values if isinstance(values, list) else [values]:
+                try:
+                    references.add((field_name, UUID(str(value))))
+                except ValueError:
+                    # empty or malformed values don't reference anything
+                    continue
+        return references
+
+    def sync_references(self):
+        """Write the references of this draft's `update` to `ChangeReference`, if they changed"""
+        references = self.get_references()
+        if references == getattr(self, "_synced_references", None):
+            return
+        ChangeReference.objects.filter(source_change=self).delete()
+        ChangeReference.objects.bulk_create(
+            ChangeReference(source_change=self, field_name=field_name, target_uuid=target_uuid)
+            for field_name, target_uuid in references
+        )
+        self._synced_references = references
 
     def _run_validator(self, partial):
         """Helper function that runs the serializer validator. Please note
@@ -530,7 +670,8 @@ class Change(models.Model):
 
         serializer_class = getattr(serializers, f"{self.model_name}Serializer")
         serializer_obj = serializer_class(data=self.update, partial=partial)
-        serializer_obj.is_valid(raise_exception=True)
+        with stage("validation"):
+            serializer_obj.is_valid(raise_exception=True)
 
         return "All serializer validations passed"
 
@@ -563,7 +704,9 @@ class Change(models.Model):
         serializer_class = getattr(serializers, f"{self.model_name}Serializer")
         serializer = serializer_class(instance=model_instance, data=data, partial=partial)
 
-        if serializer.is_valid(raise_exception=True):
+        with stage("validation"):
+            valid = serializer.is_valid(raise_exception=True)
+        if valid:
             new_model_instance = serializer.save()
             return {"uuid": new_model_instance.uuid, "status": self.Statuses.PUBLISHED}
 
@@ -897,6 +1040,129 @@ def set_change_updated_at(sender, instance, **kwargs):
             pass
 
 
+class ChangeReferenceQuerySet(models.QuerySet):
+    def sync(self, changes):
+        """
+        Replace the references of the provided changes with those of their current `update`.
+        Used where drafts are written in bulk, which skips `Change.save`.
+        """
+        changes = list(changes)
+        if not changes:
+            return
+        self.filter(source_change__in=changes).delete()
+        references = []
+        for change in changes:
+            change._synced_references = change.get_references()
+            references.extend(
+                ChangeReference(
+                    source_change=change, field_name=field_name, target_uuid=target_uuid
+                )
+                for field_name, target_uuid in change._synced_references
+            )
+        self.bulk_create(references, batch_size=1000)
+
+    def rebuild(self, batch_size=2000):
+        """Recreates the references of every draft. Returns the number of references created."""
+        self.all().delete()
+        count = 0
+        references = []
+        drafts = Change.objects.only("uuid", "content_type_id", "update")
+        for change in drafts.iterator(chunk_size=batch_size):
+            references.extend(
+                ChangeReference(
+                    source_change_id=change.uuid, field_name=field_name, target_uuid=target_uuid
+                )
+                for field_name, target_uuid in change.get_references()
+            )
+            if len(references) >= batch_size:
+                count += len(self.bulk_create(references))
+                references = []
+        count += len(self.bulk_create(references))
+        return count
+
+
+class ChangeReference(models.Model):
+    """
+    A reference from a draft's `update` to another record, such as a deployment draft's
+    `campaign` or a DOI draft's `campaigns`. References are extracted so that relationships
+    between drafts can be queried with indexed joins rather than by scanning `update`.
+
+    They are written whenever a draft is saved, by `ChangeReference.objects.sync` where
+    drafts are written in bulk, and can be rebuilt with `manage.py rebuild_change_references`.
+    """
+
+    # the unique constraint, led by the change, serves lookups from the change
+    source_change = models.ForeignKey(
+        Change, on_delete=models.CASCADE, related_name="references", db_index=False
+    )
+    field_name = models.CharField(max_length=64)
+    target_uuid = models.UUIDField()
+
+    objects = ChangeReferenceQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_change", "field_name", "target_uuid"],
+                name="unique_change_reference",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["target_uuid", "field_name"], name="changereference_target_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.source_change_id} >> {self.field_name} >> {self.target_uuid}"
+
+
+def refresh_target_drafts(*canonical_uuids):
+    """
+    Refresh `previous`, `diff` and `display_name` of the in-progress Update drafts of
+    records after the published records changed underneath them.
+    """
+    drafts = (
+        Change.objects.filter(model_instance_uuid__in=canonical_uuids, action=Change.Actions.UPDATE)
+        .exclude(status__in=[Change.Statuses.PUBLISHED, Change.Statuses.IN_TRASH])
+        .select_related("content_type")
+    )
+    for draft in drafts:
+        draft._check_model_and_uuid()
+        draft.refresh_display_name()
+        Change.objects.filter(pk=draft.pk).update(
+            previous=draft.previous, diff=draft.diff, display_name=draft.display_name
+        )
+
+
+@receiver(post_save, dispatch_uid="refresh_target_drafts_on_save")
+@receiver(m2m_changed, dispatch_uid="refresh_target_drafts_on_m2m_change")
+def refresh_target_drafts_dispatcher(sender, instance, **kwargs):
+    if (
+        instance._meta.app_label != "data_models"
+        or not isinstance(instance.pk, UUID)
+        or kwargs.get("raw")
+        or kwargs.get("action", "post_").startswith("pre_")
+    ):
+        return
+    # the many to many fields of the other side of a reverse relation are the ones changed
+    uuids = (kwargs.get("pk_set") or []) if kwargs.get("reverse") else [instance.pk]
+    for uuid in uuids:
+        # wait for the rest of the record (eg its many to many fields) to be written
+        transaction.on_commit(partial(refresh_target_drafts, uuid))
+
+
+@receiver(post_save, dispatch_uid="refresh_display_name_on_save")
+def refresh_display_name_dispatcher(sender, instance, raw=False, **kwargs):
+    """
+    Name the create draft of a record after the published record, so that published
+    renames show up wherever drafts are listed.
+    """
+    if instance._meta.app_label != "data_models" or not isinstance(instance.pk, UUID) or raw:
+        return
+    Change.objects.filter(uuid=instance.pk, action=Change.Actions.CREATE).update(
+        display_name=get_display_name(vars(instance))
+    )
+
+
 class Recommendation(models.Model):
     change = models.ForeignKey(Change, on_delete=models.CASCADE)
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, blank=True)
@@ -919,3 +1185,189 @@ class Recommendation(models.Model):
 class SubqueryCount(Subquery):
     template = "(SELECT count(*) FROM (%(subquery)s) _count)"
     output_field = models.IntegerField()
+
+
+class SearchIndex(models.Model):
+    """
+    Consolidated full-text search index spanning the searchable published models
+    and their in-progress drafts. Each canonical record has at most one published
+    entry and one draft entry. Entries are maintained by the receivers in
+    `api_app.search` and can be rebuilt with `manage.py rebuild_search_index`.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_uuid = models.UUIDField(help_text="Canonical UUID of the indexed record.")
+    change = models.ForeignKey(Change, on_delete=models.CASCADE, null=True, blank=True)
+    is_draft = models.BooleanField(default=False)
+
+    title = models.TextField(blank=True, default="")
+    body = models.TextField(blank=True, default="")
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_uuid", "is_draft"], name="unique_search_entry"
+            )
+        ]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="searchindex_vector_gin"),
+            GinIndex(fields=["title"], name="searchindex_title_trgm", opclasses=["gin_trgm_ops"]),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model} >> {self.title}"
+
+
+class MatchRun(models.Model):
+    """
+    A DOI matching job over several campaigns, instruments or platforms, carried out by
+    `cmr.batch_matching`, with a report of the DOIs matched for each of them.
+    """
+
+    class Statuses(models.IntegerChoices):
+        PENDING = 0, "Pending"
+        RUNNING = 1, "Running"
+        FINISHED = 2, "Finished"
+        # at least one of the records could not be matched
+        FAILED = 3, "Failed"
+
+    uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    table_name = models.CharField(
+        max_length=20, help_text="Table of the matched records, such as campaign."
+    )
+    targets = models.JSONField(default=list, help_text="UUIDs of the matched records.")
+    status = models.IntegerField(choices=Statuses.choices, default=Statuses.PENDING)
+    user = models.ForeignKey(
+        User, on_delete=models.SET_NULL, related_name="match_runs", null=True, blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    report = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=(
+            "Counts of the new, updated and unchanged DOIs of each matched record, with its "
+            "telemetry, or the error it failed with, by uuid."
+        ),
+    )
+    telemetry = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Seconds spent in each stage and counters of the whole run.",
+    )
+    error = models.TextField(
+        blank=True, default="", help_text="Error the run failed with before matching records."
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.table_name} x{len(self.targets)} | {self.get_status_display()}"
+
+    def fail(self, error):
+        self.status, self.error, self.finished_at = self.Statuses.FAILED, error, timezone.now()
+        self.save(update_fields=["status", "error", "finished_at"])
+
+    def add_telemetry(self, telemetry: dict):
+        """Adds the telemetry of part of the run, such as its planning, to that of the run"""
+        with transaction.atomic():
+            run = MatchRun.objects.select_for_update().get(pk=self.pk)
+            run.telemetry = merge_telemetry(run.telemetry, telemetry)
+            run.save(update_fields=["telemetry"])
+        self.telemetry = run.telemetry
+
+    def record_result(self, uuid, result):
+        """
+        Stores the report of one of the matched records. Records are matched by concurrent
+        tasks, so the run is locked while its report is updated, and finished once every
+        record has reported.
+        """
+        with transaction.atomic():
+            run = MatchRun.objects.select_for_update().get(pk=self.pk)
+            run.report[str(uuid)] = result
+            run.telemetry = merge_telemetry(run.telemetry, result.get("telemetry", {}))
+            if len(run.report) >= len(run.targets):
+                failed = any("error" in result for result in run.report.values())
+                run.status = self.Statuses.FAILED if failed else self.Statuses.FINISHED
+                run.finished_at = timezone.now()
+            run.save(update_fields=["report", "telemetry", "status", "finished_at"])
+        self.report, self.telemetry = run.report, run.telemetry
+        self.status, self.finished_at = run.status, run.finished_at
+
+
+class SyncRun(models.Model):
+    """A sync of the GCMD keyword schemes, with a report of the drafts made for each scheme"""
+
+    class Statuses(models.IntegerChoices):
+        RUNNING = 1, "Running"
+        FINISHED = 2, "Finished"
+        FAILED = 3, "Failed"
+
+    uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    status = models.IntegerField(choices=Statuses.choices, default=Statuses.RUNNING)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    report = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=(
+            "Counts of the keywords created, updated, deleted, published and unchanged in "
+            "each scheme, with its telemetry, by scheme."
+        ),
+    )
+    telemetry = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Seconds spent in each stage and counters of the whole run.",
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"GCMD sync {self.created_at:%Y-%m-%d %H:%M} | {self.get_status_display()}"
+
+    def record_scheme(self, scheme, result):
+        self.report[scheme] = result
+        self.telemetry = merge_telemetry(self.telemetry, result.get("telemetry", {}))
+        self.save(update_fields=["report", "telemetry"])
+
+    def finish(self, failed=False):
+        self.status = self.Statuses.FAILED if failed else self.Statuses.FINISHED
+        self.finished_at = timezone.now()
+        self.save(update_fields=["status", "finished_at"])
+
+
+class GcmdSchemeVersion(models.Model):
+    """The KMS version of a GCMD keyword scheme last synced, so that syncs skip unchanged schemes"""
+
+    scheme = models.CharField(max_length=32, unique=True)
+    version = models.CharField(max_length=64)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.scheme} {self.version}"
+
+
+class TaskLock(models.Model):
+    """Lock held by the run of a singleton task, see `api_app.task_locks`"""
+
+    key = models.CharField(max_length=512, unique=True)
+    task_id = models.CharField(max_length=255)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.key} ({self.task_id})"
+
+
+class RequestMetric(models.Model):
+    """Metrics of a request, recorded by `api_app.instrumentation` for its report page"""
+
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    view_name = models.CharField(max_length=256)
+    metrics = models.JSONField()
+
+    def __str__(self):
+        return f"{self.view_name} at {self.created_at}"
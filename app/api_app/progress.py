@@ -0,0 +1,109 @@
+"""
+Progress of long running Celery tasks, such as DOI matching and GCMD syncs.
+
+Tasks report progress through a `ProgressReporter`, which keeps the stage the task is in,
+the number of items of that stage done out of their total, the item being worked on and
+the number of errors met so far. It stores them as the PROGRESS state of the task's result
+at most once every TASK_PROGRESS_INTERVAL seconds, so that it can be updated on every item
+of a loop, and `get_task_progress` reads them back for the admin pages polling them.
+"""
+import json
+from time import monotonic
+
+from django.conf import settings
+from django_celery_results.models import TaskResult
+
+
+class ProgressReporter:
+    def __init__(self, task=None, interval=None):
+        """
+        Args:
+            task (Task): the bound task reporting its progress, if any. Without one progress
+                is only kept in memory.
+            interval (float): minimum number of seconds between the updates stored.
+                Defaults to the TASK_PROGRESS_INTERVAL setting.
+        """
+        self.task = task
+        self.interval = settings.TASK_PROGRESS_INTERVAL if interval is None else interval
+        self.stage = ""
+        self.done = 0
+        self.total = None
+        self.current = ""
+        self.errors = 0
+        # counts specific to the task, such as the DOIs created
+        self.counts = {}
+        self.stage_started_at = monotonic()
+        self.reported_at = None
+
+    def start_stage(self, stage, total=None):
+        self.stage, self.total, self.done, self.current = stage, total, 0, ""
+        self.stage_started_at = monotonic()
+        self.report(force=True)
+
+    def set_current(self, current):
+        self.current = str(current)
+        self.report()
+
+    def advance(self, count=1, **counts):
+        self.done += count
+        self.counts.update(counts)
+        self.report()
+
+    def add_error(self, count=1):
+        self.errors += count
+        self.report()
+
+    @property
+    def eta(self):
+        """Estimated number of seconds until the stage is done, from its rate so far"""
+        if not self.total or not self.done:
+            return None
+        elapsed = monotonic() - self.stage_started_at
+        return round(elapsed / self.done * max(self.total - self.done, 0))
+
+    def as_dict(self):
+        return {
+            "stage": self.stage,
+            "done": self.done,
+            "total": self.total,
+            "current": self.current,
+            "eta": self.eta,
+            "errors": self.errors,
+            **self.counts,
+        }
+
+    def report(self, force=False):
+        now = monotonic()
+        if not force and self.reported_at is not None and now - self.reported_at < self.interval:
+            return
+        self.reported_at = now
+        if self.task is not None and self.task.request.id:
+            self.task.update_state(state="PROGRESS", meta=self.as_dict())
+
+
+def get_task_progress(task_id) -> dict:
+    """
+    State of a task and, while it runs, its progress as reported by a `ProgressReporter`,
+    or once it is done, its result
+    """
+    task = TaskResult.objects.filter(task_id=task_id).first()
+    if task is None:
+        # tasks only have a result once a worker has picked them up
+        return {
+            "task_id": task_id,
+            "state": "PENDING",
+            "progress": None,
+            "result": None,
+            "date_created": None,
+            "date_done": None,
+        }
+
+    result = json.loads(task.result) if task.result else None
+    return {
+        "task_id": task_id,
+        "state": task.status,
+        "progress": result if task.status == "PROGRESS" else None,
+        "result": None if task.status == "PROGRESS" else result,
+        "date_created": task.date_created,
+        "date_done": task.date_done,
+    }
@@ -0,0 +1,292 @@
+"""
+Maintenance and querying of the consolidated `SearchIndex`.
+
+Published records are indexed when they are saved or deleted, and the latest in-progress
+draft of each canonical record is indexed whenever a `Change` is saved. Querying combines
+the weighted full-text vector (ranked with `ts_rank`) with trigram similarity on the title
+so that misspelled short names still find their record.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save
+
+from data_models import models as data_models
+
+from .models import Change, SearchIndex
+
+# Maps each searchable model (by its content type model name) to a pair of
+# (title fields, body fields). The title is the first populated title field,
+# the body is the concatenation of all populated body fields.
+SEARCH_DOCUMENTS = {
+    "campaign": (
+        ["short_name"],
+        ["long_name", "description_short", "focus_phenomena"],
+    ),
+    "platform": (["short_name"], ["long_name", "description"]),
+    "instrument": (["short_name"], ["long_name", "description"]),
+    "deployment": (["short_name"], ["long_name"]),
+    "partnerorg": (["short_name"], ["long_name"]),
+    "gcmdproject": (["short_name", "long_name"], ["long_name", "bucket"]),
+    "gcmdinstrument": (
+        ["short_name", "long_name"],
+        [
+            "long_name",
+            "instrument_category",
+            "instrument_class",
+            "instrument_type",
+            "instrument_subtype",
+        ],
+    ),
+    "gcmdplatform": (
+        ["short_name", "long_name"],
+        ["long_name", "basis", "category", "subcategory"],
+    ),
+    "gcmdphenomenon": (
+        ["variable_3", "variable_2", "variable_1", "term", "topic", "category"],
+        ["category", "topic", "term", "variable_1", "variable_2"],
+    ),
+    "doi": (
+        ["cmr_entry_title", "cmr_short_name", "doi", "concept_id"],
+        ["doi", "concept_id", "cmr_short_name", "long_name", "cmr_abstract"],
+    ),
+    "alias": (["short_name"], ["source"]),
+}
+
+SEARCHABLE_MODELS = [
+    data_models.Campaign,
+    data_models.Platform,
+    data_models.Instrument,
+    data_models.Deployment,
+    data_models.PartnerOrg,
+    data_models.GcmdProject,
+    data_models.GcmdInstrument,
+    data_models.GcmdPlatform,
+    data_models.GcmdPhenomenon,
+    data_models.DOI,
+    data_models.Alias,
+]
+
+# Statuses of drafts that are no longer being worked on and should not be searchable
+INACTIVE_DRAFT_STATUSES = [Change.Statuses.PUBLISHED, Change.Statuses.IN_TRASH]
+
+SEARCH_VECTOR = SearchVector("title", weight="A") + SearchVector("body", weight="B")
+
+
+def build_document(model_name, values):
+    """Builds the title and body text that get indexed for a record.
+
+    Args:
+        model_name (str): Lowercase model name, one of the SEARCH_DOCUMENTS keys
+        values (dict): Field values of a published record or the update of a draft
+
+    Returns:
+        tuple[str, str]: title, body
+    """
+    title_fields, body_fields = SEARCH_DOCUMENTS[model_name]
+    title = next((str(values[field]) for field in title_fields if values.get(field)), "")
+    body = " ".join(str(values[field]) for field in body_fields if values.get(field))
+    return title, body
+
+
+def _record_values(instance):
+    title_fields, body_fields = SEARCH_DOCUMENTS[instance._meta.model_name]
+    return {field: getattr(instance, field, None) for field in {*title_fields, *body_fields}}
+
+
+def _refresh_vectors(queryset):
+    queryset.update(search_vector=SEARCH_VECTOR)
+
+
+def index_record(instance):
+    """Creates or refreshes the published search entry for a data model instance"""
+    title, body = build_document(instance._meta.model_name, _record_values(instance))
+    entry, _ = SearchIndex.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_uuid=instance.uuid,
+        is_draft=False,
+        defaults={"title": title, "body": body},
+    )
+    _refresh_vectors(SearchIndex.objects.filter(pk=entry.pk))
+
+
+def remove_record(instance):
+    """Removes the published search entry for a deleted data model instance"""
+    SearchIndex.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_uuid=instance.uuid,
+        is_draft=False,
+    ).delete()
+
+
+def latest_active_draft(canonical_uuid):
+    return (
+        Change.objects.related_drafts(canonical_uuid)
+        .exclude(status__in=INACTIVE_DRAFT_STATUSES)
+        .exclude(action=Change.Actions.DELETE)
+        .order_by(F("updated_at").desc(nulls_last=True))
+        .first()
+    )
+
+
+def index_draft(change):
+    """
+    Points the draft search entry of a canonical record at its latest active draft,
+    removing the entry if the record has no active draft left.
+    """
+    if change.content_type.model not in SEARCH_DOCUMENTS:
+        return
+
+    canonical_uuid = change.canonical_uuid
+    # a create draft gets a new canonical uuid once it is published
+    SearchIndex.objects.filter(change=change).exclude(object_uuid=canonical_uuid).delete()
+    entries = SearchIndex.objects.filter(
+        content_type_id=change.content_type_id, object_uuid=canonical_uuid, is_draft=True
+    )
+    draft = latest_active_draft(canonical_uuid)
+    if not draft:
+        entries.delete()
+        return
+
+    title, body = build_document(change.content_type.model, draft.update)
+    entry, _ = SearchIndex.objects.update_or_create(
+        content_type_id=change.content_type_id,
+        object_uuid=canonical_uuid,
+        is_draft=True,
+        defaults={"change": draft, "title": title, "body": body},
+    )
+    _refresh_vectors(SearchIndex.objects.filter(pk=entry.pk))
+
+
+def index_drafts(changes):
+    """
+    Bulk equivalent of `index_draft` for drafts written with `bulk_update`, which
+    doesn't send `post_save`. Each change is treated as the latest draft of its record.
+    """
+    changes = [change for change in changes if change.content_type.model in SEARCH_DOCUMENTS]
+    if not changes:
+        return
+
+    SearchIndex.objects.filter(
+        is_draft=True, object_uuid__in=[change.canonical_uuid for change in changes]
+    ).delete()
+    entries = []
+    for change in changes:
+        if change.status in INACTIVE_DRAFT_STATUSES or change.action == Change.Actions.DELETE:
+            continue
+        title, body = build_document(change.content_type.model, change.update)
+        entries.append(
+            SearchIndex(
+                content_type_id=change.content_type_id,
+                object_uuid=change.canonical_uuid,
+                change=change,
+                is_draft=True,
+                title=title,
+                body=body,
+            )
+        )
+    entries = SearchIndex.objects.bulk_create(entries)
+    _refresh_vectors(SearchIndex.objects.filter(pk__in=[entry.pk for entry in entries]))
+
+
+def rebuild_index():
+    """Recreates the whole search index in bulk. Returns the number of entries created."""
+    entries = []
+    for model in SEARCHABLE_MODELS:
+        content_type = ContentType.objects.get_for_model(model)
+        title_fields, body_fields = SEARCH_DOCUMENTS[content_type.model]
+        for values in model.objects.values("uuid", *{*title_fields, *body_fields}):
+            title, body = build_document(content_type.model, values)
+            entries.append(
+                SearchIndex(
+                    content_type=content_type,
+                    object_uuid=values["uuid"],
+                    title=title,
+                    body=body,
+                )
+            )
+
+    drafts = (
+        Change.objects.of_type(*SEARCHABLE_MODELS)
+        .exclude(status__in=INACTIVE_DRAFT_STATUSES)
+        .exclude(action=Change.Actions.DELETE)
+        .select_related("content_type")
+        .order_by(F("updated_at").desc(nulls_last=True))
+    )
+    seen = set()
+    for draft in drafts:
+        key = (draft.content_type_id, draft.canonical_uuid)
+        if key in seen:
+            continue
+        seen.add(key)
+        title, body = build_document(draft.content_type.model, draft.update)
+        entries.append(
+            SearchIndex(
+                content_type_id=draft.content_type_id,
+                object_uuid=draft.canonical_uuid,
+                change=draft,
+                is_draft=True,
+                title=title,
+                body=body,
+            )
+        )
+
+    SearchIndex.objects.all().delete()
+    SearchIndex.objects.bulk_create(entries, batch_size=1000)
+    _refresh_vectors(SearchIndex.objects.all())
+    return len(entries)
+
+
+def search(term, include_drafts=False, model_names=None):
+    """Ranked, typo-tolerant search across the consolidated index.
+
+    Args:
+        term (str): Free text search term. Supports websearch syntax (quotes, OR, -)
+        include_drafts (bool, optional): Include unpublished drafts. Defaults to False.
+        model_names (list, optional): Restrict results to these lowercase model names.
+
+    Returns:
+        QuerySet: SearchIndex entries annotated with `rank`, `similarity` and `score`,
+            best matches first
+    """
+    query = SearchQuery(term, search_type="websearch")
+    queryset = (
+        SearchIndex.objects.select_related("content_type")
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            similarity=TrigramSimilarity("title", term),
+        )
+        # `trigram_similar` uses pg_trgm's `%` operator (similarity >= 0.3 by default),
+        # which, like the `@@` match, is served by a GIN index
+        .filter(Q(search_vector=query) | Q(title__trigram_similar=term))
+        .annotate(score=F("rank") + F("similarity"))
+    )
+    if not include_drafts:
+        queryset = queryset.filter(is_draft=False)
+    if model_names:
+        queryset = queryset.filter(content_type__model__in=model_names)
+    return queryset.order_by("-score", "title")
+
+
+def update_record_index(sender, instance, **kwargs):
+    index_record(instance)
+
+
+def remove_record_index(sender, instance, **kwargs):
+    remove_record(instance)
+
+
+def update_draft_index(sender, instance, **kwargs):
+    index_draft(instance)
+
+
+def connect_signals():
+    for model in SEARCHABLE_MODELS:
+        post_save.connect(update_record_index, sender=model, dispatch_uid=f"search_{model}")
+        post_delete.connect(remove_record_index, sender=model, dispatch_uid=f"search_{model}")
+    post_save.connect(update_draft_index, sender=Change, dispatch_uid="search_change")
@@ -1,7 +1,7 @@
 from data_models.models import Image
 from rest_framework import serializers
 
-from api_app.models import ApprovalLog, Change
+from api_app.models import ApprovalLog, Change, SearchIndex
 
 
 class ChangeSerializer(serializers.ModelSerializer):
@@ -37,6 +37,18 @@ class UnpublishedSerializer(serializers.ModelSerializer):
         fields = ["update", "uuid", "content_type", "status"]
 
 
+class SearchResultSerializer(serializers.ModelSerializer):
+    model_name = serializers.CharField(source="content_type.model", read_only=True)
+    uuid = serializers.UUIDField(source="object_uuid", read_only=True)
+    draft_uuid = serializers.UUIDField(source="change_id", read_only=True)
+    rank = serializers.FloatField(read_only=True)
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = SearchIndex
+        fields = ["model_name", "uuid", "draft_uuid", "is_draft", "title", "rank", "similarity"]
+
+
 class ValidationSerializer(serializers.Serializer):
     model_name = serializers.CharField(help_text="String of the model name: Season", min_length=128)
     data = serializers.JSONField(
@@ -45,3 +57,21 @@ class ValidationSerializer(serializers.Serializer):
     partial = serializers.BooleanField(
         help_text="Boolean indicating whether validation will be partial (missing required fields is allowed)"
     )
+
+
+class BatchValidationSerializer(serializers.Serializer):
+    model_name = serializers.CharField(help_text="String of the model name: Season", required=False)
+    records = serializers.ListField(
+        child=serializers.JSONField(),
+        required=False,
+        help_text="""List of JSON containing model field names and values: [{"short_name": "arctas"}]""",
+    )
+    partial = serializers.BooleanField(
+        required=False,
+        help_text="Boolean indicating whether validation will be partial (missing required fields is allowed)",
+    )
+    changes = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="UUIDs of drafts to validate instead of records, each against its own model",
+    )
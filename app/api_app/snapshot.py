@@ -0,0 +1,96 @@
+"""
+Values of a few fields of a published record, as its serializer renders them.
+
+Rendering a whole record with its serializer evaluates every one of its fields, including
+the reverse relations and computed values of its `SerializerMethodField`s, when drafts only
+need the values of the fields they change. `get_snapshot` reads just the fields asked for,
+the concrete ones with a single values query and each many to many field with a values
+query of its own, and renders them with the serializer's own fields, so that they match
+those of `serializer.data`. The few fields that can't be read that way, such as images and
+computed values, are still rendered by the serializer, from the record.
+"""
+from types import SimpleNamespace
+
+from rest_framework import serializers as drf_serializers
+from rest_framework.relations import ManyRelatedField, PKOnlyObject, PrimaryKeyRelatedField
+
+from data_models import serializers
+
+
+def _reads_model_field(field: drf_serializers.Field, model_field) -> bool:
+    """Whether a serializer field renders nothing but the value of a field of the model"""
+    if model_field is None or field.source != field.field_name:
+        return False
+    if isinstance(field, ManyRelatedField):
+        return model_field.many_to_many and isinstance(field.child_relation, PrimaryKeyRelatedField)
+    if isinstance(field, PrimaryKeyRelatedField):
+        return model_field.many_to_one
+    if isinstance(field, (drf_serializers.FileField, drf_serializers.SerializerMethodField)):
+        return False
+    return model_field.concrete and not model_field.is_relation
+
+
+def _render(field: drf_serializers.Field, model_field, value):
+    if isinstance(field, drf_serializers.ModelField):
+        # model fields are rendered from the object they are read from
+        return field.to_representation(SimpleNamespace(**{model_field.attname: value}))
+    if value is None:
+        return None
+    if isinstance(field, PrimaryKeyRelatedField):
+        return field.to_representation(PKOnlyObject(pk=value))
+    return field.to_representation(value)
+
+
+def get_snapshot(model, uuid, keys) -> dict:
+    """
+    Renders some of the fields of a record as `serializer.data` would, without rendering
+    the rest of them.
+
+    Args:
+        model (Model): model of the record
+        uuid (str): uuid of the record
+        keys (iterable): names of the fields. Those the serializer doesn't render, such as
+            write only fields, are None, as in `serializer.data.get(key)`.
+
+    Raises:
+        model.DoesNotExist: if there is no such record
+
+    Returns:
+        dict: the rendered value of each of the fields, by name
+    """
+    serializer_class = getattr(serializers, f"{model.__name__}Serializer")
+    fields = {
+        name: field for name, field in serializer_class().fields.items() if not field.write_only
+    }
+    model_fields = {model_field.name: model_field for model_field in model._meta.get_fields()}
+
+    snapshot, concrete, many_to_many, rendered = {}, {}, {}, []
+    for key in keys:
+        field, model_field = fields.get(key), model_fields.get(key)
+        if field is None:
+            snapshot[key] = None
+        elif not _reads_model_field(field, model_field):
+            rendered.append(key)
+        elif isinstance(field, ManyRelatedField):
+            many_to_many[key] = field
+        else:
+            concrete[key] = field
+
+    attnames = dict.fromkeys(["uuid", *(model_fields[key].attname for key in concrete)])
+    values = model.objects.filter(uuid=uuid).values(*attnames).first()
+    if values is None:
+        raise model.DoesNotExist(f"{model._meta.object_name} matching query does not exist.")
+    for key, field in concrete.items():
+        snapshot[key] = _render(field, model_fields[key], values[model_fields[key].attname])
+
+    record = model(uuid=uuid)
+    for key, field in many_to_many.items():
+        # in the order of the related model, as the serializer lists them
+        related_uuids = getattr(record, key).values_list("pk", flat=True)
+        snapshot[key] = field.to_representation([PKOnlyObject(pk=pk) for pk in related_uuids])
+
+    if rendered:
+        data = serializer_class(model.objects.get(uuid=uuid)).data
+        snapshot.update({key: data.get(key) for key in rendered})
+
+    return {key: snapshot[key] for key in keys}
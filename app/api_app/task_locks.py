@@ -0,0 +1,106 @@
+"""
+Singleton Celery tasks.
+
+Tasks using `SingletonTask` as their base are started with `delay_once`, which only starts
+the task if no other run with the same arguments is queued or running, and otherwise
+returns the result of that run so that callers can follow its progress instead. Runs are
+tracked with a `TaskLock` row holding the id of the run, so that the lock is shared by the
+web and worker processes. It is released when the run returns and expires after
+CELERY_TASK_TIME_LIMIT, by when the run has been stopped. Tasks declared with
+`lock_arguments=False` only ever have one run, whatever its arguments.
+"""
+import logging
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Optional
+
+from celery import Task
+from celery.result import AsyncResult
+from celery.utils import uuid
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api_app.models import TaskLock
+
+logger = logging.getLogger(__name__)
+
+
+def acquire_lock(key: str, task_id: str) -> Optional[str]:
+    """
+    Takes the lock `key` for the run `task_id`, replacing it if it has expired or outlived
+    the run holding it, which was stopped before it could release it
+
+    Returns:
+        str: None if the lock was taken, otherwise the id of the run holding it
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        TaskLock.objects.filter(key=key, expires_at__lte=now).delete()
+        lock, created = TaskLock.objects.get_or_create(
+            key=key,
+            defaults={
+                "task_id": task_id,
+                "expires_at": now + timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT),
+            },
+        )
+    if created:
+        return None
+    if AsyncResult(lock.task_id).ready():
+        logger.info(f"Releasing stale lock {key}")
+        release_lock(key, lock.task_id)
+        return acquire_lock(key, task_id)
+    return lock.task_id
+
+
+def release_lock(key: str, task_id: str):
+    TaskLock.objects.filter(key=key, task_id=task_id).delete()
+
+
+class SingletonTask(Task):
+    lock_arguments = True
+
+    def lock_key(self, args=(), kwargs=None) -> str:
+        if not self.lock_arguments:
+            args, kwargs = (), None
+        arguments = [*map(str, args), *(f"{key}={value}" for key, value in (kwargs or {}).items())]
+        return ":".join(["task_lock", self.name, *arguments])
+
+    def delay_once(self, *args, **kwargs) -> tuple[AsyncResult, bool]:
+        """
+        Starts the task, unless a run with the same arguments is already queued or running
+
+        Returns:
+            tuple: the result of the new or running task, and whether it was started
+        """
+        lock_key = self.lock_key(args, kwargs)
+        task_id = uuid()
+        running_id = acquire_lock(lock_key, task_id)
+        if running_id:
+            return self.AsyncResult(running_id), False
+        try:
+            return self.apply_async(args, kwargs, task_id=task_id), True
+        except Exception:
+            release_lock(lock_key, task_id)
+            raise
+
+    @contextmanager
+    def hold_lock(self, task_id, *args, **kwargs):
+        """
+        Holds the lock of a run of this task with the given arguments on behalf of another
+        task, so that the work the run would do isn't done twice at the same time
+
+        Yields:
+            str: None if the lock is held, otherwise the id of the run holding it
+        """
+        lock_key = self.lock_key(args, kwargs)
+        running_id = acquire_lock(lock_key, task_id)
+        try:
+            yield running_id
+        finally:
+            if not running_id:
+                release_lock(lock_key, task_id)
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        release_lock(self.lock_key(args, kwargs), task_id)
+        super().after_return(status, retval, task_id, args, kwargs, einfo)
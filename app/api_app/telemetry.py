@@ -0,0 +1,86 @@
+"""
+Stage timings and counters of task runs, such as DOI matching and GCMD syncs.
+
+While a `RunTelemetry` is recording, the `stage` timers and `count` counters used along
+the run's code path add to it, as do the HTTP requests reported by
+`record_http_response` and every ORM query. Outside of a recording they do nothing, so
+they cost next to nothing in the views that share those code paths. Stages may be nested,
+and the time of each includes that of the stages within it.
+"""
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.db import connections
+
+
+class RunTelemetry:
+    def __init__(self):
+        self.stage_seconds = defaultdict(float)
+        self.counters = Counter()
+
+    @contextmanager
+    def record(self):
+        token = _current_telemetry.set(self)
+        try:
+            with connections["default"].execute_wrapper(self._record_query):
+                yield self
+        finally:
+            _current_telemetry.reset(token)
+
+    def _record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stage_seconds["db"] += time.perf_counter() - start
+            self.counters["orm_queries"] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "stages": {name: round(seconds, 3) for name, seconds in self.stage_seconds.items()},
+            "counters": dict(self.counters),
+        }
+
+
+_current_telemetry: ContextVar[Optional[RunTelemetry]] = ContextVar("run_telemetry", default=None)
+
+
+@contextmanager
+def stage(name):
+    """Times a stage of the run being recorded, if any"""
+    telemetry = _current_telemetry.get()
+    if telemetry is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        telemetry.stage_seconds[name] += time.perf_counter() - start
+
+
+def count(name, value=1):
+    """Adds to a counter of the run being recorded, if any"""
+    if telemetry := _current_telemetry.get():
+        telemetry.counters[name] += value
+
+
+def record_http_response(response):
+    """Counts an HTTP request, and the bytes of its response, against the run being recorded"""
+    count("http_requests")
+    count("http_bytes", len(response.content))
+
+
+def merge_telemetry(*telemetries: dict) -> dict:
+    """Sums the stage timings and counters of several `RunTelemetry.as_dict()`"""
+    stage_seconds, counters = Counter(), Counter()
+    for telemetry in telemetries:
+        stage_seconds.update(telemetry.get("stages", {}))
+        counters.update(telemetry.get("counters", {}))
+    return {
+        "stages": {name: round(seconds, 3) for name, seconds in stage_seconds.items()},
+        "counters": dict(counters),
+    }
@@ -11,7 +11,7 @@ from admg_webapp.users.models import User
 from admin_ui.tests.factories import UserFactory, ChangeFactory
 from data_models.tests import factories
 
-from ..models import ApprovalLog, Change
+from ..models import ApprovalLog, Change, get_display_name
 
 
 class TestChangeStatic:
@@ -37,6 +37,39 @@ class TestChangeStatic:
         assert Change._get_processed_value([u, d, s]) == [str(u), d.isoformat(), s]
 
 
+@pytest.mark.django_db
+class TestDisplayName:
+    def test_get_display_name_priority(self):
+        assert get_display_name({"term": "Clouds"}, {"short_name": "CLD"}) == "CLD"
+        assert get_display_name({"short_name": ""}, {"variable_1": "Ice"}) == "Ice"
+        assert get_display_name({}) == ""
+
+    def test_create_draft_is_named_by_its_update(self):
+        draft = ChangeFactory.make_create_change_object(
+            factories.PartnerOrgFactory, custom_fields={"short_name": "GSFC"}
+        )
+        assert draft.display_name == "GSFC"
+
+    def test_update_draft_falls_back_to_record(self):
+        org = factories.PartnerOrgFactory(short_name="GSFC")
+        draft = Change.objects.create(
+            content_object=org,
+            action=Change.Actions.UPDATE,
+            update={"long_name": "Goddard Space Flight Center"},
+        )
+        assert draft.display_name == "GSFC"
+
+    def test_create_draft_follows_published_record(self):
+        draft = ChangeFactory.make_create_change_object(
+            factories.PartnerOrgFactory, custom_fields={"short_name": "GSFC"}
+        )
+        org = factories.PartnerOrgFactory(uuid=draft.uuid, short_name="Goddard")
+
+        draft.refresh_from_db()
+        assert draft.display_name == org.short_name
+        assert list(Change.objects.filter(display_name__icontains="godd")) == [draft]
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("factory", factories.DATAMODELS_FACTORIES)
 class TestChange:
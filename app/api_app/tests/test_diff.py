@@ -0,0 +1,111 @@
+from datetime import date
+
+import pytest
+
+from admin_ui.tests.factories import ChangeFactory
+from data_models import models as data_models
+from data_models.tests import factories
+
+from ..diff import compute_diff
+from ..models import Change
+
+
+class TestComputeDiff:
+    def test_changed_fields(self):
+        diff = compute_diff(
+            data_models.Campaign,
+            {"short_name": "ACES", "long_name": "Old name"},
+            {"short_name": "ACES", "long_name": "New name"},
+        )
+        assert diff == {"long_name": {"old": "Old name", "new": "New name"}}
+
+    def test_equivalent_values_are_unchanged(self):
+        previous = {
+            "description_short": "Some  description\n",
+            "nasa_led": True,
+            "start_date": date(2020, 1, 2),
+            "lead_investigator": None,
+            "platform_types": ["b", "a"],
+        }
+        update = {
+            "description_short": "Some description",
+            "nasa_led": "True",
+            "start_date": "2020-01-02",
+            "lead_investigator": "",
+            "platform_types": ["a", "b"],
+        }
+        assert compute_diff(data_models.Campaign, previous, update) == {}
+
+    def test_bounding_box_formats(self):
+        bbox = "10, -10, 20, -20"
+        geojson = {
+            "type": "Polygon",
+            "coordinates": [[[-20, -10], [20, -10], [20, 10], [-20, 10], [-20, -10]]],
+        }
+        previous = {"spatial_bounds": geojson}
+
+        assert compute_diff(data_models.Deployment, previous, {"spatial_bounds": bbox}) == {}
+        assert "spatial_bounds" in compute_diff(
+            data_models.Deployment, previous, {"spatial_bounds": "1, -1, 2, -2"}
+        )
+
+    def test_unknown_fields_are_ignored(self):
+        assert compute_diff(data_models.Campaign, {}, {"not_a_field": "value"}) == {}
+
+
+@pytest.mark.django_db
+class TestStoredDiff:
+    def test_diff_is_stored_when_draft_is_saved(self):
+        org = factories.PartnerOrgFactory(short_name="Goddard", long_name="Space Flight Center")
+        draft = Change.objects.create(
+            content_object=org,
+            action=Change.Actions.UPDATE,
+            update={"short_name": "Goddard", "long_name": "Goddard Space Flight Center"},
+        )
+
+        assert draft.diff == {
+            "long_name": {"old": "Space Flight Center", "new": "Goddard Space Flight Center"}
+        }
+
+        draft.update["long_name"] = "Space Flight Center"
+        draft.save()
+        draft.refresh_from_db()
+        assert draft.diff == {}
+
+    def test_create_drafts_have_no_diff(self):
+        draft = ChangeFactory.make_create_change_object(factories.PartnerOrgFactory)
+        assert draft.diff == {}
+
+    def test_diff_is_refreshed_when_target_changes(self, django_capture_on_commit_callbacks):
+        org = factories.PartnerOrgFactory(short_name="Goddard", long_name="Space Flight Center")
+        draft = Change.objects.create(
+            content_object=org,
+            action=Change.Actions.UPDATE,
+            update={"long_name": "Goddard Space Flight Center"},
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            org.long_name = "Goddard Space Flight Center"
+            org.save()
+
+        draft.refresh_from_db()
+        assert draft.previous == {"long_name": "Goddard Space Flight Center"}
+        assert draft.diff == {}
+
+    def test_locked_drafts_are_not_refreshed(self, django_capture_on_commit_callbacks):
+        org = factories.PartnerOrgFactory(long_name="Space Flight Center")
+        draft = Change.objects.create(
+            content_object=org,
+            action=Change.Actions.UPDATE,
+            update={"long_name": "Goddard Space Flight Center"},
+        )
+        Change.objects.filter(pk=draft.pk).update(status=Change.Statuses.PUBLISHED)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            org.long_name = "Ames Research Center"
+            org.save()
+
+        draft.refresh_from_db()
+        assert draft.diff == {
+            "long_name": {"old": "Space Flight Center", "new": "Goddard Space Flight Center"}
+        }
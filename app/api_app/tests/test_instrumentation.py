@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from admg_webapp.users.models import User
+from admin_ui.tests.factories import UserFactory
+from data_models.tests import factories
+
+from ..instrumentation import RequestMetrics, _current_metrics, get_report, instrument_caches
+from ..models import RequestMetric
+
+
+@pytest.fixture
+def instrumentation(settings):
+    settings.REQUEST_INSTRUMENTATION = True
+
+
+class TestRequestMetrics:
+    def test_duplicate_queries(self):
+        metrics = RequestMetrics()
+        metrics._queries.update(["SELECT a", "SELECT b", "SELECT b", "SELECT b"])
+        metrics.summarize_queries()
+
+        assert metrics.query_count == 4
+        assert metrics.duplicate_query_count == 2
+        assert metrics.worst_duplicate_query == "SELECT b"
+        assert metrics.worst_duplicate_count == 3
+
+    def test_server_timing(self):
+        metrics = RequestMetrics(total_ms=12.34, db_ms=5, query_count=3, cache_hits=1)
+
+        assert metrics.server_timing() == (
+            'total;dur=12.3, db;dur=5.0;desc="3 queries, 0 duplicates", '
+            'serializer;dur=0.0, cache;desc="1 hits, 0 misses"'
+        )
+
+    def test_cache_lookups(self):
+        instrument_caches()
+        instrument_caches()
+        cache.set("cached", 0)
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            assert cache.get("cached") == 0
+            assert cache.get("missing", "default") == "default"
+            assert cache.get_many(["cached", "missing"]) == {"cached": 0}
+            assert cache.get_or_set("missing", 1) == 1
+        finally:
+            _current_metrics.reset(token)
+            cache.clear()
+
+        assert (metrics.cache_hits, metrics.cache_misses) == (2, 3)
+
+
+@pytest.mark.django_db
+class TestInstrumentationMiddleware:
+    def test_disabled_by_default(self, client):
+        response = client.get("/api/partner_org")
+        assert "Server-Timing" not in response
+
+    def test_records_request(self, client, instrumentation):
+        factories.PartnerOrgFactory.create_batch(3)
+
+        response = client.get("/api/partner_org")
+
+        assert response["Server-Timing"].startswith("total;dur=")
+        report = get_report()
+        assert report["request_count"] == 1
+        [view] = report["slowest"]
+        assert view["view_name"] == "PartnerOrg_create_getall"
+        assert view["avg_queries"] > 0
+
+    def test_report_only_reads_the_window(self, client, instrumentation, settings):
+        client.get("/api/partner_org")
+        client.get("/api/partner_org")
+        RequestMetric.objects.filter(pk=RequestMetric.objects.earliest("pk").pk).update(
+            created_at=timezone.now() - timedelta(seconds=settings.REQUEST_INSTRUMENTATION_WINDOW)
+        )
+
+        assert get_report()["request_count"] == 1
+
+    def test_report_page_is_admin_only(self, client, instrumentation):
+        client.force_login(UserFactory(role=User.Roles.STAFF))
+        assert client.get("/instrumentation").status_code == 302
+
+        client.force_login(UserFactory(role=User.Roles.ADMIN))
+        assert client.get("/instrumentation").status_code == 200
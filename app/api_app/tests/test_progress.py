@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+from django_celery_results.models import TaskResult
+
+from api_app import progress as progress_module
+from api_app.progress import ProgressReporter, get_task_progress
+
+
+class RecordingTask:
+    request = SimpleNamespace(id="task-id")
+
+    def __init__(self):
+        self.states = []
+
+    def update_state(self, state, meta):
+        self.states.append((state, meta))
+
+
+class TestProgressReporter:
+    def test_updates_are_throttled(self, monkeypatch):
+        now = [0]
+        monkeypatch.setattr(progress_module, "monotonic", lambda: now[0])
+        task = RecordingTask()
+        progress = ProgressReporter(task, interval=5)
+
+        progress.start_stage("Syncing projects", total=4)
+        now[0] = 1
+        progress.advance()
+        now[0] = 2
+        progress.advance()
+        progress.set_current("ABoVE")
+        assert len(task.states) == 1
+
+        now[0] = 6
+        progress.advance()
+        assert task.states == [
+            (
+                "PROGRESS",
+                {
+                    "stage": "Syncing projects",
+                    "done": 0,
+                    "total": 4,
+                    "current": "",
+                    "eta": None,
+                    "errors": 0,
+                },
+            ),
+            (
+                "PROGRESS",
+                {
+                    "stage": "Syncing projects",
+                    "done": 3,
+                    "total": 4,
+                    "current": "ABoVE",
+                    "eta": 2,
+                    "errors": 0,
+                },
+            ),
+        ]
+
+    def test_without_task(self):
+        progress = ProgressReporter(interval=0)
+        progress.start_stage("Matching DOIs")
+        progress.advance(2, new=2)
+        progress.add_error()
+
+        assert progress.as_dict() == {
+            "stage": "Matching DOIs",
+            "done": 2,
+            "total": None,
+            "current": "",
+            "eta": None,
+            "errors": 1,
+            "new": 2,
+        }
+
+
+@pytest.mark.django_db
+class TestTaskProgress:
+    def test_pending(self):
+        assert get_task_progress("unknown")["state"] == "PENDING"
+
+    def test_running(self, client, user):
+        TaskResult.objects.create(
+            task_id="running", status="PROGRESS", result='{"stage": "Querying CMR", "done": 1}'
+        )
+        client.force_login(user)
+
+        data = client.get("/tasks/running/progress").json()
+
+        assert data["state"] == "PROGRESS"
+        assert data["progress"] == {"stage": "Querying CMR", "done": 1}
+        assert data["result"] is None
+
+    def test_done(self):
+        TaskResult.objects.create(task_id="done", status="SUCCESS", result='{"new": 3}')
+        assert get_task_progress("done")["result"] == {"new": 3}
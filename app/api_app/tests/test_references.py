@@ -0,0 +1,64 @@
+import pytest
+
+from admin_ui.tests.factories import ChangeFactory
+from data_models.tests import factories
+
+from ..models import Change, ChangeReference
+
+
+def make_draft(factory, **custom_fields):
+    return ChangeFactory.make_create_change_object(factory, custom_fields=custom_fields)
+
+
+@pytest.mark.django_db
+class TestChangeReferences:
+    def test_references_are_written_on_save(self):
+        campaign = make_draft(factories.CampaignFactory)
+        deployment = make_draft(factories.DeploymentFactory, campaign=str(campaign.uuid))
+
+        assert set(deployment.references.values_list("field_name", "target_uuid")) == {
+            ("campaign", campaign.uuid)
+        }
+
+    def test_references_follow_updates(self):
+        campaign, other_campaign = [make_draft(factories.CampaignFactory) for _ in range(2)]
+        deployment = make_draft(factories.DeploymentFactory, campaign=str(campaign.uuid))
+
+        deployment.update["campaign"] = str(other_campaign.uuid)
+        deployment.save()
+
+        assert list(Change.objects.referencing("campaign", [campaign.uuid])) == []
+        assert list(Change.objects.referencing("campaign", [other_campaign.uuid])) == [deployment]
+
+    def test_many_to_many_references(self):
+        campaigns = [make_draft(factories.CampaignFactory) for _ in range(2)]
+        doi = make_draft(factories.DOIFactory, campaigns=[str(c.uuid) for c in campaigns])
+
+        for campaign in campaigns:
+            assert list(Change.objects.referencing("campaigns", [campaign.uuid])) == [doi]
+
+    def test_empty_values_are_not_references(self):
+        deployment = make_draft(factories.DeploymentFactory, campaign="")
+        assert not deployment.references.exists()
+
+    def test_ancestors_and_descendents(self):
+        campaign = make_draft(factories.CampaignFactory)
+        deployment = make_draft(factories.DeploymentFactory, campaign=str(campaign.uuid))
+        iop = make_draft(factories.IOPFactory, deployment=str(deployment.uuid))
+
+        assert list(iop.get_ancestors()) == [campaign, deployment, iop]
+        assert list(campaign.get_descendents()) == [deployment]
+        assert list(deployment.get_descendents()) == [iop]
+
+    def test_sync_and_rebuild(self):
+        campaign = make_draft(factories.CampaignFactory)
+        deployment = make_draft(factories.DeploymentFactory, campaign=str(campaign.uuid))
+        ChangeReference.objects.all().delete()
+
+        ChangeReference.objects.sync([deployment])
+        assert list(Change.objects.referencing("campaign", [campaign.uuid])) == [deployment]
+
+        ChangeReference.objects.all().delete()
+        count = ChangeReference.objects.rebuild()
+        assert count == ChangeReference.objects.count()
+        assert list(Change.objects.referencing("campaign", [campaign.uuid])) == [deployment]
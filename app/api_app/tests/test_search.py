@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from oauth2_provider.models import AccessToken
+from rest_framework.test import APIClient
+
+from admin_ui.tests.factories import ChangeFactory, UserFactory
+from data_models.tests import factories
+
+from ..models import SearchIndex
+from ..search import rebuild_index, search
+
+
+@pytest.mark.django_db
+class TestSearch:
+    def test_published_record_is_indexed_on_save(self):
+        org = factories.PartnerOrgFactory(short_name="Goddard", long_name="Space Flight Center")
+        entry = SearchIndex.objects.get(object_uuid=org.uuid, is_draft=False)
+
+        assert entry.title == "Goddard"
+        assert entry.body == "Space Flight Center"
+
+    def test_deleted_record_is_removed(self):
+        org = factories.PartnerOrgFactory(short_name="Goddard")
+        org.delete()
+
+        assert not SearchIndex.objects.filter(object_uuid=org.uuid).exists()
+
+    def test_ranked_and_typo_tolerant(self):
+        factories.PartnerOrgFactory(short_name="Goddard", long_name="Space Flight Center")
+        factories.PartnerOrgFactory(short_name="Langley", long_name="Goddard partner")
+
+        titles = [entry.title for entry in search("Goddard")]
+        assert titles == ["Goddard", "Langley"]
+        assert [entry.title for entry in search("Godard")] == ["Goddard"]
+
+    def test_drafts_only_included_on_request(self):
+        draft = ChangeFactory.make_create_change_object(
+            factories.PartnerOrgFactory, custom_fields={"short_name": "Ames"}
+        )
+
+        assert not search("Ames").exists()
+        assert [entry.change_id for entry in search("Ames", include_drafts=True)] == [draft.uuid]
+
+    def test_rebuild_index(self):
+        org = factories.PartnerOrgFactory(short_name="Goddard")
+        SearchIndex.objects.all().delete()
+
+        assert rebuild_index() == 1
+        assert search("Goddard").get().object_uuid == org.uuid
+
+
+@pytest.mark.django_db
+class TestSearchApi:
+    def test_requires_search_term(self, client):
+        response = client.get("/api/search")
+        assert response.json()["success"] is False
+
+    def test_anonymous_search_excludes_drafts(self, client):
+        org = factories.PartnerOrgFactory(short_name="Goddard")
+        ChangeFactory.make_create_change_object(
+            factories.PartnerOrgFactory, custom_fields={"short_name": "Goddard Draft"}
+        )
+
+        response = client.get("/api/search", {"search": "Goddard"})
+        data = response.json()["data"]
+
+        assert data["count"] == 1
+        assert data["results"][0]["uuid"] == str(org.uuid)
+        assert data["results"][0]["model_name"] == "partnerorg"
+
+    @pytest.mark.parametrize("scope, is_draft", [("Staff", [True]), ("read", [])])
+    def test_only_staff_search_includes_drafts(self, scope, is_draft):
+        user = UserFactory()
+        client = APIClient()
+        client.force_authenticate(
+            user=user,
+            token=AccessToken(user=user, scope=scope, expires=timezone.now() + timedelta(hours=1)),
+        )
+        ChangeFactory.make_create_change_object(
+            factories.PartnerOrgFactory, custom_fields={"short_name": "Goddard Draft"}
+        )
+
+        response = client.get("/api/search", {"search": "Goddard", "models": "partner_org"})
+        results = response.json()["data"]["results"]
+
+        assert [result["is_draft"] for result in results] == is_draft
@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api_app.models import Change
+from api_app.snapshot import get_snapshot
+from data_models import serializers
+from data_models.models import Campaign
+from data_models.tests import factories
+
+
+@pytest.mark.django_db
+class TestSnapshot:
+    @pytest.mark.parametrize(
+        "factory",
+        [
+            factories.CampaignFactory,
+            factories.DeploymentFactory,
+            factories.CollectionPeriodFactory,
+            factories.InstrumentFactory,
+            factories.PlatformFactory,
+            factories.DOIFactory,
+        ],
+    )
+    def test_matches_serializer(self, factory):
+        record = factory.create()
+        model = type(record)
+        serializer_class = getattr(serializers, f"{model.__name__}Serializer")
+        data = serializer_class(record).data
+        # every field the serializer renders, and a write only field and an unknown one
+        keys = [*data, "notes_internal", "not_a_field"]
+
+        snapshot = get_snapshot(model, record.uuid, keys)
+
+        assert list(snapshot) == keys
+        assert {key: Change._get_processed_value(value) for key, value in snapshot.items()} == {
+            key: Change._get_processed_value(data.get(key)) for key in keys
+        }
+
+    def test_reads_only_the_requested_fields(self):
+        campaign = factories.CampaignFactory.create()
+        factories.DeploymentFactory.create_batch(3, campaign=campaign)
+
+        with CaptureQueriesContext(connection) as queries:
+            snapshot = get_snapshot(Campaign, campaign.uuid, ["short_name", "seasons"])
+
+        assert len(queries) == 2
+        assert snapshot["short_name"] == campaign.short_name
+
+    def test_missing_record(self):
+        with pytest.raises(Campaign.DoesNotExist):
+            get_snapshot(Campaign, "00000000-0000-4000-8000-000000000000", ["short_name"])
@@ -0,0 +1,85 @@
+import pytest
+from celery import shared_task
+from celery.result import AsyncResult
+from django.utils import timezone
+from django_celery_results.models import TaskResult
+
+from api_app.models import TaskLock
+from api_app.task_locks import SingletonTask
+
+
+@shared_task(base=SingletonTask)
+def locked_task(scope):
+    return scope
+
+
+@pytest.mark.django_db
+class TestSingletonTask:
+    @pytest.fixture(autouse=True)
+    def queued(self, monkeypatch):
+        queued = []
+
+        def apply_async(args, kwargs, task_id):
+            queued.append((args, task_id))
+            return AsyncResult(task_id)
+
+        monkeypatch.setattr(locked_task, "apply_async", apply_async)
+        return queued
+
+    def test_duplicates_attach_to_the_running_task(self, queued):
+        task, started = locked_task.delay_once("campaign-a")
+        duplicate, duplicate_started = locked_task.delay_once("campaign-a")
+        other, other_started = locked_task.delay_once("campaign-b")
+
+        assert (started, duplicate_started, other_started) == (True, False, True)
+        assert duplicate.id == task.id
+        assert other.id != task.id
+        assert [args for args, _ in queued] == [("campaign-a",), ("campaign-b",)]
+
+    def test_lock_is_released_on_return(self, queued):
+        task, _ = locked_task.delay_once("campaign-a")
+        locked_task.after_return("SUCCESS", "campaign-a", task.id, ["campaign-a"], {}, None)
+
+        rerun, started = locked_task.delay_once("campaign-a")
+
+        assert started
+        assert rerun.id != task.id
+
+    def test_stale_lock_is_replaced(self, queued):
+        task, _ = locked_task.delay_once("campaign-a")
+        # the run finished without releasing its lock, eg when its worker was killed
+        TaskResult.objects.create(task_id=task.id, status="FAILURE")
+
+        rerun, started = locked_task.delay_once("campaign-a")
+
+        assert started
+        assert rerun.id != task.id
+
+    def test_expired_lock_is_replaced(self, queued):
+        task, _ = locked_task.delay_once("campaign-a")
+        TaskLock.objects.update(expires_at=timezone.now())
+
+        rerun, started = locked_task.delay_once("campaign-a")
+
+        assert started
+        assert rerun.id != task.id
+
+    def test_hold_lock(self, queued):
+        with locked_task.hold_lock("batch-task", "campaign-a") as running_id:
+            assert running_id is None
+            task, started = locked_task.delay_once("campaign-a")
+            with locked_task.hold_lock("other-batch-task", "campaign-a") as other_running_id:
+                assert other_running_id == "batch-task"
+
+        assert not started
+        assert task.id == "batch-task"
+        assert not TaskLock.objects.exists()
+
+    def test_lock_ignoring_arguments(self, queued, monkeypatch):
+        monkeypatch.setattr(locked_task, "lock_arguments", False)
+
+        task, _ = locked_task.delay_once("campaign-a")
+        duplicate, started = locked_task.delay_once("campaign-b")
+
+        assert not started
+        assert duplicate.id == task.id
@@ -0,0 +1,47 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from api_app.telemetry import RunTelemetry, count, merge_telemetry, stage
+
+
+class TestTelemetry:
+    def test_nothing_is_recorded_outside_of_a_run(self):
+        telemetry = RunTelemetry()
+
+        with stage("http"):
+            count("http_requests")
+        with telemetry.record():
+            pass
+
+        assert telemetry.as_dict() == {"stages": {}, "counters": {}}
+
+    def test_stages_and_counters(self):
+        with RunTelemetry().record() as telemetry:
+            for _ in range(2):
+                with stage("http"):
+                    count("http_requests")
+            count("http_bytes", 512)
+
+        assert set(telemetry.as_dict()["stages"]) == {"http"}
+        assert telemetry.as_dict()["counters"] == {"http_requests": 2, "http_bytes": 512}
+
+    def test_merge(self):
+        merged = merge_telemetry(
+            {"stages": {"http": 1.5}, "counters": {"http_requests": 2}},
+            {"stages": {"http": 0.25, "db": 1.0}, "counters": {"orm_queries": 3}},
+            {},
+        )
+
+        assert merged == {
+            "stages": {"http": 1.75, "db": 1.0},
+            "counters": {"http_requests": 2, "orm_queries": 3},
+        }
+
+    @pytest.mark.django_db
+    def test_queries_are_counted(self):
+        with RunTelemetry().record() as telemetry:
+            get_user_model().objects.count()
+            list(get_user_model().objects.all())
+
+        assert telemetry.as_dict()["counters"] == {"orm_queries": 2}
+        assert "db" in telemetry.as_dict()["stages"]
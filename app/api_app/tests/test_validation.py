@@ -0,0 +1,117 @@
+import uuid
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from admin_ui.tests.factories import ChangeFactory
+from api_app.validation import validate_records
+from data_models.tests import factories
+
+
+@pytest.mark.django_db
+class TestValidation:
+    def test_errors_by_record_and_field(self):
+        season = factories.SeasonFactory.create()
+        draft = ChangeFactory.make_create_change_object(factories.SeasonFactory)
+        missing = str(uuid.uuid4())
+
+        errors = validate_records(
+            "Campaign",
+            [
+                {"short_name": "", "seasons": [str(season.uuid), missing]},
+                {"start_date": "2020-13-01", "ongoing": "maybe", "not_a_field": 1},
+                {"seasons": [str(draft.uuid)], "focus_areas": "not a list"},
+                {"long_name": "Valid"},
+            ],
+            partial=True,
+        )
+
+        assert [set(record_errors) for record_errors in errors] == [
+            {"short_name", "seasons"},
+            {"start_date", "ongoing"},
+            {"focus_areas"},
+            set(),
+        ]
+        assert errors[0]["seasons"] == [f'Invalid pk "{missing}" - object does not exist.']
+
+    def test_required_and_unique_fields(self):
+        campaign = factories.CampaignFactory.create()
+
+        (errors,) = validate_records("Campaign", [{"short_name": campaign.short_name}])
+
+        assert "already exists" in errors["short_name"][0]
+        assert errors["start_date"] == ["This field is required."]
+        assert "long_name" not in errors
+
+    def test_duplicates_within_the_batch(self):
+        errors = validate_records("Season", [{"short_name": "SUMMER"}] * 2, partial=True)
+
+        assert all("short_name" in record_errors for record_errors in errors)
+
+    def test_references_are_checked_once_per_model(self):
+        seasons = factories.SeasonFactory.create_batch(3)
+        focus_areas = factories.FocusAreaFactory.create_batch(3)
+        records = [
+            {
+                "seasons": [str(season.uuid) for season in seasons],
+                "focus_areas": [str(focus_area.uuid) for focus_area in focus_areas],
+            }
+            for _ in range(20)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            errors = validate_records("Campaign", records, partial=True)
+
+        assert len(queries) == 2
+        assert errors == [{}] * 20
+
+    def test_references_to_integer_primary_keys(self):
+        campaign = factories.CampaignFactory.create()
+        content_type = ContentType.objects.get_for_model(campaign)
+        records = [
+            {"content_type": content_type.pk, "object_id": str(campaign.uuid)},
+            {"content_type": str(content_type.pk)},
+            {"content_type": 0},
+            {"content_type": "campaign"},
+        ]
+
+        errors = validate_records("Alias", records, partial=True)
+
+        assert errors[:2] == [{}, {}]
+        assert errors[2]["content_type"] == ['Invalid pk "0" - object does not exist.']
+        assert list(errors[3]) == ["content_type"]
+
+
+@pytest.mark.django_db
+class TestBatchValidationView:
+    @pytest.fixture
+    def client(self, admin_user):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        return client
+
+    def test_records(self, client):
+        response = client.post(
+            reverse("validate_batch"),
+            {"model_name": "Season", "records": [{"short_name": ""}, {}], "partial": True},
+            format="json",
+        )
+
+        body = response.json()
+        assert body["success"]
+        assert body["message"] == "1 of 2 entries failed validation"
+        assert list(body["data"]["errors"][0]) == ["short_name"]
+        assert body["data"]["errors"][1] == {}
+
+    def test_changes(self, client):
+        draft = ChangeFactory.make_create_change_object(factories.SeasonFactory)
+
+        response = client.post(
+            reverse("validate_batch"), {"changes": [str(draft.uuid)]}, format="json"
+        )
+
+        assert list(response.json()["data"]["errors"]) == [str(draft.uuid)]
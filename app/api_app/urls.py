@@ -19,7 +19,9 @@ from .views.change_view import (
 )
 from .views.generic_views import GenericCreateGetAllView, GenericPutPatchDeleteView
 from .views.image_view import ImageListCreateAPIView, ImageRetrieveDestroyAPIView
-from .views.validation_view import JsonValidationView
+from .views.search_view import SearchView
+from .views.timeline_view import CampaignTimelineView
+from .views.validation_view import BatchValidationView, JsonValidationView
 from .views.unpublished_view import UnpublishedChangesView
 
 info = api_info
@@ -78,6 +80,8 @@ for url in urls:
 urlpatterns += [
     path("approval_log", ApprovalLogListView.as_view(), name="approval_log_list"),
     path("change_request", ChangeListView.as_view(), name="change_request_list"),
+    path("search", SearchView.as_view(), name="search"),
+    path("campaign/<str:uuid>/timeline", CampaignTimelineView.as_view(), name="campaign_timeline"),
     path("unpublished_drafts", UnpublishedChangesView.as_view(), name="unpublished"),
     path(
         "change_request/<str:uuid>",
@@ -112,5 +116,6 @@ urlpatterns += [
     path("image", ImageListCreateAPIView.as_view(), name="image_list_create"),
     path("image/<str:uuid>", ImageRetrieveDestroyAPIView.as_view(), name="image_retrieve_destroy"),
     path("validate_json", JsonValidationView.as_view(), name="validate_json"),
+    path("validate_batch", BatchValidationView.as_view(), name="validate_batch"),
     path("docs/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
 ]
@@ -0,0 +1,219 @@
+"""
+Validation of draft values against the fields of their model, in bulk.
+
+Validating drafts with their model's serializer builds the serializer, and the querysets of
+its related fields, on every call and looks each referenced record up one at a time, which
+adds up to thousands of queries for a campaign's worth of drafts or a DOI import. A
+`ModelValidator` is compiled once per model from the model's metadata: the type, length,
+choices and validators of its editable fields, whether they are required and whether they
+are unique. It then validates any number of records at once, checking the references of the
+whole batch with one query per referenced model, which also finds the records that are
+only create drafts so far, and the unique values with one query per unique field.
+
+Errors are reported per record and per field, as lists of messages.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import models
+
+from api_app.models import Change
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    name: str
+    model_field: models.Field
+    required: bool
+    # model referenced by a foreign key or many to many field
+    target: Optional[type] = None
+    many: bool = False
+
+    @classmethod
+    def compile(cls, model_field):
+        if model_field.many_to_many:
+            required = not model_field.blank
+        else:
+            required = not (model_field.has_default() or model_field.blank or model_field.null)
+        return cls(
+            name=model_field.name,
+            model_field=model_field,
+            required=required,
+            target=model_field.related_model if model_field.is_relation else None,
+            many=model_field.many_to_many,
+        )
+
+    def check(self, value) -> tuple[List[str], List[Any]]:
+        """
+        Checks a value on its own, leaving the records it references to be checked
+        along with those of the rest of the batch
+
+        Returns:
+            tuple: the errors of the value, and the primary keys it references
+        """
+        if value is None:
+            if self.many or self.model_field.null:
+                return [], []
+            return ["This field may not be null."], []
+
+        if self.target is not None:
+            values = value if self.many else [value]
+            if self.many and not isinstance(value, list):
+                return [f'Expected a list of items but got type "{type(value).__name__}".'], []
+            references, errors = [], []
+            for item in values:
+                try:
+                    # eg uuids for data models, but integers for content types
+                    references.append(self.target._meta.pk.to_python(item))
+                except ValidationError as e:
+                    errors.extend(e.messages)
+            return errors, references
+
+        try:
+            self.model_field.clean(value, None)
+        except ValidationError as e:
+            return e.messages, []
+        return [], []
+
+
+class ModelValidator:
+    def __init__(self, model):
+        self.model = model
+        self.rules = {
+            model_field.name: FieldRule.compile(model_field)
+            for model_field in model._meta.get_fields()
+            if (model_field.concrete or model_field.many_to_many)
+            and model_field.editable
+            and not model_field.auto_created
+        }
+        self.unique_fields = [
+            name
+            for name, rule in self.rules.items()
+            if rule.model_field.unique and rule.target is None
+        ]
+
+    def validate(self, records: List[dict], partial=False, uuids=None) -> List[Dict]:
+        """
+        Validates a batch of records
+
+        Args:
+            records (list): values of the fields of each record, such as the `update` of
+                drafts. Values of fields that are not editable are ignored.
+            partial (bool): allows required fields to be missing, as in updates
+            uuids (list): uuid of each record, if it is published already, so that its own
+                unique values don't count as taken
+
+        Returns:
+            list: the errors of each record, as lists of messages by field name
+        """
+        uuids = uuids or [None] * len(records)
+        errors = [defaultdict(list) for _ in records]
+        references = defaultdict(list)
+
+        for record, record_errors in zip(records, errors):
+            if not partial:
+                for name, rule in self.rules.items():
+                    if rule.required and name not in record:
+                        record_errors[name].append("This field is required.")
+            for name, value in record.items():
+                if name not in self.rules:
+                    continue
+                rule = self.rules[name]
+                field_errors, field_references = rule.check(value)
+                record_errors[name].extend(field_errors)
+                for pk in field_references:
+                    references[rule.target].append((record_errors, name, pk))
+
+        for target, target_references in references.items():
+            existing = existing_pks(target, [pk for _, _, pk in target_references])
+            for record_errors, name, pk in target_references:
+                if pk not in existing:
+                    record_errors[name].append(f'Invalid pk "{pk}" - object does not exist.')
+
+        for name in self.unique_fields:
+            self._check_unique(name, records, uuids, errors)
+
+        return [{name: messages for name, messages in e.items() if messages} for e in errors]
+
+    def _check_unique(self, name, records, uuids, errors):
+        """Flags the values of a unique field taken by other records, or within the batch"""
+        model_field = self.rules[name].model_field
+        values = defaultdict(list)
+        for index, record in enumerate(records):
+            if record.get(name) in (None, "") or errors[index].get(name):
+                continue
+            # compared as stored, eg as UUIDs rather than strings
+            values[model_field.to_python(record[name])].append(index)
+        if not values:
+            return
+
+        owners = defaultdict(set)
+        for value, pk in self.model.objects.filter(**{f"{name}__in": list(values)}).values_list(
+            name, "pk"
+        ):
+            owners[value].add(str(pk))
+        for value, indexes in values.items():
+            for index in indexes:
+                taken = owners.get(value, set()) - {str(uuids[index])}
+                if taken or len(indexes) > 1:
+                    errors[index][name].append(
+                        f"{self.model._meta.verbose_name} with this {name} already exists."
+                    )
+
+
+@lru_cache(maxsize=None)
+def get_validator(model) -> ModelValidator:
+    return ModelValidator(model)
+
+
+def existing_pks(model, pks: Iterable[Any]) -> set:
+    """
+    Those of the primary keys that belong to a record of the model, found with a single
+    query. Records of the data models may also be unpublished create drafts.
+    """
+    pks = list(set(pks))
+    existing = model.objects.filter(pk__in=pks).order_by().values_list("pk", flat=True)
+    if model._meta.app_label == "data_models":
+        drafts = (
+            Change.objects.of_type(model)
+            .filter(uuid__in=pks, action=Change.Actions.CREATE)
+            .exclude(status=Change.Statuses.IN_TRASH)
+            .order_by()
+            .values_list("uuid", flat=True)
+        )
+        existing = existing.union(drafts)
+    return set(existing)
+
+
+def validate_records(model_name: str, records: List[dict], partial=False) -> List[Dict]:
+    """Validates a batch of records of a model, given by name, such as Campaign"""
+    return get_validator(apps.get_model("data_models", model_name)).validate(records, partial)
+
+
+def validate_changes(changes: Iterable[Change]) -> Dict[str, Dict]:
+    """
+    Validates the `update` of drafts in bulk, each against its model, fully for create drafts
+    and partially for update drafts
+
+    Returns:
+        dict: the errors of each draft, as lists of messages by field name, by draft uuid
+    """
+    batches = defaultdict(list)
+    for change in changes:
+        if change.action == Change.Actions.DELETE:
+            continue
+        batches[(change.content_type.model_class(), change.action)].append(change)
+
+    errors = {}
+    for (model, action), batch in batches.items():
+        results = get_validator(model).validate(
+            [change.update for change in batch],
+            partial=action == Change.Actions.UPDATE,
+            uuids=[change.model_instance_uuid for change in batch],
+        )
+        errors.update({str(change.uuid): result for change, result in zip(batch, results)})
+    return errors
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+from oauth2_provider.contrib.rest_framework import TokenHasScope
+from rest_framework.generics import ListAPIView
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.serializers import ValidationError
+
+from admg_webapp.users.models import User
+from api_app.search import SEARCH_DOCUMENTS, search
+from api_app.serializers import SearchResultSerializer
+
+from .generic_views import GetPermissionsMixin
+from .view_utils import handle_exception
+
+
+class SearchPagination(PageNumberPagination):
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_paginated_response(self, data):
+        # nest the page under "data" so that handle_exception passes it through
+        return Response(
+            {
+                "data": OrderedDict(
+                    [
+                        ("count", self.page.paginator.count),
+                        ("next", self.get_next_link()),
+                        ("previous", self.get_previous_link()),
+                        ("results", data),
+                    ]
+                )
+            }
+        )
+
+
+class SearchView(GetPermissionsMixin, ListAPIView):
+    """
+    Ranked search across campaigns, platforms, instruments, deployments, partner orgs,
+    GCMD keywords, DOIs and aliases.
+
+    Query params:
+        search: the search term (required)
+        models: optional comma separated list of model names to limit the results to
+        page, page_size: pagination
+
+    Requests with a staff token also receive matches from unpublished drafts.
+    """
+
+    serializer_class = SearchResultSerializer
+    pagination_class = SearchPagination
+    # drafts are only searched for tokens with the staff scope, which writes also require
+    required_scopes = [User.Roles.STAFF.label]
+
+    def include_drafts(self):
+        return TokenHasScope().has_permission(self.request, self)
+
+    def get_queryset(self):
+        params = self.request.query_params
+        term = (params.get("search") or params.get("search_term") or "").strip()
+        if not term:
+            raise ValidationError({"search": "A search term is required"})
+
+        model_names = [
+            name.strip().replace("_", "") for name in params.get("models", "").split(",")
+        ]
+        model_names = [name for name in model_names if name]
+        if unknown := set(model_names) - set(SEARCH_DOCUMENTS):
+            raise ValidationError({"models": f"Unsearchable models: {', '.join(sorted(unknown))}"})
+
+        return search(
+            term,
+            include_drafts=self.include_drafts(),
+            model_names=model_names,
+        )
+
+    @handle_exception
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
@@ -0,0 +1,27 @@
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+
+from data_models.models import Campaign
+from data_models.temporal import parse_window
+
+from .generic_views import GetPermissionsMixin
+from .view_utils import handle_exception
+
+
+class CampaignTimelineView(GetPermissionsMixin, GenericAPIView):
+    """
+    Lists the deployments, IOPs and significant events of a campaign ordered by start date,
+    each with its type and the uuid of its deployment.
+
+    Query params:
+        overlaps: optional "YYYY-MM-DD/YYYY-MM-DD" window limiting the records to those
+            active during it, either side of which may be left empty
+    """
+
+    queryset = Campaign.objects.all()
+
+    @handle_exception
+    def get(self, request, uuid, *args, **kwargs):
+        campaign = self.get_queryset().get(uuid=uuid)
+        window = request.query_params.get("overlaps")
+        return Response(campaign.get_timeline(parse_window(window) if window else None))
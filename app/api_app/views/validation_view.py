@@ -3,7 +3,9 @@ from rest_framework.generics import GenericAPIView
 
 from data_models import serializers as data_models_serializers
 
-from api_app.serializers import ValidationSerializer
+from api_app.models import Change
+from api_app.serializers import BatchValidationSerializer, ValidationSerializer
+from api_app.validation import validate_changes, validate_records
 
 from .view_utils import handle_exception
 
@@ -35,3 +37,36 @@ class JsonValidationView(GenericAPIView):  # CreateAPIView):
                 "message": "All serializer validations passed",
             },
         )
+
+
+class BatchValidationView(GenericAPIView):
+    """
+    Validate many database entries, or drafts, at once, returning the errors of each entry
+    by field.
+    """
+
+    validation_serializer = BatchValidationSerializer
+
+    @handle_exception
+    def post(self, request, *args, **kwargs):
+        if "changes" in request.data:
+            changes = Change.objects.filter(uuid__in=request.data["changes"]).select_related(
+                "content_type"
+            )
+            errors = validate_changes(changes)
+            invalid_count = sum(1 for record_errors in errors.values() if record_errors)
+        else:
+            errors = validate_records(
+                request.data["model_name"],
+                request.data["records"],
+                partial=request.data.get("partial", False),
+            )
+            invalid_count = sum(1 for record_errors in errors if record_errors)
+
+        return Response(
+            status=200,
+            data={
+                "message": f"{invalid_count} of {len(errors)} entries failed validation",
+                "data": {"errors": errors},
+            },
+        )
@@ -0,0 +1,36 @@
+"""
+Compares two benchmark result files.
+
+    python -m benchmarks.compare baseline.json benchmark-results.json
+"""
+import json
+import sys
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return {result["name"]: result for result in json.load(f)["results"]}
+
+
+def compare(baseline_path: str, current_path: str) -> str:
+    baseline, current = load_results(baseline_path), load_results(current_path)
+    lines = [f"{'benchmark':<20}{'median ms':>22}{'change':>10}{'queries':>16}"]
+    for name, result in current.items():
+        if name not in baseline:
+            lines.append(f"{name:<20}{result['median_ms']:>22}{'new':>10}{result['queries']:>16}")
+            continue
+        before = baseline[name]
+        change = (result["median_ms"] - before["median_ms"]) / (before["median_ms"] or 1) * 100
+        lines.append(
+            f"{name:<20}"
+            f"{before['median_ms']:>10} -> {result['median_ms']:>8}"
+            f"{change:>+9.1f}%"
+            f"{before['queries']:>7} -> {result['queries']:>5}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    print(compare(sys.argv[1], sys.argv[2]))
@@ -0,0 +1,29 @@
+import pytest
+
+from data_models.tests.catalogue import CatalogueGenerator, CatalogueSize
+
+from .runner import (
+    BENCHMARK_OUTPUT,
+    BENCHMARK_SCALE,
+    BENCHMARK_SEED,
+    BenchmarkRunner,
+    write_results,
+)
+
+
+@pytest.fixture(scope="session")
+def catalogue(django_db_setup, django_db_blocker):
+    """Synthetic catalogue shared by every benchmark. It is never rolled back."""
+    with django_db_blocker.unblock():
+        return CatalogueGenerator(
+            CatalogueSize().scaled(BENCHMARK_SCALE), BENCHMARK_SEED
+        ).generate()
+
+
+@pytest.fixture(scope="session")
+def benchmark(catalogue):
+    """Runs and records benchmarks; the results are written when the session ends"""
+    runner = BenchmarkRunner()
+    yield runner
+    if runner.results:
+        write_results(BENCHMARK_OUTPUT, catalogue.size, runner.results)
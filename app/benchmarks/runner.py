@@ -0,0 +1,114 @@
+"""Timing, budget checks and JSON output of the benchmark suite"""
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from data_models.tests.catalogue import CatalogueSize
+
+BENCHMARK_SEED = int(os.environ.get("BENCHMARK_SEED", 0))
+BENCHMARK_SCALE = float(os.environ.get("BENCHMARK_SCALE", 1))
+BENCHMARK_REPEAT = int(os.environ.get("BENCHMARK_REPEAT", 5))
+# Multiplies every latency budget, for runs on machines slower than the reference one
+BENCHMARK_TIME_FACTOR = float(os.environ.get("BENCHMARK_TIME_FACTOR", 1))
+BENCHMARK_OUTPUT = os.environ.get("BENCHMARK_OUTPUT", "benchmark-results.json")
+
+
+@dataclass
+class Budget:
+    max_ms: float
+    max_queries: int
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    runs: int
+    median_ms: float
+    min_ms: float
+    max_ms: float
+    queries: int
+    budget_ms: float
+    budget_queries: int
+
+    @property
+    def within_budget(self) -> bool:
+        return self.median_ms <= self.budget_ms and self.queries <= self.budget_queries
+
+
+class BenchmarkRunner:
+    def __init__(self):
+        self.results = []
+
+    def __call__(
+        self,
+        name: str,
+        function: Callable,
+        budget: Budget,
+        repeat: int = BENCHMARK_REPEAT,
+        warmup: bool = True,
+    ) -> BenchmarkResult:
+        """Times `function`, records the result and asserts that it is within `budget`.
+
+        Args:
+            name (str): Name of the benchmark in the result output
+            function (Callable): Called without arguments once per run
+            budget (Budget): Maximum median latency and maximum queries of a single run
+            repeat (int, optional): Number of timed runs. Defaults to BENCHMARK_REPEAT.
+            warmup (bool, optional): Run once before timing, so that caches are populated.
+                Disable for benchmarks that change the data they run against. Defaults to True.
+
+        Returns:
+            BenchmarkResult: The recorded result
+        """
+        if warmup:
+            function()
+
+        timings, query_counts = [], []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                function()
+                timings.append((time.perf_counter() - start) * 1000)
+            query_counts.append(len(queries))
+
+        result = BenchmarkResult(
+            name=name,
+            runs=repeat,
+            median_ms=round(statistics.median(timings), 2),
+            min_ms=round(min(timings), 2),
+            max_ms=round(max(timings), 2),
+            queries=max(query_counts),
+            budget_ms=budget.max_ms * BENCHMARK_TIME_FACTOR,
+            budget_queries=budget.max_queries,
+        )
+        self.results.append(result)
+
+        assert result.queries <= result.budget_queries, (
+            f"{name} ran {result.queries} queries, " f"the budget is {result.budget_queries}"
+        )
+        assert result.median_ms <= result.budget_ms, (
+            f"{name} took {result.median_ms}ms (median of {repeat} runs), "
+            f"the budget is {result.budget_ms}ms"
+        )
+        return result
+
+
+def write_results(path: str, catalogue_size: CatalogueSize, results: list):
+    output = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "seed": BENCHMARK_SEED,
+        "scale": BENCHMARK_SCALE,
+        "catalogue": vars(catalogue_size),
+        "results": [{**vars(result), "within_budget": result.within_budget} for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(output, f, indent=2)
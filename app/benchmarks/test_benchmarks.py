@@ -0,0 +1,195 @@
+"""
+Latency and query-count budgets for the pages, endpoints and jobs that have regressed in
+the past. Each benchmark runs against the same seeded synthetic catalogue.
+
+Query budgets are fixed counts with a little headroom: none of the benchmarked work should
+run more queries as the catalogue grows, so a regression to a query per record exceeds them
+at any `BENCHMARK_SCALE`. Latency budgets of work over the whole catalogue grow with it.
+"""
+import ast
+import os
+
+import pytest
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cmr import doi_matching
+from data_models import models
+from data_models.summary import refresh_campaign_summaries
+from data_models.tests import factories
+from kms import api, gcmd
+
+from .runner import BENCHMARK_SCALE, Budget
+
+pytestmark = [
+    pytest.mark.skipif(
+        not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run benchmarks"
+    ),
+    pytest.mark.django_db,
+]
+
+PAGE_BUDGET = Budget(max_ms=1500, max_queries=40)
+
+# CMR fields that the DOI matcher receives as lists and stores as their string representation
+STRUCTURED_CMR_FIELDS = [
+    "cmr_projects",
+    "cmr_dates",
+    "cmr_plats_and_insts",
+    "cmr_science_keywords",
+    "cmr_data_formats",
+]
+
+
+@pytest.fixture
+def admin_client(client, catalogue):
+    client.force_login(catalogue.admin)
+    return client
+
+
+@pytest.fixture
+def campaign(catalogue):
+    """A campaign with at least two published DOIs"""
+    return (
+        models.Campaign.objects.annotate(doi_count=Count("dois"))
+        .filter(doi_count__gte=2)
+        .order_by("short_name")
+        .first()
+    )
+
+
+def get_ok(client, url):
+    def request():
+        response = client.get(url)
+        assert response.status_code == 200, f"{url} returned {response.status_code}"
+        return response
+
+    return request
+
+
+class TestAdminPages:
+    def test_summary(self, benchmark, admin_client):
+        benchmark("summary", get_ok(admin_client, reverse("summary")), PAGE_BUDGET)
+
+    def test_canonical_list(self, benchmark, admin_client):
+        url = reverse("canonical-list", args=["campaign"])
+        benchmark("canonical_list", get_ok(admin_client, url), PAGE_BUDGET)
+
+    def test_campaign_detail(self, benchmark, admin_client, campaign):
+        url = reverse(
+            "campaign-detail", kwargs={"model": "campaign", "canonical_uuid": campaign.uuid}
+        )
+        benchmark("campaign_detail", get_ok(admin_client, url), Budget(max_ms=1500, max_queries=80))
+
+    def test_doi_approval(self, benchmark, admin_client, campaign):
+        url = reverse("doi-approval", kwargs={"canonical_uuid": campaign.uuid})
+        benchmark("doi_approval", get_ok(admin_client, url), PAGE_BUDGET)
+
+    def test_gcmd_list(self, benchmark, admin_client):
+        benchmark("gcmd_list", get_ok(admin_client, reverse("gcmd-list")), PAGE_BUDGET)
+
+
+class TestApi:
+    def test_list(self, benchmark, catalogue):
+        # The generic list isn't paginated, but joins the summaries and prefetches the
+        # related records of every campaign, so it runs a query per related field
+        request = get_ok(APIClient(), "/api/campaign")
+        budget = Budget(max_ms=20000 * BENCHMARK_SCALE, max_queries=15)
+        result = benchmark("api_list", request, budget)
+
+        campaigns = factories.CampaignFactory.create_batch(5)
+        for campaign in campaigns:
+            factories.DeploymentFactory(campaign=campaign)
+            factories.AliasFactory(parent_fk=campaign)
+        refresh_campaign_summaries([campaign.uuid for campaign in campaigns])
+        with CaptureQueriesContext(connection) as queries:
+            request()
+        assert len(queries) == result.queries, "the list runs more queries as campaigns are added"
+
+    def test_detail(self, benchmark, campaign):
+        url = f"/api/campaign/{campaign.uuid}"
+        benchmark("api_detail", get_ok(APIClient(), url), Budget(max_ms=250, max_queries=20))
+
+
+class TestJobs:
+    def test_doi_matching(self, benchmark, catalogue, campaign, monkeypatch):
+        """
+        Matches CMR metadata for two DOIs the campaign already has, one of which has new
+        CMR metadata, and one new DOI
+        """
+        existing = []
+        for doi in models.DOI.objects.filter(campaigns=campaign)[:2]:
+            metadata = {"concept_id": doi.concept_id}
+            for field in doi_matching.DoiMatcher().core_cmr_fields:
+                value = getattr(doi, field)
+                metadata[field] = (
+                    ast.literal_eval(value) if field in STRUCTURED_CMR_FIELDS else value
+                )
+            existing.append(metadata)
+        existing[0]["cmr_abstract"] = "Updated abstract"
+        new = {**existing[1], "concept_id": "C0000000000-NEW", "doi": "10.5067/NEW"}
+        metadata_list = [*existing, new]
+
+        monkeypatch.setattr(
+            doi_matching,
+            "iter_processed_cmr",
+            lambda table_name, aliases, progress=None: (
+                dict(metadata) for metadata in metadata_list
+            ),
+        )
+
+        # The aliases and collection periods of the catalogue are loaded in bulk, so this is
+        # about 40 queries for the matching and 70 for the new and the updated DOI, most of
+        # them publishing the update
+        budget = Budget(max_ms=60000 * BENCHMARK_SCALE, max_queries=150)
+        benchmark(
+            "doi_matching",
+            lambda: doi_matching.DoiMatcher().generate_recommendations("campaign", campaign.uuid),
+            budget,
+            repeat=1,
+            warmup=False,
+        )
+
+    def test_gcmd_sync(self, benchmark, catalogue, monkeypatch):
+        """
+        Syncs the projects scheme against a GCMD response where a few keywords have
+        changed, a few are new and a few have been removed
+        """
+        keywords = catalogue.gcmd_keywords["GcmdProject"]
+        rows = [
+            {
+                "Bucket": keyword.bucket,
+                "Short_Name": keyword.short_name,
+                "Long_Name": keyword.long_name,
+                "UUID": str(keyword.gcmd_uuid),
+            }
+            for keyword in keywords[10:]
+        ]
+        for row in rows[:10]:
+            row["Long_Name"] = f"{row['Long_Name']} (renamed)"
+        rows += [
+            {
+                "Bucket": "NEW",
+                "Short_Name": f"NEW-{index}",
+                "Long_Name": "",
+                "UUID": f"00000000-0000-4000-8000-{index:012d}",
+            }
+            for index in range(10)
+        ]
+
+        # convert_keyword consumes the rows, so each call gets fresh copies
+        monkeypatch.setattr(api, "fetch_keyword_list", lambda scheme: [dict(row) for row in rows])
+
+        # The keywords are looked up in a single query, plus the drafts, recommendations and
+        # publication of each of the 30 changes, which is about 25 queries for each change and
+        # 2 for each of the few records connected to an updated or removed keyword
+        budget = Budget(max_ms=30000 * BENCHMARK_SCALE, max_queries=900)
+        benchmark(
+            "gcmd_sync",
+            lambda: gcmd.GcmdSync("projects").sync_keywords(),
+            budget,
+            repeat=1,
+            warmup=False,
+        )
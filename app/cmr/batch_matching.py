@@ -0,0 +1,216 @@
+"""
+DOI matching of many campaigns, instruments or platforms in a single run.
+
+A run is planned once: the aliases of every record are resolved by a single matcher, and
+each distinct alias is queried on CMR once however many records share it. The records are
+then split between at most CMR_MATCHING_CONCURRENCY tasks, each of which matches its
+records in turn with a single matcher, so that alias indexes are built once per task
+rather than once per record. CMR responses are kept in the cache for CMR_CACHE_TIMEOUT.
+With the local memory cache they are only reused within a worker process, by the records
+a task matches and by the tasks that process runs next.
+"""
+import hashlib
+import logging
+
+from celery.utils import uuid as celery_uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from api_app.models import MatchRun
+from api_app.progress import ProgressReporter
+from api_app.telemetry import RunTelemetry, stage
+from cmr.cmr import (
+    CHUNK_SIZE,
+    cmr_parameter_transform,
+    individual_concept_ids_query,
+    iter_collections_by_concept_id,
+)
+from cmr.doi_matching import DoiMatcher
+from cmr.process_metadata import process_data_product
+from cmr.utils import batched
+
+logger = logging.getLogger(__name__)
+
+CMR_CACHE_TIMEOUT = 60 * 60
+
+
+def _concept_ids_key(query_parameter, alias) -> str:
+    digest = hashlib.sha256(f"{query_parameter}:{alias}".encode()).hexdigest()
+    return f"cmr:concept_ids:{digest}"
+
+
+def _collection_key(concept_id) -> str:
+    return f"cmr:collection:{concept_id}"
+
+
+def get_concept_ids(query_parameter, alias):
+    """Cached `individual_concept_ids_query`"""
+    return cache.get_or_set(
+        _concept_ids_key(query_parameter, alias),
+        lambda: individual_concept_ids_query(query_parameter, alias),
+        CMR_CACHE_TIMEOUT,
+    )
+
+
+def iter_cached_collections(concept_ids, chunk_size=CHUNK_SIZE):
+    """
+    Yields the processed metadata of the collections of a list of concept_ids, requesting
+    from CMR only those that aren't already cached, chunk by chunk as they are consumed.
+    """
+    for chunk in batched(concept_ids, chunk_size):
+        cached = cache.get_many([_collection_key(concept_id) for concept_id in chunk])
+        missing = [concept_id for concept_id in chunk if _collection_key(concept_id) not in cached]
+        fetched = {
+            _collection_key(metadata["concept_id"]): metadata
+            for metadata in map(process_data_product, iter_collections_by_concept_id(missing))
+        }
+        cache.set_many(fetched, CMR_CACHE_TIMEOUT)
+        for concept_id in chunk:
+            metadata = cached.get(_collection_key(concept_id)) or fetched.get(
+                _collection_key(concept_id)
+            )
+            if metadata:
+                # matching adds recommendations to the metadata, so cached values are copied
+                yield dict(metadata)
+
+
+def all_targets(table_name) -> list[str]:
+    """UUIDs of every record of a table that DOIs can be matched for, published or not"""
+    return DoiMatcher().valid_uuids(table_name)
+
+
+def create_match_run(table_name, uuids, user=None) -> MatchRun:
+    # a record listed twice would be matched twice, and the run would finish early
+    targets = list(dict.fromkeys(str(uuid) for uuid in uuids))
+    return MatchRun.objects.create(table_name=table_name, targets=targets, user=user)
+
+
+def plan_match_run(
+    run: MatchRun, concurrency=None, progress=None
+) -> list[list[tuple[str, list[str]]]]:
+    """
+    Resolves the CMR concept_ids of every record of a run, querying each distinct alias
+    once, and splits the records between at most `concurrency` tasks.
+
+    Args:
+        run (MatchRun): the run to plan
+        concurrency (int): maximum number of tasks. Defaults to CMR_MATCHING_CONCURRENCY.
+        progress (ProgressReporter): reports the records whose aliases are queried
+
+    Returns:
+        list: for each task, the (uuid, concept_ids) of the records it matches
+
+    Raises:
+        Exception: whatever planning failed with, once the run is marked as failed
+    """
+    if not run.targets:
+        run.status, run.finished_at = MatchRun.Statuses.FINISHED, timezone.now()
+        run.save(update_fields=["status", "finished_at"])
+        return []
+    run.status = MatchRun.Statuses.RUNNING
+    run.save(update_fields=["status"])
+    try:
+        targets = _resolve_concept_ids(run, progress or ProgressReporter())
+    except Exception as e:
+        logger.exception(f"Match run {run.uuid}: planning failed")
+        run.fail(str(e))
+        raise
+
+    concurrency = min(concurrency or settings.CMR_MATCHING_CONCURRENCY, len(targets))
+    return [targets[index::concurrency] for index in range(concurrency)]
+
+
+def _resolve_concept_ids(run: MatchRun, progress) -> list[tuple[str, list[str]]]:
+    progress.start_stage("Querying CMR", total=len(run.targets))
+    matcher = DoiMatcher()
+    query_parameter = cmr_parameter_transform(run.table_name)
+    alias_to_concept_ids = {}
+    targets = []
+    with RunTelemetry().record() as telemetry:
+        with stage("alias_resolution"):
+            matcher.load_aliases(run.table_name, run.targets)
+        for uuid in run.targets:
+            concept_ids = set()
+            with stage("alias_resolution"):
+                aliases = matcher.universal_alias(run.table_name, uuid)
+            for alias in aliases:
+                if alias not in alias_to_concept_ids:
+                    progress.set_current(alias)
+                    alias_to_concept_ids[alias] = get_concept_ids(query_parameter, alias)
+                concept_ids.update(alias_to_concept_ids[alias])
+            targets.append((uuid, sorted(concept_ids)))
+            progress.advance()
+    run.add_telemetry(telemetry.as_dict())
+    logger.info(
+        f"Match run {run.uuid}: {len(alias_to_concept_ids)} distinct aliases queried "
+        f"for {len(targets)} records"
+    )
+    return targets
+
+
+def match_targets(run: MatchRun, targets, progress=None, task_id=None):
+    """
+    Matches the DOIs of some of the records of a run with a single matcher, recording the
+    counts of new, updated and unchanged DOIs of each in the run's report. Each record is
+    matched holding the lock of `match_dois` for it, and records already being matched by
+    another task are skipped.
+
+    Args:
+        run (MatchRun): the run the records are part of
+        targets (list): (uuid, concept_ids) of the records, as planned by `plan_match_run`
+        progress (ProgressReporter): reports the records matched and those that failed
+        task_id (str): id of the task matching the records, which holds their locks
+    """
+    from cmr.tasks import match_dois
+
+    progress = progress or ProgressReporter()
+    progress.start_stage("Matching DOIs", total=len(targets))
+    matcher = DoiMatcher()
+    task_id = task_id or celery_uuid()
+    for uuid, concept_ids in targets:
+        telemetry = RunTelemetry()
+        try:
+            with match_dois.hold_lock(task_id, run.table_name, uuid) as running_id:
+                if running_id:
+                    run.record_result(uuid, {"skipped": f"Already being matched by {running_id}"})
+                    progress.advance()
+                    continue
+                with telemetry.record():
+                    name = matcher.universal_get(run.table_name, uuid).get("short_name", "")
+                    progress.set_current(name or uuid)
+                    result = matcher.match_metadata(iter_cached_collections(concept_ids))
+        except Exception as e:
+            logger.exception(f"Match run {run.uuid}: matching {uuid} failed")
+            result = {"error": str(e)}
+            progress.add_error()
+        else:
+            result["name"] = name
+        run.record_result(uuid, {**result, "telemetry": telemetry.as_dict()})
+        progress.advance()
+
+
+def match_record(table_name, uuid, progress=None) -> dict:
+    """
+    Matches the DOIs of a single record, as `DoiMatcher.generate_recommendations` does,
+    recording it as a run of its own so that it shows in the run history
+
+    Returns:
+        dict: counts of the new, updated and unchanged DOIs of the record
+    """
+    uuid = str(uuid)
+    run = create_match_run(table_name, [uuid])
+    run.status = MatchRun.Statuses.RUNNING
+    run.save(update_fields=["status"])
+
+    matcher = DoiMatcher()
+    telemetry = RunTelemetry()
+    try:
+        with telemetry.record():
+            result = matcher.generate_recommendations(table_name, uuid, progress=progress)
+    except Exception as e:
+        run.record_result(uuid, {"error": str(e), "telemetry": telemetry.as_dict()})
+        raise
+    name = matcher.universal_get(table_name, uuid).get("short_name", "")
+    run.record_result(uuid, {**result, "name": name, "telemetry": telemetry.as_dict()})
+    return result
@@ -2,8 +2,14 @@ from urllib.parse import urlencode
 
 import requests
 
-from cmr.process_metadata import process_metadata_list
-from cmr.utils import purify_list
+from api_app.progress import ProgressReporter
+from api_app.telemetry import record_http_response, stage
+from cmr.process_metadata import process_data_product, process_metadata_list
+from cmr.utils import batched, purify_list
+
+# cmr can't handle big requests, like 303 concept_ids, all at once, so collections are
+# requested 50 concept_ids at a time
+CHUNK_SIZE = 50
 
 
 class QueryCounter:
@@ -59,30 +65,32 @@ def get_json(cmr_url):
         data (dict): JSON response from the CMR query url
     """
 
-    response = requests.get(cmr_url)
-    response.raise_for_status()
-    response_dict = response.json()
+    with stage("http"):
+        response = requests.get(cmr_url)
+        response.raise_for_status()
+    record_http_response(response)
+    with stage("json_parsing"):
+        response_dict = response.json()
 
     return response_dict
 
 
-def universal_query(query_parameter, query_value):
-    """Queries CMR for a specific query_parameter and value and aggergates
-    all the collection metadata.
+def iter_query_pages(query_parameter, query_value):
+    """Queries CMR for a specific query_parameter and value and yields each page of
+    collection metadata as it is retrieved, so that only one page is held at a time.
 
     Args:
         query_parameter (str): 'project', 'instrument', 'platform'
         query_value (str): value associated with parameter such as a
             campaign short_name, 'ABOVE' for query_parameter='project'
 
-    Returns:
-        list: list of xml_trees
+    Yields:
+        dict: JSON response of each page
     """
 
     # set initial variables
     counter = QueryCounter()
     base_url = "https://cmr.earthdata.nasa.gov/search/collections.umm_json?"
-    results = []
 
     while not counter.finished:
         # make inital query and append results
@@ -96,15 +104,29 @@ def universal_query(query_parameter, query_value):
         )
         url = base_url + parameters
 
-        # retrieve and append results
+        # retrieve and yield results
         response = get_json(url)
-        results.append(response)
+        yield response
 
         # iterate counter
         num_hits = int(response["hits"])
         counter.iterate(num_hits)
 
-    return results
+
+def universal_query(query_parameter, query_value):
+    """Queries CMR for a specific query_parameter and value and aggergates
+    all the collection metadata.
+
+    Args:
+        query_parameter (str): 'project', 'instrument', 'platform'
+        query_value (str): value associated with parameter such as a
+            campaign short_name, 'ABOVE' for query_parameter='project'
+
+    Returns:
+        list: list of xml_trees
+    """
+
+    return list(iter_query_pages(query_parameter, query_value))
 
 
 def extract_concept_ids_from_universal_query(collections_json):
@@ -143,13 +165,14 @@ def individual_concept_ids_query(query_parameter, query_value):
         concept_id_list (list): list of concept_id strings returned from CMR
     """
 
-    collections_json = universal_query(query_parameter, query_value)
+    # pages are consumed as they are retrieved, keeping only their concept_ids
+    collections_json = iter_query_pages(query_parameter, query_value)
     concept_ids = extract_concept_ids_from_universal_query(collections_json)
 
     return concept_ids
 
 
-def aggregate_concept_ids_queries(query_parameter, query_value_list):
+def aggregate_concept_ids_queries(query_parameter, query_value_list, progress=None):
     """The main CMR query is a bulk query that uses multiple aliases. This function
     executes each alias query and aggergates the results and removes duplicates.
 
@@ -158,19 +181,67 @@ def aggregate_concept_ids_queries(query_parameter, query_value_list):
         query_value_list (list of str): list of alias strings associated with the parameter,
             such as 'ACES' for 'project'
 
+        progress (ProgressReporter): reports the aliases queried
+
     Returns:
         concept_id_list (list): list of concept_id strings returned from CMR
     """
 
+    progress = progress or ProgressReporter()
+    progress.start_stage("Querying CMR", total=len(query_value_list))
     concept_id_list = []
     for query_value in query_value_list:
+        progress.set_current(query_value)
         concept_ids = individual_concept_ids_query(query_parameter, query_value)
         concept_id_list.extend(concept_ids)
+        progress.advance()
     concept_id_list = purify_list(concept_id_list, lower=False)
 
     return concept_id_list
 
 
+def iter_cmr_collections(query_parameter, query_value_list, chunk_size=CHUNK_SIZE, progress=None):
+    """Generator version of `bulk_cmr_query`. The concept_ids of every alias are gathered
+    first, then their collections are requested chunk by chunk, only as they are consumed.
+
+    Args:
+        query_parameter (str): CMR query parameter in ['project', 'instrument', 'platform']
+        query_value_list (list of str): list of alias strings associated with the parameter,
+            such as 'ACES' for 'project'
+        chunk_size (int): number of concept_ids requested at a time
+        progress (ProgressReporter): reports the aliases queried, then starts the
+            "Matching DOIs" stage over the collections found
+
+    Yields:
+        dict: metadata of each dataproduct returned from CMR
+    """
+
+    progress = progress or ProgressReporter()
+    concept_id_list = sorted(
+        aggregate_concept_ids_queries(query_parameter, query_value_list, progress)
+    )
+    progress.start_stage("Matching DOIs", total=len(concept_id_list))
+
+    yield from iter_collections_by_concept_id(concept_id_list, chunk_size)
+
+
+def iter_collections_by_concept_id(concept_id_list, chunk_size=CHUNK_SIZE):
+    """Requests the collections of a list of concept_ids chunk by chunk, only as they are
+    consumed.
+
+    Args:
+        concept_id_list (list of str): concept_ids of the collections
+        chunk_size (int): number of concept_ids requested at a time
+
+    Yields:
+        dict: metadata of each dataproduct returned from CMR
+    """
+
+    for concept_ids in batched(concept_id_list, chunk_size):
+        for page in iter_query_pages("echo_collection_id[]", concept_ids):
+            yield from page["items"]
+
+
 def bulk_cmr_query(query_parameter, query_value_list):
     """Primary CMR query function which takes a parameter and a list of aliases.
     Each alias is queried and the results are aggregated.
@@ -184,26 +255,7 @@ def bulk_cmr_query(query_parameter, query_value_list):
         metadata_list (list): list of dataproduct metadata returned from CMR
     """
 
-    concept_id_list = list(aggregate_concept_ids_queries(query_parameter, query_value_list))
-
-    # cmr can't handle big requests, like 303 concept_ids, all at once
-    # this breaks them into sub requests of 50 at a time
-    CHUNK_SIZE = 50
-    current_index = 0
-    concept_ids_responses = []
-    length = len(concept_id_list)
-    while current_index < length:
-        concept_ids = concept_id_list[current_index : (current_index + CHUNK_SIZE)]
-        concept_ids_responses.extend(universal_query("echo_collection_id[]", concept_ids))
-        current_index += CHUNK_SIZE
-
-    metadata_list = [
-        concept_id_data
-        for page in [response["items"] for response in concept_ids_responses]
-        for concept_id_data in page
-    ]
-
-    return metadata_list
+    return list(iter_cmr_collections(query_parameter, query_value_list))
 
 
 def cmr_parameter_transform(input_str, reverse=False):
@@ -241,6 +293,25 @@ def cmr_parameter_transform(input_str, reverse=False):
     return result
 
 
+def iter_processed_cmr(table_name, aliases, progress=None):
+    """Generator version of `query_and_process_cmr`, which processes each dataproduct as it
+    is retrieved from CMR so that its raw metadata can be released straight away.
+
+    Args:
+        table_name (str): db table_name in ['campaign', 'instrument', 'platform']
+        aliases (list of str): list of alias strings associated with the parameter,
+            such as 'ACES' for 'project'
+        progress (ProgressReporter): reports the aliases queried and the collections found
+
+    Yields:
+        dict: processed metadata of each dataproduct returned from CMR
+    """
+
+    query_parameter = cmr_parameter_transform(table_name)
+    for data_product in iter_cmr_collections(query_parameter, aliases, progress=progress):
+        yield process_data_product(data_product)
+
+
 def query_and_process_cmr(table_name, aliases):
     """Takes a database table name and a list of aliases and runs cmr queries for each
     alias, aggregating the results before filtering out the unused metadata.
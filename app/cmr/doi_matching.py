@@ -1,35 +1,60 @@
 import json
 import logging
 import pickle
-from datetime import datetime
+from datetime import date, datetime
 
 from django.apps import apps
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core import serializers
+from django.db import transaction
 
 from admg_webapp.users.models import User
 from api_app.models import Change, ApprovalLog
-from cmr.cmr import query_and_process_cmr
-from cmr.utils import clean_table_name, purify_list
+from api_app.progress import ProgressReporter
+from api_app.telemetry import count, stage
+from cmr.cmr import iter_processed_cmr, query_and_process_cmr
+from cmr.utils import (
+    CORE_CMR_FIELDS,
+    IntervalIndex,
+    batched,
+    clean_table_name,
+    cmr_fingerprint,
+    purify_list,
+)
+from data_models.models import DOI, Alias, CollectionPeriod, Deployment
+from data_models.temporal import cmr_date_intervals
 
 logger = logging.getLogger(__name__)
 
+# telemetry counter of each action taken by DoiMatcher.add_to_db
+DRAFT_COUNTERS = {
+    "new": "drafts_created",
+    "updated": "drafts_updated",
+    "unchanged": "drafts_skipped",
+}
+
+
+def to_date(value):
+    """Returns the date of a date or ISO formatted string, such as a draft's start_date, or None"""
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
 
 class DoiMatcher:
     def __init__(self):
         self.uuid_to_aliases = {}
         self.table_to_valid_uuids = {}
-        self.core_cmr_fields = [
-            'cmr_short_name',
-            'cmr_entry_title',
-            'cmr_projects',
-            'cmr_dates',
-            'cmr_plats_and_insts',
-            'cmr_science_keywords',
-            'cmr_abstract',
-            'cmr_data_formats',
-            'doi',  # TODO: do we want to not autopublish if this field is different?
-        ]
+        self.table_to_alias_index = {}
+        # deployments of each campaign indexed by date, and collection periods of each
+        # deployment as (uuid, platform uuid, instrument uuids), loaded by load_collection_periods
+        self.campaign_to_deployments = {}
+        self.deployment_to_collection_periods = {}
+        self.core_cmr_fields = list(CORE_CMR_FIELDS)
         self.previously_curated_fields = [
             'campaigns',
             'instruments',
@@ -55,14 +80,7 @@ class DoiMatcher:
         # attempt to find the uuid as a published object
         try:
             obj = model.objects.get(uuid=uuid)
-            data = json.loads(
-                serializers.serialize(
-                    "json",
-                    [
-                        obj,
-                    ],
-                )
-            )[
+            data = json.loads(serializers.serialize("json", [obj,],))[
                 0
             ]["fields"]
 
@@ -70,14 +88,7 @@ class DoiMatcher:
         except model.DoesNotExist:
             model = apps.get_model("api_app", "change")
             obj = model.objects.get(uuid=uuid)
-            data = json.loads(
-                serializers.serialize(
-                    "json",
-                    [
-                        obj,
-                    ],
-                )
-            )[0][
+            data = json.loads(serializers.serialize("json", [obj,],))[0][
                 "fields"
             ]["update"]
             data["uuid"] = uuid
@@ -133,40 +144,146 @@ class DoiMatcher:
             alias_set (set): Set containing lower-case aliases for the given UUID.
         """
 
-        if aliases := self.uuid_to_aliases.get(table_name, {}).get(uuid):
-            return aliases
-
         table_name = clean_table_name(table_name)
-        obj = self.universal_get(table_name, uuid)
+        self.load_aliases(table_name, [uuid])
+        return self.uuid_to_aliases[table_name][str(uuid)]
 
-        alias_list = []
-        alias_list.append(obj.get("short_name"))
-        alias_list.append(obj.get("long_name"))
+    def _load_records(self, model, uuids, many_to_many=()):
+        """Names, and the uuids of the given many to many fields, of the records of a model,
+        preferring published records to drafts like `universal_get`
 
-        # gets gcmd alias
-        if table_name in ["campaign", "platform", "instrument"]:
-            if table_name == "campaign":
-                table_name = "project"
+        Returns:
+            records (dict): uuid to the record's fields, or to its draft's update.
+        """
+
+        records = {}
+        for obj in model.objects.filter(uuid__in=uuids).prefetch_related(*many_to_many):
+            record = {
+                "short_name": getattr(obj, "short_name", None),
+                "long_name": getattr(obj, "long_name", None),
+            }
+            for field_name in many_to_many:
+                record[field_name] = [str(related.pk) for related in getattr(obj, field_name).all()]
+            records[str(obj.uuid)] = record
+
+        unpublished_uuids = set(map(str, uuids)) - records.keys()
+        for uuid, update in Change.objects.filter(uuid__in=unpublished_uuids).values_list(
+            "uuid", "update"
+        ):
+            records[str(uuid)] = update
+        return records
 
-            gcmd_uuids = obj.get(f"gcmd_{table_name}s", [])
-            for gcmd_uuid in gcmd_uuids:
-                gcmd_obj = self.universal_get(f"gcmd_{table_name}", gcmd_uuid)
-                alias_list.append(gcmd_obj.get("short_name"))
-                alias_list.append(gcmd_obj.get("long_name"))
+    def load_aliases(self, table_name, uuids):
+        """Gathers the aliases of objects of a table into `uuid_to_aliases`, as described in
+        `universal_alias`, with a fixed number of queries however many objects there are.
+
+        Args:
+            table_name (str): Table name such as platform.
+            uuids (list): UUIDs of the objects. These can be draft or database UUIDs.
+        """
+
+        table_name = clean_table_name(table_name)
+        table_aliases = self.uuid_to_aliases.setdefault(table_name, {})
+        uuids = [str(uuid) for uuid in uuids if str(uuid) not in table_aliases]
+        if not uuids:
+            return
+
+        gcmd_fields = []
+        if table_name in ["campaign", "platform", "instrument"]:
+            gcmd_table_name = "project" if table_name == "campaign" else table_name
+            gcmd_fields = [f"gcmd_{gcmd_table_name}s"]
+        records = self._load_records(apps.get_model("data_models", table_name), uuids, gcmd_fields)
+
+        gcmd_records = {}
+        for gcmd_field in gcmd_fields:
+            gcmd_uuids = {
+                str(gcmd_uuid)
+                for record in records.values()
+                for gcmd_uuid in record.get(gcmd_field) or []
+            }
+            gcmd_model = apps.get_model("data_models", clean_table_name(gcmd_field[:-1]))
+            gcmd_records.update(self._load_records(gcmd_model, gcmd_uuids))
 
         # get alias that are still in draft
-        linked_aliases = self.valid_object_list_generator("alias", "object_id", uuid)
-        for alias_uuid in linked_aliases:
-            alias = self.universal_get("alias", alias_uuid)
-            alias_list.append(alias.get("short_name"))
+        deleted_uuids = Change.objects.filter(
+            action=Change.Actions.DELETE, status=Change.Statuses.PUBLISHED
+        ).values("model_instance_uuid")
+        alias_drafts = (
+            Change.objects.of_type(Alias)
+            .filter(action=Change.Actions.CREATE)
+            .referencing("object_id", uuids)
+            .exclude(uuid__in=deleted_uuids)
+            .values_list("uuid", "update__object_id")
+        )
+        uuid_to_alias_uuids = {}
+        for alias_uuid, object_id in alias_drafts:
+            uuid_to_alias_uuids.setdefault(str(object_id), []).append(str(alias_uuid))
+        alias_records = self._load_records(
+            Alias,
+            [
+                alias_uuid
+                for alias_uuids in uuid_to_alias_uuids.values()
+                for alias_uuid in alias_uuids
+            ],
+        )
+
+        for uuid in uuids:
+            record = records.get(uuid, {})
+            alias_list = [record.get("short_name"), record.get("long_name")]
+            for gcmd_field in gcmd_fields:
+                for gcmd_uuid in record.get(gcmd_field) or []:
+                    gcmd_record = gcmd_records.get(str(gcmd_uuid), {})
+                    alias_list.append(gcmd_record.get("short_name"))
+                    alias_list.append(gcmd_record.get("long_name"))
+            for alias_uuid in uuid_to_alias_uuids.get(uuid, []):
+                alias_list.append(alias_records.get(alias_uuid, {}).get("short_name"))
+
+            # store alias set for faster lookups later
+            table_aliases[uuid] = purify_list(alias_list)
+
+    def valid_uuids(self, table_name):
+        """Cached `valid_object_list_generator` of a whole table, computed once per matcher"""
+
+        if table_name not in self.table_to_valid_uuids:
+            self.table_to_valid_uuids[table_name] = self.valid_object_list_generator(table_name)
+        return self.table_to_valid_uuids[table_name]
+
+    def alias_index(self, table_name):
+        """Inverts the aliases of every valid object of a table into a lookup of the uuids
+        that go by each alias. The index is built once per matcher, so that matching a
+        data product is a lookup per name rather than a comparison with every object.
+
+        Args:
+            table_name (str): Table name such as platform.
 
-        alias_set = purify_list(alias_list)
+        Returns:
+            alias_index (dict): Lower-case alias to a set of UUIDs.
+        """
 
-        # store alias set for faster lookups later
-        self.uuid_to_aliases[table_name] = self.uuid_to_aliases.get(table_name, {})
-        self.uuid_to_aliases[table_name][uuid] = alias_set
+        if table_name not in self.table_to_alias_index:
+            alias_index = {}
+            self.load_aliases(table_name, self.valid_uuids(table_name))
+            for uuid in self.valid_uuids(table_name):
+                for alias in self.universal_alias(table_name, uuid):
+                    alias_index.setdefault(alias, set()).add(uuid)
+            self.table_to_alias_index[table_name] = alias_index
+        return self.table_to_alias_index[table_name]
 
-        return alias_set
+    def match_aliases(self, table_name, names):
+        """Returns the UUIDs of the valid objects of a table that go by any of the names,
+        in the order of `valid_uuids`
+
+        Args:
+            table_name (str): Table name such as platform.
+            names (set): Lower-case names from CMR.
+
+        Returns:
+            list: UUIDs of the matching objects.
+        """
+
+        alias_index = self.alias_index(table_name)
+        matches = set().union(*(alias_index.get(name, set()) for name in names))
+        return [uuid for uuid in self.valid_uuids(table_name) if uuid in matches]
 
     def campaign_recommender(self, doi_metadata):
         """Takes the metadata for a single dataproduct and returns a list of the UUIDs
@@ -179,7 +296,6 @@ class DoiMatcher:
             campaign_recs (list): List of suggested UUID matches.
         """
 
-        campaign_recs = []
         # extract all cmr_project_names
         cmr_project_names = []
         for project in doi_metadata.get("cmr_projects", []):
@@ -187,14 +303,7 @@ class DoiMatcher:
             cmr_project_names.append(project.get("LongName"))
         cmr_project_names = purify_list(cmr_project_names)
 
-        # list of each campaign uuid with all it's names
-        campaign_uuids = self.valid_object_list_generator("campaign")
-
-        # compare the lists for matches and suppelent the metadata
-        for campaign_uuid in campaign_uuids:
-            camp_uuid_aliases = self.universal_alias("campaign", campaign_uuid)
-            if cmr_project_names.intersection(camp_uuid_aliases):
-                campaign_recs.append(campaign_uuid)
+        campaign_recs = self.match_aliases("campaign", cmr_project_names)
 
         return campaign_recs
 
@@ -209,7 +318,6 @@ class DoiMatcher:
             instrument_recs (list): List of suggested UUID matches.
         """
 
-        instrument_recs = []
         # extract all cmr instrument names
         cmr_instrument_names = []
         for platform_data in doi_metadata["cmr_plats_and_insts"]:
@@ -218,14 +326,7 @@ class DoiMatcher:
                 cmr_instrument_names.append(instrument_data.get("LongName"))
         cmr_instrument_names = purify_list(cmr_instrument_names)
 
-        # list of each instrument uuid with all it's names
-        instrument_uuids = self.valid_object_list_generator("instrument")
-
-        # compare the lists for matches and suppelent the metadata
-        for instrument_uuid in instrument_uuids:
-            inst_uuid_aliases = self.universal_alias("instrument", instrument_uuid)
-            if cmr_instrument_names.intersection(inst_uuid_aliases):
-                instrument_recs.append(instrument_uuid)
+        instrument_recs = self.match_aliases("instrument", cmr_instrument_names)
 
         return instrument_recs
 
@@ -240,7 +341,6 @@ class DoiMatcher:
             platform_recs (list): List of suggested UUID matches.
         """
 
-        platform_recs = []
         # extract all cmr platform names
         cmr_platform_names = []
         for platform_data in doi_metadata["cmr_plats_and_insts"]:
@@ -248,21 +348,90 @@ class DoiMatcher:
             cmr_platform_names.append(platform_data.get("LongName"))
         cmr_platform_names = purify_list(cmr_platform_names)
 
-        # list of each platform uuid with all it's names
-        platform_uuids = self.valid_object_list_generator("platform")
-
-        # compare the lists for matches and suppelent the metadata
-        for platform_uuid in platform_uuids:
-            plat_uuid_aliases = self.universal_alias("platform", platform_uuid)
-            if cmr_platform_names.intersection(plat_uuid_aliases):
-                platform_recs.append(platform_uuid)
+        platform_recs = self.match_aliases("platform", cmr_platform_names)
 
         return platform_recs
 
+    def _valid_drafts(self, model, field_name, uuids):
+        """Unpublished create drafts of a model that reference any of the uuids in a field and
+        have not been deleted"""
+
+        deleted_uuids = Change.objects.filter(
+            action=Change.Actions.DELETE, status=Change.Statuses.PUBLISHED
+        ).values("model_instance_uuid")
+        return (
+            Change.objects.of_type(model)
+            .filter(action=Change.Actions.CREATE)
+            .referencing(field_name, uuids)
+            .exclude(uuid__in=deleted_uuids)
+            .exclude(uuid__in=model.objects.values("uuid"))
+        )
+
+    def load_collection_periods(self, campaign_uuids):
+        """Loads the deployments and collection periods of the campaigns, published or in
+        draft, into the indexes used by `flight_recommender`. Campaigns are loaded with a
+        fixed number of queries however many there are, and only once per matcher.
+
+        Args:
+            campaign_uuids (iterable): UUIDs of campaigns, which can be draft UUIDs.
+        """
+
+        campaign_uuids = {str(uuid) for uuid in campaign_uuids} - set(self.campaign_to_deployments)
+        if not campaign_uuids:
+            return
+
+        deployments = {campaign_uuid: [] for campaign_uuid in campaign_uuids}
+        for uuid, campaign, start_date, end_date in Deployment.objects.filter(
+            campaign__in=campaign_uuids
+        ).values_list("uuid", "campaign", "start_date", "end_date"):
+            deployments[str(campaign)].append((start_date, end_date, str(uuid)))
+        for uuid, update in self._valid_drafts(Deployment, "campaign", campaign_uuids).values_list(
+            "uuid", "update"
+        ):
+            if (campaign := str(update.get("campaign"))) in deployments:
+                deployments[campaign].append(
+                    (to_date(update.get("start_date")), to_date(update.get("end_date")), str(uuid))
+                )
+
+        deployment_uuids = [uuid for intervals in deployments.values() for *_, uuid in intervals]
+        collection_periods = {uuid: [] for uuid in deployment_uuids}
+        instruments = {}
+        for collection_period, instrument in CollectionPeriod.instruments.through.objects.filter(
+            collectionperiod__deployment__in=deployment_uuids
+        ).values_list("collectionperiod", "instrument"):
+            instruments.setdefault(str(collection_period), set()).add(str(instrument))
+        for uuid, deployment, platform in CollectionPeriod.objects.filter(
+            deployment__in=deployment_uuids
+        ).values_list("uuid", "deployment", "platform"):
+            collection_periods[str(deployment)].append(
+                (str(uuid), str(platform), instruments.get(str(uuid), set()))
+            )
+        for uuid, update in self._valid_drafts(
+            CollectionPeriod, "deployment", deployment_uuids
+        ).values_list("uuid", "update"):
+            if (deployment := str(update.get("deployment"))) in collection_periods:
+                collection_periods[deployment].append(
+                    (
+                        str(uuid),
+                        str(update.get("platform")),
+                        {str(instrument) for instrument in update.get("instruments") or []},
+                    )
+                )
+
+        for campaign_uuid, intervals in deployments.items():
+            self.campaign_to_deployments[campaign_uuid] = IntervalIndex(intervals)
+        self.deployment_to_collection_periods.update(collection_periods)
+
     def flight_recommender(self, doi_metadata):
         """Takes the metadata for a single dataproduct and returns a list of the UUIDs
         for each suggested flight match from the database and drafts.
 
+        Collection periods are suggested from the deployments of the recommended campaigns
+        that overlap the temporal extents of the dataproduct, when their platform is one of
+        the recommended platforms and, when both list instruments, they share an instrument.
+        Without recommended platforms, a shared instrument is required. The recommended
+        campaigns, platforms and instruments must be set on `doi_metadata` beforehand.
+
         Args:
             doi_metadata (dict): Data product metadata from CMR.
 
@@ -270,8 +439,35 @@ class DoiMatcher:
             flight_recs (list): List of suggested UUID matches.
         """
 
-        # fully implemented in a separate PR
+        platforms = set(doi_metadata.get("platforms", []))
+        instruments = set(doi_metadata.get("instruments", []))
+        if not platforms and not instruments:
+            return []
+
+        campaigns = doi_metadata.get("campaigns", [])
+        self.load_collection_periods(campaigns)
+        # without temporal extents, every deployment of the campaigns is a candidate
+        intervals = cmr_date_intervals(doi_metadata.get("cmr_dates")) or [(None, None)]
+        deployments = []
+        for campaign in campaigns:
+            for start, end in intervals:
+                for deployment in self.campaign_to_deployments[campaign].overlapping(start, end):
+                    if deployment not in deployments:
+                        deployments.append(deployment)
+
         flight_recs = []
+        for deployment in deployments:
+            for uuid, platform, cp_instruments in self.deployment_to_collection_periods[deployment]:
+                if platforms and platform not in platforms:
+                    continue
+                if (
+                    instruments
+                    and (cp_instruments or not platforms)
+                    and not instruments & cp_instruments
+                ):
+                    continue
+                flight_recs.append(uuid)
+
         return flight_recs
 
     def supplement_metadata(self, metadata_list, development=False):
@@ -297,15 +493,21 @@ class DoiMatcher:
             doi_metadata["campaigns"] = self.campaign_recommender(doi_metadata)
             doi_metadata["instruments"] = self.instrument_recommender(doi_metadata)
             doi_metadata["platforms"] = self.platform_recommender(doi_metadata)
-            doi_metadata["collection_periods"] = self.flight_recommender(doi_metadata)
 
             supplemented_metadata_list.append(doi_metadata)
 
+        # collection periods of every recommended campaign are loaded in a single pass
+        self.load_collection_periods(
+            {uuid for doi_metadata in metadata_list for uuid in doi_metadata["campaigns"]}
+        )
+        for doi_metadata in supplemented_metadata_list:
+            doi_metadata["collection_periods"] = self.flight_recommender(doi_metadata)
+
         return supplemented_metadata_list
 
     def is_core_metadata_changed(self, recent_draft, recommendation):
         """Takes a doi_recommendation that includes metadata from CMR and a doi_draft from
-        the admg database and compares specific fields to find a mismatch.
+        the admg database and compares the fingerprints of their core CMR fields.
 
         Args:
             recent_draft (dict): Change object of type model=doi
@@ -315,20 +517,60 @@ class DoiMatcher:
             bool: True if there was a mismatch
         """
 
-        results = {}
-        for field in self.core_cmr_fields:
-            results[field] = {
-                'bool': recommendation.get(field) != recent_draft.update.get(field),
-                'values': (recommendation.get(field), recent_draft.update.get(field)),
-            }
-        json.dump(results, open(f'cmr_{recommendation["concept_id"]}.json', 'w'))
+        stored_fingerprint = recent_draft.cmr_fingerprint or cmr_fingerprint(recent_draft.update)
+        return stored_fingerprint != cmr_fingerprint(recommendation)
 
-        return any(
-            [
-                recommendation.get(field) != recent_draft.update.get(field)
-                for field in self.core_cmr_fields
-            ]
+    def latest_fingerprints(self, concept_ids):
+        """Returns the core CMR fingerprint of the most recently worked on create or update
+        draft of each concept_id, in a single query.
+
+        Args:
+            concept_ids (list): CMR concept ids of dataproducts
+
+        Returns:
+            dict: concept_id to fingerprint, for the concept_ids that have a DOI draft
+        """
+
+        drafts = (
+            Change.objects.of_type(DOI)
+            .filter(
+                action__in=[Change.Actions.CREATE, Change.Actions.UPDATE],
+                update__concept_id__in=concept_ids,
+            )
+            .order_by("-updated_at")
+            .values_list("update__concept_id", "cmr_fingerprint")
+        )
+        fingerprints = {}
+        for concept_id, fingerprint in drafts:
+            fingerprints.setdefault(concept_id, fingerprint)
+        return fingerprints
+
+    def remove_unchanged(self, metadata_list):
+        """Drops the dataproducts whose core CMR metadata is identical to that of their most
+        recent DOI draft, which add_to_db would leave untouched, before any recommendations
+        are made for them.
+
+        Args:
+            metadata_list (list): List of metadata dicts from CMR.
+
+        Returns:
+            list: metadata dicts of new or changed dataproducts
+        """
+
+        fingerprints = {
+            (metadata["concept_id"], cmr_fingerprint(metadata)) for metadata in metadata_list
+        }
+        stored = set(
+            self.latest_fingerprints([concept_id for concept_id, _ in fingerprints]).items()
         )
+        changed = fingerprints - stored
+        logger.info(f"{len(metadata_list) - len(changed)} unchanged dataproducts skipped")
+
+        return [
+            metadata
+            for metadata in metadata_list
+            if (metadata["concept_id"], cmr_fingerprint(metadata)) in changed
+        ]
 
     @staticmethod
     def serialize_recommendation(doi_recommendation):
@@ -402,7 +644,7 @@ class DoiMatcher:
                 UUID links.
 
         Returns:
-            str: String indicating action taken by the function
+            str: action taken by the function, one of "new", "updated" or "unchanged"
         """
         doi_recommendation = self.serialize_recommendation(doi_recommendation)
         # search db for the most recently worked on draft that matches our concept_id
@@ -419,10 +661,11 @@ class DoiMatcher:
         if not recent_draft:
             # no DOI draft exists yet for this concept_id, so we create one
             self.make_create_draft(doi_recommendation)
+            return "new"
 
         # TODO: handle delete drafts?
 
-        elif self.is_core_metadata_changed(recent_draft, doi_recommendation):
+        if self.is_core_metadata_changed(recent_draft, doi_recommendation):
             # a doi draft of some kind exists, and it's different from the new data
             generic_admin_user = User.objects.get(username='nimda')
             merged = self.create_merged_draft(recent_draft, doi_recommendation)
@@ -446,45 +689,90 @@ class DoiMatcher:
                     notes="New CMR metadata added, needs to be re-reviewed",
                 )
                 approval_log.save()
+            return "updated"
 
-    def generate_recommendations(self, table_name, uuid, development=False):
+        return "unchanged"
+
+    def generate_recommendations(
+        self, table_name, uuid, development=False, batch_size=None, progress=None
+    ):
         """This is the overarching parent function which takes a table_name and a uuid and
         then searches CMR for all the related dataproducts before finally searching the
         database drafts and objects for any possible matches. It will store all dataproducts
         and their possible matches as drafts.
 
+        Dataproducts are streamed from CMR and matched in batches, each of which is written
+        to the database in its own transaction before the next one is requested, so only a
+        single batch is held in memory at a time.
+
         Args:
             table_name (str): Table name from `campaign`, `instrument`, `platform`.
             uuid (str): UUID of the object from the given table
             development (bool): Bool which specifies whether in developement. If
                 true, only 1 metadata object will be processed and CMR metadata will be
                 saved and reused to prevent repeated CMR queries. Defaults to False.
+            batch_size (int): Number of dataproducts per batch. Defaults to the
+                CMR_INGEST_BATCH_SIZE setting.
+            progress (ProgressReporter): reports the aliases queried on CMR, then the
+                dataproducts matched and the running counts as each batch is committed.
 
         Returns:
-            supplemented_metadata_list (list): Function will return a list of dicts for each dataproduct's
-                supplemented metadata. This return is for informational purposes only, as all dataproducts
-                will have been added to the database as drafts already.
+            dict: Counts of the dataproducts `processed`, and of the `new`, `updated` and
+                `unchanged` DOIs among them. This return is for informational purposes only,
+                as all dataproducts will have been added to the database as drafts already.
         """
 
-        failed = False
+        with stage("alias_resolution"):
+            aliases = self.universal_alias(table_name, uuid)
+
         if development:
             try:
                 metadata_list = pickle.load(open(f"metadata_{uuid}", "rb"))
                 logger.debug("using cached CMR metadata")
             except FileNotFoundError:
-                failed = True
                 logger.debug("cached CMR data unavailable")
+                metadata_list = query_and_process_cmr(table_name, aliases)
+                pickle.dump(metadata_list, open(f"metadata_{uuid}", "wb"))
+            metadata = metadata_list[0:1]
+        else:
+            metadata = iter_processed_cmr(table_name, aliases, progress=progress)
 
-        aliases = self.universal_alias(table_name, uuid)
+        return self.match_metadata(metadata, batch_size, progress)
 
-        if failed or not development:
-            metadata_list = query_and_process_cmr(table_name, aliases)
+    def match_metadata(self, metadata, batch_size=None, progress=None):
+        """Matches and stores processed CMR metadata batch by batch, each batch being written
+        to the database in its own transaction before the next one is consumed.
 
-        if development:
-            pickle.dump(metadata_list, open(f"metadata_{uuid}", "wb"))
+        Args:
+            metadata (iterable): processed metadata dicts, such as a generator streaming
+                them from CMR
+            batch_size (int): Number of dataproducts per batch. Defaults to the
+                CMR_INGEST_BATCH_SIZE setting.
+            progress (ProgressReporter): advanced with the running counts as each batch is
+                committed
 
-        supplemented_metadata_list = self.supplement_metadata(metadata_list, development)
-        for doi in supplemented_metadata_list:
-            logger.debug(self.add_to_db(doi))
+        Returns:
+            dict: Counts of the dataproducts `processed`, and of the `new`, `updated` and
+                `unchanged` DOIs among them.
+        """
 
-        return supplemented_metadata_list
+        progress = progress or ProgressReporter()
+        counts = {"processed": 0, "new": 0, "updated": 0, "unchanged": 0}
+        for batch in batched(metadata, batch_size or settings.CMR_INGEST_BATCH_SIZE):
+            with stage("fingerprinting"):
+                changed = self.remove_unchanged(batch)
+            with stage("recommendation"):
+                supplemented_metadata_list = self.supplement_metadata(changed)
+            with stage("db_writes"), transaction.atomic():
+                for doi in supplemented_metadata_list:
+                    action = self.add_to_db(doi)
+                    logger.debug(f"{doi['concept_id']}: {action}")
+                    counts[action] += 1
+                    count(DRAFT_COUNTERS[action])
+
+            counts["processed"] += len(batch)
+            counts["unchanged"] += len(batch) - len(changed)
+            count(DRAFT_COUNTERS["unchanged"], len(batch) - len(changed))
+            progress.advance(len(batch), **counts)
+
+        return counts
@@ -1,12 +1,28 @@
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
 
+from cmr import batch_matching
 from cmr.doi_matching import DoiMatcher
 
 
 class Command(BaseCommand):
+    help = "Matches the DOIs of one or more campaigns, reporting the DOIs matched for each"
+
     def add_arguments(self, parser):
-        parser.add_argument("--campaign-id", required=True, type=str)
+        parser.add_argument("--campaign-id", action="append", dest="campaign_ids", type=str)
+        parser.add_argument("--all", action="store_true", help="Match every campaign")
+
+    def handle(self, campaign_ids, all, **options):
+        if all:
+            campaign_ids = batch_matching.all_targets("campaign")
+        elif not campaign_ids:
+            raise CommandError("Provide at least one --campaign-id, or --all")
+
+        if len(campaign_ids) == 1:
+            DoiMatcher().generate_recommendations("campaign", campaign_ids[0])
+            return
 
-    def handle(self, campaign_id, **options):
-        matcher = DoiMatcher()
-        matcher.generate_recommendations("campaign", campaign_id)
+        run = batch_matching.create_match_run("campaign", campaign_ids)
+        for targets in batch_matching.plan_match_run(run, concurrency=1):
+            batch_matching.match_targets(run, targets)
+        for uuid, result in run.report.items():
+            self.stdout.write(f"{uuid}: {result}")
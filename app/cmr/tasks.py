@@ -1,11 +1,30 @@
 from celery import shared_task
-from cmr.doi_matching import DoiMatcher
 
+from api_app.models import MatchRun
+from api_app.progress import ProgressReporter
+from api_app.task_locks import SingletonTask
+from cmr import batch_matching
 
-@shared_task
-def match_dois(table_name, uuid):
-    matcher = DoiMatcher()
-    return matcher.generate_recommendations(table_name, str(uuid))
+
+@shared_task(bind=True, base=SingletonTask)
+def match_dois(self, table_name, uuid):
+    return batch_matching.match_record(table_name, uuid, progress=ProgressReporter(self))
+
+
+@shared_task(bind=True)
+def start_match_run(self, run_uuid):
+    """Plans a MatchRun and fans its records out to at most CMR_MATCHING_CONCURRENCY tasks"""
+    run = MatchRun.objects.get(uuid=run_uuid)
+    for targets in batch_matching.plan_match_run(run, progress=ProgressReporter(self)):
+        match_run_targets.delay(run_uuid, targets)
+
+
+@shared_task(bind=True)
+def match_run_targets(self, run_uuid, targets):
+    run = MatchRun.objects.get(uuid=run_uuid)
+    batch_matching.match_targets(
+        run, targets, progress=ProgressReporter(self), task_id=self.request.id
+    )
 
 
 @shared_task
@@ -1,10 +1,46 @@
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
 import pytest
 from django.core.management import call_command
 from django.contrib.contenttypes.models import ContentType
 
+from cmr import cmr
+
 
 @pytest.fixture(scope='session')
 def load_test_data(django_db_setup, django_db_blocker):
     with django_db_blocker.unblock():
         ContentType.objects.all().delete()
         call_command('loaddata', 'cmr/fixtures/stage_backup_2023.05.23.json')
+
+
+@pytest.fixture
+def fake_cmr(monkeypatch):
+    """
+    Fakes CMR, which finds the collections of `alias_concept_ids` for the aliases listed
+    there and those of `concept_ids` for any other alias, and records the requested urls
+    """
+    fake = SimpleNamespace(
+        urls=[], concept_ids=[f"C000000000{i}-TEST" for i in range(5)], alias_concept_ids={}
+    )
+
+    def get_json(url):
+        fake.urls.append(url)
+        query = parse_qs(urlparse(url).query)
+        if "echo_collection_id[]" in query:
+            items = [
+                {
+                    "meta": {"concept-id": concept_id},
+                    "umm": {"ShortName": concept_id, "EntryTitle": f"Collection {concept_id}"},
+                }
+                for concept_id in query["echo_collection_id[]"]
+            ]
+        else:
+            (alias,) = [value for key, (value, *_) in query.items() if not key.startswith("page_")]
+            concept_ids = fake.alias_concept_ids.get(alias, fake.concept_ids)
+            items = [{"meta": {"concept-id": concept_id}} for concept_id in concept_ids]
+        return {"hits": len(items), "items": items}
+
+    monkeypatch.setattr(cmr, "get_json", get_json)
+    return fake
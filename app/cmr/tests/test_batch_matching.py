@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.utils import timezone
+
+from admin_ui.admin.actions.doi import fetch_dois
+from admin_ui.tests.factories import ChangeFactory
+from api_app.models import MatchRun, TaskLock
+from cmr import batch_matching, tasks
+from cmr.batch_matching import create_match_run, match_targets, plan_match_run
+from data_models.models import Campaign
+from data_models.tests import factories
+
+
+@pytest.mark.django_db
+class TestBatchMatching:
+    @pytest.fixture
+    def campaigns(self, fake_cmr):
+        cache.clear()
+        fake_cmr.concept_ids = []
+        fake_cmr.alias_concept_ids = {
+            "alpha": ["C1-TEST", "C2-TEST"],
+            "beta": ["C2-TEST", "C3-TEST"],
+        }
+        return [
+            ChangeFactory.make_create_change_object(
+                factories.CampaignFactory,
+                custom_fields={"short_name": short_name, "long_name": "Shared Mission"},
+            )
+            for short_name in ["ALPHA", "BETA", "GAMMA"]
+        ]
+
+    def test_aliases_are_queried_once(self, fake_cmr, campaigns):
+        run = create_match_run("campaign", [campaign.uuid for campaign in campaigns])
+
+        plan = plan_match_run(run, concurrency=2)
+
+        alias_queries = [url for url in fake_cmr.urls if "echo_collection_id" not in url]
+        assert len(alias_queries) == len(set(alias_queries))
+        assert plan == [
+            [(str(campaigns[0].uuid), ["C1-TEST", "C2-TEST"]), (str(campaigns[2].uuid), [])],
+            [(str(campaigns[1].uuid), ["C2-TEST", "C3-TEST"])],
+        ]
+        assert MatchRun.objects.get().status == MatchRun.Statuses.RUNNING
+
+    def test_duplicate_targets(self, campaigns):
+        run = create_match_run("campaign", [campaigns[0].uuid, str(campaigns[0].uuid)])
+
+        assert run.targets == [str(campaigns[0].uuid)]
+
+    def test_planning_failure(self, campaigns, monkeypatch):
+        def get_concept_ids(query_parameter, alias):
+            raise ConnectionError("CMR is down")
+
+        monkeypatch.setattr(batch_matching, "get_concept_ids", get_concept_ids)
+        run = create_match_run("campaign", [campaigns[0].uuid])
+
+        with pytest.raises(ConnectionError):
+            plan_match_run(run)
+
+        run.refresh_from_db()
+        assert run.status == MatchRun.Statuses.FAILED
+        assert run.error == "CMR is down"
+        assert run.finished_at
+
+    def test_report(self, fake_cmr, campaigns):
+        run = create_match_run("campaign", [campaign.uuid for campaign in campaigns[:2]])
+        (targets,) = plan_match_run(run, concurrency=1)
+        fake_cmr.urls.clear()
+
+        match_targets(run, targets)
+
+        # the collection shared by both campaigns is only requested once
+        assert sum(url.count("C2-TEST") for url in fake_cmr.urls) == 1
+        run.refresh_from_db()
+        assert run.status == MatchRun.Statuses.FINISHED
+        assert run.finished_at
+        telemetries = [result.pop("telemetry") for result in run.report.values()]
+        assert all(telemetry["counters"]["orm_queries"] for telemetry in telemetries)
+        assert run.telemetry["counters"]["drafts_created"] == 3
+        assert run.telemetry["counters"]["drafts_skipped"] == 1
+        assert run.report == {
+            str(campaigns[0].uuid): {
+                "name": "ALPHA",
+                "processed": 2,
+                "new": 2,
+                "updated": 0,
+                "unchanged": 0,
+            },
+            str(campaigns[1].uuid): {
+                "name": "BETA",
+                "processed": 2,
+                "new": 1,
+                "updated": 0,
+                "unchanged": 1,
+            },
+        }
+
+    def test_failures_are_reported(self, campaigns):
+        run = create_match_run("campaign", [campaigns[0].uuid])
+
+        match_targets(run, [(str(campaigns[0].uuid), None)])
+
+        run.refresh_from_db()
+        assert run.status == MatchRun.Statuses.FAILED
+        assert "error" in run.report[str(campaigns[0].uuid)]
+
+    def test_records_being_matched_are_skipped(self, campaigns):
+        run = create_match_run("campaign", [campaigns[0].uuid])
+        lock_key = tasks.match_dois.lock_key(("campaign", str(campaigns[0].uuid)))
+        TaskLock.objects.create(
+            key=lock_key, task_id="running-task", expires_at=timezone.now() + timedelta(hours=1)
+        )
+
+        match_targets(run, [(str(campaigns[0].uuid), None)])
+
+        run.refresh_from_db()
+        assert run.status == MatchRun.Statuses.FINISHED
+        assert "skipped" in run.report[str(campaigns[0].uuid)]
+        assert TaskLock.objects.get(key=lock_key).task_id == "running-task"
+
+    def test_admin_action(self, rf, admin_user, monkeypatch, django_capture_on_commit_callbacks):
+        campaigns = factories.CampaignFactory.create_batch(2)
+        started = []
+        monkeypatch.setattr(tasks.start_match_run, "delay", started.append)
+        request = rf.post("/")
+        request.user = admin_user
+        request._messages = CookieStorage(request)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            fetch_dois(None, request, Campaign.objects.all())
+
+        run = MatchRun.objects.get()
+        assert started == [str(run.uuid)]
+        assert set(run.targets) == {str(campaign.uuid) for campaign in campaigns}
+        assert run.user == admin_user
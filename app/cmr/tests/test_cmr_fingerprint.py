@@ -0,0 +1,56 @@
+import json
+import os
+
+import pytest
+
+from admin_ui.tests.factories import ChangeFactory
+from cmr.doi_matching import DoiMatcher
+from cmr.utils import cmr_fingerprint
+from data_models.tests import factories
+
+
+@pytest.fixture
+def metadata():
+    return json.load(open('cmr/tests/cmr_response-ASCENDS.json', 'r'))[0]
+
+
+class TestCmrFingerprint:
+    def test_stored_drafts_match_cmr_metadata(self, metadata):
+        serialized = DoiMatcher.serialize_recommendation(dict(metadata))
+        assert cmr_fingerprint(serialized) == cmr_fingerprint(metadata)
+
+    def test_curated_fields_are_ignored(self, metadata):
+        assert cmr_fingerprint({**metadata, "campaigns": ["uuid"]}) == cmr_fingerprint(metadata)
+
+    def test_core_fields_are_compared(self, metadata):
+        changed = {**metadata, "cmr_abstract": "Updated abstract"}
+        assert cmr_fingerprint(changed) != cmr_fingerprint(metadata)
+
+
+@pytest.mark.django_db
+class TestUnchangedDois:
+    @pytest.fixture
+    def draft(self, metadata):
+        return ChangeFactory.make_create_change_object(
+            factories.DOIFactory,
+            custom_fields=DoiMatcher.serialize_recommendation(dict(metadata)),
+        )
+
+    def test_fingerprint_is_stored_on_doi_drafts(self, draft, metadata):
+        assert draft.cmr_fingerprint == cmr_fingerprint(metadata)
+        assert (
+            ChangeFactory.make_create_change_object(factories.CampaignFactory).cmr_fingerprint == ""
+        )
+
+    def test_unchanged_dois_are_skipped(self, draft, metadata):
+        changed = {**metadata, "cmr_abstract": "Updated abstract"}
+        new = {**metadata, "concept_id": "C0000000000-NEW"}
+
+        remaining = DoiMatcher().remove_unchanged([dict(metadata), changed, new])
+
+        assert remaining == [changed, new]
+
+    def test_no_debug_files_are_written(self, draft, metadata, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assert not DoiMatcher().is_core_metadata_changed(draft, dict(metadata))
+        assert os.listdir(tmp_path) == []
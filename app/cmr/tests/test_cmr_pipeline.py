@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+
+from admin_ui.tests.factories import ChangeFactory
+from api_app.models import Change
+from api_app.progress import ProgressReporter
+from cmr import cmr
+from cmr.doi_matching import DoiMatcher
+from cmr.utils import batched
+from data_models.models import DOI
+from data_models.tests import factories
+
+
+class RecordingTask:
+    """Bound task recording the progress stored by a ProgressReporter"""
+
+    request = SimpleNamespace(id="task-id")
+
+    def __init__(self):
+        self.states = []
+
+    def update_state(self, state, meta):
+        self.states.append(meta)
+
+
+class TestBatched:
+    def test_batches(self):
+        assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(batched([], 2)) == []
+
+    def test_is_lazy(self):
+        consumed = []
+
+        def numbers():
+            for number in range(5):
+                consumed.append(number)
+                yield number
+
+        next(batched(numbers(), 2))
+        assert consumed == [0, 1]
+
+
+class TestCmrStreaming:
+    def test_collections_are_requested_as_consumed(self, fake_cmr):
+        collections = cmr.iter_cmr_collections("project", ["ACES", "aces"], chunk_size=2)
+
+        assert next(collections)["meta"]["concept-id"] == fake_cmr.concept_ids[0]
+        # a query per alias for the concept_ids, then only the first chunk of collections
+        assert len(fake_cmr.urls) == 3
+
+        assert [item["meta"]["concept-id"] for item in collections] == fake_cmr.concept_ids[1:]
+        assert len(fake_cmr.urls) == 5
+
+    def test_matches_bulk_query(self, fake_cmr):
+        processed = list(cmr.iter_processed_cmr("campaign", ["ACES"]))
+        assert processed == cmr.query_and_process_cmr("campaign", ["ACES"])
+        assert [metadata["concept_id"] for metadata in processed] == fake_cmr.concept_ids
+
+
+@pytest.mark.django_db
+class TestGenerateRecommendations:
+    def test_batches_are_committed(self, fake_cmr):
+        campaign = ChangeFactory.make_create_change_object(factories.CampaignFactory)
+        task = RecordingTask()
+
+        summary = DoiMatcher().generate_recommendations(
+            "campaign",
+            str(campaign.uuid),
+            batch_size=2,
+            progress=ProgressReporter(task, interval=0),
+        )
+
+        matching = [state for state in task.states if state["stage"] == "Matching DOIs"]
+        assert [(state["done"], state["total"], state["new"]) for state in matching[1:]] == [
+            (2, 5, 2),
+            (4, 5, 4),
+            (5, 5, 5),
+        ]
+        assert summary == {"processed": 5, "new": 5, "updated": 0, "unchanged": 0}
+        assert set(Change.objects.of_type(DOI).values_list("update__concept_id", flat=True)) == set(
+            fake_cmr.concept_ids
+        )
+
+    def test_unchanged_dois_are_counted(self, fake_cmr):
+        campaign = ChangeFactory.make_create_change_object(factories.CampaignFactory)
+        DoiMatcher().generate_recommendations("campaign", str(campaign.uuid))
+
+        summary = DoiMatcher().generate_recommendations("campaign", str(campaign.uuid))
+
+        assert summary == {"processed": 5, "new": 0, "updated": 0, "unchanged": 5}
+        assert Change.objects.of_type(DOI).count() == len(fake_cmr.concept_ids)
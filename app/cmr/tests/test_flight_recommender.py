@@ -0,0 +1,154 @@
+from datetime import date
+
+import pytest
+
+from admin_ui.tests.factories import ChangeFactory
+from cmr.doi_matching import DoiMatcher
+from cmr.utils import IntervalIndex
+from data_models.tests import factories
+
+CMR_DATES = [
+    {
+        "EndsAtPresentFlag": False,
+        "RangeDateTimes": [
+            {
+                "BeginningDateTime": "2017-07-20T16:58:21.000Z",
+                "EndingDateTime": "2017-08-08T20:36:00.000Z",
+            }
+        ],
+    }
+]
+
+
+class TestIntervalIndex:
+    def test_overlapping(self):
+        index = IntervalIndex(
+            [
+                (date(2017, 1, 1), date(2017, 1, 31), "january"),
+                (date(2017, 3, 1), None, "ongoing"),
+                (date(2016, 12, 1), date(2017, 2, 1), "winter"),
+            ]
+        )
+        assert index.overlapping(date(2017, 1, 31), date(2017, 2, 1)) == ["winter", "january"]
+        assert index.overlapping(date(2018, 1, 1), None) == ["ongoing"]
+        assert index.overlapping() == ["winter", "january", "ongoing"]
+        assert index.overlapping(date(2017, 2, 2), date(2017, 2, 28)) == []
+
+
+@pytest.mark.django_db
+class TestFlightRecommender:
+    @pytest.fixture
+    def catalogue(self):
+        campaign = factories.CampaignFactory()
+        platform, other_platform = factories.PlatformFactory.create_batch(2)
+        instrument, other_instrument = factories.InstrumentFactory.create_batch(2)
+        deployments = {
+            year: factories.DeploymentFactory(
+                campaign=campaign, start_date=date(year, 7, 1), end_date=date(year, 8, 31)
+            )
+            for year in [2016, 2017]
+        }
+
+        def collection_period(year, platform, instrument):
+            collection_period = factories.CollectionPeriodFactory(
+                deployment=deployments[year], platform=platform
+            )
+            collection_period.instruments.set([instrument])
+            return collection_period
+
+        return {
+            "campaign": campaign,
+            "platform": platform,
+            "instrument": instrument,
+            "match": collection_period(2017, platform, instrument),
+            "other_year": collection_period(2016, platform, instrument),
+            "other_platform": collection_period(2017, other_platform, instrument),
+            "other_instrument": collection_period(2017, platform, other_instrument),
+            "draft": ChangeFactory.make_create_change_object(
+                factories.CollectionPeriodFactory,
+                custom_fields={
+                    "deployment": str(deployments[2017].uuid),
+                    "platform": str(platform.uuid),
+                    "instruments": [str(instrument.uuid)],
+                },
+            ),
+        }
+
+    def doi_metadata(self, catalogue, **overrides):
+        return {
+            "cmr_dates": CMR_DATES,
+            "campaigns": [str(catalogue["campaign"].uuid)],
+            "platforms": [str(catalogue["platform"].uuid)],
+            "instruments": [str(catalogue["instrument"].uuid)],
+            **overrides,
+        }
+
+    def test_recommendations(self, catalogue):
+        recommendations = DoiMatcher().flight_recommender(self.doi_metadata(catalogue))
+        assert set(recommendations) == {str(catalogue["match"].uuid), str(catalogue["draft"].uuid)}
+
+    def test_without_dates(self, catalogue):
+        recommendations = DoiMatcher().flight_recommender(
+            self.doi_metadata(catalogue, cmr_dates=[])
+        )
+        assert str(catalogue["other_year"].uuid) in recommendations
+
+    def test_without_platforms(self, catalogue):
+        recommendations = DoiMatcher().flight_recommender(
+            self.doi_metadata(catalogue, platforms=[])
+        )
+        assert str(catalogue["other_platform"].uuid) in recommendations
+        assert str(catalogue["other_instrument"].uuid) not in recommendations
+
+    def test_single_pass(self, catalogue, django_assert_num_queries):
+        matcher = DoiMatcher()
+        matcher.load_collection_periods([catalogue["campaign"].uuid])
+
+        with django_assert_num_queries(0):
+            for _ in range(3):
+                matcher.flight_recommender(self.doi_metadata(catalogue))
+
+    def test_campaign_aliases_are_cached_under_campaign(self):
+        campaign = ChangeFactory.make_create_change_object(factories.CampaignFactory)
+        matcher = DoiMatcher()
+
+        aliases = matcher.universal_alias("campaign", str(campaign.uuid))
+
+        assert matcher.uuid_to_aliases == {"campaign": {str(campaign.uuid): aliases}}
+
+    def test_alias_index_queries_are_fixed(self, django_assert_max_num_queries):
+        gcmd_project = factories.GcmdProjectFactory(short_name="GCMD", long_name="Gcmd Project")
+        campaigns = [
+            ChangeFactory.make_create_change_object(
+                factories.CampaignFactory,
+                {
+                    "short_name": f"C{index}",
+                    "long_name": f"Campaign {index}",
+                    "gcmd_projects": [str(gcmd_project.uuid)],
+                },
+            )
+            for index in range(3)
+        ]
+        for campaign in campaigns:
+            ChangeFactory.make_create_change_object(
+                factories.AliasFactory,
+                {
+                    "object_id": str(campaign.uuid),
+                    "short_name": f"Alias {campaign.update['short_name']}",
+                },
+            )
+        matcher = DoiMatcher()
+
+        with django_assert_max_num_queries(9):
+            alias_index = matcher.alias_index("campaign")
+
+        for index, campaign in enumerate(campaigns):
+            assert matcher.universal_alias("campaign", str(campaign.uuid)) == {
+                f"c{index}",
+                f"campaign {index}",
+                "gcmd",
+                "gcmd project",
+                f"alias c{index}",
+            }
+            assert alias_index[f"c{index}"] == {str(campaign.uuid)}
+        assert alias_index["gcmd"] == {str(campaign.uuid) for campaign in campaigns}
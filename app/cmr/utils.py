@@ -1,3 +1,33 @@
+import ast
+import hashlib
+import json
+from bisect import bisect_right
+from datetime import date
+from itertools import islice
+
+# CMR metadata of a DOI that is refreshed from CMR rather than curated
+CORE_CMR_FIELDS = [
+    'cmr_short_name',
+    'cmr_entry_title',
+    'cmr_projects',
+    'cmr_dates',
+    'cmr_plats_and_insts',
+    'cmr_science_keywords',
+    'cmr_abstract',
+    'cmr_data_formats',
+    'doi',  # TODO: do we want to not autopublish if this field is different?
+]
+
+# core CMR fields that are lists in CMR responses and their str() in DOI drafts
+STRUCTURED_CMR_FIELDS = [
+    'cmr_projects',
+    'cmr_dates',
+    'cmr_plats_and_insts',
+    'cmr_science_keywords',
+    'cmr_data_formats',
+]
+
+
 def clean_table_name(table_name):
     """Takes in various randomly formatted table names such as 'Gcmd Platform', 'gcmd_platform'
     and 'GcmdPlatform' and standardizes them all to 'gcmdplatform' for comparison purposes.
@@ -33,3 +63,84 @@ def purify_list(dirty_list, lower=True):
         clean_set = set(i for i in dirty_list if i)
 
     return clean_set
+
+
+def batched(iterable, size):
+    """Splits an iterable into lists of up to `size` items, consuming it lazily so that only
+    one batch is held at a time.
+
+    Args:
+        iterable (iterable): items to split, such as a generator
+        size (int): maximum number of items per batch
+
+    Yields:
+        list: the next batch of items
+    """
+
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class IntervalIndex:
+    """Sorted index of (start, end, value) date intervals, for looking up the values whose
+    interval overlaps a query interval without scanning every interval. Missing starts and
+    ends are open ended.
+
+    Args:
+        intervals (iterable): (start, end, value) tuples
+    """
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(
+            ((start or date.min, end or date.max, value) for start, end, value in intervals),
+            key=lambda interval: interval[0],
+        )
+        self.starts = [start for start, _, _ in self.intervals]
+
+    def overlapping(self, start=None, end=None):
+        """Returns the values of the intervals that overlap the range from start to end (inclusive)
+
+        Args:
+            start (date, optional): first date of the range, open if None
+            end (date, optional): last date of the range, open if None
+
+        Returns:
+            list: values in order of their interval's start
+        """
+
+        # only the intervals starting by the end of the range can overlap it
+        candidates = self.intervals[: bisect_right(self.starts, end or date.max)]
+        start = start or date.min
+        return [value for _, interval_end, value in candidates if interval_end >= start]
+
+
+def _normalize_cmr_value(field, value):
+    if field in STRUCTURED_CMR_FIELDS and isinstance(value, str):
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+    if isinstance(value, str):
+        value = value.strip()
+    return value or None
+
+
+def cmr_fingerprint(metadata):
+    """Hashes the core CMR fields of DOI metadata, either as processed from a CMR response or
+    as stored on a DOI draft, where structured fields are stringified. Both forms of the same
+    metadata have the same fingerprint, so unchanged collections can be found by comparing
+    fingerprints rather than fields.
+
+    Args:
+        metadata (dict): DOI metadata, such as a draft's `update`
+
+    Returns:
+        str: hex digest of the normalized core CMR fields
+    """
+
+    normalized = {
+        field: _normalize_cmr_value(field, metadata.get(field)) for field in CORE_CMR_FIELDS
+    }
+    canonical = json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
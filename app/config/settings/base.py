@@ -73,6 +73,7 @@ DJANGO_APPS = [
     "admin_ui",  # Must be before django.contrib.admin
     "django.contrib.admin",
     "django.contrib.gis",  # add this line
+    "django.contrib.postgres",  # trigram lookups for search
     "active_link",  # for formating navigation links
 ]
 
@@ -153,6 +154,8 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    # Outermost so that it measures the full cost of each request
+    "api_app.instrumentation.InstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -370,5 +373,27 @@ OAUTH2_PROVIDER = {
 
 CORS_ORIGIN_ALLOW_ALL = True
 
+# Request instrumentation (query counts, DB/serializer time, Server-Timing headers)
+# ------------------------------------------------------------------------------
+REQUEST_INSTRUMENTATION = env.bool("DJANGO_REQUEST_INSTRUMENTATION", default=False)
+# Rolling window, in seconds, of requests summarized on the instrumentation report page
+REQUEST_INSTRUMENTATION_WINDOW = env.int("DJANGO_REQUEST_INSTRUMENTATION_WINDOW", default=3600)
+REQUEST_INSTRUMENTATION_MAX_ENTRIES = env.int(
+    "DJANGO_REQUEST_INSTRUMENTATION_MAX_ENTRIES", default=5000
+)
+
+# DOI matching
+# ------------------------------------------------------------------------------
+# Number of CMR dataproducts matched and written to the database at a time, which bounds
+# the memory used by a matching run
+CMR_INGEST_BATCH_SIZE = env.int("DJANGO_CMR_INGEST_BATCH_SIZE", default=50)
+# Maximum number of tasks a batch matching run is split between
+CMR_MATCHING_CONCURRENCY = env.int("DJANGO_CMR_MATCHING_CONCURRENCY", default=4)
+
+# Task progress
+# ------------------------------------------------------------------------------
+# Minimum number of seconds between the progress updates stored by long running tasks
+TASK_PROGRESS_INTERVAL = env.float("DJANGO_TASK_PROGRESS_INTERVAL", default=2.0)
+
 
 APPEND_SLASH = False
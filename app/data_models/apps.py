@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class DataModelsConfig(AppConfig):
     name = "data_models"
+
+    def ready(self):
+        from .summary import connect_signals
+
+        connect_signals()
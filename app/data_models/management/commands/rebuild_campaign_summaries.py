@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data_models.summary import rebuild_campaign_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored summary of every campaign"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_campaign_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Summarized {count} campaigns"))
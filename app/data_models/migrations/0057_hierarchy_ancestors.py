@@ -0,0 +1,68 @@
+# Generated by Django 4.1.5 on 2026-10-19 12:58
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def populate_ancestors(apps, schema_editor):
+    for model_name in ["PlatformType", "MeasurementType", "MeasurementStyle"]:
+        model = apps.get_model("data_models", model_name)
+        parents = dict(model.objects.values_list("uuid", "parent_id"))
+
+        records = list(model.objects.all())
+        for record in records:
+            uuid = record.uuid
+            while (uuid := parents.get(uuid)) and uuid not in record.ancestors:
+                record.ancestors.insert(0, uuid)
+        model.objects.bulk_update(records, ["ancestors"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_models', '0056_alter_doi_cmr_data_formats_alter_doi_cmr_dates_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measurementstyle',
+            name='ancestors',
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.UUIDField(), blank=True, default=list, editable=False, size=None
+            ),
+        ),
+        migrations.AddField(
+            model_name='measurementtype',
+            name='ancestors',
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.UUIDField(), blank=True, default=list, editable=False, size=None
+            ),
+        ),
+        migrations.AddField(
+            model_name='platformtype',
+            name='ancestors',
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.UUIDField(), blank=True, default=list, editable=False, size=None
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='measurementstyle',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['ancestors'], name='measurementstyle_ancestors_gin'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='measurementtype',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['ancestors'], name='measurementtype_ancestors_gin'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='platformtype',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['ancestors'], name='platformtype_ancestors_gin'
+            ),
+        ),
+        migrations.RunPython(populate_ancestors, migrations.RunPython.noop),
+    ]
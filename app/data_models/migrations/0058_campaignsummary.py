@@ -0,0 +1,151 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:01
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.fields
+from django.contrib.gis.db.models import Extent
+from django.contrib.gis.geos import Polygon
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+import django.db.models.deletion
+
+
+def _aggregate_by_campaign(queryset, campaign_lookup, **aggregates):
+    rows = queryset.values(campaign_lookup).annotate(**aggregates).order_by()
+    return {row.pop(campaign_lookup): row for row in rows.iterator()}
+
+
+def populate_summaries(apps, schema_editor):
+    """
+    Frozen copy of `data_models.summary.rebuild_campaign_summaries`, storing the fields
+    that exist at this point of the migrations
+    """
+    Campaign = apps.get_model("data_models", "Campaign")
+    CampaignSummary = apps.get_model("data_models", "CampaignSummary")
+    CollectionPeriod = apps.get_model("data_models", "CollectionPeriod")
+    Deployment = apps.get_model("data_models", "Deployment")
+    DOI = apps.get_model("data_models", "DOI")
+    IOP = apps.get_model("data_models", "IOP")
+    SignificantEvent = apps.get_model("data_models", "SignificantEvent")
+
+    deployments = _aggregate_by_campaign(
+        Deployment.objects.all(),
+        "campaign",
+        number_deployments=Count("uuid"),
+        start_date=Min("start_date"),
+        end_date=Max("end_date"),
+        extent=Extent("spatial_bounds"),
+    )
+    collection_periods = _aggregate_by_campaign(
+        CollectionPeriod.objects.all(),
+        "deployment__campaign",
+        number_ventures=Sum("number_ventures"),
+        platforms=ArrayAgg("platform", distinct=True),
+    )
+    instruments = _aggregate_by_campaign(
+        CollectionPeriod.instruments.through.objects.all(),
+        "collectionperiod__deployment__campaign",
+        instruments=ArrayAgg("instrument", distinct=True),
+    )
+    iops = _aggregate_by_campaign(IOP.objects.all(), "deployment__campaign", iops=ArrayAgg("uuid"))
+    significant_events = _aggregate_by_campaign(
+        SignificantEvent.objects.all(),
+        "deployment__campaign",
+        significant_events=ArrayAgg("uuid"),
+    )
+    dois = _aggregate_by_campaign(
+        DOI.campaigns.through.objects.all(), "campaign", number_data_products=Count("doi")
+    )
+
+    def summaries():
+        for uuid in Campaign.objects.values_list("uuid", flat=True).iterator():
+            deployment_stats = deployments.get(uuid, {})
+            extent = deployment_stats.get("extent")
+            yield CampaignSummary(
+                campaign_id=uuid,
+                instruments=sorted(instruments.get(uuid, {}).get("instruments", [])),
+                platforms=sorted(collection_periods.get(uuid, {}).get("platforms", [])),
+                iops=sorted(iops.get(uuid, {}).get("iops", [])),
+                significant_events=sorted(
+                    significant_events.get(uuid, {}).get("significant_events", [])
+                ),
+                number_ventures=collection_periods.get(uuid, {}).get("number_ventures") or 0,
+                number_data_products=dois.get(uuid, {}).get("number_data_products", 0),
+                number_deployments=deployment_stats.get("number_deployments", 0),
+                start_date=deployment_stats.get("start_date"),
+                end_date=deployment_stats.get("end_date"),
+                spatial_bounds=Polygon.from_bbox(extent) if extent else None,
+            )
+
+    CampaignSummary.objects.bulk_create(summaries(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_models', '0057_hierarchy_ancestors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampaignSummary',
+            fields=[
+                (
+                    'campaign',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='summary',
+                        serialize=False,
+                        to='data_models.campaign',
+                    ),
+                ),
+                (
+                    'instruments',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.UUIDField(), blank=True, default=list, size=None
+                    ),
+                ),
+                (
+                    'platforms',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.UUIDField(), blank=True, default=list, size=None
+                    ),
+                ),
+                (
+                    'iops',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.UUIDField(), blank=True, default=list, size=None
+                    ),
+                ),
+                (
+                    'significant_events',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.UUIDField(), blank=True, default=list, size=None
+                    ),
+                ),
+                ('number_ventures', models.PositiveIntegerField(default=0)),
+                ('number_data_products', models.PositiveIntegerField(default=0)),
+                ('number_deployments', models.PositiveIntegerField(default=0)),
+                (
+                    'start_date',
+                    models.DateField(blank=True, help_text='Start of first deployment', null=True),
+                ),
+                (
+                    'end_date',
+                    models.DateField(blank=True, help_text='End of last deployment', null=True),
+                ),
+                (
+                    'spatial_bounds',
+                    django.contrib.gis.db.models.fields.PolygonField(
+                        blank=True,
+                        help_text='Bounding box of the spatial bounds of all deployments',
+                        null=True,
+                        srid=4326,
+                    ),
+                ),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:03
+
+import json
+
+from django.contrib.gis.db.models import Union
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+# Frozen copy of `data_models.spatial.SIMPLIFY_TOLERANCE` and `simplified_geojson`
+SIMPLIFY_TOLERANCE = 0.01
+
+
+def simplified_geojson(geometry):
+    if not geometry:
+        return None
+    return json.loads(geometry.simplify(SIMPLIFY_TOLERANCE, preserve_topology=True).geojson)
+
+
+def _update_in_batches(model, records, field_name):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_update(batch, [field_name])
+            batch = []
+    model.objects.bulk_update(batch, [field_name])
+
+
+def populate_geojson(apps, schema_editor):
+    Deployment = apps.get_model("data_models", "Deployment")
+    CampaignSummary = apps.get_model("data_models", "CampaignSummary")
+
+    def deployments():
+        records = Deployment.objects.filter(spatial_bounds__isnull=False).only(
+            "uuid", "spatial_bounds"
+        )
+        for deployment in records.iterator(chunk_size=BATCH_SIZE):
+            deployment.spatial_bounds_geojson = simplified_geojson(deployment.spatial_bounds)
+            yield deployment
+
+    _update_in_batches(Deployment, deployments(), "spatial_bounds_geojson")
+
+    def summaries():
+        unions = (
+            Deployment.objects.filter(spatial_bounds__isnull=False)
+            .values("campaign")
+            .annotate(union=Union("spatial_bounds"))
+            .order_by()
+        )
+        for row in unions.iterator():
+            yield CampaignSummary(
+                campaign_id=row["campaign"],
+                spatial_bounds_geojson=simplified_geojson(row["union"]),
+            )
+
+    _update_in_batches(CampaignSummary, summaries(), "spatial_bounds_geojson")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_models', '0058_campaignsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaignsummary',
+            name='spatial_bounds_geojson',
+            field=models.JSONField(
+                blank=True,
+                help_text='Simplified GeoJSON of the union of the spatial bounds of all deployments',
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name='deployment',
+            name='spatial_bounds_geojson',
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                help_text='Simplified GeoJSON of spatial_bounds',
+                null=True,
+            ),
+        ),
+        migrations.RunPython(populate_geojson, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,166 @@
+# Generated by Django 4.1.5 on 2026-10-19 13:06
+
+import ast
+from datetime import date
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations
+from psycopg2.extras import DateRange
+
+BATCH_SIZE = 500
+
+
+# Frozen copy of the helpers of `data_models.temporal` as of this migration
+
+
+def to_date_range(start, end):
+    if start is None and end is None:
+        return None
+    if start is not None and end is not None and start > end:
+        start, end = end, start
+    return DateRange(start, end, "[]")
+
+
+def _parse_cmr_date(value):
+    return date.fromisoformat(value[:10])
+
+
+def cmr_date_intervals(cmr_dates):
+    if isinstance(cmr_dates, str):
+        try:
+            cmr_dates = ast.literal_eval(cmr_dates)
+        except (ValueError, SyntaxError):
+            return []
+    if not isinstance(cmr_dates, list):
+        return []
+
+    intervals = []
+    for extent in cmr_dates:
+        if not isinstance(extent, dict):
+            continue
+        extent_intervals = []
+        try:
+            for range_date_time in extent.get("RangeDateTimes") or []:
+                begins = range_date_time.get("BeginningDateTime")
+                ends = range_date_time.get("EndingDateTime")
+                extent_intervals.append(
+                    (
+                        _parse_cmr_date(begins) if begins else None,
+                        _parse_cmr_date(ends) if ends else None,
+                    )
+                )
+            for single_date_time in extent.get("SingleDateTimes") or []:
+                single_date = _parse_cmr_date(single_date_time)
+                extent_intervals.append((single_date, single_date))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if extent_intervals and extent.get("EndsAtPresentFlag"):
+            extent_intervals[-1] = (extent_intervals[-1][0], None)
+        intervals.extend(extent_intervals)
+    return intervals
+
+
+def normalize_cmr_dates(cmr_dates):
+    intervals = [(start, end) for start, end in cmr_date_intervals(cmr_dates) if start or end]
+    if not intervals:
+        return None
+    starts = [start for start, _ in intervals if start]
+    ends = [end for _, end in intervals]
+    return to_date_range(min(starts) if starts else None, None if None in ends else max(ends))
+
+
+def populate_date_ranges(apps, schema_editor):
+    for model_name in ["Campaign", "Deployment", "IOP", "SignificantEvent", "DOI"]:
+        model = apps.get_model("data_models", model_name)
+        if model_name == "DOI":
+            records = model.objects.only("uuid", "cmr_dates")
+        else:
+            records = model.objects.only("uuid", "start_date", "end_date")
+        batch = []
+        for record in records.iterator(chunk_size=BATCH_SIZE):
+            if model_name == "DOI":
+                record.date_range = normalize_cmr_dates(record.cmr_dates)
+            else:
+                record.date_range = to_date_range(record.start_date, record.end_date)
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ["date_range"])
+                batch = []
+        model.objects.bulk_update(batch, ["date_range"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_models', '0059_spatial_bounds_geojson'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='date_range',
+            field=django.contrib.postgres.fields.ranges.DateRangeField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name='deployment',
+            name='date_range',
+            field=django.contrib.postgres.fields.ranges.DateRangeField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name='doi',
+            name='date_range',
+            field=django.contrib.postgres.fields.ranges.DateRangeField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name='iop',
+            name='date_range',
+            field=django.contrib.postgres.fields.ranges.DateRangeField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name='significantevent',
+            name='date_range',
+            field=django.contrib.postgres.fields.ranges.DateRangeField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=['date_range'], name='campaign_dates_gist'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='deployment',
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=['date_range'], name='deployment_dates_gist'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='doi',
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=['date_range'], name='doi_dates_gist'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='iop',
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=['date_range'], name='iop_dates_gist'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='significantevent',
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=['date_range'], name='significantevent_dates_gist'
+            ),
+        ),
+        migrations.RunPython(populate_date_ranges, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.1.5 on 2026-10-19 14:01
+
+import django.contrib.gis.db.models.fields
+from django.contrib.gis.db.models import Union
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+# Frozen copy of `data_models.spatial.as_multipolygon`
+def as_multipolygon(geometry):
+    if not geometry:
+        return None
+    if isinstance(geometry, Polygon):
+        return MultiPolygon(geometry, srid=geometry.srid)
+    return geometry
+
+
+def populate_spatial_union(apps, schema_editor):
+    Deployment = apps.get_model("data_models", "Deployment")
+    CampaignSummary = apps.get_model("data_models", "CampaignSummary")
+
+    unions = (
+        Deployment.objects.filter(spatial_bounds__isnull=False, campaign__summary__isnull=False)
+        .values("campaign")
+        .annotate(union=Union("spatial_bounds"))
+        .order_by()
+    )
+    batch = []
+    for row in unions.iterator(chunk_size=BATCH_SIZE):
+        batch.append(
+            CampaignSummary(
+                campaign_id=row["campaign"], spatial_union=as_multipolygon(row["union"])
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            CampaignSummary.objects.bulk_update(batch, ["spatial_union"])
+            batch = []
+    CampaignSummary.objects.bulk_update(batch, ["spatial_union"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_models', '0060_date_ranges'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaignsummary',
+            name='spatial_union',
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(
+                blank=True,
+                help_text='Union of the spatial bounds of all deployments',
+                null=True,
+                srid=4326,
+            ),
+        ),
+        migrations.RunPython(populate_spatial_union, migrations.RunPython.noop),
+    ]
@@ -5,9 +5,14 @@ import uuid
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.db import models as geomodels
+from django.contrib.postgres.fields import ArrayField, DateRangeField
+from django.contrib.postgres.indexes import GinIndex, GistIndex
 from django.contrib.postgres.search import SearchQuery, SearchVector
 from django.db import models
 
+from .spatial import filter_by_location, simplified_geojson
+from .temporal import filter_by_period, normalize_cmr_dates, to_date_range
+
 
 # TODO: Mv to config
 FRONTEND_URL = "https://airborne-inventory.surge.sh/"
@@ -45,6 +50,15 @@ def create_gcmd_str(categories):
 class BaseModel(models.Model):
     uuid = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False, unique=True)
 
+    # lookup of the geometry filtered by the `bbox` and `point` search parameters, if any
+    spatial_lookup = None
+    # lookup of the date range filtered by the `overlaps` search parameter, if any
+    temporal_lookup = None
+    # one-to-one relations rendered by the serializer, joined in the query of `search`
+    search_select_related = ()
+    # many valued relations rendered by the serializer, prefetched by `search`
+    search_prefetch_related = ()
+
     @staticmethod
     def search_fields():
         return ["short_name", "long_name"]
@@ -60,6 +74,10 @@ class BaseModel(models.Model):
             search_fields = cls.search_fields()
 
         queryset = cls.objects.all()
+        if cls.search_select_related:
+            queryset = queryset.select_related(*cls.search_select_related)
+        if cls.search_prefetch_related:
+            queryset = queryset.prefetch_related(*cls.search_prefetch_related)
 
         if search:
             vector = SearchVector(*search_fields)
@@ -68,6 +86,11 @@ class BaseModel(models.Model):
                 search=SearchQuery(search, search_type=search_type)
             )
 
+        if cls.spatial_lookup:
+            queryset = filter_by_location(queryset, cls.spatial_lookup, params)
+        if cls.temporal_lookup:
+            queryset = filter_by_period(queryset, cls.temporal_lookup, params)
+
         return queryset.filter(**params)
 
     @property
@@ -126,42 +149,135 @@ class LimitedInfoPriority(LimitedInfo):
         abstract = True
 
 
-class PlatformType(LimitedInfoPriority):
-    parent = models.ForeignKey(
-        "PlatformType", on_delete=models.CASCADE, related_name="sub_types", null=True, blank=True
-    )
+class Hierarchical(models.Model):
+    """
+    A record with a self-referential `parent`. The uuids of every ancestor of a record are
+    stored on `ancestors`, highest level first, and kept up to date when records are saved.
+    Ancestries and subtrees are then a single indexed lookup rather than one query per
+    level of the hierarchy, eg the platforms under a platform type are
+    `Platform.objects.filter(platform_type__in=platform_type.get_descendants(include_self=True))`.
+    """
 
-    gcmd_uuid = models.UUIDField(null=True, blank=True)
-    example = models.CharField(max_length=1024, blank=True, default="")
+    ancestors = ArrayField(models.UUIDField(), default=list, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+        indexes = [GinIndex(fields=["ancestors"], name="%(class)s_ancestors_gin")]
 
     @property
     def patriarch(self):
-        """Returns the highest level parent in the platform_type hierarchy
+        """Returns the highest level parent in the hierarchy
 
         Returns:
             [str]: short name of the highest level parent
         """
 
-        if self.parent:
-            return self.parent.patriarch
-        else:
+        if not self.ancestors:
             return self.short_name
+        return self.__class__.objects.values_list("short_name", flat=True).get(
+            uuid=self.ancestors[0]
+        )
 
-    class Meta(LimitedInfo.Meta):
+    def get_ancestors(self):
+        return self.__class__.objects.filter(uuid__in=self.ancestors)
+
+    def get_descendants(self, include_self=False):
+        query = models.Q(ancestors__contains=[self.uuid])
+        if include_self:
+            query |= models.Q(uuid=self.uuid)
+        return self.__class__.objects.filter(query)
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        previous_ancestors = list(self.ancestors)
+        self.ancestors = [*self.parent.ancestors, self.parent.uuid] if self.parent_id else []
+        super().save(*args, **kwargs)
+        if not adding and self.ancestors != previous_ancestors:
+            self._refresh_descendants()
+
+    def _refresh_descendants(self):
+        """Moves the subtree of this record under its new ancestors"""
+        descendants = list(self.get_descendants())
+        for descendant in descendants:
+            position = descendant.ancestors.index(self.uuid)
+            descendant.ancestors = [*self.ancestors, *descendant.ancestors[position:]]
+        self.__class__.objects.bulk_update(descendants, ["ancestors"])
+
+    @classmethod
+    def rebuild_ancestors(cls):
+        """Recomputes `ancestors` of every record, eg after records were loaded in bulk"""
+        parents = dict(cls.objects.values_list("uuid", "parent_id"))
+
+        def lineage(uuid):
+            ancestors = []
+            while (uuid := parents.get(uuid)) and uuid not in ancestors:
+                ancestors.insert(0, uuid)
+            return ancestors
+
+        records = list(cls.objects.only("uuid", "ancestors"))
+        for record in records:
+            record.ancestors = lineage(record.uuid)
+        cls.objects.bulk_update(records, ["ancestors"], batch_size=500)
+
+
+class Dated(models.Model):
+    """
+    A record that covers a period of time. The period is stored as an inclusive daterange
+    on `date_range` when records are saved, so that the records active during a window are
+    a single indexed lookup, eg `Deployment.objects.filter(date_range__overlap=window)`.
+    """
+
+    date_range = DateRangeField(blank=True, null=True, editable=False)
+
+    temporal_lookup = "date_range"
+
+    class Meta:
+        abstract = True
+        indexes = [GistIndex(fields=["date_range"], name="%(class)s_dates_gist")]
+
+    def get_date_range(self):
+        start_date, end_date = [
+            self._meta.get_field(name).to_python(getattr(self, name))
+            for name in ("start_date", "end_date")
+        ]
+        return to_date_range(start_date, end_date)
+
+    def save(self, *args, **kwargs):
+        self.date_range = self.get_date_range()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def rebuild_date_ranges(cls):
+        """Recomputes `date_range` of every record, eg after records were loaded in bulk"""
+        records = list(cls.objects.all())
+        for record in records:
+            record.date_range = record.get_date_range()
+        cls.objects.bulk_update(records, ["date_range"], batch_size=500)
+
+
+class PlatformType(Hierarchical, LimitedInfoPriority):
+    parent = models.ForeignKey(
+        "PlatformType", on_delete=models.CASCADE, related_name="sub_types", null=True, blank=True
+    )
+
+    gcmd_uuid = models.UUIDField(null=True, blank=True)
+    example = models.CharField(max_length=1024, blank=True, default="")
+
+    class Meta(LimitedInfo.Meta, Hierarchical.Meta):
         pass
 
 
-class MeasurementType(LimitedInfoPriority):
+class MeasurementType(Hierarchical, LimitedInfoPriority):
     parent = models.ForeignKey(
         "MeasurementType", on_delete=models.CASCADE, related_name="sub_types", null=True, blank=True
     )
     example = models.CharField(max_length=1024, blank=True, default="")
 
-    class Meta(LimitedInfo.Meta):
+    class Meta(LimitedInfo.Meta, Hierarchical.Meta):
         pass
 
 
-class MeasurementStyle(LimitedInfoPriority):
+class MeasurementStyle(Hierarchical, LimitedInfoPriority):
     parent = models.ForeignKey(
         "MeasurementStyle",
         on_delete=models.CASCADE,
@@ -171,7 +287,7 @@ class MeasurementStyle(LimitedInfoPriority):
     )
     example = models.CharField(max_length=1024, blank=True, default="")
 
-    class Meta(LimitedInfo.Meta):
+    class Meta(LimitedInfo.Meta, Hierarchical.Meta):
         pass
 
 
@@ -430,7 +546,7 @@ class DataModel(LimitedInfo):
         abstract = True
 
 
-class Campaign(DataModel):
+class Campaign(Dated, DataModel):
     description_long = models.TextField(
         default="",
         blank=True,
@@ -555,16 +671,12 @@ class Campaign(DataModel):
     def website_details(self):
         websites = []
         for website in self.websites.all():
-            website_type = website.website_type.long_name
-            order_priority = self.campaign_websites.get(
-                campaign=self.uuid, website=website
-            ).order_priority
             websites.append(
                 {
                     "title": website.title,
                     "url": website.url,
-                    "website_type": website_type,
-                    "order_priority": order_priority,
+                    "website_type": website.website_type.long_name,
+                    "order_priority": website.order_priority,
                 }
             )
         return websites
@@ -604,6 +716,66 @@ class Campaign(DataModel):
     def platforms(self):
         return select_related_distinct_data(self.deployments, "collection_periods__platform__uuid")
 
+    spatial_lookup = "summary__spatial_union"
+    search_select_related = ("summary",)
+    search_prefetch_related = (
+        "aliases",
+        "dois",
+        "deployments",
+        "websites__website_type",
+        "seasons",
+        "focus_areas",
+        "geophysical_concepts",
+        "gcmd_projects",
+        "platform_types",
+        "partner_orgs",
+        "repositories",
+    )
+
+    def get_summary(self):
+        """Returns the stored `CampaignSummary` of the campaign, computing it if it is missing"""
+        try:
+            return self.summary
+        except CampaignSummary.DoesNotExist:
+            from .summary import refresh_campaign_summaries
+
+            refresh_campaign_summaries([self.uuid])
+            summary = CampaignSummary.objects.get(campaign=self)
+            # the failed lookup cached None, which would recompute the summary on every call
+            Campaign.summary.related.set_cached_value(self, summary)
+            return summary
+
+    def get_timeline(self, window=None):
+        """Returns the deployments, IOPs and significant events of the campaign as a list of
+        dicts ordered by start date, in a single query
+
+        Args:
+            window (DateRange, optional): only include records that overlap this range
+        """
+
+        def entries(queryset, record_type, deployment):
+            if window:
+                queryset = queryset.filter(date_range__overlap=window)
+            return queryset.values(
+                "uuid",
+                "short_name",
+                "start_date",
+                "end_date",
+                type=models.Value(record_type, output_field=models.CharField()),
+                deployment_uuid=models.F(deployment),
+            )
+
+        timeline = entries(self.deployments.all(), "deployment", "uuid").union(
+            entries(IOP.objects.filter(deployment__campaign=self), "iop", "deployment"),
+            entries(
+                SignificantEvent.objects.filter(deployment__campaign=self),
+                "significant_event",
+                "deployment",
+            ),
+            all=True,
+        )
+        return list(timeline.order_by("start_date", "end_date", "short_name"))
+
     @staticmethod
     def search_fields():
         return ["short_name", "long_name", "description_short", "focus_phenomena"]
@@ -818,7 +990,7 @@ class Instrument(DataModel):
         return ["short_name", "long_name", "description"]
 
 
-class Deployment(DataModel):
+class Deployment(Dated, DataModel):
     campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name="deployments")
     aliases = GenericRelation(Alias)
 
@@ -834,19 +1006,28 @@ class Deployment(DataModel):
     )
 
     spatial_bounds = geomodels.PolygonField(blank=True, null=True)
+    spatial_bounds_geojson = models.JSONField(
+        blank=True, null=True, editable=False, help_text="Simplified GeoJSON of spatial_bounds"
+    )
     study_region_map = models.TextField(default="", blank=True, help_text=UNIMPLEMENTED_HELP_TEXT)
     ground_sites_map = models.TextField(default="", blank=True, help_text=UNIMPLEMENTED_HELP_TEXT)
     flight_tracks = models.TextField(default="", blank=True, help_text=UNIMPLEMENTED_HELP_TEXT)
 
+    spatial_lookup = "spatial_bounds"
+
     def __str__(self):
         return self.short_name
 
+    def save(self, *args, **kwargs):
+        self.spatial_bounds_geojson = simplified_geojson(self.spatial_bounds)
+        super().save(*args, **kwargs)
+
     @property
     def platforms(self):
         return select_related_distinct_data(self.collection_periods, "platform__uuid")
 
 
-class IopSe(BaseModel):
+class IopSe(Dated, BaseModel):
     deployment = models.ForeignKey(
         Deployment,
         on_delete=models.CASCADE,
@@ -890,7 +1071,7 @@ class IopSe(BaseModel):
     def search_fields():
         return ["short_name", "description"]
 
-    class Meta:
+    class Meta(Dated.Meta):
         abstract = True
 
 
@@ -1004,7 +1185,7 @@ class CollectionPeriod(BaseModel):
         return f"{campaign} | {deployment} | {self.platform} {platform_id}"
 
 
-class DOI(BaseModel):
+class DOI(Dated, BaseModel):
     concept_id = models.CharField(max_length=512, unique=True)
     doi = models.CharField(max_length=512, null=True, blank=True, default="")
     long_name = models.TextField(blank=True, default="")
@@ -1031,9 +1212,52 @@ class DOI(BaseModel):
     def get_absolute_url(self):
         return urllib.parse.urljoin("https://doi.org", self.doi)
 
+    def get_date_range(self):
+        return normalize_cmr_dates(self.cmr_dates)
+
     @staticmethod
     def search_fields():
         return ["concept_id", "long_name", "doi"]
 
-    class Meta:
+    class Meta(Dated.Meta):
         verbose_name = "DOI"
+
+
+class CampaignSummary(models.Model):
+    """
+    Statistics of a campaign derived from its deployments, collection periods, events and
+    DOIs, stored so that campaigns can be listed without aggregating across those tables.
+    Summaries are refreshed by the receivers in `data_models.summary` and can be rebuilt
+    with `manage.py rebuild_campaign_summaries`.
+    """
+
+    campaign = models.OneToOneField(
+        Campaign, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    instruments = ArrayField(models.UUIDField(), default=list, blank=True)
+    platforms = ArrayField(models.UUIDField(), default=list, blank=True)
+    iops = ArrayField(models.UUIDField(), default=list, blank=True)
+    significant_events = ArrayField(models.UUIDField(), default=list, blank=True)
+
+    number_ventures = models.PositiveIntegerField(default=0)
+    number_data_products = models.PositiveIntegerField(default=0)
+    number_deployments = models.PositiveIntegerField(default=0)
+
+    start_date = models.DateField(blank=True, null=True, help_text="Start of first deployment")
+    end_date = models.DateField(blank=True, null=True, help_text="End of last deployment")
+    spatial_bounds = geomodels.PolygonField(
+        blank=True, null=True, help_text="Bounding box of the spatial bounds of all deployments"
+    )
+    spatial_union = geomodels.MultiPolygonField(
+        blank=True, null=True, help_text="Union of the spatial bounds of all deployments"
+    )
+    spatial_bounds_geojson = models.JSONField(
+        blank=True,
+        null=True,
+        help_text="Simplified GeoJSON of the union of the spatial bounds of all deployments",
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Summary of {self.campaign_id}"
@@ -2,13 +2,19 @@ import json
 from uuid import uuid4
 
 from django.contrib.gis.geos import GEOSGeometry
+from django.contrib.postgres import fields as postgres_fields
 from rest_framework import serializers
 
 from data_models import models
+from data_models.temporal import range_bounds
 
 
 def get_uuids(database_entries):
-    return list(database_entries.values_list("uuid", flat=True))
+    queryset = database_entries.all()
+    # related records prefetched by the view are read from memory rather than queried again
+    if queryset._result_cache is not None:
+        return [entry.uuid for entry in queryset]
+    return list(queryset.values_list("uuid", flat=True))
 
 
 def get_geojson_from_bb(bb_data):
@@ -49,7 +55,23 @@ def change_bbox_to_polygon(validated_data, key="spatial_bounds"):
     return validated_data
 
 
+class DateRangeField(serializers.Field):
+    """Represents an inclusive date range as {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}"""
+
+    def to_representation(self, value):
+        start, end = range_bounds(value)
+        return {
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+        }
+
+
 class BaseSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        postgres_fields.DateRangeField: DateRangeField,
+    }
+
     uuid = serializers.UUIDField(default=uuid4)
 
 
@@ -67,6 +89,13 @@ class GetDoiSerializer(BaseSerializer):
         return get_uuids(obj.dois)
 
 
+class GetDescendantsSerializer(BaseSerializer):
+    descendants = serializers.SerializerMethodField(read_only=True)
+
+    def get_descendants(self, obj):
+        return get_uuids(obj.get_descendants())
+
+
 class TextImageField(serializers.ImageField):
     def to_internal_value(self, data):
         """
@@ -85,7 +114,7 @@ class ImageSerializer(BaseSerializer):
         fields = "__all__"
 
 
-class PlatformTypeSerializer(BaseSerializer):
+class PlatformTypeSerializer(GetDescendantsSerializer):
     platforms = serializers.SerializerMethodField(read_only=True)
     campaigns = serializers.SerializerMethodField(read_only=True)
     sub_types = serializers.SerializerMethodField(read_only=True)
@@ -106,7 +135,7 @@ class PlatformTypeSerializer(BaseSerializer):
         extra_kwargs = {"notes_internal": {"write_only": True}}
 
 
-class MeasurementTypeSerializer(BaseSerializer):
+class MeasurementTypeSerializer(GetDescendantsSerializer):
     instruments = serializers.SerializerMethodField(read_only=True)
     sub_types = serializers.SerializerMethodField(read_only=True)
 
@@ -122,7 +151,7 @@ class MeasurementTypeSerializer(BaseSerializer):
         extra_kwargs = {"notes_internal": {"write_only": True}}
 
 
-class MeasurementStyleSerializer(BaseSerializer):
+class MeasurementStyleSerializer(GetDescendantsSerializer):
     instruments = serializers.SerializerMethodField(read_only=True)
     sub_types = serializers.SerializerMethodField(read_only=True)
 
@@ -396,13 +425,23 @@ class InstrumentSerializer(GetAliasSerializer, GetDoiSerializer):
 class CampaignSerializer(GetAliasSerializer, GetDoiSerializer):
     deployments = serializers.SerializerMethodField(read_only=True)
     websites = serializers.SerializerMethodField(read_only=True)
-    significant_events = serializers.ListField(read_only=True)
-    iops = serializers.ListField(read_only=True)
-    number_ventures = serializers.IntegerField(read_only=True)
-    number_data_products = serializers.IntegerField(read_only=True)
-    number_deployments = serializers.IntegerField(read_only=True)
-    instruments = serializers.ListField(read_only=True)
-    platforms = serializers.ListField(read_only=True)
+    # derived statistics are read from the stored campaign summary
+    significant_events = serializers.ListField(
+        source="get_summary.significant_events", read_only=True
+    )
+    iops = serializers.ListField(source="get_summary.iops", read_only=True)
+    number_ventures = serializers.IntegerField(source="get_summary.number_ventures", read_only=True)
+    number_data_products = serializers.IntegerField(
+        source="get_summary.number_data_products", read_only=True
+    )
+    number_deployments = serializers.IntegerField(
+        source="get_summary.number_deployments", read_only=True
+    )
+    instruments = serializers.ListField(source="get_summary.instruments", read_only=True)
+    platforms = serializers.ListField(source="get_summary.platforms", read_only=True)
+    spatial_bounds = serializers.JSONField(
+        source="get_summary.spatial_bounds_geojson", read_only=True
+    )
     website_details = serializers.ListField(read_only=True)
 
     def get_deployments(self, obj):
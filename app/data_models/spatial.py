@@ -0,0 +1,110 @@
+"""
+Spatial filtering of records by the `bbox`, `bbox_relation`, `point` and `radius` search
+parameters of the list endpoints, and the simplified GeoJSON stored alongside geometries.
+
+    ?bbox=N,S,E,W                          records intersecting the box
+    ?bbox=N,S,E,W&bbox_relation=contains   records entirely inside the box
+    ?point=LAT,LON&radius=KM               records within KM kilometers of the point
+
+Every filter includes a lookup served by the GiST index of the geometry column.
+"""
+import json
+from math import cos, radians
+
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.contrib.gis.measure import D
+
+SRID = 4326
+KM_PER_DEGREE = 111.32
+# Tolerance, in degrees (roughly 1km), of the simplified GeoJSON returned by the API
+SIMPLIFY_TOLERANCE = 0.01
+BBOX_RELATIONS = {"intersects": "intersects", "contains": "coveredby"}
+
+
+def parse_bbox(value):
+    """
+    Converts a "N,S,E,W" bounding box, the format used by the admin forms, to a polygon.
+    Boxes crossing the antimeridian (W > E) are split in two.
+    """
+    try:
+        n, s, e, w = [float(coord) for coord in value.split(",")]
+    except ValueError:
+        raise ValueError(f"bbox must be formatted as 'N,S,E,W', got '{value}'")
+    if not (-90 <= s <= n <= 90 and -180 <= w <= 180 and -180 <= e <= 180):
+        raise ValueError(f"bbox '{value}' is out of range")
+
+    if w > e:
+        return MultiPolygon(
+            Polygon.from_bbox((w, s, 180, n)), Polygon.from_bbox((-180, s, e, n)), srid=SRID
+        )
+    box = Polygon.from_bbox((w, s, e, n))
+    box.srid = SRID
+    return box
+
+
+def parse_point(value):
+    """Converts a "LAT,LON" string to a point"""
+    try:
+        lat, lon = [float(coord) for coord in value.split(",")]
+    except ValueError:
+        raise ValueError(f"point must be formatted as 'LAT,LON', got '{value}'")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"point '{value}' is out of range")
+    return Point(lon, lat, srid=SRID)
+
+
+def filter_by_location(queryset, lookup, params):
+    """
+    Applies, and removes from `params`, the spatial search parameters
+
+    Args:
+        queryset (QuerySet): records to filter
+        lookup (str): lookup of the geometry to filter on, eg "spatial_bounds"
+        params (dict): search parameters of the request
+
+    Returns:
+        QuerySet: the filtered records
+    """
+    bbox = params.pop("bbox", None)
+    relation = params.pop("bbox_relation", "intersects")
+    point = params.pop("point", None)
+    radius = params.pop("radius", None)
+
+    if bbox:
+        if relation not in BBOX_RELATIONS:
+            raise ValueError(f"bbox_relation must be one of {', '.join(BBOX_RELATIONS)}")
+        queryset = queryset.filter(**{f"{lookup}__{BBOX_RELATIONS[relation]}": parse_bbox(bbox)})
+
+    if point:
+        center = parse_point(point)
+        try:
+            radius = float(radius)
+        except (TypeError, ValueError):
+            raise ValueError("radius, in kilometers, is required with point")
+        # `dwithin` works in degrees on this SRID and uses the index to narrow the records
+        # down to a box around the point, which `distance_lte` refines to the exact circle
+        degrees = radius / (KM_PER_DEGREE * max(cos(radians(center.y)), 0.01))
+        queryset = queryset.filter(
+            **{
+                f"{lookup}__dwithin": (center, degrees),
+                f"{lookup}__distance_lte": (center, D(km=radius)),
+            }
+        )
+
+    return queryset
+
+
+def as_multipolygon(geometry):
+    """A polygon or multipolygon, such as a union of polygons, as a multipolygon, or None"""
+    if not geometry:
+        return None
+    if isinstance(geometry, Polygon):
+        return MultiPolygon(geometry, srid=geometry.srid)
+    return geometry
+
+
+def simplified_geojson(geometry):
+    """GeoJSON of a geometry simplified for display on a map, or None"""
+    if not geometry:
+        return None
+    return json.loads(geometry.simplify(SIMPLIFY_TOLERANCE, preserve_topology=True).geojson)
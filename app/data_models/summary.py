@@ -0,0 +1,233 @@
+"""
+Maintenance of the denormalized `CampaignSummary` of each campaign.
+
+A campaign's summary is refreshed once the transaction that saves or deletes one of its
+deployments, collection periods, IOPs, significant events or DOIs commits, which is when
+drafts of those records are published. Refreshing any number of campaigns takes a fixed
+number of grouped queries.
+"""
+from functools import partial
+
+from django.contrib.gis.db.models import Extent, Union
+from django.contrib.gis.geos import Polygon
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+
+from .models import (
+    IOP,
+    Campaign,
+    CampaignSummary,
+    CollectionPeriod,
+    Deployment,
+    DOI,
+    SignificantEvent,
+)
+from .spatial import as_multipolygon, simplified_geojson
+
+# Maps each model that contributes to a summary to the lookup of its campaign(s)
+CAMPAIGN_LOOKUPS = {
+    Deployment: "campaign",
+    CollectionPeriod: "deployment__campaign",
+    IOP: "deployment__campaign",
+    SignificantEvent: "deployment__campaign",
+    DOI: "campaigns",
+}
+
+SUMMARY_FIELDS = [
+    "instruments",
+    "platforms",
+    "iops",
+    "significant_events",
+    "number_ventures",
+    "number_data_products",
+    "number_deployments",
+    "start_date",
+    "end_date",
+    "spatial_bounds",
+    "spatial_union",
+    "spatial_bounds_geojson",
+    "updated_at",
+]
+
+
+def _aggregate_by_campaign(queryset, campaign_lookup, **aggregates):
+    """Returns {campaign uuid: aggregates} for the rows of a queryset"""
+    rows = queryset.values(campaign_lookup).annotate(**aggregates).order_by()
+    return {row.pop(campaign_lookup): row for row in rows}
+
+
+def compute_campaign_summaries(campaign_uuids):
+    """Builds unsaved summaries of the provided campaigns from their related records
+
+    Args:
+        campaign_uuids (list): uuids of existing campaigns
+
+    Returns:
+        list[CampaignSummary]: one summary per campaign
+    """
+    deployments = _aggregate_by_campaign(
+        Deployment.objects.filter(campaign__in=campaign_uuids),
+        "campaign",
+        number_deployments=Count("uuid"),
+        start_date=Min("start_date"),
+        end_date=Max("end_date"),
+        extent=Extent("spatial_bounds"),
+        union=Union("spatial_bounds"),
+    )
+    collection_periods = _aggregate_by_campaign(
+        CollectionPeriod.objects.filter(deployment__campaign__in=campaign_uuids),
+        "deployment__campaign",
+        number_ventures=Sum("number_ventures"),
+        platforms=ArrayAgg("platform", distinct=True),
+    )
+    instruments = _aggregate_by_campaign(
+        CollectionPeriod.instruments.through.objects.filter(
+            collectionperiod__deployment__campaign__in=campaign_uuids
+        ),
+        "collectionperiod__deployment__campaign",
+        instruments=ArrayAgg("instrument", distinct=True),
+    )
+    iops = _aggregate_by_campaign(
+        IOP.objects.filter(deployment__campaign__in=campaign_uuids),
+        "deployment__campaign",
+        iops=ArrayAgg("uuid"),
+    )
+    significant_events = _aggregate_by_campaign(
+        SignificantEvent.objects.filter(deployment__campaign__in=campaign_uuids),
+        "deployment__campaign",
+        significant_events=ArrayAgg("uuid"),
+    )
+    dois = _aggregate_by_campaign(
+        DOI.campaigns.through.objects.filter(campaign__in=campaign_uuids),
+        "campaign",
+        number_data_products=Count("doi"),
+    )
+
+    summaries = []
+    for uuid in campaign_uuids:
+        deployment_stats = deployments.get(uuid, {})
+        extent, union = deployment_stats.get("extent"), deployment_stats.get("union")
+        summaries.append(
+            CampaignSummary(
+                campaign_id=uuid,
+                instruments=sorted(instruments.get(uuid, {}).get("instruments", [])),
+                platforms=sorted(collection_periods.get(uuid, {}).get("platforms", [])),
+                iops=sorted(iops.get(uuid, {}).get("iops", [])),
+                significant_events=sorted(
+                    significant_events.get(uuid, {}).get("significant_events", [])
+                ),
+                number_ventures=collection_periods.get(uuid, {}).get("number_ventures") or 0,
+                number_data_products=dois.get(uuid, {}).get("number_data_products", 0),
+                number_deployments=deployment_stats.get("number_deployments", 0),
+                start_date=deployment_stats.get("start_date"),
+                end_date=deployment_stats.get("end_date"),
+                spatial_bounds=Polygon.from_bbox(extent) if extent else None,
+                spatial_union=as_multipolygon(union),
+                spatial_bounds_geojson=simplified_geojson(union),
+            )
+        )
+    return summaries
+
+
+def refresh_campaign_summaries(campaign_uuids):
+    """Recomputes and stores the summaries of the provided campaigns"""
+    # campaigns may have been deleted since the refresh was requested
+    campaign_uuids = list(
+        Campaign.objects.filter(uuid__in=set(campaign_uuids)).values_list("uuid", flat=True)
+    )
+    CampaignSummary.objects.bulk_create(
+        compute_campaign_summaries(campaign_uuids),
+        update_conflicts=True,
+        unique_fields=["campaign"],
+        update_fields=SUMMARY_FIELDS,
+    )
+
+
+def rebuild_campaign_summaries(batch_size=500):
+    """Recomputes the summary of every campaign. Returns the number of summaries stored."""
+    campaign_uuids = list(Campaign.objects.values_list("uuid", flat=True))
+    for start in range(0, len(campaign_uuids), batch_size):
+        refresh_campaign_summaries(campaign_uuids[start : start + batch_size])
+    return len(campaign_uuids)
+
+
+def _stored_campaigns(instance):
+    lookup = CAMPAIGN_LOOKUPS[type(instance)]
+    return set(
+        type(instance)
+        .objects.filter(pk=instance.pk, **{f"{lookup}__isnull": False})
+        .values_list(lookup, flat=True)
+    )
+
+
+def _schedule_refresh(campaign_uuids):
+    if campaign_uuids:
+        transaction.on_commit(partial(refresh_campaign_summaries, campaign_uuids))
+
+
+def remember_stored_campaigns(sender, instance, **kwargs):
+    """Keeps the campaigns a record belonged to before it is moved or deleted"""
+    if kwargs.get("raw") or instance._state.adding:
+        return
+    instance._summary_campaigns = _stored_campaigns(instance)
+
+
+def refresh_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _schedule_refresh(_stored_campaigns(instance) | getattr(instance, "_summary_campaigns", set()))
+
+
+def refresh_on_delete(sender, instance, **kwargs):
+    _schedule_refresh(getattr(instance, "_summary_campaigns", set()))
+
+
+def refresh_on_campaign_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _schedule_refresh({instance.uuid})
+
+
+def refresh_on_doi_campaigns_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        instance._summary_campaigns = (
+            {instance.pk} if reverse else set(instance.campaigns.values_list("uuid", flat=True))
+        )
+    elif action in ("post_add", "post_remove"):
+        _schedule_refresh({instance.pk} if reverse else set(pk_set))
+    elif action == "post_clear":
+        _schedule_refresh(getattr(instance, "_summary_campaigns", set()))
+
+
+def refresh_on_instruments_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    collection_periods = CollectionPeriod.objects.filter(
+        pk__in=pk_set if reverse else [instance.pk]
+    )
+    _schedule_refresh(
+        set(collection_periods.values_list("deployment__campaign", flat=True).distinct())
+    )
+
+
+def connect_signals():
+    for model in CAMPAIGN_LOOKUPS:
+        uid = f"campaign_summary_{model.__name__}"
+        pre_save.connect(remember_stored_campaigns, sender=model, dispatch_uid=uid)
+        pre_delete.connect(remember_stored_campaigns, sender=model, dispatch_uid=uid)
+        post_save.connect(refresh_on_save, sender=model, dispatch_uid=uid)
+        post_delete.connect(refresh_on_delete, sender=model, dispatch_uid=uid)
+    post_save.connect(
+        refresh_on_campaign_created, sender=Campaign, dispatch_uid="campaign_summary_Campaign"
+    )
+    m2m_changed.connect(
+        refresh_on_doi_campaigns_changed,
+        sender=DOI.campaigns.through,
+        dispatch_uid="campaign_summary_doi_campaigns",
+    )
+    m2m_changed.connect(
+        refresh_on_instruments_changed,
+        sender=CollectionPeriod.instruments.through,
+        dispatch_uid="campaign_summary_instruments",
+    )
@@ -0,0 +1,127 @@
+"""
+Date ranges of records that cover a period of time, and filtering of records by the
+`overlaps` search parameter of the list endpoints.
+
+    ?overlaps=YYYY-MM-DD/YYYY-MM-DD    records active at any time in the window
+    ?overlaps=YYYY-MM-DD/              records active on or after a date
+
+Ranges include both of their end dates. A missing end date leaves the range open.
+"""
+import ast
+from datetime import date, timedelta
+
+from psycopg2.extras import DateRange
+
+
+def to_date_range(start, end):
+    """Returns the inclusive range between two dates, which may be in either order, or None"""
+    if start is None and end is None:
+        return None
+    if start is not None and end is not None and start > end:
+        start, end = end, start
+    return DateRange(start, end, "[]")
+
+
+def range_bounds(date_range):
+    """Returns the first and last dates (inclusive) of a range, None for open bounds"""
+    if not date_range or date_range.isempty:
+        return None, None
+    start, end = date_range.lower, date_range.upper
+    if start is not None and not date_range.lower_inc:
+        start += timedelta(days=1)
+    if end is not None and not date_range.upper_inc:
+        end -= timedelta(days=1)
+    return start, end
+
+
+def parse_window(value):
+    """Converts a "YYYY-MM-DD/YYYY-MM-DD" window, either side of which may be empty, to a range"""
+    try:
+        start, end = [date.fromisoformat(part) if part else None for part in value.split("/")]
+    except ValueError:
+        raise ValueError(f"overlaps must be formatted as 'YYYY-MM-DD/YYYY-MM-DD', got '{value}'")
+    if start is not None and end is not None and start > end:
+        raise ValueError(f"overlaps '{value}' ends before it starts")
+    return DateRange(start, end, "[]")
+
+
+def filter_by_period(queryset, lookup, params):
+    """
+    Applies, and removes from `params`, the `overlaps` search parameter
+
+    Args:
+        queryset (QuerySet): records to filter
+        lookup (str): lookup of the date range to filter on, eg "date_range"
+        params (dict): search parameters of the request
+
+    Returns:
+        QuerySet: the filtered records
+    """
+    window = params.pop("overlaps", None)
+    if window:
+        queryset = queryset.filter(**{f"{lookup}__overlap": parse_window(window)})
+    return queryset
+
+
+def _parse_cmr_date(value):
+    return date.fromisoformat(value[:10])
+
+
+def cmr_date_intervals(cmr_dates):
+    """
+    Returns the (start, end) dates of each range and single date of the UMM-C
+    `TemporalExtents` of a collection, as stored on `DOI.cmr_dates`. Ends are None for
+    ranges without an ending date or that end at present, and unreadable entries are skipped.
+
+    Args:
+        cmr_dates (list|str): the temporal extents, or their repr as stored by DOI drafts
+    """
+    if isinstance(cmr_dates, str):
+        try:
+            cmr_dates = ast.literal_eval(cmr_dates)
+        except (ValueError, SyntaxError):
+            return []
+    if not isinstance(cmr_dates, list):
+        return []
+
+    intervals = []
+    for extent in cmr_dates:
+        if not isinstance(extent, dict):
+            continue
+        extent_intervals = []
+        try:
+            for range_date_time in extent.get("RangeDateTimes") or []:
+                begins = range_date_time.get("BeginningDateTime")
+                ends = range_date_time.get("EndingDateTime")
+                extent_intervals.append(
+                    (
+                        _parse_cmr_date(begins) if begins else None,
+                        _parse_cmr_date(ends) if ends else None,
+                    )
+                )
+            for single_date_time in extent.get("SingleDateTimes") or []:
+                single_date = _parse_cmr_date(single_date_time)
+                extent_intervals.append((single_date, single_date))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if extent_intervals and extent.get("EndsAtPresentFlag"):
+            extent_intervals[-1] = (extent_intervals[-1][0], None)
+        intervals.extend(extent_intervals)
+    return intervals
+
+
+def normalize_cmr_dates(cmr_dates):
+    """
+    Returns the range covered by the UMM-C `TemporalExtents` of a collection, as stored on
+    `DOI.cmr_dates`, or None if it has no readable dates. Extents flagged as ending at
+    present leave the range open.
+
+    Args:
+        cmr_dates (list|str): the temporal extents, or their repr as stored by DOI drafts
+    """
+    intervals = [(start, end) for start, end in cmr_date_intervals(cmr_dates) if start or end]
+    if not intervals:
+        return None
+    starts = [start for start, _ in intervals if start]
+    ends = [end for _, end in intervals]
+    return to_date_range(min(starts) if starts else None, None if None in ends else max(ends))
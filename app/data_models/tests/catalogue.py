@@ -0,0 +1,631 @@
+"""
+Seeded generator for large synthetic catalogues.
+
+Unlike the factories, which save one record (and its related records) at a time, the
+generator builds every record in memory and writes each table with `bulk_create`. This
+makes it practical to build a catalogue with thousands of campaigns, including their
+deployments, collection periods, DOIs, GCMD keywords, draft history and approval logs.
+The same seed always produces the same catalogue.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from admg_webapp.users.models import User
+from api_app.models import ApprovalLog, Change, ChangeReference, get_display_name
+from api_app.search import rebuild_index
+from data_models import models
+from data_models.summary import rebuild_campaign_summaries
+
+BATCH_SIZE = 2000
+
+WORDS = [
+    "aerosol",
+    "arctic",
+    "boundary",
+    "carbon",
+    "cloud",
+    "coastal",
+    "convection",
+    "cryosphere",
+    "dust",
+    "emission",
+    "flux",
+    "forest",
+    "glacier",
+    "humidity",
+    "ice",
+    "lidar",
+    "marine",
+    "methane",
+    "monsoon",
+    "ocean",
+    "ozone",
+    "plume",
+    "polar",
+    "precipitation",
+    "radar",
+    "radiation",
+    "sea",
+    "smoke",
+    "snow",
+    "storm",
+    "stratosphere",
+    "surface",
+    "tropical",
+    "vapor",
+    "wetland",
+    "wind",
+]
+
+PLATFORM_TYPE_PATRIARCHS = ["Air Platforms", "Water Platforms", "Land Platforms", "Satellites"]
+
+LIMITED_FIELD_MODELS = [
+    models.PlatformType,
+    models.MeasurementType,
+    models.MeasurementStyle,
+    models.HomeBase,
+    models.FocusArea,
+    models.Season,
+    models.Repository,
+    models.MeasurementRegion,
+    models.GeographicalRegion,
+    models.GeophysicalConcept,
+    models.PartnerOrg,
+    models.WebsiteType,
+]
+
+GCMD_MODELS = [
+    models.GcmdProject,
+    models.GcmdInstrument,
+    models.GcmdPlatform,
+    models.GcmdPhenomenon,
+]
+
+# Approval logs that lead a draft to each status
+STATUS_LOGS = {
+    Change.Statuses.CREATED: [ApprovalLog.Actions.CREATE],
+    Change.Statuses.IN_PROGRESS: [ApprovalLog.Actions.CREATE, ApprovalLog.Actions.EDIT],
+    Change.Statuses.AWAITING_REVIEW: [
+        ApprovalLog.Actions.CREATE,
+        ApprovalLog.Actions.EDIT,
+        ApprovalLog.Actions.SUBMIT,
+    ],
+    Change.Statuses.IN_REVIEW: [
+        ApprovalLog.Actions.CREATE,
+        ApprovalLog.Actions.SUBMIT,
+        ApprovalLog.Actions.CLAIM,
+    ],
+    Change.Statuses.AWAITING_ADMIN_REVIEW: [
+        ApprovalLog.Actions.CREATE,
+        ApprovalLog.Actions.SUBMIT,
+        ApprovalLog.Actions.CLAIM,
+        ApprovalLog.Actions.REVIEW,
+    ],
+    Change.Statuses.IN_ADMIN_REVIEW: [
+        ApprovalLog.Actions.CREATE,
+        ApprovalLog.Actions.SUBMIT,
+        ApprovalLog.Actions.REVIEW,
+        ApprovalLog.Actions.CLAIM,
+    ],
+    Change.Statuses.PUBLISHED: [
+        ApprovalLog.Actions.CREATE,
+        ApprovalLog.Actions.SUBMIT,
+        ApprovalLog.Actions.REVIEW,
+        ApprovalLog.Actions.PUBLISH,
+    ],
+    Change.Statuses.IN_TRASH: [ApprovalLog.Actions.CREATE, ApprovalLog.Actions.TRASH],
+}
+
+
+@dataclass
+class CatalogueSize:
+    campaigns: int = 2000
+    deployments_per_campaign: int = 3
+    collection_periods_per_deployment: int = 2
+    instruments_per_collection_period: int = 3
+    dois_per_campaign: int = 5
+    platforms: int = 400
+    instruments: int = 800
+    gcmd_keywords_per_scheme: int = 500
+    limited_fields_per_model: int = 12
+    # Drafts of each campaign, platform, instrument, deployment and published DOI,
+    # including the published create draft
+    drafts_per_record: int = 3
+
+    def scaled(self, scale: float) -> "CatalogueSize":
+        """Scales the number of top level records, keeping the per-record counts"""
+        return replace(
+            self,
+            campaigns=max(1, round(self.campaigns * scale)),
+            platforms=max(1, round(self.platforms * scale)),
+            instruments=max(1, round(self.instruments * scale)),
+            gcmd_keywords_per_scheme=max(1, round(self.gcmd_keywords_per_scheme * scale)),
+        )
+
+
+@dataclass
+class Catalogue:
+    seed: int
+    size: CatalogueSize
+    admin: User
+    staff: User
+    campaigns: List[models.Campaign] = field(default_factory=list)
+    platforms: List[models.Platform] = field(default_factory=list)
+    instruments: List[models.Instrument] = field(default_factory=list)
+    deployments: List[models.Deployment] = field(default_factory=list)
+    dois: List[models.DOI] = field(default_factory=list)
+    gcmd_keywords: Dict[str, list] = field(default_factory=dict)
+    change_count: int = 0
+    approval_log_count: int = 0
+
+
+class CatalogueGenerator:
+    """Builds a reproducible synthetic catalogue with bulk inserts.
+
+    Args:
+        size (CatalogueSize, optional): Number of records to create. Defaults to CatalogueSize().
+        seed (int, optional): Seed of the random generator. Defaults to 0.
+    """
+
+    def __init__(self, size: CatalogueSize = None, seed: int = 0):
+        self.size = size or CatalogueSize()
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.changes = []
+        self.approval_logs = []
+        self.m2m_links = {}
+        self.clock = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+    def generate(self) -> Catalogue:
+        with transaction.atomic():
+            admin, staff = self._create_users()
+            catalogue = Catalogue(seed=self.seed, size=self.size, admin=admin, staff=staff)
+            self.users = [admin, staff]
+
+            limited_fields = self._create_limited_fields()
+            catalogue.gcmd_keywords = self._create_gcmd_keywords()
+            catalogue.platforms = self._create_platforms(limited_fields, catalogue.gcmd_keywords)
+            catalogue.instruments = self._create_instruments(
+                limited_fields, catalogue.gcmd_keywords
+            )
+            catalogue.campaigns = self._create_campaigns(limited_fields, catalogue.gcmd_keywords)
+            catalogue.deployments = self._create_deployments(catalogue.campaigns, limited_fields)
+            collection_periods = self._create_collection_periods(
+                catalogue.deployments, catalogue.platforms, catalogue.instruments, limited_fields
+            )
+            catalogue.dois = self._create_dois(collection_periods, catalogue.instruments)
+            self._create_aliases(catalogue.campaigns + catalogue.platforms + catalogue.instruments)
+
+            self._write_m2m_links()
+            Change.objects.bulk_create(self.changes, batch_size=BATCH_SIZE)
+            ApprovalLog.objects.bulk_create(self.approval_logs, batch_size=BATCH_SIZE)
+            ChangeReference.objects.sync(self.changes)
+            rebuild_index()
+            rebuild_campaign_summaries()
+
+        catalogue.change_count = len(self.changes)
+        catalogue.approval_log_count = len(self.approval_logs)
+        return catalogue
+
+    # Helpers
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.random.getrandbits(128), version=4)
+
+    def _words(self, count: int) -> str:
+        return " ".join(self.random.choices(WORDS, k=count))
+
+    def _name(self, prefix: str, index: int) -> str:
+        # the seed keeps names unique when generating into a database that has a catalogue
+        return f"{prefix}-{self.seed}-{index:05d}"
+
+    def _sample(self, population: list, count: int) -> list:
+        return self.random.sample(population, min(count, len(population)))
+
+    def _date(self, start: date, max_days: int) -> date:
+        return start + timedelta(days=self.random.randint(0, max_days))
+
+    def _tick(self) -> datetime:
+        self.clock += timedelta(minutes=self.random.randint(1, 120))
+        return self.clock
+
+    def _link(self, instance, field_name: str, targets: list) -> List[str]:
+        """Queues M2M rows for `instance.<field_name>`, returns the target uuids as strings"""
+        model_field = instance._meta.get_field(field_name)
+        rows = self.m2m_links.setdefault(model_field.remote_field.through, [])
+        for target in targets:
+            rows.append(
+                model_field.remote_field.through(
+                    **{
+                        model_field.m2m_column_name(): instance.uuid,
+                        model_field.m2m_reverse_name(): target.uuid,
+                    }
+                )
+            )
+        return [str(target.uuid) for target in targets]
+
+    def _write_m2m_links(self):
+        for through, rows in self.m2m_links.items():
+            through.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+    @staticmethod
+    def _as_update(instance, m2m_values: dict) -> dict:
+        """Serializes a record the way its published create draft stores it"""
+        update = {
+            model_field.name: Change._get_processed_value(model_field.value_from_object(instance))
+            for model_field in instance._meta.concrete_fields
+            if model_field.editable
+        }
+        return {**update, **m2m_values}
+
+    def _log(self, change: Change, actions: list):
+        for action in actions:
+            self.approval_logs.append(
+                ApprovalLog(
+                    change=change,
+                    user=self.random.choice(self.users),
+                    action=action,
+                )
+            )
+
+    def _add_change(self, model, action, status, update, previous=None, **kwargs) -> Change:
+        change = Change(
+            content_type=ContentType.objects.get_for_model(model),
+            action=action,
+            status=status,
+            update=update,
+            previous=previous or {},
+            display_name=get_display_name(update, previous or {}),
+            updated_at=self._tick(),
+            **kwargs,
+        )
+        change.refresh_cmr_fingerprint()
+        self.changes.append(change)
+        self._log(change, STATUS_LOGS[status])
+        return change
+
+    def _add_history(self, instance, m2m_values: dict, draft_count: int):
+        """
+        Adds the published create draft of a record, followed by published update drafts
+        and, when `draft_count` > 1, a latest update draft in a random workflow status
+        """
+        model = type(instance)
+        update = self._as_update(instance, m2m_values)
+        self._add_change(
+            model,
+            Change.Actions.CREATE,
+            Change.Statuses.PUBLISHED,
+            dict(update),
+            uuid=instance.uuid,
+            model_instance_uuid=instance.uuid,
+        )
+
+        edited_field = "long_name" if "long_name" in update else None
+        for version in range(1, draft_count):
+            is_latest = version == draft_count - 1
+            status = (
+                self.random.choice(list(Change.Statuses))
+                if is_latest
+                else Change.Statuses.PUBLISHED
+            )
+            if edited_field:
+                new_value = self._words(4)
+                previous = {edited_field: update[edited_field]}
+                draft_update = {edited_field: new_value}
+                if status == Change.Statuses.PUBLISHED:
+                    update[edited_field] = new_value
+                    setattr(instance, edited_field, new_value)
+            else:
+                previous, draft_update = {}, {}
+            self._add_change(
+                model,
+                Change.Actions.UPDATE,
+                status,
+                draft_update,
+                previous=previous,
+                model_instance_uuid=instance.uuid,
+            )
+
+    def _bulk_create(self, model, instances: list, m2m: dict, draft_count: int) -> list:
+        """
+        Queues the M2M rows and draft history of `instances`, then saves them. The history
+        comes first because published update drafts change the saved values.
+        `m2m` maps each instance's uuid to a dict of {field name: [related instances]}.
+        """
+        for instance in instances:
+            m2m_values = {
+                field_name: self._link(instance, field_name, targets)
+                for field_name, targets in m2m.get(instance.uuid, {}).items()
+            }
+            self._add_history(instance, m2m_values, draft_count)
+            if isinstance(instance, models.Dated):
+                # bulk_create skips the save() that stores date ranges
+                instance.date_range = instance.get_date_range()
+        return model.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+
+    # Records
+
+    def _create_users(self):
+        admin, _ = User.objects.get_or_create(
+            username="nimda", defaults={"role": User.Roles.ADMIN, "email": "nimda@localhost"}
+        )
+        staff, _ = User.objects.get_or_create(
+            username=f"catalogue-staff-{self.seed}",
+            defaults={"role": User.Roles.STAFF, "email": "staff@localhost"},
+        )
+        return admin, staff
+
+    def _create_limited_fields(self) -> Dict[type, list]:
+        limited_fields = {}
+        for model in LIMITED_FIELD_MODELS:
+            instances = []
+            for index in range(self.size.limited_fields_per_model):
+                instance = model(
+                    uuid=self._uuid(),
+                    short_name=self._name(model.__name__, index),
+                    long_name=self._words(3).title(),
+                )
+                if model is models.PlatformType and index < len(PLATFORM_TYPE_PATRIARCHS):
+                    instance.short_name = f"{PLATFORM_TYPE_PATRIARCHS[index]} {self.seed}"
+                if hasattr(instance, "parent_id") and index >= len(PLATFORM_TYPE_PATRIARCHS):
+                    instance.parent = self.random.choice(instances[: len(PLATFORM_TYPE_PATRIARCHS)])
+                    # bulk_create skips the save() that stores ancestors
+                    instance.ancestors = [instance.parent.uuid]
+                instances.append(instance)
+            limited_fields[model] = self._bulk_create(model, instances, {}, 1)
+        return limited_fields
+
+    def _create_gcmd_keywords(self) -> Dict[str, list]:
+        gcmd_keywords = {}
+        for model in GCMD_MODELS:
+            instances = []
+            for index in range(self.size.gcmd_keywords_per_scheme):
+                instance = model(uuid=self._uuid(), gcmd_uuid=self._uuid())
+                for attribute in model.gcmd_path:
+                    setattr(instance, attribute, self._words(2).upper())
+                if hasattr(instance, "short_name"):
+                    instance.short_name = self._name(model.__name__.upper(), index)
+                instances.append(instance)
+            gcmd_keywords[model.__name__] = self._bulk_create(model, instances, {}, 1)
+
+            # roughly one keyword in ten has an update waiting from a previous GCMD sync
+            for instance in self._sample(instances, len(instances) // 10):
+                attribute = model.gcmd_path[0]
+                self._add_change(
+                    model,
+                    Change.Actions.UPDATE,
+                    Change.Statuses.CREATED,
+                    {attribute: self._words(2).upper()},
+                    previous={attribute: getattr(instance, attribute)},
+                    model_instance_uuid=instance.uuid,
+                )
+        return gcmd_keywords
+
+    def _create_platforms(self, limited_fields: dict, gcmd_keywords: dict) -> list:
+        platform_types = limited_fields[models.PlatformType][len(PLATFORM_TYPE_PATRIARCHS) :]
+        instances, m2m = [], {}
+        for index in range(self.size.platforms):
+            instance = models.Platform(
+                uuid=self._uuid(),
+                short_name=self._name("PLATFORM", index),
+                long_name=self._words(3).title(),
+                platform_type=self.random.choice(platform_types),
+                description=self._words(20),
+                stationary=self.random.random() < 0.2,
+            )
+            instances.append(instance)
+            m2m[instance.uuid] = {
+                "gcmd_platforms": self._sample(gcmd_keywords["GcmdPlatform"], 1),
+            }
+        return self._bulk_create(models.Platform, instances, m2m, self.size.drafts_per_record)
+
+    def _create_instruments(self, limited_fields: dict, gcmd_keywords: dict) -> list:
+        instances, m2m = [], {}
+        for index in range(self.size.instruments):
+            instance = models.Instrument(
+                uuid=self._uuid(),
+                short_name=self._name("INSTRUMENT", index),
+                long_name=self._words(3).title(),
+                measurement_type=self.random.choice(limited_fields[models.MeasurementType]),
+                measurement_style=self.random.choice(limited_fields[models.MeasurementStyle]),
+                description=self._words(20),
+                technical_contact=self._words(2).title(),
+                spatial_resolution=f"{self.random.randint(1, 1000)} m",
+                temporal_resolution=f"{self.random.randint(1, 60)} s",
+                radiometric_frequency=f"{self.random.randint(1, 300)} GHz",
+            )
+            instances.append(instance)
+            m2m[instance.uuid] = {
+                "gcmd_instruments": self._sample(gcmd_keywords["GcmdInstrument"], 1),
+                "gcmd_phenomena": self._sample(gcmd_keywords["GcmdPhenomenon"], 2),
+                "measurement_regions": self._sample(limited_fields[models.MeasurementRegion], 1),
+                "repositories": self._sample(limited_fields[models.Repository], 1),
+            }
+        return self._bulk_create(models.Instrument, instances, m2m, self.size.drafts_per_record)
+
+    def _create_campaigns(self, limited_fields: dict, gcmd_keywords: dict) -> list:
+        instances, m2m = [], {}
+        for index in range(self.size.campaigns):
+            start_date = self._date(date(1990, 1, 1), 30 * 365)
+            instance = models.Campaign(
+                uuid=self._uuid(),
+                short_name=self._name("CAMPAIGN", index),
+                long_name=self._words(4).title(),
+                description_short=self._words(30),
+                description_long=self._words(120),
+                start_date=start_date,
+                end_date=self._date(start_date, 3 * 365),
+                region_description=self._words(6),
+                focus_phenomena=self._words(5),
+                lead_investigator=self._words(2).title(),
+                ongoing=self.random.random() < 0.1,
+                nasa_led=self.random.random() < 0.7,
+            )
+            instances.append(instance)
+            m2m[instance.uuid] = {
+                "seasons": self._sample(limited_fields[models.Season], 2),
+                "focus_areas": self._sample(limited_fields[models.FocusArea], 2),
+                "geophysical_concepts": self._sample(limited_fields[models.GeophysicalConcept], 2),
+                "platform_types": self._sample(limited_fields[models.PlatformType], 2),
+                "partner_orgs": self._sample(limited_fields[models.PartnerOrg], 2),
+                "repositories": self._sample(limited_fields[models.Repository], 1),
+                "gcmd_projects": self._sample(gcmd_keywords["GcmdProject"], 1),
+            }
+        return self._bulk_create(models.Campaign, instances, m2m, self.size.drafts_per_record)
+
+    def _create_deployments(self, campaigns: list, limited_fields: dict) -> list:
+        instances, m2m = [], {}
+        for campaign in campaigns:
+            for index in range(self.size.deployments_per_campaign):
+                start_date = self._date(campaign.start_date, 365)
+                instance = models.Deployment(
+                    uuid=self._uuid(),
+                    campaign=campaign,
+                    short_name=f"{campaign.short_name}_{index}",
+                    long_name=self._words(3).title(),
+                    start_date=start_date,
+                    end_date=self._date(start_date, 60),
+                )
+                instances.append(instance)
+                m2m[instance.uuid] = {
+                    "geographical_regions": self._sample(
+                        limited_fields[models.GeographicalRegion], 1
+                    ),
+                }
+        return self._bulk_create(models.Deployment, instances, m2m, self.size.drafts_per_record)
+
+    def _create_collection_periods(
+        self, deployments: list, platforms: list, instruments: list, limited_fields: dict
+    ) -> list:
+        instances, m2m = [], {}
+        for deployment in deployments:
+            for _ in range(self.size.collection_periods_per_deployment):
+                instance = models.CollectionPeriod(
+                    uuid=self._uuid(),
+                    deployment=deployment,
+                    platform=self.random.choice(platforms),
+                    home_base=self.random.choice(limited_fields[models.HomeBase]),
+                    platform_owner=self._words(2).title(),
+                    auto_generated=False,
+                )
+                instances.append(instance)
+                m2m[instance.uuid] = {
+                    "instruments": self._sample(
+                        instruments, self.size.instruments_per_collection_period
+                    ),
+                }
+        return self._bulk_create(models.CollectionPeriod, instances, m2m, 1)
+
+    def _cmr_metadata(self, index: int, campaign, collection_period, instruments) -> dict:
+        """DOI fields as stored by the DOI matcher, which keeps CMR values as strings"""
+        start = collection_period.deployment.start_date
+        end = collection_period.deployment.end_date
+        platform = collection_period.platform
+        return {
+            "concept_id": f"C{self.seed:03d}{index:07d}-BENCH",
+            "doi": f"10.5067/BENCH/{self.seed}/{index}",
+            "long_name": "",
+            "cmr_short_name": self._name("DATASET", index),
+            "cmr_entry_title": self._words(8).title(),
+            "cmr_abstract": self._words(60),
+            "cmr_projects": str(
+                [{"ShortName": campaign.short_name, "LongName": campaign.long_name}]
+            ),
+            "cmr_dates": str(
+                [
+                    {
+                        "EndsAtPresentFlag": False,
+                        "RangeDateTimes": [
+                            {
+                                "BeginningDateTime": f"{start.isoformat()}T00:00:00.000Z",
+                                "EndingDateTime": f"{end.isoformat()}T00:00:00.000Z",
+                            }
+                        ],
+                    }
+                ]
+            ),
+            "cmr_plats_and_insts": str(
+                [
+                    {
+                        "ShortName": platform.short_name,
+                        "LongName": platform.long_name,
+                        "Instruments": [
+                            {"ShortName": instrument.short_name, "LongName": instrument.long_name}
+                            for instrument in instruments
+                        ],
+                    }
+                ]
+            ),
+            "cmr_science_keywords": str([{"Category": "EARTH SCIENCE", "Topic": self._words(1)}]),
+            "cmr_data_formats": str(["netCDF-4"]),
+        }
+
+    def _create_dois(self, collection_periods: list, instruments: list) -> list:
+        collection_periods_by_campaign = {}
+        for collection_period in collection_periods:
+            campaign = collection_period.deployment.campaign
+            collection_periods_by_campaign.setdefault(campaign, []).append(collection_period)
+
+        instances, m2m = [], {}
+        index = 0
+        for campaign, campaign_collection_periods in collection_periods_by_campaign.items():
+            for _ in range(self.size.dois_per_campaign):
+                index += 1
+                collection_period = self.random.choice(campaign_collection_periods)
+                doi_instruments = self._sample(instruments, 2)
+                metadata = self._cmr_metadata(index, campaign, collection_period, doi_instruments)
+                links = {
+                    "campaigns": [campaign],
+                    "platforms": [collection_period.platform],
+                    "instruments": doi_instruments,
+                    "collection_periods": [collection_period],
+                }
+                date_queried = self._tick()
+
+                # most DOIs have been reviewed and published, the rest are waiting for review
+                if self.random.random() < 0.6:
+                    instance = models.DOI(uuid=self._uuid(), date_queried=date_queried, **metadata)
+                    instances.append(instance)
+                    m2m[instance.uuid] = links
+                else:
+                    self._add_change(
+                        models.DOI,
+                        Change.Actions.CREATE,
+                        self.random.choice(
+                            [
+                                Change.Statuses.CREATED,
+                                Change.Statuses.IN_PROGRESS,
+                                Change.Statuses.IN_TRASH,
+                            ]
+                        ),
+                        {
+                            **metadata,
+                            "date_queried": date_queried.isoformat(),
+                            **{
+                                name: [str(linked.uuid) for linked in linked_records]
+                                for name, linked_records in links.items()
+                            },
+                        },
+                        model_instance_uuid=None,
+                    )
+        return self._bulk_create(models.DOI, instances, m2m, self.size.drafts_per_record)
+
+    def _create_aliases(self, records: list):
+        instances = []
+        for record in records:
+            instances.append(
+                models.Alias(
+                    uuid=self._uuid(),
+                    content_type=ContentType.objects.get_for_model(record),
+                    object_id=record.uuid,
+                    short_name=f"{record.short_name} {self._words(1)}",
+                    source="synthetic catalogue",
+                )
+            )
+        self._bulk_create(models.Alias, instances, {}, 1)
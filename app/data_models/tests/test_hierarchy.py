@@ -0,0 +1,60 @@
+import pytest
+
+from data_models import models
+from data_models.serializers import PlatformTypeSerializer
+
+from . import factories
+
+
+@pytest.mark.django_db
+class TestHierarchy:
+    @pytest.fixture
+    def tree(self):
+        air = factories.PlatformTypeFactory(short_name="Air Platforms")
+        jet = factories.PlatformTypeFactory(short_name="Jet", parent=air)
+        uav = factories.PlatformTypeFactory(short_name="UAV", parent=jet)
+        water = factories.PlatformTypeFactory(short_name="Water Platforms")
+        return air, jet, uav, water
+
+    def test_ancestors_are_stored_on_save(self, tree):
+        air, jet, uav, water = tree
+        assert air.ancestors == []
+        assert jet.ancestors == [air.uuid]
+        assert uav.ancestors == [air.uuid, jet.uuid]
+
+    def test_patriarch_is_a_single_query(self, tree, django_assert_num_queries):
+        air, jet, uav, water = tree
+        with django_assert_num_queries(0):
+            assert air.patriarch == "Air Platforms"
+        with django_assert_num_queries(1):
+            assert uav.patriarch == "Air Platforms"
+
+    def test_descendants(self, tree):
+        air, jet, uav, water = tree
+        assert set(air.get_descendants()) == {jet, uav}
+        assert set(jet.get_descendants(include_self=True)) == {jet, uav}
+        assert list(water.get_descendants()) == []
+
+    def test_moving_a_subtree(self, tree):
+        air, jet, uav, water = tree
+        jet.parent = water
+        jet.save()
+
+        uav.refresh_from_db()
+        assert uav.ancestors == [water.uuid, jet.uuid]
+        assert uav.patriarch == "Water Platforms"
+
+    def test_rebuild_ancestors(self, tree):
+        air, jet, uav, water = tree
+        models.PlatformType.objects.update(ancestors=[])
+
+        models.PlatformType.rebuild_ancestors()
+
+        uav.refresh_from_db()
+        assert uav.ancestors == [air.uuid, jet.uuid]
+
+    def test_serializer_exposes_hierarchy(self, tree):
+        air, jet, uav, water = tree
+        data = PlatformTypeSerializer(jet).data
+        assert data["ancestors"] == [str(air.uuid)]
+        assert data["descendants"] == [uav.uuid]
@@ -0,0 +1,98 @@
+import pytest
+from django.contrib.gis.geos import MultiPolygon, Polygon
+
+from data_models.models import Campaign, Deployment
+from data_models.serializers import CampaignSerializer
+from data_models.spatial import parse_bbox
+from data_models.summary import refresh_campaign_summaries
+
+from . import factories
+
+
+class TestParseBbox:
+    def test_bbox(self):
+        box = parse_bbox("10,-10,20,5")
+        assert box.extent == (5, -10, 20, 10)
+        assert box.srid == 4326
+
+    def test_bbox_crossing_antimeridian(self):
+        box = parse_bbox("10,-10,-170,170")
+        assert isinstance(box, MultiPolygon)
+        assert [polygon.extent for polygon in box] == [(170, -10, 180, 10), (-180, -10, -170, 10)]
+
+    @pytest.mark.parametrize("value", ["10,-10,20", "a,b,c,d", "95,-10,20,5", "-10,10,20,5"])
+    def test_invalid_bbox(self, value):
+        with pytest.raises(ValueError):
+            parse_bbox(value)
+
+
+@pytest.mark.django_db
+class TestSpatialSearch:
+    @pytest.fixture
+    def deployments(self):
+        return {
+            name: factories.DeploymentFactory(spatial_bounds=Polygon.from_bbox(bbox, srid=4326))
+            for name, bbox in [("small", (1, 1, 2, 2)), ("large", (0, 0, 10, 10))]
+        }
+
+    def test_bbox_intersects(self, deployments):
+        results = Deployment.search({"bbox": "3,1.5,3,1.5"})
+        assert set(results) == set(deployments.values())
+
+    def test_bbox_contains(self, deployments):
+        results = Deployment.search({"bbox": "3,0.5,3,0.5", "bbox_relation": "contains"})
+        assert list(results) == [deployments["small"]]
+
+    def test_point_radius(self, deployments):
+        assert list(Deployment.search({"point": "1.5,5", "radius": "100"})) == [
+            deployments["large"]
+        ]
+        results = Deployment.search({"point": "1.5,5", "radius": "400"})
+        assert set(results) == set(deployments.values())
+
+    def test_point_requires_radius(self, deployments):
+        with pytest.raises(ValueError):
+            Deployment.search({"point": "1.5,5"})
+
+    def test_remaining_params_are_filters(self, deployments):
+        small = deployments["small"]
+        results = Deployment.search({"bbox": "3,0,3,0", "short_name": small.short_name})
+        assert list(results) == [small]
+
+    def test_campaign_search_uses_summary(self, deployments):
+        refresh_campaign_summaries([d.campaign_id for d in deployments.values()])
+        results = Campaign.search({"bbox": "10,5,10,5"})
+        assert list(results) == [deployments["large"].campaign]
+
+    def test_campaign_search_uses_union_of_deployments(self):
+        campaign = factories.CampaignFactory()
+        for bbox in [(-165, 55, -145, 70), (-87, 25, -80, 31)]:  # Alaska and Florida
+            factories.DeploymentFactory(
+                campaign=campaign, spatial_bounds=Polygon.from_bbox(bbox, srid=4326)
+            )
+        refresh_campaign_summaries([campaign.uuid])
+
+        # Texas lies within the bounding box of the deployments, but away from both
+        assert list(Campaign.search({"bbox": "36,26,-94,-106"})) == []
+        assert list(Campaign.search({"bbox": "30,28,-81,-83"})) == [campaign]
+        assert list(Campaign.search({"point": "61,-150", "radius": "50"})) == [campaign]
+
+
+@pytest.mark.django_db
+class TestSimplifiedGeojson:
+    def test_deployment_geojson(self):
+        deployment = factories.DeploymentFactory(spatial_bounds=Polygon.from_bbox((0, 0, 1, 1)))
+        assert deployment.spatial_bounds_geojson["type"] == "Polygon"
+
+        deployment.spatial_bounds = None
+        deployment.save()
+        assert deployment.spatial_bounds_geojson is None
+
+    def test_campaign_geojson_is_union_of_deployments(self):
+        campaign = factories.CampaignFactory()
+        for bbox in [(0, 0, 1, 1), (5, 5, 6, 6)]:
+            factories.DeploymentFactory(campaign=campaign, spatial_bounds=Polygon.from_bbox(bbox))
+
+        data = CampaignSerializer(campaign).data
+        assert data["spatial_bounds"]["type"] == "MultiPolygon"
+        assert len(data["spatial_bounds"]["coordinates"]) == 2
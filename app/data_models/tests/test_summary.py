@@ -0,0 +1,108 @@
+from datetime import date
+
+import pytest
+from django.contrib.gis.geos import Polygon
+
+from data_models.models import Campaign, CampaignSummary
+from data_models import summary
+from data_models.serializers import CampaignSerializer
+from data_models.summary import rebuild_campaign_summaries, refresh_campaign_summaries
+
+from . import factories
+
+
+@pytest.mark.django_db
+class TestCampaignSummary:
+    def test_refresh(self):
+        campaign = factories.CampaignFactory()
+        first, second = [
+            factories.DeploymentFactory(
+                campaign=campaign,
+                start_date=date(year, 1, 1),
+                end_date=date(year, 2, 1),
+                spatial_bounds=Polygon.from_bbox(bbox),
+            )
+            for year, bbox in [(2020, (0, 0, 1, 1)), (2021, (2, 2, 3, 3))]
+        ]
+        collection_period = factories.CollectionPeriodFactory(deployment=first, number_ventures=3)
+        instrument = factories.InstrumentFactory()
+        collection_period.instruments.add(instrument)
+        iop = factories.IOPFactory(deployment=second)
+        doi = factories.DOIFactory()
+        doi.campaigns.add(campaign)
+
+        refresh_campaign_summaries([campaign.uuid])
+
+        summary = CampaignSummary.objects.get(campaign=campaign)
+        assert summary.number_deployments == 2
+        assert summary.number_ventures == 3
+        assert summary.number_data_products == 1
+        assert summary.instruments == [instrument.uuid]
+        assert summary.platforms == [collection_period.platform_id]
+        assert summary.iops == [iop.uuid]
+        assert summary.significant_events == []
+        assert (summary.start_date, summary.end_date) == (date(2020, 1, 1), date(2021, 2, 1))
+        assert summary.spatial_bounds.extent == (0, 0, 3, 3)
+        assert sorted(polygon.extent for polygon in summary.spatial_union) == [
+            (0, 0, 1, 1),
+            (2, 2, 3, 3),
+        ]
+
+    def test_empty_campaign(self):
+        campaign = factories.CampaignFactory()
+        refresh_campaign_summaries([campaign.uuid])
+
+        summary = CampaignSummary.objects.get(campaign=campaign)
+        assert summary.number_deployments == 0
+        assert summary.instruments == []
+        assert summary.spatial_bounds is None
+        assert summary.spatial_union is None
+
+    def test_refreshed_when_records_are_published(self, django_capture_on_commit_callbacks):
+        campaign = factories.CampaignFactory()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            deployment = factories.DeploymentFactory(campaign=campaign)
+        assert CampaignSummary.objects.get(campaign=campaign).number_deployments == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            deployment.delete()
+        assert CampaignSummary.objects.get(campaign=campaign).number_deployments == 0
+
+    def test_deployment_moved_between_campaigns(self, django_capture_on_commit_callbacks):
+        old_campaign, new_campaign = factories.CampaignFactory.create_batch(2)
+        deployment = factories.DeploymentFactory(campaign=old_campaign)
+        rebuild_campaign_summaries()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            deployment.campaign = new_campaign
+            deployment.save()
+
+        assert CampaignSummary.objects.get(campaign=old_campaign).number_deployments == 0
+        assert CampaignSummary.objects.get(campaign=new_campaign).number_deployments == 1
+
+    def test_serializer_reads_summary(self):
+        campaign = factories.CampaignFactory()
+        factories.DeploymentFactory(campaign=campaign)
+
+        # the summary is computed on first use
+        assert CampaignSerializer(campaign).data["number_deployments"] == 1
+        CampaignSummary.objects.filter(campaign=campaign).update(number_deployments=5)
+        campaign = Campaign.objects.get(uuid=campaign.uuid)
+        assert CampaignSerializer(campaign).data["number_deployments"] == 5
+
+    def test_missing_summary_is_computed_once(self, monkeypatch):
+        campaign = factories.CampaignFactory()
+        factories.DeploymentFactory(campaign=campaign)
+        CampaignSummary.objects.filter(campaign=campaign).delete()
+        refreshed = []
+
+        def refresh(campaign_uuids):
+            refreshed.append(campaign_uuids)
+            refresh_campaign_summaries(campaign_uuids)
+
+        monkeypatch.setattr(summary, "refresh_campaign_summaries", refresh)
+        (campaign,) = Campaign.search({"uuid": campaign.uuid})
+
+        assert CampaignSerializer(campaign).data["number_deployments"] == 1
+        assert refreshed == [[campaign.uuid]]
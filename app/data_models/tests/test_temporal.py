@@ -0,0 +1,129 @@
+from datetime import date
+
+import pytest
+from psycopg2.extras import DateRange
+
+from data_models.models import Deployment, DOI
+from data_models.serializers import DeploymentSerializer
+from data_models.temporal import normalize_cmr_dates, parse_window, range_bounds
+
+from . import factories
+
+CMR_DATES = [
+    {
+        "EndsAtPresentFlag": False,
+        "RangeDateTimes": [
+            {
+                "BeginningDateTime": "2017-07-20T16:58:21.000Z",
+                "EndingDateTime": "2017-08-08T20:36:00.000Z",
+            }
+        ],
+    },
+    {"SingleDateTimes": ["2016-02-10T14:35:28.000Z"]},
+]
+
+
+class TestNormalizeCmrDates:
+    def test_extents_are_merged(self):
+        assert range_bounds(normalize_cmr_dates(CMR_DATES)) == (
+            date(2016, 2, 10),
+            date(2017, 8, 8),
+        )
+
+    def test_stored_repr(self):
+        assert normalize_cmr_dates(str(CMR_DATES)) == normalize_cmr_dates(CMR_DATES)
+
+    def test_ends_at_present(self):
+        cmr_dates = [{**CMR_DATES[0], "EndsAtPresentFlag": True}]
+        assert range_bounds(normalize_cmr_dates(cmr_dates)) == (date(2017, 7, 20), None)
+
+    @pytest.mark.parametrize("cmr_dates", [None, [], "not a list", [{"RangeDateTimes": []}]])
+    def test_no_dates(self, cmr_dates):
+        assert normalize_cmr_dates(cmr_dates) is None
+
+
+class TestParseWindow:
+    def test_window(self):
+        assert parse_window("2020-01-01/2020-12-31") == DateRange(
+            date(2020, 1, 1), date(2020, 12, 31), "[]"
+        )
+
+    def test_open_window(self):
+        assert parse_window("2020-01-01/") == DateRange(date(2020, 1, 1), None, "[]")
+
+    @pytest.mark.parametrize(
+        "value", ["2020-01-01", "2020-13-01/2020-12-31", "2021-01-01/2020-01-01"]
+    )
+    def test_invalid_window(self, value):
+        with pytest.raises(ValueError):
+            parse_window(value)
+
+
+@pytest.mark.django_db
+class TestOverlapSearch:
+    @pytest.fixture
+    def deployments(self):
+        return {
+            year: factories.DeploymentFactory(
+                start_date=date(year, 3, 1), end_date=date(year, 4, 30)
+            )
+            for year in [2018, 2019]
+        }
+
+    def test_date_range_is_stored(self, deployments):
+        deployment = Deployment.objects.get(uuid=deployments[2018].uuid)
+        assert range_bounds(deployment.date_range) == (date(2018, 3, 1), date(2018, 4, 30))
+        assert DeploymentSerializer(deployment).data["date_range"] == {
+            "start": "2018-03-01",
+            "end": "2018-04-30",
+        }
+
+    def test_overlaps(self, deployments):
+        assert list(Deployment.search({"overlaps": "2018-04-30/2018-12-31"})) == [deployments[2018]]
+        assert set(Deployment.search({"overlaps": "2018-04-01/"})) == set(deployments.values())
+        assert list(Deployment.search({"overlaps": "2018-05-01/2019-02-28"})) == []
+
+    def test_doi_dates_are_normalized(self):
+        doi = factories.DOIFactory(cmr_dates=str(CMR_DATES))
+        assert DOI.search({"overlaps": "2017-08-08/2017-08-08"}).get() == doi
+
+
+@pytest.mark.django_db
+class TestCampaignTimeline:
+    @pytest.fixture
+    def campaign(self):
+        campaign = factories.CampaignFactory()
+        deployment = factories.DeploymentFactory(
+            campaign=campaign, start_date=date(2018, 3, 1), end_date=date(2018, 4, 30)
+        )
+        factories.IOPFactory(
+            deployment=deployment, start_date=date(2018, 3, 5), end_date=date(2018, 3, 6)
+        )
+        factories.SignificantEventFactory(
+            deployment=deployment, start_date=date(2018, 4, 20), end_date=date(2018, 4, 20)
+        )
+        factories.IOPFactory()
+        return campaign
+
+    def test_timeline(self, campaign, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            timeline = campaign.get_timeline()
+        assert [entry["type"] for entry in timeline] == ["deployment", "iop", "significant_event"]
+        assert {entry["deployment_uuid"] for entry in timeline} == {timeline[0]["uuid"]}
+
+    def test_timeline_window(self, campaign):
+        timeline = campaign.get_timeline(parse_window("2018-04-01/2018-04-30"))
+        assert [entry["type"] for entry in timeline] == ["deployment", "significant_event"]
+
+    def test_timeline_endpoint(self, campaign, client):
+        response = client.get(f"/api/campaign/{campaign.uuid}/timeline?overlaps=2018-03-06/")
+        data = response.json()
+        assert data["success"]
+        assert [entry["type"] for entry in data["data"]] == [
+            "deployment",
+            "iop",
+            "significant_event",
+        ]
+
+        response = client.get(f"/api/campaign/{campaign.uuid}/timeline?overlaps=2018")
+        assert not response.json()["success"]
@@ -1,23 +1,32 @@
 import logging
-from typing import Any, Dict, List
+from string import Template
+from typing import Any, Dict, List, Optional
 import requests
 import csv
 
+from api_app.telemetry import record_http_response, stage
+
 logger = logging.getLogger(__name__)
 
 base_url = "https://gcmdservices.gsfc.nasa.gov/kms"
 
+# reuses connections to KMS across the requests of a sync
+session = requests.Session()
+
 
 def kms_lookup(endpoint: str, page_num=1) -> Dict[str, Any]:
     url = f"{base_url}/{endpoint if not endpoint.startswith('/') else endpoint[1:]}"
     logger.debug(f"Fetching {url}, page {page_num}")
-    r = requests.get(url, params={"format": "json", "page_num": page_num})
+    with stage("http"):
+        r = session.get(url, params={"format": "json", "page_num": page_num})
+    record_http_response(r)
     try:
         r.raise_for_status()
     except requests.HTTPError:
         logger.error(f'Response from KMS: "{r.text}"')
         raise
-    return r.json()
+    with stage("json_parsing"):
+        return r.json()
 
 
 # https://gcmdservices.gsfc.nasa.gov/kms/
@@ -37,10 +46,34 @@ endpoints = {
 }
 
 
+def get_endpoint(name: str, **kwargs) -> str:
+    return Template(endpoints[name]).substitute(**kwargs)
+
+
+def get_scheme_version(scheme: str) -> Optional[str]:
+    """
+    Version of a keyword scheme, which changes whenever any of its concepts does: the
+    published KMS version along with the date the scheme was last updated in it. Returns None
+    if KMS doesn't report either of them.
+    """
+    versions = kms_lookup(get_endpoint("get_concept_versions", versionType="published"))
+    schemes = kms_lookup(get_endpoint("get_concept_schemes"))
+    try:
+        version = versions["versions"][0]["version"]
+        update_date = next(s["updateDate"] for s in schemes["schemes"] if s["name"] == scheme)
+    except (KeyError, IndexError, StopIteration):
+        logger.warning(f"KMS didn't report the version of {scheme}")
+        return None
+    return f"{version}/{update_date}"
+
+
 def fetch_keyword_list(scheme: str) -> List[Dict[str, any]]:
     url = f"https://gcmd.earthdata.nasa.gov/kms/concepts/concept_scheme/{scheme}"
-    r = requests.get(url, params={"format": "csv"})
-    csv_contents = r.content.decode('utf-8')
-    # Skip first line of CSV, it is junk
-    csv_contents = csv_contents.splitlines()[1:]
-    return list(csv.DictReader(csv_contents))
+    with stage("http"):
+        r = session.get(url, params={"format": "csv"})
+    record_http_response(r)
+    with stage("csv_parsing"):
+        csv_contents = r.content.decode('utf-8')
+        # Skip first line of CSV, it is junk
+        csv_contents = csv_contents.splitlines()[1:]
+        return list(csv.DictReader(csv_contents))
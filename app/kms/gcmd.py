@@ -1,13 +1,18 @@
 import logging
 import uuid
 from dataclasses import dataclass, field
-from typing import List, Optional, Set, Type, Union
+from functools import partial
+from typing import Iterable, List, Optional, Set, Type, Union
 
+import requests
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.forms.models import model_to_dict
 
 from admg_webapp.users.models import User
-from api_app.models import Change, Recommendation
+from api_app.models import Change, GcmdSchemeVersion, Recommendation, refresh_target_drafts
+from api_app.progress import ProgressReporter
+from api_app.telemetry import count, stage
 from data_models.models import (
     Alias,
     Campaign,
@@ -44,7 +49,6 @@ keyword_casei_attribute_map = {
     "gcmdinstrument": "gcmd_instruments",
     "gcmdphenomenon": "gcmd_phenomena",
 }
-short_name_priority = ["short_name", "variable_3", "variable_2", "variable_1", "term"]
 
 
 def get_content_type(model: Type[Models]) -> ContentType:
@@ -66,6 +70,54 @@ def get_casei_model(content_type: str) -> Casei_Object:
     return keyword_to_casei_map[content_type.lower()]
 
 
+def get_keyword_through(keyword: Models):
+    """
+    The through model of the many to many field connecting CASEI objects to a keyword, with
+    the names of its foreign keys to the CASEI object and to the keyword
+    """
+    m2m_field = keyword.casei_model._meta.get_field(keyword.casei_attribute)
+    return (
+        m2m_field.remote_field.through,
+        m2m_field.m2m_field_name(),
+        m2m_field.m2m_reverse_field_name(),
+    )
+
+
+def get_connected_uuids(keyword: Models, casei_uuids: Iterable) -> Set:
+    """UUIDs of those of the CASEI objects that are connected to a keyword"""
+    through, casei_field, keyword_field = get_keyword_through(keyword)
+    return set(
+        through.objects.filter(
+            **{keyword_field: keyword.pk, f"{casei_field}__in": list(casei_uuids)}
+        ).values_list(f"{casei_field}_id", flat=True)
+    )
+
+
+def set_keyword_connections(keyword: Models, connect: Iterable, disconnect: Iterable) -> None:
+    """
+    Connects a keyword to the CASEI objects of the `connect` uuids and disconnects it from
+    those of the `disconnect` uuids, with a single bulk insert and delete on the through table
+    of their many to many field
+    """
+    through, casei_field, keyword_field = get_keyword_through(keyword)
+    connect, disconnect = set(connect), set(disconnect)
+    if disconnect:
+        through.objects.filter(
+            **{keyword_field: keyword.pk, f"{casei_field}__in": disconnect}
+        ).delete()
+    if connect:
+        through.objects.bulk_create(
+            [
+                through(**{f"{casei_field}_id": casei_uuid, f"{keyword_field}_id": keyword.pk})
+                for casei_uuid in connect
+            ],
+            ignore_conflicts=True,
+        )
+    # bulk writes don't send `m2m_changed`, so the drafts of the objects are refreshed here
+    if connect | disconnect:
+        transaction.on_commit(partial(refresh_target_drafts, *(connect | disconnect)))
+
+
 def convert_keyword(record: dict, model: Type[Models]) -> dict:
     """Convert GCMD API record to match the format from the output of model_to_dict for each type of model."""
     record["gcmd_uuid"] = record.pop("UUID")
@@ -228,6 +280,8 @@ class GcmdSync:
     update_keywords: List[str] = field(default_factory=list)
     delete_keywords: List[str] = field(default_factory=list)
     published_keywords: List[str] = field(default_factory=list)
+    # whether the scheme was left as is, its KMS version having been synced already
+    skipped: bool = False
     model: Models = field(init=False)
     content_type: ContentType = field(init=False)
 
@@ -239,31 +293,77 @@ class GcmdSync:
     def total_count(self):
         return len(self.create_keywords) + len(self.update_keywords) + len(self.delete_keywords)
 
-    def sync_keywords(self):
+    def sync(self, progress: Optional[ProgressReporter] = None, full: bool = False) -> str:
+        """
+        Syncs the scheme if KMS has published a new version of it since it was last synced,
+        and records that version. When KMS doesn't report the version of the scheme, or when
+        `full` is set, the scheme is synced regardless.
+        """
+        progress = progress or ProgressReporter()
+        progress.start_stage(f"Checking {self.gcmd_scheme} version")
+        try:
+            version = api.get_scheme_version(self.gcmd_scheme)
+        except requests.RequestException:
+            logger.exception(f"Could not get the KMS version of {self.gcmd_scheme}")
+            version = None
+
+        synced_version = (
+            GcmdSchemeVersion.objects.filter(scheme=self.gcmd_scheme)
+            .values_list("version", flat=True)
+            .first()
+        )
+        if not full and version is not None and version == synced_version:
+            self.skipped = True
+            return f"Skipped {self.gcmd_scheme} gcmd keywords, version {version} already synced"
+
+        result = self.sync_keywords(progress)
+        if version is not None:
+            GcmdSchemeVersion.objects.update_or_create(
+                scheme=self.gcmd_scheme, defaults={"version": version}
+            )
+        return result
+
+    def sync_keywords(self, progress: Optional[ProgressReporter] = None):
         """This method aims to sync the gcmd public dataset with the gcmd database by doing the following:
         * If item not in db but in API, create "ADD" change record
         * If item in db and in API do not match, create "UPDATE" change record
         * If item in db but not in API, create "DELETE" change record
         """
+        progress = progress or ProgressReporter()
+        progress.start_stage(f"Fetching {self.gcmd_scheme}")
         keywords = api.fetch_keyword_list(self.gcmd_scheme)
         uuids = set([keyword.get("UUID") for keyword in keywords])
+        with stage("keyword_diff"):
+            published_keywords = {
+                str(row.gcmd_uuid): row for row in self.model.objects.all().iterator()
+            }
 
+        progress.start_stage(f"Syncing {self.gcmd_scheme}", total=len(keywords))
         for x, keyword in enumerate(keywords):
+            progress.advance()
             if not is_valid_keyword(keyword, self.model):
                 continue
             keyword = convert_keyword(keyword, self.model)
-            try:
-                published_keyword = self.model.objects.get(gcmd_uuid=keyword["gcmd_uuid"])
-            except self.model.DoesNotExist:
+            progress.set_current(get_short_name(keyword))
+            with stage("keyword_diff"):
+                published_keyword = published_keywords.get(keyword["gcmd_uuid"])
+                # Compare api record to record in db to see if they match.
+                unchanged = published_keyword is not None and compare_record_with_keyword(
+                    published_keyword, keyword
+                )
+            if published_keyword is None:
                 # If item not in db but in API, create "ADD" change record
                 self.create_change(keyword, Change.Actions.CREATE, None)
+            elif not unchanged:
+                # If item in db and in API do not match, create "UPDATE" change record
+                self.create_change(keyword, Change.Actions.UPDATE, published_keyword.uuid)
             else:
-                # Compare api record to record in db to see if they match. If they are the same, then we are done for this record.
-                if not compare_record_with_keyword(published_keyword, keyword):
-                    # If item in db and in API do not match, create "UPDATE" change record
-                    self.create_change(keyword, Change.Actions.UPDATE, published_keyword.uuid)
+                # The api record matches the record in db, so we are done for this record.
+                count("drafts_skipped")
 
-        self.delete_keywords_from_current_uuids(uuids, self.model)
+        progress.start_stage(f"Removing deleted {self.gcmd_scheme}")
+        with stage("keyword_diff"):
+            self.delete_keywords_from_current_uuids(uuids, self.model)
 
         return (
             f"Successfully Synced {len(keywords)} {self.gcmd_scheme} gcmd keywords - "
@@ -321,13 +421,19 @@ class GcmdSync:
                 recommendation.save()
 
     def create_change(self, keyword: dict, action: Actions, model_uuid: Optional[str]) -> None:
+        with stage("db_writes"):
+            self._create_change(keyword, action, model_uuid)
+
+    def _create_change(self, keyword: dict, action: Actions, model_uuid: Optional[str]) -> None:
         change_draft = get_change(keyword, self.model, action, model_uuid)
         # If a non-published Change already exists, just update the current one.
         if change_draft:
+            count("drafts_updated")
             self.update_change(change_draft, keyword)
             self.create_recommended_list(keyword, action, change_draft)
             self._add_keyword_to_changed_list(change_draft, action)
         else:
+            count("drafts_created")
             if action is Change.Actions.CREATE:
                 model_uuid = str(uuid.uuid4())
                 # Create records reuse the change's uuid for the instance's uuid
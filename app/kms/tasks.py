@@ -4,7 +4,10 @@ from dataclasses import asdict
 from celery import shared_task
 from django.conf import settings
 
-from api_app.models import Change
+from api_app.models import Change, SyncRun
+from api_app.progress import ProgressReporter
+from api_app.task_locks import SingletonTask
+from api_app.telemetry import RunTelemetry
 from kms import email, gcmd
 
 logger = logging.getLogger(__name__)
@@ -72,12 +75,36 @@ def email_gcmd_sync_results(gcmd_syncs):
     )
 
 
-@shared_task
-def sync_gcmd() -> str:
+@shared_task(bind=True, base=SingletonTask, lock_arguments=False)
+def sync_gcmd(self, full=False) -> str:
+    """
+    Syncs the GCMD keyword schemes with KMS, skipping those whose KMS version has been synced
+    already unless `full` is set
+    """
     gcmd_syncs = {}
-    for keyword_scheme in gcmd.scheme_to_model_map:
-        sync = gcmd.GcmdSync(keyword_scheme)
-        logger.info(sync.sync_keywords())
-        gcmd_syncs[keyword_scheme] = asdict(sync, dict_factory=serialize)
+    progress = ProgressReporter(self)
+    run = SyncRun.objects.create()
+    try:
+        for keyword_scheme in gcmd.scheme_to_model_map:
+            sync = gcmd.GcmdSync(keyword_scheme)
+            with RunTelemetry().record() as telemetry:
+                logger.info(sync.sync(progress, full=full))
+            run.record_scheme(
+                keyword_scheme,
+                {
+                    "created": len(sync.create_keywords),
+                    "updated": len(sync.update_keywords),
+                    "deleted": len(sync.delete_keywords),
+                    "published": len(sync.published_keywords),
+                    "unchanged": telemetry.counters["drafts_skipped"],
+                    "skipped": sync.skipped,
+                    "telemetry": telemetry.as_dict(),
+                },
+            )
+            gcmd_syncs[keyword_scheme] = asdict(sync, dict_factory=serialize)
+    except Exception:
+        run.finish(failed=True)
+        raise
+    run.finish()
 
     email_gcmd_sync_results.apply_async(args=(gcmd_syncs,), retry=False)
@@ -0,0 +1,67 @@
+import pytest
+
+from api_app.models import GcmdSchemeVersion
+from data_models.tests.factories import GcmdProjectFactory
+from kms import api, gcmd
+
+
+@pytest.mark.django_db
+class TestIncrementalSync:
+    @pytest.fixture
+    def kms(self, monkeypatch):
+        keywords = GcmdProjectFactory.create_batch(2)
+        fetched = []
+
+        def fetch_keyword_list(scheme):
+            fetched.append(scheme)
+            return [
+                {
+                    "Bucket": keyword.bucket,
+                    "Short_Name": keyword.short_name,
+                    "Long_Name": keyword.long_name,
+                    "UUID": str(keyword.gcmd_uuid),
+                }
+                for keyword in keywords
+            ]
+
+        monkeypatch.setattr(api, "fetch_keyword_list", fetch_keyword_list)
+        monkeypatch.setattr(api, "get_scheme_version", lambda scheme: "16.5/2023-05-01")
+        return fetched
+
+    def test_synced_version_is_skipped(self, kms):
+        GcmdSchemeVersion.objects.create(scheme="projects", version="16.5/2023-05-01")
+        sync = gcmd.GcmdSync("projects")
+
+        sync.sync()
+
+        assert sync.skipped
+        assert kms == []
+
+    def test_new_version_is_synced(self, kms):
+        GcmdSchemeVersion.objects.create(scheme="projects", version="16.4/2023-01-01")
+        sync = gcmd.GcmdSync("projects")
+
+        sync.sync()
+
+        assert not sync.skipped
+        assert kms == ["projects"]
+        assert sync.total_count == 0
+        assert GcmdSchemeVersion.objects.get(scheme="projects").version == "16.5/2023-05-01"
+
+    def test_full_sync(self, kms):
+        GcmdSchemeVersion.objects.create(scheme="projects", version="16.5/2023-05-01")
+        sync = gcmd.GcmdSync("projects")
+
+        sync.sync(full=True)
+
+        assert not sync.skipped
+        assert kms == ["projects"]
+
+    def test_unknown_version_falls_back_to_a_full_sync(self, kms, monkeypatch):
+        monkeypatch.setattr(api, "get_scheme_version", lambda scheme: None)
+        sync = gcmd.GcmdSync("projects")
+
+        sync.sync()
+
+        assert kms == ["projects"]
+        assert not GcmdSchemeVersion.objects.exists()